@@ -1,9 +1,15 @@
-import { Controller, Get, Post, Delete, Body, Param, Query } from '@nestjs/common';
+import { Controller, Get, Post, Delete, Body, Param, Query, BadRequestException } from '@nestjs/common';
 import { DevicesService } from './devices.service';
 import { WebSocketGateway } from './websocket.gateway';
 import { DebugEventsGateway } from './debug-events.gateway';
 import { AppLogger } from '../../common/logger';
 
+/**
+ * Max. Devices pro Bulk-Registrierung - größere Flotten in mehreren Batches senden
+ * (hält den Request auch unter dem Standard-Body-Limit von Express, 100 KB)
+ */
+const MAX_BULK_DEVICES = 500;
+
 /**
  * Controller für Device-Verwaltung
  */
@@ -82,6 +88,48 @@ export class DevicesController {
     return device;
   }
 
+  /**
+   * POST /api/devices/bulk
+   * Registriert viele Devices in einem Request (ein bulkWrite pro Batch)
+   */
+  @Post('bulk')
+  async registerDevicesBulk(
+    @Body() body: {
+      devices: Array<{
+        clientId: string;
+        name: string;
+        capabilities: string[];
+        metadata?: any;
+      }>;
+    }
+  ) {
+    const devices = body?.devices;
+    if (!Array.isArray(devices) || devices.length === 0) {
+      throw new BadRequestException('devices must be a non-empty array');
+    }
+    if (devices.length > MAX_BULK_DEVICES) {
+      throw new BadRequestException(`At most ${MAX_BULK_DEVICES} devices per request`);
+    }
+    if (devices.some(device => !device?.clientId || !device?.name)) {
+      throw new BadRequestException('Every device needs clientId and name');
+    }
+
+    this.logger.info('📱 Registering devices (bulk)', { count: devices.length });
+
+    const result = await this.devicesService.registerDevicesBulk(
+      devices.map(device => ({
+        clientId: device.clientId,
+        name: device.name,
+        capabilities: device.capabilities || [],
+        metadata: device.metadata,
+      }))
+    );
+
+    this.logger.info('✅ Devices registered successfully (bulk)', result);
+
+    return result;
+  }
+
   @Delete(':clientId')
   async deleteDevice(@Param('clientId') clientId: string) {
     this.logger.warn('🗑️  Deleting device', { clientId });
@@ -43,6 +43,56 @@ export class DevicesService {
     }
   }
 
+  /**
+   * Registriert viele Devices auf einmal (Upsert in einem bulkWrite statt
+   * einem findOneAndUpdate pro Device, z.B. für simulierte Flotten)
+   */
+  async registerDevicesBulk(
+    devices: Array<{
+      clientId: string;
+      name: string;
+      capabilities: string[];
+      metadata?: any;
+    }>
+  ): Promise<{ received: number; upserted: number; modified: number; durationMs: number }> {
+    const startTime = Date.now();
+    const now = new Date();
+
+    const operations = devices.map(device => ({
+      updateOne: {
+        filter: { clientId: device.clientId },
+        update: {
+          $set: {
+            clientId: device.clientId,
+            name: device.name,
+            capabilities: device.capabilities,
+            metadata: device.metadata,
+            lastSeen: now,
+            active: true,
+          },
+        },
+        upsert: true,
+      },
+    }));
+
+    try {
+      // ordered: false - ein fehlerhaftes Device blockiert den Rest des Batches nicht
+      const result = await this.deviceModel.bulkWrite(operations, { ordered: false });
+      const summary = {
+        received: devices.length,
+        upserted: result.upsertedCount,
+        modified: result.modifiedCount,
+        durationMs: Date.now() - startTime,
+      };
+
+      this.logger.info('Devices registered (bulk)', summary);
+      return summary;
+    } catch (error) {
+      this.logger.error('Failed to register devices (bulk)', error.message, { count: devices.length });
+      throw error;
+    }
+  }
+
   /**
    * Aktualisiert den Device-Status
    */
@@ -20,6 +20,9 @@ export class WebSocketGateway implements OnModuleInit, OnModuleDestroy {
   private server: http.Server | https.Server;
   private clients: Map<string, ClientConnection> = new Map();
   private heartbeatInterval: NodeJS.Timeout;
+
+  // Binär-Payloads (Audio) mitkomprimieren? PCM spart nur ~10-20% bei deutlich mehr CPU
+  private deflateBinary = false;
   
   // Event-Emitter für USO-Datenströme
   public readonly eventEmitter = new EventEmitter();
@@ -50,8 +53,11 @@ export class WebSocketGateway implements OnModuleInit, OnModuleDestroy {
       this.server = http.createServer();
     }
 
-    // WebSocket-Server erstellen
-    this.wss = new WebSocket.Server({ server: this.server });
+    // WebSocket-Server erstellen (permessage-deflate wird nur genutzt, wenn der Client es anbietet)
+    this.wss = new WebSocket.Server({
+      server: this.server,
+      perMessageDeflate: this.createPerMessageDeflateOptions(),
+    });
 
     this.wss.on('connection', (ws: WebSocket, req: http.IncomingMessage) => {
       this.handleConnection(ws, req);
@@ -65,6 +71,35 @@ export class WebSocketGateway implements OnModuleInit, OnModuleDestroy {
     this.startHeartbeat();
   }
 
+  /**
+   * permessage-deflate (RFC 7692) für die vielen kleinen, fast gleichen USO-Header
+   * WS_PERMESSAGE_DEFLATE=false schaltet ab, WS_DEFLATE_THRESHOLD (Bytes) ist die Mindestgröße -
+   * die ws-Standardschwelle von 1024 würde gerade die Header (~250 Bytes) nie komprimieren.
+   * Mit Kontext-Übernahme komprimiert jeder Header gegen die vorherigen (Benchmark: test-scripts/uso-compression-bench.py)
+   */
+  private createPerMessageDeflateOptions(): WebSocket.PerMessageDeflateOptions | false {
+    if (process.env.WS_PERMESSAGE_DEFLATE === 'false') {
+      return false;
+    }
+
+    this.deflateBinary = process.env.WS_DEFLATE_BINARY === 'true';
+    const options: WebSocket.PerMessageDeflateOptions = {
+      threshold: parseInt(process.env.WS_DEFLATE_THRESHOLD || '0', 10),
+      zlibDeflateOptions: {
+        level: parseInt(process.env.WS_DEFLATE_LEVEL || '1', 10),
+        memLevel: 7,
+      },
+      concurrencyLimit: 10,
+    };
+
+    this.logger.info('permessage-deflate enabled', {
+      threshold: options.threshold,
+      level: options.zlibDeflateOptions!.level,
+      deflateBinary: this.deflateBinary,
+    });
+    return options;
+  }
+
   async onModuleDestroy() {
     this.logger.info('Shutting down WebSocket server...');
     
@@ -100,6 +135,8 @@ export class WebSocketGateway implements OnModuleInit, OnModuleDestroy {
     const url = new URL(req.url || '', `http://${req.headers.host}`);
     const clientId = url.searchParams.get('clientId');
     const clientSecret = url.searchParams.get('secret');
+    // Delta-Header (headerDelta=1): pro Session erster Header vollständig, danach nur Änderungen
+    const headerDelta = url.searchParams.get('headerDelta') === '1';
 
     if (!clientId || !clientSecret) {
       this.logger.warn('Connection rejected - missing credentials', { connectionId });
@@ -125,6 +162,7 @@ export class WebSocketGateway implements OnModuleInit, OnModuleDestroy {
       lastHeartbeat: Date.now(),
       lastUSOHeader: null,
       isAlive: true,
+      headerDelta: headerDelta ? { sent: new Map(), received: new Map() } : undefined,
     };
 
     this.clients.set(connectionId, client);
@@ -135,7 +173,12 @@ export class WebSocketGateway implements OnModuleInit, OnModuleDestroy {
       lastSeen: new Date(),
     });
 
-    this.logger.info('Client connected and authenticated', { connectionId, clientId });
+    this.logger.info('Client connected and authenticated', {
+      connectionId,
+      clientId,
+      permessageDeflate: ws.extensions.includes('permessage-deflate'),
+      headerDelta,
+    });
 
     // Pong-Handler für Heartbeat
     ws.on('pong', () => {
@@ -143,9 +186,9 @@ export class WebSocketGateway implements OnModuleInit, OnModuleDestroy {
       client.lastHeartbeat = Date.now();
     });
 
-    // Message-Handler
-    ws.on('message', (data: WebSocket.Data) => {
-      this.handleMessage(client, data);
+    // Message-Handler (ws v8: jeder Frame kommt als Buffer, isBinary unterscheidet Text/Binär)
+    ws.on('message', (data: WebSocket.RawData, isBinary: boolean) => {
+      this.handleMessage(client, data, isBinary);
     });
 
     // Close-Handler
@@ -158,30 +201,30 @@ export class WebSocketGateway implements OnModuleInit, OnModuleDestroy {
       this.logger.error('WebSocket error', error.message, { connectionId, clientId });
     });
 
-    // Willkommensnachricht senden
-    ws.send(JSON.stringify({ type: 'welcome', connectionId, timestamp: Date.now() }));
+    // Willkommensnachricht senden - headerDelta bestätigt die Aushandlung, erst danach sendet
+    // der Client Delta-Header (ältere Gateways kennen das Feld nicht → vollständige Header)
+    ws.send(JSON.stringify({ type: 'welcome', connectionId, timestamp: Date.now(), headerDelta }));
   }
 
   /**
    * Behandelt eingehende Messages (USO-Protokoll)
    */
-  private handleMessage(client: ClientConnection, data: WebSocket.Data) {
+  private handleMessage(client: ClientConnection, data: WebSocket.RawData, isBinary: boolean) {
+    // Empfangszeitpunkt so früh wie möglich festhalten (Latenz-Messung)
+    const receivedAt = USOUtils.preciseNow();
+
     try {
-      // Konvertiere Binär-Frames zu String, wenn möglich (Python websockets library sendet immer Binär!)
-      let stringData: string | null = null;
-      if (Buffer.isBuffer(data)) {
-        try {
-          // Versuche als UTF-8 String zu dekodieren
-          stringData = data.toString('utf8');
-        } catch (err) {
-          // Kein String, weiter als Binär behandeln
-        }
-      } else if (typeof data === 'string') {
-        stringData = data;
-      }
+      // Nur Text-Frames als String dekodieren - Binär-Frames sind immer Audio-Payload
+      // (toString('utf8') wirft nie, ein Dekodier-Versuch würde PCM als Text behandeln)
+      const stringData: string | null = isBinary ? null : data.toString();
 
       // Phase 1: Text-Frame
       if (stringData !== null) {
+        // Uhren-Abgleich (NTP-artig) - unabhängig vom USO-Protokoll beantworten
+        if (this.handleTimeSync(client, stringData, receivedAt)) {
+          return;
+        }
+
         // Prüfe ob bereits ein Header vorhanden ist (Text-Payload für Text-USO)
         if (client.lastUSOHeader && client.lastUSOHeader.type === 'text') {
           // Text-Payload empfangen
@@ -212,10 +255,20 @@ export class WebSocketGateway implements OnModuleInit, OnModuleDestroy {
 
         // Versuche Header zu parsen
         try {
-          const header = USOUtils.deserializeHeader(stringData);
+          const header = this.decodeHeader(client, stringData);
           
           // Header validieren und speichern
           client.lastUSOHeader = header;
+          header.receivedAt = receivedAt;
+
+          // One-Way-Latenz Client → Gateway (nur sinnvoll nach Uhren-Abgleich)
+          if (typeof header.sentAt === 'number') {
+            this.logger.debug('USO uplink latency', {
+              clientId: client.clientId,
+              sessionId: header.id,
+              latencyMs: Math.round((receivedAt - header.sentAt) * 1000) / 1000,
+            });
+          }
           
           // WebSocket-Info zum Header hinzufügen
           header.websocketInfo = {
@@ -231,6 +284,9 @@ export class WebSocketGateway implements OnModuleInit, OnModuleDestroy {
             const uso = { header, payload: '' };
             this.eventEmitter.emit('uso:received', uso, client);
             client.lastUSOHeader = null;
+
+            // Session-Steuerung für RAW Audio (start/stop vom Device)
+            this.handleRawAudioControl(client, header, receivedAt);
           }
           // Text-USOs: Warte auf Payload im nächsten Frame
           if (header.type === 'text') {
@@ -251,46 +307,16 @@ export class WebSocketGateway implements OnModuleInit, OnModuleDestroy {
         return; // WICHTIG: Early return für Text-Frames
       }
       
-      // Phase 2: Binär-Frame = Audio-Payload (nur wenn NICHT als Text dekodierbar!)
+      // Phase 2: Binär-Frame = Audio-Payload
       if (Buffer.isBuffer(data)) {
         if (!client.lastUSOHeader) {
           // RAW Audio Mode: Erstelle automatisch USO-Header (wie WS In Node)
           if (!client.rawAudioSessionId) {
-            client.rawAudioSessionId = `raw_audio_${client.id}_${Date.now()}`;
-            client.rawAudioChunkCount = 0;
-            this.logger.info('Started raw audio session for device', {
-              clientId: client.clientId,
-              sessionId: client.rawAudioSessionId,
-            });
+            this.startRawAudioSession(client, `raw_audio_${client.id}_${Date.now()}`);
           }
-          
-          // Erstelle automatisch Header
-          const autoHeader: USO_Header = {
-            id: client.rawAudioSessionId!,
-            type: 'audio',
-            sourceId: client.clientId,  // WICHTIG: clientId als sourceId
-            timestamp: Date.now(),
-            final: false,
-            audioMeta: {
-              sampleRate: 16000,
-              channels: 1,
-              encoding: 'pcm_s16le',
-              bitDepth: 16,
-              format: 'int16',
-              endianness: 'little',
-            },
-            websocketInfo: {
-              connectionId: client.id,
-              clientIp: client.ws['_socket']?.remoteAddress || 'unknown',
-              connectedAt: client.connectedAt,
-            },
-          };
 
           // USO mit auto-generiertem Header
-          const uso = {
-            header: autoHeader,
-            payload: data,
-          };
+          const uso = this.createRawAudioUSO(client, data, false, receivedAt);
 
           client.rawAudioChunkCount!++;
           
@@ -337,6 +363,123 @@ export class WebSocketGateway implements OnModuleInit, OnModuleDestroy {
     }
   }
 
+  /**
+   * Session-Steuerung für RAW Audio per Control-USO vom Device
+   *
+   * - start: neue Session mit der ID aus dem Header; ein leeres Audio-USO geht sofort
+   *          in den Flow, damit die STT-Node die Vosk-Verbindung schon öffnet,
+   *          während der Nutzer zu sprechen beginnt
+   * - stop:  finales (leeres) Audio-USO → STT-Node ruft VoskService.finalize sofort auf
+   *          statt auf ihre Timeout-Fallbacks zu warten
+   *
+   * Ohne Control-USOs bleibt das bisherige Verhalten (Session beginnt mit dem ersten Chunk).
+   */
+  private handleRawAudioControl(client: ClientConnection, header: USO_Header, receivedAt: number): void {
+    const action = header.control?.action;
+
+    if (action === 'start') {
+      // Laufende Session ohne stop (z.B. verlorene Nachricht) zuerst abschließen
+      this.endRawAudioSession(client, receivedAt, 'restart');
+      this.startRawAudioSession(client, header.id || `raw_audio_${client.id}_${Date.now()}`);
+      this.eventEmitter.emit('uso:received', this.createRawAudioUSO(client, Buffer.alloc(0), false, receivedAt), client);
+    } else if (action === 'stop') {
+      this.endRawAudioSession(client, receivedAt, 'stop');
+    }
+  }
+
+  private startRawAudioSession(client: ClientConnection, sessionId: string): void {
+    client.rawAudioSessionId = sessionId;
+    client.rawAudioChunkCount = 0;
+    client.rawAudioStartedAt = Date.now();
+    this.logger.info('Started raw audio session for device', {
+      clientId: client.clientId,
+      sessionId,
+    });
+  }
+
+  /**
+   * Beendet die RAW-Audio-Session: finales Audio-USO in den Flow, nächste Chunks starten eine neue Session
+   */
+  private endRawAudioSession(client: ClientConnection, receivedAt: number, reason: string): void {
+    if (!client.rawAudioSessionId) {
+      return;
+    }
+
+    this.eventEmitter.emit('uso:received', this.createRawAudioUSO(client, Buffer.alloc(0), true, receivedAt), client);
+    this.logger.info('Raw audio session finalized', {
+      clientId: client.clientId,
+      sessionId: client.rawAudioSessionId,
+      chunkCount: client.rawAudioChunkCount,
+      durationMs: Date.now() - (client.rawAudioStartedAt || Date.now()),
+      reason,
+    });
+
+    client.rawAudioSessionId = undefined;
+    client.rawAudioChunkCount = 0;
+    client.rawAudioStartedAt = undefined;
+  }
+
+  /**
+   * Audio-USO mit auto-generiertem Header für die aktuelle RAW-Audio-Session (wie WS In Node)
+   */
+  private createRawAudioUSO(client: ClientConnection, payload: Buffer, final: boolean, receivedAt: number) {
+    const header: USO_Header = {
+      id: client.rawAudioSessionId!,
+      type: 'audio',
+      sourceId: client.clientId,  // WICHTIG: clientId als sourceId
+      timestamp: Date.now(),
+      receivedAt,
+      final,
+      audioMeta: {
+        sampleRate: 16000,
+        channels: 1,
+        encoding: 'pcm_s16le',
+        bitDepth: 16,
+        format: 'int16',
+        endianness: 'little',
+      },
+      websocketInfo: {
+        connectionId: client.id,
+        clientIp: client.ws['_socket']?.remoteAddress || 'unknown',
+        connectedAt: client.connectedAt,
+      },
+    };
+
+    return { header, payload };
+  }
+
+  /**
+   * Beantwortet Uhren-Abgleich-Anfragen der Clients
+   * Request:  { type: 'time_sync', t1 }
+   * Response: { type: 'time_sync_reply', t1, t2 (Empfang), t3 (Antwort) }
+   *
+   * @returns true wenn die Nachricht ein time_sync war
+   */
+  private handleTimeSync(client: ClientConnection, stringData: string, receivedAt: number): boolean {
+    // Schneller Vorfilter, damit normale Header/Payloads nicht doppelt geparst werden
+    if (stringData.length > 256 || !stringData.includes('"time_sync"')) {
+      return false;
+    }
+
+    let request: any;
+    try {
+      request = JSON.parse(stringData);
+    } catch {
+      return false;
+    }
+    if (!request || request.type !== 'time_sync' || typeof request.t1 !== 'number') {
+      return false;
+    }
+
+    client.ws.send(JSON.stringify({
+      type: 'time_sync_reply',
+      t1: request.t1,
+      t2: receivedAt,
+      t3: USOUtils.preciseNow(),
+    }));
+    return true;
+  }
+
   /**
    * Behandelt Disconnect
    */
@@ -348,6 +491,9 @@ export class WebSocketGateway implements OnModuleInit, OnModuleDestroy {
 
     this.clients.delete(client.id);
 
+    // Offene RAW-Audio-Session abschließen (STT finalisiert statt auf Timeouts zu warten)
+    this.endRawAudioSession(client, USOUtils.preciseNow(), 'disconnect');
+
     // Device-Status aktualisieren
     await this.devicesService.updateDeviceStatus(client.clientId, 'offline');
 
@@ -366,13 +512,13 @@ export class WebSocketGateway implements OnModuleInit, OnModuleDestroy {
     }
 
     try {
-      // Phase 1: Header als Text-Frame senden
-      const headerJson = USOUtils.serializeHeader(uso.header);
+      // Phase 1: Header als Text-Frame senden (sentAt für Latenz-Messung beim Client)
+      const headerJson = this.encodeHeader(client, { ...uso.header, sentAt: USOUtils.preciseNow() });
       client.ws.send(headerJson);
 
       // Phase 2: Payload senden (falls vorhanden)
       if (uso.payload && uso.payload.length > 0) {
-        client.ws.send(uso.payload);
+        client.ws.send(uso.payload, { compress: typeof uso.payload === 'string' || this.deflateBinary });
       }
 
       this.logger.logUSO('out', uso, { clientId });
@@ -383,6 +529,65 @@ export class WebSocketGateway implements OnModuleInit, OnModuleDestroy {
     }
   }
 
+  /**
+   * Serialisiert einen ausgehenden Header - als Delta, wenn der Client es ausgehandelt hat
+   */
+  private encodeHeader(client: ClientConnection, header: USO_Header): string {
+    if (!client.headerDelta) {
+      return USOUtils.serializeHeader(header);
+    }
+
+    const previous = client.headerDelta.sent.get(header.id);
+    this.rememberHeader(client.headerDelta.sent, header);
+    return previous
+      ? JSON.stringify(USOUtils.createHeaderDelta(previous, header))
+      : USOUtils.serializeHeader(header);
+  }
+
+  /**
+   * Deserialisiert einen eingehenden Header und löst Delta-Header gegen den letzten Header der Session auf
+   */
+  private decodeHeader(client: ClientConnection, data: string): USO_Header {
+    if (!client.headerDelta) {
+      return USOUtils.deserializeHeader(data);
+    }
+
+    let parsed: any;
+    try {
+      parsed = JSON.parse(data);
+    } catch (error) {
+      throw new Error(`Failed to deserialize USO header: ${error.message}`);
+    }
+    if (parsed && parsed.delta === true) {
+      const previous = client.headerDelta.received.get(parsed.id);
+      if (!previous) {
+        throw new Error(`Delta header for unknown session: ${parsed.id}`);
+      }
+      parsed = USOUtils.applyHeaderDelta(previous, parsed);
+    }
+    if (!USOUtils.validateHeader(parsed)) {
+      throw new Error('Failed to deserialize USO header: Invalid USO header format');
+    }
+
+    // Kopie merken - der Gateway ergänzt receivedAt/websocketInfo am zurückgegebenen Header
+    this.rememberHeader(client.headerDelta.received, { ...parsed });
+    return parsed;
+  }
+
+  /**
+   * Letzten Header pro Session merken (finale Header beenden die Session, höchstens 32 Sessions)
+   */
+  private rememberHeader(headers: Map<string, USO_Header>, header: USO_Header): void {
+    headers.delete(header.id);
+    if (header.final) {
+      return;
+    }
+    headers.set(header.id, header);
+    if (headers.size > 32) {
+      headers.delete(headers.keys().next().value!);
+    }
+  }
+
   /**
    * Heartbeat-Mechanismus
    */
@@ -456,5 +661,10 @@ interface ClientConnection {
   isAlive: boolean;
   rawAudioSessionId?: string;  // Session-ID für RAW Audio Mode
   rawAudioChunkCount?: number;  // Chunk-Zähler für RAW Audio
+  rawAudioStartedAt?: number;  // Start der RAW-Audio-Session (Epoch MS)
+  headerDelta?: {              // Delta-Header ausgehandelt (?headerDelta=1): letzter Header pro Session
+    sent: Map<string, USO_Header>;
+    received: Map<string, USO_Header>;
+  };
 }
 
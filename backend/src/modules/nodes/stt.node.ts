@@ -12,6 +12,12 @@ export class STTNode extends BaseNode {
   private readonly logger = new AppLogger('STTNode');
   private voskService: VoskService;
   private activeConnections: Map<string, VoskConnection> = new Map();
+
+  // Laufende Verbindungsaufbauten (Pre-Open per leerem Start-USO + erste Chunks gleichzeitig)
+  private pendingConnections: Map<string, Promise<VoskConnection>> = new Map();
+
+  // Sessions mit explizitem Ende (final-Frame): Zeitpunkt von finalize für time-to-final
+  private finalizedSessions: Map<string, number> = new Map();
   
   // Debouncing für finale Ergebnisse
   private finalResultTimers: Map<string, NodeJS.Timeout> = new Map();
@@ -49,16 +55,33 @@ export class STTNode extends BaseNode {
 
       const sessionId = uso.header.id;
 
+      // Leeres Session-Ende ohne Verbindung (z.B. stop ohne Audio): keine Verbindung nur zum Schließen öffnen
+      const hasAudio = Buffer.isBuffer(uso.payload) && uso.payload.length > 0;
+      if (uso.header.final && !hasAudio
+          && !this.activeConnections.has(sessionId) && !this.pendingConnections.has(sessionId)) {
+        return;
+      }
+
       // Vosk-Verbindung holen oder erstellen
       let connection = this.activeConnections.get(sessionId);
 
       if (!connection) {
-        connection = await this.connectToVosk(sessionId, emitter);
+        // Nur ein Verbindungsaufbau pro Session, auch wenn Chunks während des Aufbaus eintreffen
+        let pending = this.pendingConnections.get(sessionId);
+        if (!pending) {
+          pending = this.connectToVosk(sessionId, emitter);
+          this.pendingConnections.set(sessionId, pending);
+        }
+        try {
+          connection = await pending;
+        } finally {
+          this.pendingConnections.delete(sessionId);
+        }
         this.activeConnections.set(sessionId, connection);
       }
 
       // Audio-Daten senden (prüfe Audio-Format)
-      if (Buffer.isBuffer(uso.payload) && uso.payload.length > 0) {
+      if (hasAudio) {
         // Logge Audio-Metadaten für Debugging
         this.logger.debug('Audio received for STT processing', {
           nodeId: this.id,
@@ -79,6 +102,7 @@ export class STTNode extends BaseNode {
 
       // Wenn finales Frame, finalize und cleanup
       if (uso.header.final) {
+        this.finalizedSessions.set(sessionId, Date.now());
         await this.voskService.finalize(sessionId);
         
         this.logger.info('STT processing finalized - waiting for final result', {
@@ -86,14 +110,19 @@ export class STTNode extends BaseNode {
           sessionId,
         });
 
-        // Warte kurz auf finale Ergebnisse und cleanup
+        // Endergebnis kommt ohne Debounce (siehe 'result'); Fallback falls Vosk nichts liefert
+        const finalizeTimeout = this.config.finalizeTimeout || 5000;
         setTimeout(() => {
+          if (!this.finalizedSessions.has(sessionId)) {
+            return;
+          }
           this.cleanup(sessionId);
-          this.logger.info('STT cleanup completed', {
+          this.logger.info('STT cleanup completed (no final result)', {
             nodeId: this.id,
             sessionId,
+            finalizeTimeout,
           });
-        }, 500); // Kurz warten auf Endergebnis
+        }, finalizeTimeout);
       }
     } catch (error) {
       this.logger.error('Error in STT node processing', error.message, {
@@ -239,7 +268,11 @@ export class STTNode extends BaseNode {
         this.lastSentFinalText.set(sessionId, result.text);
         
         // Finales Ergebnis mit DEBOUNCE-Delay (Standard: 2000ms) für KI-Nodes
-        const debounceDelay = this.config.finalResultDebounceDelay || 2000; // Standard: 2 Sekunden
+        // Nach explizitem Session-Ende (final-Frame) kommt nichts mehr nach - sofort senden
+        const finalizedAt = this.finalizedSessions.get(sessionId);
+        const debounceDelay = finalizedAt !== undefined
+          ? 0
+          : this.config.finalResultDebounceDelay || 2000; // Standard: 2 Sekunden
         
         // Alten Timer löschen wenn vorhanden
         if (this.finalResultTimers.has(sessionId)) {
@@ -279,10 +312,12 @@ export class STTNode extends BaseNode {
             final: result.final,
             wordCount: result.words ? result.words.length : 0,
             debounceDelay,
+            timeToFinalMs: finalizedAt !== undefined ? Date.now() - finalizedAt : undefined,
           });
           
           // Timer entfernen
           this.finalResultTimers.delete(sessionId);
+          this.finalizedSessions.delete(sessionId);
           
           // WICHTIG: Vosk-Verbindung nach finalem Ergebnis schließen
           setTimeout(async () => {
@@ -331,6 +366,7 @@ export class STTNode extends BaseNode {
       clearTimeout(this.finalResultTimers.get(sessionId)!);
       this.finalResultTimers.delete(sessionId);
     }
+    this.finalizedSessions.delete(sessionId);
     
     this.voskService.disconnect(sessionId);
     this.activeConnections.delete(sessionId);
@@ -342,6 +378,7 @@ export class STTNode extends BaseNode {
       clearTimeout(timer);
     });
     this.finalResultTimers.clear();
+    this.finalizedSessions.clear();
     
     // Alle Verbindungen schließen
     this.activeConnections.forEach((_, sessionId) => {
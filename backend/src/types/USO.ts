@@ -3,6 +3,8 @@
  * Dies ist der einzige Datencontainer für alle Datenströme im System
  */
 
+import { performance } from 'perf_hooks';
+
 export type USOType = 'audio' | 'text' | 'control';
 
 /**
@@ -17,6 +19,9 @@ export interface USO_Header {
   final: boolean;                // Ende des Streams
   
   // Optionale Felder
+  sentAt?: number;               // Hochauflösender Sendezeitpunkt (Epoch MS mit Nachkommastellen, Gateway-Uhr)
+  receivedAt?: number;           // Hochauflösender Empfangszeitpunkt am Gateway (Epoch MS)
+
   speakerInfo?: {
     speakerId?: string;
     confidence?: number;
@@ -109,6 +114,14 @@ export class USOUtils {
     });
   }
 
+  /**
+   * Hochauflösende, monotone Zeit in Epoch MS (mit Nachkommastellen)
+   * Wird für sentAt/receivedAt und den Uhren-Abgleich mit Clients verwendet
+   */
+  static preciseNow(): number {
+    return performance.timeOrigin + performance.now();
+  }
+
   /**
    * Validiert ein USO-Header
    */
@@ -141,6 +154,37 @@ export class USOUtils {
     return JSON.stringify(header);
   }
 
+  /**
+   * Delta-Header: nur die gegenüber dem vorherigen Header derselben Session geänderten Felder
+   * Format: { id, delta: true, ...geänderte Felder, unset?: [entfernte Felder] }
+   * Gleiches Schema wie test-scripts/uso_delta.py
+   */
+  static createHeaderDelta(previous: USO_Header, header: USO_Header): Record<string, any> {
+    const delta: Record<string, any> = { id: header.id, delta: true };
+    for (const [key, value] of Object.entries(header)) {
+      if (key !== 'id' && JSON.stringify(previous[key]) !== JSON.stringify(value)) {
+        delta[key] = value;
+      }
+    }
+    const unset = Object.keys(previous).filter((key) => !(key in header));
+    if (unset.length > 0) {
+      delta.unset = unset;
+    }
+    return delta;
+  }
+
+  /**
+   * Setzt einen Header aus dem vorherigen Header und einem Delta-Header zusammen
+   */
+  static applyHeaderDelta(previous: USO_Header, delta: Record<string, any>): USO_Header {
+    const { delta: _delta, unset, ...changes } = delta;
+    const header: any = { ...previous, ...changes };
+    for (const key of unset || []) {
+      delete header[key];
+    }
+    return header;
+  }
+
   /**
    * Deserialisiert USO-Header von WebSocket
    */
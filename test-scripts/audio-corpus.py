@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Audio-Korpus für Benchmarks erzeugen, anzeigen und prüfen
+=========================================================
+Erzeugt aus einem Seed einen deterministischen, sprachähnlichen Korpus
+(16 kHz s16le Mono, siehe audio_corpus.py) mit JSON-Index daneben. Gleicher
+Seed + gleiche Parameter = bitgleiche Datei - Benchmarks auf verschiedenen
+Rechnern oder vor/nach einer Änderung laufen auf identischen Eingaben.
+
+Verwendung:
+    python3 audio-corpus.py                                   # audio_corpus/speech-42.wav, 120s
+    python3 audio-corpus.py --seed 7 --seconds 600 --output korpus.raw
+    python3 audio-corpus.py --clip-ratio 0.3                  # mehr übersteuerte Äußerungen
+    python3 audio-corpus.py --tts-dir piper_batch_output      # Clips von piper_test.py --batch einfügen
+    python3 audio-corpus.py --tts-url ws://localhost:5002 --tts-text "Guten Morgen" --tts-text "Licht aus"
+    python3 audio-corpus.py --info audio_corpus/speech-42.wav
+    python3 audio-corpus.py --verify audio_corpus/speech-42.wav
+
+Danach z.B.:
+    AUDIO_BACKEND=file AUDIO_FILE=audio_corpus/speech-42.wav python3 device-client.py
+    python3 audio-path-bench.py --corpus audio_corpus/speech-42.wav
+    python3 fleet-sim.py --audio-file audio_corpus/speech-42.wav
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+try:
+    from audio_corpus import (generate_corpus, write_corpus, load_corpus, load_tts_clips,
+                              index_path, DEFAULT_PARAMS)
+except ImportError as e:
+    print(f"❌ {e.name} nicht installiert!")
+    print(f"   Installiere mit: pip install {e.name}")
+    sys.exit(1)
+from audio_io import AudioBackendError
+
+# ======================================
+# KONFIGURATION - HIER ANPASSEN
+# ======================================
+CORPUS_DIR = os.getenv("AUDIO_CORPUS_DIR", "audio_corpus")
+DEFAULT_SEED = 42
+DEFAULT_SECONDS = 120.0
+
+# Lokaler Piper-Server (oder Ersatz mit gleichem Protokoll) für --tts-text
+PIPER_WS_URL = os.getenv("PIPER_WS_URL", "ws://localhost:5002")
+
+# ======================================
+# ENDE KONFIGURATION
+# ======================================
+
+# Farben für Terminal-Output
+class Colors:
+    HEADER = '\033[95m'
+    OKBLUE = '\033[94m'
+    OKCYAN = '\033[96m'
+    OKGREEN = '\033[92m'
+    WARNING = '\033[93m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+def print_header(args):
+    """Zeigt den Header mit Konfiguration an"""
+    print(f"\n{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}")
+    print(f"{Colors.HEADER}{Colors.BOLD}  Audio-Korpus für Benchmarks{Colors.ENDC}")
+    print(f"{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}\n")
+    print(f"{Colors.OKCYAN}🎲 Seed:{Colors.ENDC} {args.seed}")
+    print(f"{Colors.OKCYAN}⏱️  Dauer:{Colors.ENDC} {args.seconds}s")
+    print(f"{Colors.OKCYAN}📁 Ausgabe:{Colors.ENDC} {args.output} (+ {index_path(args.output)})")
+    if args.tts_dir or args.tts_text:
+        print(f"{Colors.OKCYAN}🗣️  TTS:{Colors.ENDC} {args.tts_dir or args.tts_url}")
+    print()
+
+async def fetch_tts(url, texts):
+    """Synthetisiert die Texte über eine Piper-Verbindung (Antwort-Erkennung wie piper_test.py)"""
+    import websockets
+    from piper_test import receive_audio_reply
+
+    clips = []
+    async with websockets.connect(url) as websocket:
+        for text in texts:
+            await websocket.send(text)
+            audio, _, _ = await receive_audio_reply(websocket)
+            clips.append({'pcm': audio[:len(audio) // 2 * 2], 'source': url, 'text': text})
+            print(f"{Colors.OKGREEN}✓ TTS: '{text}' → {len(audio) / 32000:.2f}s{Colors.ENDC}")
+    return clips
+
+def print_info(corpus):
+    index = corpus.index
+    print(f"{Colors.BOLD}{corpus.path}{Colors.ENDC}")
+    print(f"  {corpus.summary()}")
+    print(f"  Parameter: {', '.join(f'{k}={v}' for k, v in index['params'].items())}")
+    for scene in index['noise']:
+        print(f"  Rauschen {scene['start'] / index['sample_rate']:7.2f}s  {scene['frames'] / index['sample_rate']:5.1f}s  "
+              f"{scene['type']:<6} {scene['level_dbfs']:.1f} dBFS")
+    for clip in index['tts']:
+        print(f"  TTS {clip['source']}: {clip['frames'] / index['sample_rate']:.2f}s {clip['text'] or ''}")
+    print(f"  SHA-256: {index['sha256']}")
+
+def verify(path):
+    """Prüft Audio gegen den Index; ohne TTS-Clips wird zusätzlich neu erzeugt und verglichen"""
+    corpus = load_corpus(path)
+    if not corpus.verify():
+        print(f"{Colors.FAIL}✗ {path}: Audiodaten passen nicht zum SHA-256 im Index{Colors.ENDC}")
+        return False
+    print(f"{Colors.OKGREEN}✓ SHA-256 stimmt ({corpus.summary()}){Colors.ENDC}")
+    index = corpus.index
+    if index['tts']:
+        print(f"{Colors.WARNING}⚠ Enthält TTS-Clips - Neuerzeugung übersprungen{Colors.ENDC}")
+        return True
+    pcm, _ = generate_corpus(index['seed'], index['frames'] / index['sample_rate'], index['params'])
+    if pcm != corpus.pcm:
+        print(f"{Colors.FAIL}✗ Neu erzeugter Korpus weicht ab (andere NumPy-Version oder Generator geändert?){Colors.ENDC}")
+        return False
+    print(f"{Colors.OKGREEN}✓ Neu erzeugt aus Seed {index['seed']}: bitgleich{Colors.ENDC}")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Deterministischer, sprachähnlicher Audio-Korpus für Benchmarks")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="Zufalls-Seed")
+    parser.add_argument('--seconds', type=float, default=DEFAULT_SECONDS, help="Länge in Sekunden")
+    parser.add_argument('--output', help=f"Ausgabe .wav oder .raw (Standard: {CORPUS_DIR}/speech-<seed>.wav)")
+    parser.add_argument('--clip-ratio', type=float, default=DEFAULT_PARAMS['clip_ratio'],
+                        help="Anteil übersteuerter Äußerungen (0-1)")
+    parser.add_argument('--tts-dir', help="Verzeichnis mit TTS-Clips (.raw/.wav), z.B. piper_batch_output")
+    parser.add_argument('--tts-url', default=PIPER_WS_URL, help=f"Piper-URL für --tts-text (Standard: {PIPER_WS_URL})")
+    parser.add_argument('--tts-text', action='append', default=[], help="Text für einen TTS-Clip (mehrfach)")
+    parser.add_argument('--info', metavar='DATEI', help="Index eines Korpus anzeigen")
+    parser.add_argument('--verify', metavar='DATEI', help="Korpus prüfen (SHA-256, Neuerzeugung)")
+    args = parser.parse_args()
+
+    try:
+        if args.info:
+            print_info(load_corpus(args.info))
+            return
+        if args.verify:
+            sys.exit(0 if verify(args.verify) else 1)
+    except (OSError, ValueError, KeyError, AudioBackendError) as e:
+        print(f"{Colors.FAIL}❌ {e}{Colors.ENDC}")
+        sys.exit(1)
+
+    if not 0 <= args.clip_ratio <= 1:
+        parser.error("--clip-ratio muss zwischen 0 und 1 liegen")
+    if args.seconds <= 0:
+        parser.error("--seconds muss größer als 0 sein")
+    args.output = args.output or os.path.join(CORPUS_DIR, f"speech-{args.seed}.wav")
+    print_header(args)
+
+    tts_clips = []
+    if args.tts_dir:
+        try:
+            tts_clips += load_tts_clips(args.tts_dir)
+        except (OSError, AudioBackendError) as e:
+            print(f"{Colors.FAIL}❌ TTS-Clips: {e}{Colors.ENDC}")
+            sys.exit(1)
+        print(f"{Colors.OKGREEN}✓ {len(tts_clips)} TTS-Clips aus {args.tts_dir}{Colors.ENDC}")
+    if args.tts_text:
+        try:
+            tts_clips += asyncio.run(fetch_tts(args.tts_url, args.tts_text))
+        except Exception as e:
+            print(f"{Colors.FAIL}❌ TTS über {args.tts_url}: {e}{Colors.ENDC}")
+            sys.exit(1)
+
+    started = time.perf_counter()
+    pcm, index = generate_corpus(args.seed, args.seconds, {'clip_ratio': args.clip_ratio}, tts_clips)
+    write_corpus(args.output, pcm, index)
+    corpus = load_corpus(args.output)
+    print(f"{Colors.OKGREEN}✓ {args.output} in {time.perf_counter() - started:.1f}s erzeugt{Colors.ENDC}")
+    print(f"  {corpus.summary()}")
+    print(f"  SHA-256: {index['sha256']}\n")
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print(f"\n{Colors.WARNING}Abgebrochen.{Colors.ENDC}\n")
+        sys.exit(1)
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Audio-I/O-Backends (pyaudio / sounddevice / file / null)
+===================================================================
+Öffnet jedes verfügbare Backend aus audio_io.py mit denselben Parametern wie
+device-client.py (16 kHz Mono) und misst:
+
+- Capture (Echtzeit): Block-Jitter gegenüber dem Soll-Takt (p50/p99), vom
+  Treiber gemeldete Latenz, Zeit im Callback und Prozess-CPU pro Sekunde Audio
+- Capture (ungebremst, nur file/null): Durchsatz als Vielfaches der Echtzeit
+  (Obergrenze für CI-Läufe und den Fleet-Simulator)
+- Wiedergabe: Latenz play() → Übergabe an das Gerät (p50/p99), Über-/Unterläufe
+  und Prozess-CPU pro Sekunde Audio
+
+Nicht installierte Backends (oder Rechner ohne Audio-Gerät) werden übersprungen.
+
+Verwendung:
+    python3 audio-io-bench.py                         # alle Backends, 5s pro Messung
+    python3 audio-io-bench.py --backends null file --seconds 10
+    python3 audio-io-bench.py --block-ms 20           # kleine Blöcke (Jitter sichtbarer)
+    python3 audio-io-bench.py --audio-file aufnahme.wav
+    python3 audio-io-bench.py --seed 7                # anderer Audio-Korpus (audio-corpus.py)
+"""
+
+import argparse
+import math
+import os
+import queue
+import struct
+import sys
+import tempfile
+import time
+import wave
+
+from audio_io import BACKENDS, open_capture, open_playback, backend_problem, AudioBackendError
+
+# ======================================
+# KONFIGURATION - HIER ANPASSEN
+# ======================================
+SAMPLE_RATE = 16000
+CHANNELS = 1
+DEFAULT_BLOCK_MS = 500      # wie CHUNK_SIZE = 8000 im device-client.py
+DEFAULT_SECONDS = 5.0
+PLAYBACK_CHUNK_MS = 500     # TTS-Chunks vom Gateway
+THROUGHPUT_SECONDS = 600.0  # Audio-Sekunden für die ungebremste Messung
+
+# ======================================
+# ENDE KONFIGURATION
+# ======================================
+
+# Farben für Terminal-Output
+class Colors:
+    HEADER = '\033[95m'
+    OKBLUE = '\033[94m'
+    OKCYAN = '\033[96m'
+    OKGREEN = '\033[92m'
+    WARNING = '\033[93m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+def print_header(args, backends):
+    """Zeigt den Header mit Konfiguration an"""
+    print(f"\n{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}")
+    print(f"{Colors.HEADER}{Colors.BOLD}  Benchmark: Audio-I/O-Backends{Colors.ENDC}")
+    print(f"{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}\n")
+    print(f"{Colors.OKCYAN}🎛️  Backends:{Colors.ENDC} {', '.join(backends) or '-'}")
+    print(f"{Colors.OKCYAN}🎵 Format:{Colors.ENDC} {SAMPLE_RATE} Hz, {CHANNELS} Kanal, 16-bit PCM, "
+          f"{args.block_ms:.0f} ms Blöcke")
+    print(f"{Colors.OKCYAN}⏱️  Dauer:{Colors.ENDC} {args.seconds}s pro Echtzeit-Messung")
+    print(f"{Colors.OKCYAN}📁 Datei:{Colors.ENDC} {args.audio_file or f'(Audio-Korpus, Seed {args.seed})'}\n")
+
+def write_test_wav(path, seconds, seed):
+    """Sprachähnlicher Korpus (audio_corpus.py) als Quelle für das file-Backend, ohne numpy ein Ton mit Pausen"""
+    try:
+        from audio_corpus import generate_corpus, write_corpus
+    except ImportError:
+        print(f"{Colors.WARNING}⚠ numpy nicht installiert - Ton mit Pausen statt Audio-Korpus{Colors.ENDC}")
+    else:
+        pcm, index = generate_corpus(seed, seconds)
+        write_corpus(path, pcm, index)
+        return
+    frames = int(SAMPLE_RATE * seconds)
+    samples = (int(8000 * math.sin(2 * math.pi * 440 * n / SAMPLE_RATE)) if (n // 8000) % 2 == 0 else 0
+               for n in range(frames))
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(CHANNELS)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(struct.pack(f'<{frames}h', *samples))
+
+def bench_capture(name, args, realtime):
+    """Capture mit einem Callback wie im Client (Chunk in eine Queue)"""
+    chunks = queue.Queue()
+    done = []
+    duration = args.seconds if realtime else THROUGHPUT_SECONDS
+    capture = open_capture(name, path=args.audio_file, realtime=realtime, duration=duration, loop=True)
+    rate, channels = (SAMPLE_RATE, CHANNELS)
+    if capture.fixed_format:
+        rate, channels = capture.native_format()
+    frames = int(rate * args.block_ms / 1000)
+    capture.open(rate, channels, frames, lambda data, captured_at: chunks.put((data, captured_at)),
+                 on_end=lambda: done.append(True))
+    started = time.perf_counter()
+    capture.start()
+    try:
+        if capture.on_end and name in ('file', 'null'):
+            while not done:
+                time.sleep(0.01)
+        else:
+            time.sleep(args.seconds)
+    finally:
+        capture.stop()
+        capture.close()
+    wall = time.perf_counter() - started
+    result = capture.stats.as_dict()
+    result['realtime_factor'] = capture.stats.audio_seconds / wall if wall > 0 else None
+    return result
+
+def bench_playback(name, args, path):
+    """Wiedergabe: TTS-Chunks im Echtzeit-Takt einreihen, danach ausspielen lassen"""
+    playback = open_playback(name, path=path)
+    playback.open(SAMPLE_RATE, CHANNELS, frames=int(SAMPLE_RATE * args.block_ms / 1000))
+    chunk = bytes(int(SAMPLE_RATE * PLAYBACK_CHUNK_MS / 1000) * CHANNELS * 2)
+    playback.start()
+    try:
+        next_at = time.monotonic()
+        for _ in range(max(1, int(args.seconds * 1000 / PLAYBACK_CHUNK_MS))):
+            playback.play(chunk)
+            next_at += PLAYBACK_CHUNK_MS / 1000
+            delay = next_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        deadline = time.monotonic() + PLAYBACK_CHUNK_MS / 1000 * 4
+        while playback.busy() and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        playback.stop()
+        playback.close()
+    return playback.stats.as_dict()
+
+def fmt(value, unit='ms', digits=2):
+    return f"{value:.{digits}f}{unit}" if value is not None else '-'
+
+def print_capture(results, title):
+    print(f"{Colors.BOLD}{title}{Colors.ENDC}")
+    print(f"{Colors.BOLD}{'Backend':<12} {'Blöcke':>7} {'Jitter p50':>11} {'p99':>9} {'Treiber':>9} "
+          f"{'Callback':>10} {'CPU/s Audio':>12} {'xRuns':>6} {'Echtzeit':>9}{Colors.ENDC}")
+    for r in results:
+        print(f"{r['backend']:<12} {r['blocks']:>7} {fmt(r['jitter_p50_ms']):>11} {fmt(r['jitter_p99_ms']):>9} "
+              f"{fmt(r['reported_latency_ms'], digits=1):>9} {fmt(r['callback_ms_per_audio_second']):>10} "
+              f"{fmt(r['cpu_ms_per_audio_second'], digits=1):>12} {r['xruns']:>6} "
+              f"{fmt(r['realtime_factor'], 'x', 1):>9}")
+    print()
+
+def print_playback(results):
+    print(f"{Colors.BOLD}Wiedergabe (Echtzeit){Colors.ENDC}")
+    print(f"{Colors.BOLD}{'Backend':<12} {'Audio':>7} {'Latenz p50':>11} {'p99':>9} {'Treiber':>9} "
+          f"{'CPU/s Audio':>12} {'xRuns':>6}{Colors.ENDC}")
+    for r in results:
+        print(f"{r['backend']:<12} {fmt(r['audio_seconds'], 's', 1):>7} {fmt(r['latency_p50_ms'], digits=1):>11} "
+              f"{fmt(r['latency_p99_ms'], digits=1):>9} {fmt(r['reported_latency_ms'], digits=1):>9} "
+              f"{fmt(r['cpu_ms_per_audio_second'], digits=1):>12} {r['xruns']:>6}")
+    print()
+
+def main():
+    parser = argparse.ArgumentParser(description="Vergleicht Latenz und CPU der Audio-I/O-Backends")
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument('--seconds', type=float, default=DEFAULT_SECONDS, help="Dauer pro Echtzeit-Messung")
+    parser.add_argument('--block-ms', type=float, default=DEFAULT_BLOCK_MS, help="Blockgröße in ms")
+    parser.add_argument('--audio-file', default=os.getenv("AUDIO_FILE", ""),
+                        help="Quelle für das file-Backend (Standard: $AUDIO_FILE, sonst Audio-Korpus aus --seed)")
+    parser.add_argument('--seed', type=int, default=42, help="Seed des Audio-Korpus (audio-corpus.py)")
+    parser.add_argument('--no-playback', action='store_true', help="Nur Capture messen")
+    args = parser.parse_args()
+
+    backends = []
+    for name in args.backends:
+        problem = backend_problem(name)
+        if problem:
+            print(f"{Colors.WARNING}⚠ {problem} - übersprungen{Colors.ENDC}")
+        else:
+            backends.append(name)
+    print_header(args, backends)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if not args.audio_file:
+            args.audio_file = os.path.join(tmp, 'bench.wav')
+            write_test_wav(args.audio_file, max(args.seconds, 10.0), args.seed)
+
+        realtime, throughput, playback = [], [], []
+        for name in backends:
+            print(f"{Colors.OKCYAN}⏳ {name}...{Colors.ENDC}")
+            try:
+                realtime.append(bench_capture(name, args, realtime=True))
+                if name in ('file', 'null'):
+                    throughput.append(bench_capture(name, args, realtime=False))
+                if not args.no_playback:
+                    playback.append(bench_playback(name, args, os.path.join(tmp, 'playback.wav')))
+            except AudioBackendError as e:
+                print(f"{Colors.WARNING}⚠ {name}: {e} - übersprungen{Colors.ENDC}")
+            except Exception as e:
+                # z.B. PortAudio ohne Eingabe-/Ausgabegerät
+                print(f"{Colors.WARNING}⚠ {name}: Gerät nicht nutzbar ({e}) - übersprungen{Colors.ENDC}")
+        print()
+
+        if realtime:
+            print_capture(realtime, "Capture (Echtzeit)")
+        if throughput:
+            print_capture(throughput, "Capture (ungebremst)")
+        if playback:
+            print_playback(playback)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print(f"\n{Colors.WARNING}Abgebrochen.{Colors.ENDC}\n")
+        sys.exit(1)
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Edge-Gating und Resampling auf dem Audio-Korpus
+==========================================================
+Lässt die Audio-Pfade des Device-Clients über einen deterministischen Korpus
+(audio_corpus.py) laufen - gleiche Eingaben auf jedem Rechner und vor/nach
+jeder Änderung, mit Ground Truth aus dem Korpus-Index:
+
+- Edge-Gating (audio_gate.py, Modi energy/pattern): Anteil erkannter
+  Sprach-Chunks, verpasste Äußerungen, Fehl-Öffnungen in Pausen (inkl.
+  Nachlaufzeit), Trigger-Latenz ab Äußerungsbeginn, Uplink-Einsparung, CPU
+- Resampling (audio_resample.py): Korpus auf native Geräte-Formate
+  (48/44.1 kHz Stereo) hochgerechnet, dann wie im Capture-Pfad zurück auf
+  16 kHz Mono - CPU pro Sekunde Audio und SNR gegenüber dem Original im
+  Durchlassbereich, getrennt für normale und übersteuerte Äußerungen
+
+Verwendung:
+    python3 audio-path-bench.py                               # Korpus aus Seed 42 (im Speicher)
+    python3 audio-path-bench.py --seed 7 --seconds 600
+    python3 audio-path-bench.py --corpus audio_corpus/speech-42.wav
+    python3 audio-path-bench.py --chunk-ms 500 --report pfade.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+try:
+    import numpy as np
+    from audio_corpus import generate_corpus, load_corpus, Corpus, SAMPLE_RATE
+    from audio_gate import EdgeGate, GATE_MODES
+    from audio_resample import PolyphaseResampler, CaptureConverter
+    from latency_stats import percentile
+except ImportError as e:
+    print(f"❌ {e.name} nicht installiert!")
+    print(f"   Installiere mit: pip install {e.name}")
+    sys.exit(1)
+
+# ======================================
+# KONFIGURATION - HIER ANPASSEN
+# ======================================
+DEFAULT_SEED = 42
+DEFAULT_SECONDS = 120.0
+DEFAULT_CHUNK_MS = 100       # device-client.py nutzt 500 ms, kleinere Chunks zeigen die Latenz genauer
+NATIVE_FORMATS = [(48000, 2), (44100, 2), (48000, 1)]
+MAX_ALIGN_SAMPLES = 200      # Suchbereich für die Gruppenlaufzeit der Filter
+PASSBAND_HZ = 6000           # SNR nur im Durchlassbereich (Tiefpass der Resampler bei 0.9 * 8 kHz)
+
+# ======================================
+# ENDE KONFIGURATION
+# ======================================
+
+# Farben für Terminal-Output
+class Colors:
+    HEADER = '\033[95m'
+    OKBLUE = '\033[94m'
+    OKCYAN = '\033[96m'
+    OKGREEN = '\033[92m'
+    WARNING = '\033[93m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+def print_header(args, corpus):
+    """Zeigt den Header mit Konfiguration an"""
+    print(f"\n{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}")
+    print(f"{Colors.HEADER}{Colors.BOLD}  Benchmark: Edge-Gating und Resampling (Audio-Korpus){Colors.ENDC}")
+    print(f"{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}\n")
+    print(f"{Colors.OKCYAN}📁 Korpus:{Colors.ENDC} {corpus.path or '(im Speicher)'}")
+    print(f"{Colors.OKCYAN}🎙️  Inhalt:{Colors.ENDC} {corpus.summary()}")
+    print(f"{Colors.OKCYAN}🔑 SHA-256:{Colors.ENDC} {corpus.index['sha256'][:16]}...")
+    print(f"{Colors.OKCYAN}📦 Chunks:{Colors.ENDC} {args.chunk_ms:.0f} ms\n")
+
+def bench_gate(corpus, mode, chunk_ms):
+    """Gate Chunk für Chunk wie im Capture-Thread, Auswertung gegen die Sprach-Labels"""
+    gate = EdgeGate(mode=mode)
+    frames = int(SAMPLE_RATE * chunk_ms / 1000)
+    labels = corpus.speech_mask(frame_ms=chunk_ms)
+    opened = []
+    for chunk in corpus.chunks(frames):
+        was_open = gate.is_open
+        gate.update(chunk)
+        opened.append(was_open or gate.is_open)
+    opened = np.array(opened[:len(labels)])
+
+    utterances = [s for s in corpus.segments() if s['speech']]
+    latencies, missed = [], 0
+    for segment in utterances:
+        first = segment['start'] // frames
+        last = (segment['start'] + segment['frames'] - 1) // frames
+        hits = np.flatnonzero(opened[first:last + 1])
+        if not len(hits):
+            missed += 1
+            continue
+        # Ab Äußerungsbeginn bis zum Ende des ersten offenen Chunks (dann ist das Audio beim Sender)
+        latencies.append(max(0.0, float((first + hits[0] + 1) * frames - segment['start']) / SAMPLE_RATE * 1000))
+
+    speech, silence = labels, ~labels
+    return {
+        'mode': mode,
+        'sessions': gate.sessions,
+        'speech_recall': float(opened[speech].mean()) if speech.any() else None,
+        'false_open': float(opened[silence].mean()) if silence.any() else None,
+        'utterances': len(utterances),
+        'missed_utterances': missed,
+        'trigger_p50_ms': percentile(latencies, 50),
+        'trigger_p95_ms': percentile(latencies, 95),
+        'uplink_reduction': gate.reduction,
+        'cpu_ms_per_audio_second': gate.cpu_seconds * 1000 / max(gate.captured_seconds, 1e-9),
+    }
+
+def to_native(samples, rate, channels):
+    """Korpus (int16, 16 kHz) → natives Geräteformat (int16 interleaved)"""
+    upsampled = samples.astype(np.float32)
+    if rate != SAMPLE_RATE:
+        upsampled = PolyphaseResampler(SAMPLE_RATE, rate).process(upsampled)
+    native = np.clip(np.rint(upsampled), -32768, 32767).astype(np.int16)
+    return np.repeat(native, channels) if channels > 1 else native
+
+def snr_db(reference, signal):
+    noise = np.sum((reference - signal) ** 2)
+    power = np.sum(reference ** 2)
+    if power <= 0:
+        return None
+    return float(10 * np.log10(power / noise)) if noise > 0 else float('inf')
+
+def align(reference, signal):
+    """
+    Gleicht die Gruppenlaufzeit beider Filter aus (auch Bruchteile eines Samples) und
+    begrenzt beide Signale auf PASSBAND_HZ - Returns: (reference, signal, delay_samples)
+    """
+    n = len(reference)
+    signal = np.pad(signal[:n], (0, max(0, n - len(signal))))
+    ref_spectrum = np.fft.rfft(reference)
+    spectrum = np.fft.rfft(signal)
+    correlation = np.fft.irfft(spectrum * np.conj(ref_spectrum), n)[:MAX_ALIGN_SAMPLES]
+    lag = int(np.argmax(correlation))
+    freqs = np.fft.rfftfreq(n, 1 / SAMPLE_RATE)
+    band = freqs <= PASSBAND_HZ
+    # Bruchteil: Kreuzspektrum im Durchlassbereich maximieren (grob, dann fein)
+    cross = (np.conj(ref_spectrum) * spectrum)[band]
+    omega = 2j * np.pi * freqs[band] / SAMPLE_RATE
+    delay = float(lag)
+    for step in (0.05, 0.002):
+        candidates = delay + step * np.arange(-25, 26)
+        delay = max(candidates, key=lambda d: float(np.real(np.sum(cross * np.exp(omega * d)))))
+    shifted = spectrum * np.exp(2j * np.pi * freqs * delay / SAMPLE_RATE)
+    return np.fft.irfft(ref_spectrum * band, n), np.fft.irfft(shifted * band, n), delay
+
+def bench_resample(corpus, rate, channels, chunk_ms):
+    """Capture-Pfad: natives Format in Chunks über CaptureConverter zurück auf 16 kHz Mono"""
+    original = corpus.samples()
+    native = to_native(original, rate, channels)
+    converter = CaptureConverter(rate, channels, SAMPLE_RATE)
+    block = int(rate * chunk_ms / 1000) * channels
+    output = b''.join(converter.process(native[i:i + block].tobytes()) for i in range(0, len(native), block))
+    result = np.frombuffer(output, dtype=np.int16).astype(np.float64)
+    reference, aligned, delay = align(original.astype(np.float64), result)
+    length = len(reference)
+
+    snr = {}
+    for kind in ('speech', 'clipping'):
+        parts = [(s['start'], min(s['start'] + s['frames'], length)) for s in corpus.segments(kind)]
+        parts = [(a, b) for a, b in parts if b > a]
+        if parts:
+            ref = np.concatenate([reference[a:b] for a, b in parts])
+            out = np.concatenate([aligned[a:b] for a, b in parts])
+            snr[kind] = snr_db(ref, out)
+    return {
+        'format': f"{rate / 1000:g} kHz {'Stereo' if channels == 2 else 'Mono'}",
+        'in_rate': rate,
+        'in_channels': channels,
+        'delay_ms': delay / SAMPLE_RATE * 1000,
+        'snr_band_hz': PASSBAND_HZ,
+        'snr_db': snr_db(reference[:length], aligned[:length]),
+        'snr_speech_db': snr.get('speech'),
+        'snr_clipping_db': snr.get('clipping'),
+        'cpu_ms_per_audio_second': converter.cpu_ms_per_audio_second,
+    }
+
+def fmt(value, unit='', digits=1, scale=1):
+    return f"{value * scale:.{digits}f}{unit}" if value is not None else '-'
+
+def print_gate(results):
+    print(f"{Colors.BOLD}Edge-Gating{Colors.ENDC}")
+    print(f"{Colors.BOLD}{'Modus':<9} {'Sessions':>8} {'Sprache':>8} {'Verpasst':>9} {'Fehl-offen':>11} "
+          f"{'Trigger p50':>12} {'p95':>8} {'Uplink':>8} {'CPU/s Audio':>12}{Colors.ENDC}")
+    for r in results:
+        print(f"{r['mode']:<9} {r['sessions']:>8} {fmt(r['speech_recall'], '%', scale=100):>8} "
+              f"{r['missed_utterances']:>4}/{r['utterances']:<4} {fmt(r['false_open'], '%', scale=100):>11} "
+              f"{fmt(r['trigger_p50_ms'], 'ms', 0):>12} {fmt(r['trigger_p95_ms'], 'ms', 0):>8} "
+              f"{fmt(r['uplink_reduction'], '%', 0, -100):>8} {fmt(r['cpu_ms_per_audio_second'], 'ms', 2):>12}")
+    print()
+
+def print_resample(results):
+    print(f"{Colors.BOLD}Resampling (natives Format → 16 kHz Mono){Colors.ENDC}")
+    print(f"{Colors.BOLD}{'Format':<16} {'Laufzeit':>9} {'SNR':>8} {'Sprache':>9} {'Übersteuert':>12} "
+          f"{'CPU/s Audio':>12}{Colors.ENDC}")
+    for r in results:
+        print(f"{r['format']:<16} {fmt(r['delay_ms'], 'ms', 2):>9} {fmt(r['snr_db'], 'dB'):>8} "
+              f"{fmt(r['snr_speech_db'], 'dB'):>9} {fmt(r['snr_clipping_db'], 'dB'):>12} "
+              f"{fmt(r['cpu_ms_per_audio_second'], 'ms', 2):>12}")
+    print()
+
+def main():
+    parser = argparse.ArgumentParser(description="Edge-Gating und Resampling auf einem deterministischen Audio-Korpus")
+    parser.add_argument('--corpus', default=os.getenv("AUDIO_CORPUS", ""),
+                        help="Korpus-Datei von audio-corpus.py (Standard: $AUDIO_CORPUS, sonst aus --seed erzeugen)")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="Seed, wenn kein --corpus angegeben ist")
+    parser.add_argument('--seconds', type=float, default=DEFAULT_SECONDS, help="Länge, wenn kein --corpus angegeben ist")
+    parser.add_argument('--chunk-ms', type=float, default=DEFAULT_CHUNK_MS, help="Chunk-Größe in ms")
+    parser.add_argument('--modes', nargs='+', choices=GATE_MODES, default=list(GATE_MODES))
+    parser.add_argument('--report', help="Ergebnisse als JSON speichern")
+    args = parser.parse_args()
+
+    if args.corpus:
+        try:
+            corpus = load_corpus(args.corpus)
+        except (OSError, ValueError) as e:
+            print(f"{Colors.FAIL}❌ {e}{Colors.ENDC}")
+            sys.exit(1)
+        if not corpus.verify():
+            print(f"{Colors.WARNING}⚠ {args.corpus}: SHA-256 passt nicht zum Index - Ergebnisse nicht vergleichbar{Colors.ENDC}")
+    else:
+        corpus = Corpus(*generate_corpus(args.seed, args.seconds))
+    print_header(args, corpus)
+
+    started = time.perf_counter()
+    gate = [bench_gate(corpus, mode, args.chunk_ms) for mode in args.modes]
+    resample = [bench_resample(corpus, rate, channels, args.chunk_ms) for rate, channels in NATIVE_FORMATS]
+    print_gate(gate)
+    print_resample(resample)
+    print(f"{Colors.OKGREEN}✓ Fertig in {time.perf_counter() - started:.1f}s{Colors.ENDC}\n")
+
+    if args.report:
+        report = {'corpus': {'path': corpus.path, 'seed': corpus.index['seed'], 'sha256': corpus.index['sha256'],
+                             'seconds': corpus.seconds},
+                  'chunk_ms': args.chunk_ms, 'gate': gate, 'resample': resample}
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"{Colors.OKGREEN}✓ Report: {args.report}{Colors.ENDC}\n")
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print(f"\n{Colors.WARNING}Abgebrochen.{Colors.ENDC}\n")
+        sys.exit(1)
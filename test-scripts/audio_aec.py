@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Akustische Echo-Unterdrückung (AEC) für Full-Duplex-Betrieb
+===========================================================
+Wenn Mikrofon und Lautsprecher im selben Gerät stecken, nimmt das Mikrofon
+die TTS-Wiedergabe wieder auf. Die AEC-Stufe im Capture-Pfad nutzt das
+abgespielte Signal als Referenz und zieht das geschätzte Echo ab, bevor
+das Audio zum Gateway geht - das Gerät bleibt während TTS live (Barge-in).
+
+- PlaybackReference: zeitgestempelte Wiedergabe-Samples (Ringpuffer, thread-safe),
+  gleichzeitig laufende Wiedergaben werden gemischt
+- EchoCanceller: partitionierter Block-Frequenzbereichs-NLMS (Overlap-Save, NumPy),
+  Adaption wird bei Gegensprechen (Geigel-Detektor) und ohne Referenz angehalten
+- Misst CPU-Zeit pro Sekunde Audio und die Echo-Dämpfung (ERLE)
+
+Blockweise Verarbeitung: die Ausgabe ist um einen Block (16 ms bei 256 Samples)
+verzögert, jeder Chunk behält seine Länge.
+
+Die Verzögerung Wiedergabe → Mikrofon (Player-Start, Treiber-Puffer) wird grob
+über delay_ms vorgegeben; Abweichungen bis zur Filterlänge gleicht das Filter aus.
+
+Verwendung:
+    from audio_aec import PlaybackReference, EchoCanceller
+
+    reference = PlaybackReference(sample_rate=16000)
+    aec = EchoCanceller(reference, delay_ms=60, filter_ms=128)
+
+    reference.add(tts_pcm)                     # beim Start der Wiedergabe
+    clean = aec.process(mic_pcm)               # bytes (int16 mono) → bytes
+    aec.process_into(pooled_buffer)            # oder in-place in einem PooledBuffer
+"""
+
+import threading
+import time
+
+import numpy as np
+
+class PlaybackReference:
+    """Ringpuffer der Lautsprecher-Samples auf einer monotonen Zeitachse"""
+
+    def __init__(self, sample_rate=16000, capacity_s=10.0):
+        self.sample_rate = int(sample_rate)
+        self._size = int(capacity_s * self.sample_rate)
+        self._ring = np.zeros(self._size, dtype=np.float32)
+        self._origin = time.monotonic()  # Zeitpunkt von Sample-Index 0
+        self._written_until = 0          # Absoluter Index hinter dem letzten Sample
+        self._lock = threading.Lock()
+
+    def index_at(self, timestamp):
+        """Absoluter Sample-Index für einen time.monotonic()-Zeitpunkt"""
+        return int(round((timestamp - self._origin) * self.sample_rate))
+
+    def add(self, pcm, start_time=None):
+        """Trägt abgespielte Samples (int16 mono) ab start_time (Standard: jetzt) ein"""
+        samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32)
+        if len(samples) == 0:
+            return
+        samples = samples[-self._size:]
+        start = self.index_at(time.monotonic() if start_time is None else start_time)
+        end = start + len(samples)
+
+        with self._lock:
+            # Bereich zwischen letzter Wiedergabe und neuem Ende leeren (alte Ring-Inhalte)
+            if end > self._written_until:
+                clear_from = max(self._written_until, end - self._size)
+                self._ring[self._positions(clear_from, end)] = 0.0
+                self._written_until = end
+            # Mischen (überlappende Wiedergaben addieren sich am Lautsprecher)
+            self._ring[self._positions(start, end)] += samples
+
+    def read(self, start, count):
+        """Samples [start, start+count) - fehlende/überschriebene Bereiche als Stille"""
+        output = np.zeros(count, dtype=np.float32)
+        with self._lock:
+            first = max(start, self._written_until - self._size)
+            last = min(start + count, self._written_until)
+            if last > first:
+                output[first - start:last - start] = self._ring[self._positions(first, last)]
+        return output
+
+    def _positions(self, start, end):
+        return np.arange(start, end) % self._size
+
+class EchoCanceller:
+    """Partitionierter Block-Frequenzbereichs-NLMS (PBFDAF) mit Doubletalk-Erkennung"""
+
+    HANGOVER_BLOCKS = 8  # Blöcke ohne Adaption nach erkanntem Gegensprechen (~130 ms)
+
+    def __init__(self, reference, delay_ms=60, filter_ms=128, block_size=256,
+                 step_size=0.5, doubletalk_threshold=1.5):
+        self.reference = reference
+        self.sample_rate = reference.sample_rate
+        self.block = int(block_size)
+        self.partitions = max(1, int(round(filter_ms * self.sample_rate / 1000 / self.block)))
+        self.delay = int(delay_ms * self.sample_rate / 1000)
+        self.step_size = step_size
+        self.doubletalk_threshold = doubletalk_threshold
+
+        bins = self.block + 1
+        self._weights = np.zeros((self.partitions, bins), dtype=np.complex64)
+        self._spectra = np.zeros((self.partitions, bins), dtype=np.complex64)  # X der letzten P Blöcke
+        self._previous = np.zeros(self.block, dtype=np.float32)                 # Vorheriger Referenzblock
+        self._reference_peak = 0.0
+        self._echo_gain = 1.0     # Gelerntes Verhältnis Mikrofon-Spitze / Referenz-Spitze bei reinem Echo
+        self._hangover = 0
+        self._pending = np.zeros(0, dtype=np.float32)   # Mikrofon-Samples, die keinen vollen Block ergeben
+        self._pending_ref = np.zeros(0, dtype=np.float32)
+        # Ausgabe um einen Block verzögert, damit jeder Chunk vollständig ausgegeben werden kann
+        self._output = np.zeros(self.block, dtype=np.float32)
+        self._idle_blocks = self.partitions             # Blöcke ohne Referenz seit der letzten Wiedergabe
+
+        # Statistik
+        self.cpu_seconds = 0.0
+        self.audio_seconds = 0.0
+        self.echo_energy_in = 0.0
+        self.echo_energy_out = 0.0
+        self.doubletalk_blocks = 0
+
+    def process(self, data, end_time=None):
+        """Entfernt das Echo aus einem Capture-Chunk (bytes int16 mono) → bytes"""
+        samples = np.frombuffer(data, dtype=np.int16)
+        output = np.empty_like(samples)
+        self._process_samples(samples, output, end_time)
+        return output.tobytes()
+
+    def process_into(self, buffer, end_time=None):
+        """Wie process(), aber in-place im Slab eines PooledBuffer (audio_buffers.py)"""
+        samples = np.frombuffer(buffer.slab, dtype=np.int16, count=buffer.length // 2)
+        self._process_samples(samples, samples, end_time)
+        return buffer
+
+    def _process_samples(self, samples, output, end_time):
+        start = time.thread_time()
+        count = len(samples)
+        # Referenz-Zeitfenster des Chunks: endet bei end_time (Ende des Captures) minus Verzögerung
+        end_index = self.reference.index_at(time.monotonic() if end_time is None else end_time) - self.delay
+        ref = self.reference.read(end_index - count, count)
+
+        near = np.concatenate((self._pending, samples.astype(np.float32)))
+        far = np.concatenate((self._pending_ref, ref))
+        usable = len(near) - len(near) % self.block
+        cleaned = np.empty(usable, dtype=np.float32)
+
+        for offset in range(0, usable, self.block):
+            block = slice(offset, offset + self.block)
+            cleaned[block] = self._process_block(near[block], far[block])
+
+        self._pending = near[usable:]
+        self._pending_ref = far[usable:]
+        self._output = np.concatenate((self._output, cleaned))
+        result = self._output[:count].copy()
+        self._output = self._output[count:]
+        np.rint(result, out=result)
+        np.clip(result, -32768, 32767, out=result)
+        output[:] = result
+
+        self.cpu_seconds += time.thread_time() - start
+        self.audio_seconds += count / self.sample_rate
+
+    def _process_block(self, near, far):
+        """Ein Block (block_size Samples): Echo schätzen, abziehen, Filter adaptieren"""
+        if not far.any():
+            self._idle_blocks += 1
+            if self._idle_blocks > self.partitions:
+                # Keine Wiedergabe im Filterfenster - nichts zu tun (spart CPU)
+                self._previous[:] = 0.0
+                return near
+        else:
+            self._idle_blocks = 0
+
+        # Referenzspektrum (Overlap-Save: vorheriger + aktueller Block)
+        spectrum = np.fft.rfft(np.concatenate((self._previous, far))).astype(np.complex64)
+        self._previous = far
+        self._spectra = np.roll(self._spectra, 1, axis=0)
+        self._spectra[0] = spectrum
+
+        # Echo-Schätzung: Summe über alle Partitionen, letzte B Samples gültig
+        echo = np.fft.irfft((self._weights * self._spectra).sum(axis=0), n=2 * self.block)[self.block:]
+        error = near - echo
+
+        # Doubletalk-Erkennung (Geigel mit gelernter Echo-Pfad-Dämpfung): Mikrofon deutlich
+        # lauter als das zu erwartende Echo → Nahsprecher aktiv, Filter nicht adaptieren
+        far_energy = float(np.dot(far, far))
+        self._reference_peak = max(float(np.abs(far).max()), self._reference_peak * 0.9)
+        near_peak = float(np.abs(near).max())
+        expected_peak = self._echo_gain * self._reference_peak
+        if far_energy == 0 or near_peak > self.doubletalk_threshold * expected_peak:
+            if far_energy > 0:
+                self.doubletalk_blocks += 1
+                self._hangover = self.HANGOVER_BLOCKS
+            return error
+        if self._hangover > 0:
+            # Nachlauf: Sprachpausen innerhalb des Gegensprechens nicht zum Adaptieren nutzen
+            self._hangover -= 1
+            return error
+        if self._reference_peak > 0:
+            self._echo_gain = 0.95 * self._echo_gain + 0.05 * near_peak / self._reference_peak
+
+        # ERLE nur über Blöcke mit reinem Echo (Wiedergabe ohne Gegensprechen), gleitend ~2 s
+        self.echo_energy_in = 0.99 * self.echo_energy_in + float(np.dot(near, near))
+        self.echo_energy_out = 0.99 * self.echo_energy_out + float(np.dot(error, error))
+
+        # NLMS-Update im Frequenzbereich, normalisiert pro Bin auf die Referenzleistung im Filterfenster
+        power = (self._spectra.real ** 2 + self._spectra.imag ** 2).sum(axis=0)
+        power += 1e-3 * power.mean() + 1e-6
+        error_spectrum = np.fft.rfft(np.concatenate((np.zeros(self.block, dtype=np.float32), error)))
+        gradient = self.step_size * np.conj(self._spectra) * (error_spectrum / power)[None, :]
+        # Gradienten-Beschränkung: nur die ersten B Taps pro Partition (lineare statt zyklische Faltung)
+        taps = np.fft.irfft(gradient, n=2 * self.block, axis=1)[:, :self.block]
+        self._weights += np.fft.rfft(taps, n=2 * self.block, axis=1).astype(np.complex64)
+        return error
+
+    @property
+    def cpu_ms_per_audio_second(self):
+        """CPU-Kosten in Millisekunden pro Sekunde Audio"""
+        if self.audio_seconds <= 0:
+            return 0.0
+        return self.cpu_seconds * 1000 / self.audio_seconds
+
+    @property
+    def erle_db(self):
+        """Aktuelle Echo-Dämpfung (Echo Return Loss Enhancement) in dB, höher = besser"""
+        if self.echo_energy_out <= 0 or self.echo_energy_in <= 0:
+            return 0.0
+        return 10 * np.log10(self.echo_energy_in / self.echo_energy_out)
+
+    def summary(self):
+        """Kurzbericht für die Konsole"""
+        return (f"ERLE {self.erle_db:.1f} dB, {self.cpu_ms_per_audio_second:.2f} ms CPU pro Sekunde Audio, "
+                f"{self.doubletalk_blocks} Blöcke Gegensprechen ({self.partitions} Partitionen à {self.block} Samples)")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Buffer-Pool für den Audio-Pfad Capture → WebSocket-Send
+=======================================================
+Vorallokierte bytearray-Slabs, die vom Capture-Thread befüllt, als
+memoryview über die Queue gereicht, direkt an websocket.send() übergeben
+und danach wiederverwendet werden. Spart pro Chunk die Allokation und die
+Kopie durch tobytes()/bytes().
+
+- Thread-safe (Capture-Thread befüllt, Event-Loop gibt frei)
+- Wächst bei Bedarf (z.B. wenn der Sender hängt), alloziert sonst nie neu
+- Zählt Slab-Allokationen und selbst kopierte Bytes (inkl. Raten pro Sekunde)
+
+Hinweis: Client-Frames werden von der WebSocket-Bibliothek maskiert - diese
+eine Kopie beim Framing ist durch das Protokoll vorgegeben und nicht vermeidbar.
+
+Verwendung:
+    from audio_buffers import BufferPool
+
+    pool = BufferPool(slab_size=16000)
+    buffer = pool.acquire()
+    buffer.write(indata)              # eine Kopie aus dem (flüchtigen) Treiber-Buffer
+    await websocket.send(buffer.payload)
+    buffer.release()
+"""
+
+import threading
+import time
+from collections import deque
+
+class PooledBuffer:
+    """Ein Slab aus dem Pool mit aktueller Nutzlänge"""
+
+    __slots__ = ('slab', 'length', 'pool')
+
+    def __init__(self, slab, pool):
+        self.slab = slab
+        self.length = 0
+        self.pool = pool
+
+    def write(self, data):
+        """Kopiert data (bytes-like) an den Anfang des Slabs"""
+        view = memoryview(data).cast('B')
+        length = view.nbytes
+        if length > len(self.slab):
+            raise ValueError(f"Chunk ({length} Bytes) größer als Slab ({len(self.slab)} Bytes)")
+        self.slab[:length] = view
+        self.length = length
+        self.pool.bytes_copied += length
+        return self
+
+    @property
+    def payload(self):
+        """Nutzdaten ohne Kopie: bei vollem Slab das bytearray selbst, sonst memoryview"""
+        if self.length == len(self.slab):
+            return self.slab
+        return memoryview(self.slab)[:self.length]
+
+    def __len__(self):
+        return self.length
+
+    def release(self):
+        """Gibt den Slab an den Pool zurück (nach abgeschlossenem Send)"""
+        self.pool.release(self)
+
+class BufferPool:
+    """Pool aus vorallokierten bytearray-Slabs fester Größe"""
+
+    def __init__(self, slab_size, count=8):
+        self.slab_size = int(slab_size)
+        self._free = deque()
+        self._lock = threading.Lock()
+        self.allocations = 0      # Neu angelegte Slabs
+        self.acquires = 0         # Ausgegebene Buffer (= Chunks)
+        self.bytes_copied = 0     # Selbst kopierte Bytes (write())
+        self.in_use = 0
+        self._started = time.monotonic()
+        for _ in range(count):
+            self._free.append(self._new_buffer())
+
+    def _new_buffer(self):
+        self.allocations += 1
+        return PooledBuffer(bytearray(self.slab_size), self)
+
+    def acquire(self):
+        """Holt einen freien Slab (legt nur bei leerem Pool einen neuen an)"""
+        with self._lock:
+            buffer = self._free.pop() if self._free else self._new_buffer()
+            self.acquires += 1
+            self.in_use += 1
+        buffer.length = 0
+        return buffer
+
+    def release(self, buffer):
+        with self._lock:
+            self.in_use -= 1
+            self._free.append(buffer)
+
+    def rates(self):
+        """Allokationen und kopierte Bytes pro Sekunde seit Start"""
+        elapsed = max(time.monotonic() - self._started, 1e-9)
+        return self.allocations / elapsed, self.bytes_copied / elapsed
+
+    def summary(self):
+        """Kurzbericht: Pool-Nutzung im Vergleich zum Pfad ohne Pool (1 Allokation + Kopie pro Chunk)"""
+        alloc_rate, copy_rate = self.rates()
+        return (f"{self.acquires} Chunks, {self.allocations} Slab-Allokationen "
+                f"(ohne Pool: {self.acquires}), {alloc_rate:.2f} Allokationen/s, "
+                f"{copy_rate / 1024:.1f} KB/s kopiert")
+
+def payload_view(payload):
+    """Sendbare Daten eines Queue-Payloads (PooledBuffer oder bytes) ohne Kopie"""
+    if isinstance(payload, PooledBuffer):
+        return payload.payload
+    return payload
+
+def release_payload(payload):
+    """Gibt einen Queue-Payload frei, falls er aus einem Pool stammt"""
+    if isinstance(payload, PooledBuffer):
+        payload.release()
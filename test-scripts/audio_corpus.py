@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Deterministischer, sprachähnlicher Audio-Korpus für Benchmarks
+==============================================================
+Erzeugt aus einem Seed immer dasselbe 16 kHz s16le Mono-Signal, damit
+Audio-Benchmarks, Edge-Gating (VAD) und Resampling auf identischen
+Eingaben laufen statt auf dem, was gerade jemand ins Mikrofon spricht:
+
+- Äußerungen aus Silben: Vokale als Obertonreihe mit Formanten (a/e/i/o/u),
+  fallender Tonhöhe und Vibrato, Frikative (Hochpass-Rauschen) und Plosive,
+  Silben-/Wort-Pausen und Betonung - ergibt eine sprachtypische Hüllkurve
+- Pausen zwischen den Äußerungen (kurz bis mehrere Sekunden)
+- Rauschboden in wechselnden Szenen (weiß, rosa, braun, Netzbrummen) mit
+  unterschiedlichem Pegel
+- Übersteuerte Äußerungen (hart geclippt) als Randfall
+- Optional eingefügte TTS-Clips (z.B. von piper_test.py --batch oder einem
+  lokalen Piper-Server), der Index speichert deren SHA-256
+
+Der Korpus wird als WAV (oder .raw) plus kompaktem JSON-Index gespeichert:
+Segmente mit Position, Art, Pegel, geclippten Samples und Sprach-Label
+(Ground Truth für VAD), Rausch-Szenen, Parameter und SHA-256 der Audiodaten.
+
+Verwendung:
+    from audio_corpus import generate_corpus, write_corpus, load_corpus
+
+    pcm, index = generate_corpus(seed=42, seconds=120)
+    write_corpus('audio_corpus/speech-42.wav', pcm, index)
+
+    corpus = load_corpus('audio_corpus/speech-42.wav')
+    for chunk in corpus.chunks(8000):      # 500 ms Chunks wie device-client.py
+        ...
+    labels = corpus.speech_mask(frame_ms=500)
+
+CLI: audio-corpus.py
+"""
+
+import hashlib
+import json
+import os
+import wave
+
+import numpy as np
+
+from audio_io import read_audio_file, split_blocks
+from audio_resample import CaptureConverter
+
+SAMPLE_RATE = 16000
+CORPUS_VERSION = 1
+FULL_SCALE = 32767
+
+# Formanten (Hz) und Bandbreiten der Vokale
+VOWELS = {
+    'a': (800, 1250, 2600),
+    'e': (450, 2000, 2700),
+    'i': (300, 2300, 3000),
+    'o': (500, 900, 2500),
+    'u': (330, 800, 2400),
+}
+FORMANT_BANDWIDTHS = (90, 120, 180)
+NOISE_TYPES = ('white', 'pink', 'brown', 'hum')
+
+# Standard-Parameter (werden im Index gespeichert, gleiche Parameter + Seed = gleiche Datei)
+DEFAULT_PARAMS = {
+    'clip_ratio': 0.1,            # Anteil übersteuerter Äußerungen
+    'speech_dbfs': [-32.0, -16.0],  # RMS-Pegel normaler Äußerungen
+    'clip_overdrive_db': [4.0, 14.0],  # Spitzenpegel übersteuerter Äußerungen über Vollaussteuerung
+    'noise_dbfs': [-72.0, -45.0],  # RMS-Pegel des Rauschbodens
+    'scene_seconds': [8.0, 30.0],  # Dauer einer Rausch-Szene
+    'words': [2, 12],             # Wörter pro Äußerung
+    'pause_seconds': [0.3, 2.5],  # Pause nach einer Äußerung
+    'long_pause_ratio': 0.15,     # Anteil langer Pausen (4-8 s, z.B. für Gate-Nachlaufzeiten)
+    'tts_every': 4,               # Jede n-te Äußerung ist ein TTS-Clip (falls vorhanden)
+}
+
+def dbfs(value):
+    """dBFS → lineare Amplitude (1.0 = Vollaussteuerung)"""
+    return 10 ** (value / 20)
+
+def level_dbfs(samples):
+    """RMS-Pegel in dBFS (float-Samples, 1.0 = Vollaussteuerung)"""
+    if len(samples) == 0:
+        return None
+    rms = float(np.sqrt(np.mean(np.square(samples, dtype=np.float64))))
+    return round(20 * np.log10(rms), 2) if rms > 0 else None
+
+def index_path(path):
+    """Pfad des JSON-Index zu einer Korpus-Datei (gleicher Name, .json)"""
+    return os.path.splitext(path)[0] + '.json'
+
+class SpeechSynth:
+    """Sprachähnliche Äußerungen aus Silben (Obertöne + Formanten, Frikative, Plosive)"""
+
+    def __init__(self, rng):
+        self.rng = rng  # np.random.RandomState (stabiler Zahlenstrom über NumPy-Versionen)
+
+    def _ramp(self, n, attack, release):
+        """Hüllkurve mit Cosinus-Flanken"""
+        envelope = np.ones(n)
+        a = min(n // 2, int(attack * SAMPLE_RATE))
+        r = min(n - a, int(release * SAMPLE_RATE))
+        if a:
+            envelope[:a] = 0.5 - 0.5 * np.cos(np.linspace(0, np.pi, a))
+        if r:
+            envelope[n - r:] = 0.5 + 0.5 * np.cos(np.linspace(0, np.pi, r))
+        return envelope
+
+    def vowel(self, seconds, f0_start, f0_end, formants):
+        n = int(seconds * SAMPLE_RATE)
+        t = np.arange(n) / SAMPLE_RATE
+        f0 = np.linspace(f0_start, f0_end, n) * (1 + 0.015 * np.sin(2 * np.pi * 5.5 * t + self.rng.uniform(0, 6.28)))
+        phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+        mean_f0 = float(f0.mean())
+        out = np.zeros(n)
+        for k in range(1, int(3800 // mean_f0) + 1):
+            fk = k * mean_f0
+            gain = sum(1 / (1 + ((fk - f) / b) ** 2) for f, b in zip(formants, FORMANT_BANDWIDTHS))
+            out += gain / np.sqrt(k) * np.sin(k * phase)
+        # Behauchung
+        out += 0.03 * self.rng.standard_normal(n)
+        return out * self._ramp(n, 0.015, 0.04)
+
+    def fricative(self, seconds):
+        n = int(seconds * SAMPLE_RATE)
+        noise = self.rng.standard_normal(n + 2)
+        hiss = noise[2:] - 1.6 * noise[1:-1] + 0.64 * noise[:-2]  # Hochpass (s/f/sch-artig)
+        return 0.25 * hiss * self._ramp(n, 0.02, 0.02)
+
+    def plosive(self):
+        closure = np.zeros(int(self.rng.uniform(0.02, 0.05) * SAMPLE_RATE))
+        n = int(0.012 * SAMPLE_RATE)
+        burst = 0.6 * self.rng.standard_normal(n) * np.exp(-np.arange(n) / (0.003 * SAMPLE_RATE))
+        return np.concatenate([closure, burst])
+
+    def utterance(self, words):
+        """Eine Äußerung, normiert auf Spitze 1.0 - Returns: (samples, f0)"""
+        f0_base = self.rng.uniform(95, 230)
+        syllables = []
+        for _ in range(words):
+            for _ in range(self.rng.randint(1, 4)):
+                syllables.append(self.rng.rand() < 0.35)  # betont?
+        parts = []
+        total = len(syllables)
+        vowel_names = sorted(VOWELS)
+        for i, stressed in enumerate(syllables):
+            # Deklination: Tonhöhe fällt über die Äußerung
+            f0 = f0_base * (1.1 - 0.25 * i / max(total - 1, 1)) * (1.12 if stressed else 1.0)
+            onset = self.rng.rand()
+            if onset < 0.3:
+                parts.append(self.fricative(self.rng.uniform(0.04, 0.11)))
+            elif onset < 0.5:
+                parts.append(self.plosive())
+            length = self.rng.uniform(0.07, 0.22) * (1.4 if stressed else 1.0)
+            vowel = self.vowel(length, f0, f0 * self.rng.uniform(0.9, 1.02),
+                               VOWELS[vowel_names[self.rng.randint(len(vowel_names))]])
+            parts.append(vowel * (dbfs(4) if stressed else 1.0))
+            parts.append(np.zeros(int(self.rng.uniform(0.0, 0.03) * SAMPLE_RATE)))
+            if i + 1 < total and self.rng.rand() < 0.4:
+                # Wortgrenze
+                parts.append(np.zeros(int(self.rng.uniform(0.04, 0.16) * SAMPLE_RATE)))
+        samples = np.concatenate(parts)
+        return samples / np.max(np.abs(samples)), round(f0_base, 1)
+
+def noise_floor(rng, kind, n, level):
+    """Rauschboden mit RMS-Pegel level (linear)"""
+    if kind == 'hum':
+        t = np.arange(n) / SAMPLE_RATE
+        signal = sum(np.sin(2 * np.pi * 50 * k * t + rng.uniform(0, 6.28)) / k for k in (1, 2, 3, 5))
+        signal = signal + 0.2 * rng.standard_normal(n)
+    else:
+        white = rng.standard_normal(n)
+        if kind == 'white':
+            signal = white
+        else:
+            # Spektrum 1/f (rosa) bzw. 1/f² (braun)
+            spectrum = np.fft.rfft(white)
+            freqs = np.fft.rfftfreq(n, 1 / SAMPLE_RATE)
+            freqs[0] = freqs[1] if n > 1 else 1.0
+            spectrum /= np.sqrt(freqs) if kind == 'pink' else freqs
+            signal = np.fft.irfft(spectrum, n)
+    rms = np.sqrt(np.mean(np.square(signal))) or 1.0
+    return signal * (level / rms)
+
+def load_tts_clips(directory):
+    """
+    TTS-Clips aus einem Verzeichnis (.raw = 16 kHz s16le Mono wie von piper_test.py --batch, oder .wav),
+    sortiert nach Dateiname; andere WAV-Formate werden auf 16 kHz Mono umgerechnet
+    """
+    clips = []
+    for name in sorted(os.listdir(directory)):
+        if not name.lower().endswith(('.raw', '.wav')):
+            continue
+        path = os.path.join(directory, name)
+        pcm, rate, channels, _ = read_audio_file(path, SAMPLE_RATE, 1)
+        if (rate, channels) != (SAMPLE_RATE, 1):
+            pcm = CaptureConverter(rate, channels, SAMPLE_RATE).process(pcm)
+        if pcm:
+            clips.append({'pcm': pcm[:len(pcm) // 2 * 2], 'source': name, 'text': None})
+    return clips
+
+def generate_corpus(seed=42, seconds=120.0, params=None, tts_clips=None):
+    """
+    Erzeugt einen Korpus
+
+    Args:
+        params: Abweichungen von DEFAULT_PARAMS
+        tts_clips: Liste von Dicts {'pcm': bytes (16 kHz s16le mono), 'source': ..., 'text': ...}
+
+    Returns:
+        (pcm_bytes, index)
+    """
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    rng = np.random.RandomState(seed)
+    synth = SpeechSynth(rng)
+    total = int(seconds * SAMPLE_RATE)
+    signal = np.zeros(total)
+    segments = []
+    tts_clips = list(tts_clips or [])
+    tts_used = []
+
+    def add_pause(length):
+        length = min(length, total - position)
+        if length > 0:
+            segments.append({'kind': 'pause', 'start': position, 'frames': length, 'speech': False})
+        return position + length
+
+    # Zu Beginn eine Pause (Gates/VADs lernen den Rauschboden)
+    position = 0
+    position = add_pause(int(rng.uniform(0.5, 1.5) * SAMPLE_RATE))
+    utterances = 0
+    while position < total:
+        utterances += 1
+        segment = {'speech': True}
+        if tts_clips and utterances % params['tts_every'] == 0:
+            clip = tts_clips[len(tts_used) % len(tts_clips)]
+            samples = np.frombuffer(clip['pcm'], dtype=np.int16) / FULL_SCALE
+            segment.update({'kind': 'tts', 'tts': len(tts_used) % len(tts_clips)})
+            if len(tts_used) < len(tts_clips):
+                tts_used.append(clip)
+        else:
+            samples, f0 = synth.utterance(rng.randint(params['words'][0], params['words'][1] + 1))
+            if rng.rand() < params['clip_ratio']:
+                # Übersteuert: Spitze über Vollaussteuerung, wird beim Schreiben hart geclippt
+                samples = samples * dbfs(rng.uniform(*params['clip_overdrive_db']))
+                segment['kind'] = 'clipping'
+            else:
+                target = dbfs(rng.uniform(*params['speech_dbfs']))
+                samples = samples * (target / np.sqrt(np.mean(np.square(samples))))
+                segment['kind'] = 'speech'
+            segment['f0'] = f0
+
+        length = min(len(samples), total - position)
+        signal[position:position + length] = samples[:length]
+        segment.update({'start': position, 'frames': length, 'level_dbfs': level_dbfs(samples[:length])})
+        segments.append(segment)
+        position += length
+
+        if rng.rand() < params['long_pause_ratio']:
+            pause = rng.uniform(4.0, 8.0)
+        else:
+            pause = rng.uniform(*params['pause_seconds'])
+        position = add_pause(int(pause * SAMPLE_RATE))
+
+    # Rauschboden in Szenen
+    scenes = []
+    position = 0
+    while position < total:
+        length = min(int(rng.uniform(*params['scene_seconds']) * SAMPLE_RATE), total - position)
+        kind = NOISE_TYPES[rng.randint(len(NOISE_TYPES))]
+        level = rng.uniform(*params['noise_dbfs'])
+        signal[position:position + length] += noise_floor(rng, kind, length, dbfs(level))
+        scenes.append({'start': position, 'frames': length, 'type': kind, 'level_dbfs': round(level, 2)})
+        position += length
+
+    scaled = np.rint(signal * FULL_SCALE)
+    clipped = np.abs(scaled) > FULL_SCALE
+    pcm = np.clip(scaled, -FULL_SCALE - 1, FULL_SCALE).astype('<i2').tobytes()
+    for segment in segments:
+        start, end = segment['start'], segment['start'] + segment['frames']
+        segment['clipped_samples'] = int(np.count_nonzero(clipped[start:end]))
+
+    index = {
+        'version': CORPUS_VERSION,
+        'sample_rate': SAMPLE_RATE,
+        'channels': 1,
+        'encoding': 'pcm_s16le',
+        'frames': total,
+        'seconds': total / SAMPLE_RATE,
+        'seed': seed,
+        'params': params,
+        'sha256': hashlib.sha256(pcm).hexdigest(),
+        'tts': [{'source': clip.get('source'), 'text': clip.get('text'),
+                 'frames': len(clip['pcm']) // 2, 'sha256': hashlib.sha256(clip['pcm']).hexdigest()}
+                for clip in tts_used],
+        'noise': scenes,
+        'segments': segments,
+    }
+    return pcm, index
+
+def write_corpus(path, pcm, index):
+    """Schreibt Audio (WAV oder .raw) und den kompakten JSON-Index daneben"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if path.lower().endswith('.wav'):
+        with wave.open(path, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(SAMPLE_RATE)
+            wav.writeframes(pcm)
+    else:
+        with open(path, 'wb') as f:
+            f.write(pcm)
+    with open(index_path(path), 'w', encoding='utf-8') as f:
+        json.dump({**index, 'audio': os.path.basename(path)}, f, separators=(',', ':'))
+
+class Corpus:
+    """Geladener Korpus: Audio + Index"""
+
+    def __init__(self, pcm, index, path=None):
+        self.pcm = pcm
+        self.index = index
+        self.path = path
+
+    @property
+    def seconds(self):
+        return len(self.pcm) / 2 / SAMPLE_RATE
+
+    def samples(self):
+        """int16-Samples ohne Kopie"""
+        return np.frombuffer(self.pcm, dtype='<i2')
+
+    def segments(self, kind=None):
+        return [s for s in self.index['segments'] if kind is None or s['kind'] == kind]
+
+    def chunks(self, frames):
+        """Gleich große Chunks (letzter mit Stille aufgefüllt), wie das file-Backend aus audio_io.py"""
+        return split_blocks(self.pcm, frames * 2)
+
+    def speech_mask(self, frame_ms=20):
+        """Ground Truth pro Frame: True, wenn mehr als die Hälfte des Frames in einer Äußerung liegt"""
+        frame = int(SAMPLE_RATE * frame_ms / 1000)
+        active = np.zeros(len(self.pcm) // 2, dtype=bool)
+        for segment in self.index['segments']:
+            if segment['speech']:
+                active[segment['start']:segment['start'] + segment['frames']] = True
+        count = -(-len(active) // frame)
+        padded = np.zeros(count * frame, dtype=bool)
+        padded[:len(active)] = active
+        return padded.reshape(count, frame).mean(axis=1) > 0.5
+
+    def verify(self):
+        """True, wenn die Audiodaten zum SHA-256 im Index passen"""
+        return hashlib.sha256(self.pcm).hexdigest() == self.index['sha256']
+
+    def summary(self):
+        """Kurzbericht für die Konsole"""
+        kinds = {}
+        for segment in self.index['segments']:
+            kinds.setdefault(segment['kind'], [0, 0])
+            kinds[segment['kind']][0] += 1
+            kinds[segment['kind']][1] += segment['frames']
+        parts = [f"{self.seconds:.1f}s Audio (Seed {self.index['seed']})"]
+        parts += [f"{count} {kind} ({frames / SAMPLE_RATE:.1f}s)" for kind, (count, frames) in sorted(kinds.items())]
+        parts.append(f"{len(self.index['noise'])} Rausch-Szenen")
+        clipped = sum(s.get('clipped_samples', 0) for s in self.index['segments'])
+        if clipped:
+            parts.append(f"{clipped} geclippte Samples")
+        return ', '.join(parts)
+
+def load_corpus(path):
+    """Lädt Audio und Index (Raises: FileNotFoundError ohne Index, ValueError bei falschem Format)"""
+    with open(index_path(path), encoding='utf-8') as f:
+        index = json.load(f)
+    pcm, rate, channels, _ = read_audio_file(path, SAMPLE_RATE, 1)
+    if (rate, channels) != (SAMPLE_RATE, 1):
+        raise ValueError(f"{path}: {rate} Hz / {channels} Kanal/Kanäle, erwartet {SAMPLE_RATE} Hz Mono")
+    return Corpus(pcm, index, path)
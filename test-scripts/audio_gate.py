@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Edge-Gating: Audio erst nach einem Trigger streamen
+===================================================
+Leichtgewichtiger Detektor für den Capture-Thread: statt dauerhaft zu
+streamen (und im Backend eine Vosk-Verbindung pro Gerät offen zu halten),
+öffnet das Gerät eine Audio-Session erst nach einem Trigger und schließt
+sie nach einer Sprechpause wieder.
+
+Modi:
+- energy:  Sprachbeginn (Energie über adaptivem Rauschboden für min_speech_ms)
+- pattern: Energie-Muster aus N kurzen Sprach-Bursts innerhalb eines Zeitfensters
+           (z.B. zweisilbiges Wake-Word oder Doppel-Klopfen) - filtert einzelne
+           Geräusche und Dauergeräusche besser als 'energy'
+
+Der Pre-Roll (die letzten pre_roll_ms vor dem Trigger) wird vom Aufrufer
+gepuffert und beim Öffnen der Session zuerst gesendet.
+
+Verwendung:
+    from audio_gate import EdgeGate
+
+    gate = EdgeGate(mode="energy", hangover_ms=1200)
+    event = gate.update(pcm16k)        # 'open', 'close' oder None (pro Chunk)
+    print(gate.summary())              # Einsparung Uplink-Bytes / STT-Session-Sekunden
+"""
+
+import time
+
+import numpy as np
+
+GATE_MODES = ('energy', 'pattern')
+
+class EdgeGate:
+    """Energie-/Muster-Trigger mit adaptivem Rauschboden und Nachlaufzeit"""
+
+    def __init__(self, mode='energy', sample_rate=16000, frame_ms=20, threshold_db=12.0,
+                 min_level_db=-55.0, min_speech_ms=150, hangover_ms=1200, max_session_s=30.0,
+                 pattern_bursts=2, pattern_window_ms=1500, max_burst_ms=600):
+        if mode not in GATE_MODES:
+            raise ValueError(f"Unbekannter Gate-Modus '{mode}' (erlaubt: {', '.join(GATE_MODES)})")
+        self.mode = mode
+        self.sample_rate = int(sample_rate)
+        self.frame = int(self.sample_rate * frame_ms / 1000)
+        self.frame_ms = frame_ms
+        self.threshold_db = threshold_db
+        self.min_level_db = min_level_db
+        self.min_speech_frames = max(1, int(min_speech_ms / frame_ms))
+        self.hangover_frames = max(1, int(hangover_ms / frame_ms))
+        self.max_session_frames = int(max_session_s * 1000 / frame_ms)
+        self.pattern_bursts = pattern_bursts
+        self.pattern_window_frames = int(pattern_window_ms / frame_ms)
+        self.max_burst_frames = int(max_burst_ms / frame_ms)
+
+        self.is_open = False
+        self._noise_floor = None   # dBFS
+        self._voiced_run = 0       # Aufeinanderfolgende Sprach-Frames
+        self._silent_run = 0       # Aufeinanderfolgende Stille-Frames
+        self._frame_index = 0
+        self._session_frames = 0
+        self._bursts = []          # End-Frames erkannter Bursts (pattern)
+        self._remainder = np.zeros(0, dtype=np.float32)
+
+        # Statistik: gesamt erfasst vs. tatsächlich gestreamt
+        self.captured_seconds = 0.0
+        self.streamed_seconds = 0.0
+        self.captured_bytes = 0
+        self.streamed_bytes = 0
+        self.sessions = 0
+        self.cpu_seconds = 0.0
+
+    def update(self, pcm):
+        """
+        Analysiert einen Chunk (int16 mono, bytes-like)
+
+        Returns:
+            'open' beim Trigger, 'close' nach der Nachlaufzeit, sonst None
+        """
+        start = time.thread_time()
+        samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32)
+        duration = len(samples) / self.sample_rate
+        self.captured_seconds += duration
+        self.captured_bytes += len(samples) * 2
+        was_open = self.is_open
+
+        samples = np.concatenate((self._remainder, samples))
+        count = len(samples) // self.frame
+        self._remainder = samples[count * self.frame:]
+        frames = samples[:count * self.frame].reshape(count, self.frame)
+        # Frame-Energie in dBFS (vektorisiert für den ganzen Chunk)
+        levels = 10 * np.log10(np.mean(frames * frames, axis=1) + 1e-9) - 20 * np.log10(32768)
+
+        event = None
+        for level in levels:
+            frame_event = self._step(float(level))
+            if frame_event:
+                event = frame_event if event is None or event == frame_event else None
+
+        # Chunk zählt als gestreamt, wenn die Session während des Chunks offen war
+        if was_open or self.is_open:
+            self.streamed_seconds += duration
+            self.streamed_bytes += len(pcm) if isinstance(pcm, (bytes, bytearray)) else memoryview(pcm).nbytes
+        self.cpu_seconds += time.thread_time() - start
+        return event
+
+    def account_pre_roll(self, seconds, nbytes):
+        """Pre-Roll-Chunks, die beim Öffnen zusätzlich gesendet werden"""
+        self.streamed_seconds += seconds
+        self.streamed_bytes += nbytes
+
+    def _step(self, level):
+        """Zustandsautomat pro Frame"""
+        self._frame_index += 1
+        if self._noise_floor is None:
+            self._noise_floor = level
+        voiced = level > max(self._noise_floor + self.threshold_db, self.min_level_db)
+
+        # Rauschboden: fällt sofort, steigt langsam (~2.5 dB/s) - nur außerhalb von Sprache
+        if level < self._noise_floor:
+            self._noise_floor = level
+        elif not voiced:
+            self._noise_floor += 0.05 * self.frame_ms / 20
+
+        if voiced:
+            self._voiced_run += 1
+            self._silent_run = 0
+        else:
+            if self._voiced_run:
+                self._burst_ended(self._voiced_run)
+            self._voiced_run = 0
+            self._silent_run += 1
+
+        if self.is_open:
+            self._session_frames += 1
+            if self._silent_run >= self.hangover_frames or self._session_frames >= self.max_session_frames:
+                self.is_open = False
+                self._bursts.clear()
+                return 'close'
+            return None
+
+        if self._triggered():
+            self.is_open = True
+            self.sessions += 1
+            self._session_frames = 0
+            self._bursts.clear()
+            return 'open'
+        return None
+
+    def _burst_ended(self, length):
+        if self.mode == 'pattern' and self.min_speech_frames // 2 <= length <= self.max_burst_frames:
+            self._bursts.append(self._frame_index)
+            window_start = self._frame_index - self.pattern_window_frames
+            self._bursts = [end for end in self._bursts if end >= window_start]
+
+    def _triggered(self):
+        if self.mode == 'energy':
+            return self._voiced_run >= self.min_speech_frames
+        # pattern: genug Bursts im Fenster, Trigger nach dem letzten Burst
+        return len(self._bursts) >= self.pattern_bursts and self._voiced_run == 0
+
+    @property
+    def reduction(self):
+        """Anteil eingesparter Uplink-Bytes gegenüber Dauer-Streaming (0.0 - 1.0)"""
+        if self.captured_bytes <= 0:
+            return 0.0
+        return max(0.0, 1.0 - self.streamed_bytes / self.captured_bytes)
+
+    def summary(self):
+        """Kurzbericht: Uplink-Bytes und STT-Session-Sekunden im Vergleich zu Dauer-Streaming"""
+        return (f"{self.sessions} Sessions, STT-Session-Sekunden {self.streamed_seconds:.1f}s statt "
+                f"{self.captured_seconds:.1f}s, Uplink {self.streamed_bytes / 1024:.0f} KB statt "
+                f"{self.captured_bytes / 1024:.0f} KB (-{self.reduction * 100:.0f}%), "
+                f"CPU {self.cpu_seconds * 1000 / max(self.captured_seconds, 1e-9):.2f} ms/s Audio")
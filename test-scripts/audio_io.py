@@ -0,0 +1,734 @@
+#!/usr/bin/env python3
+"""
+Audio-I/O mit austauschbaren Backends (Capture und Wiedergabe)
+==============================================================
+Einheitliche, callback-basierte Schnittstelle für Mikrofon und Lautsprecher,
+damit derselbe Client-Code auf echter Hardware, in CI und im Fleet-Simulator
+läuft:
+
+- pyaudio:     PortAudio über PyAudio (Callback-Modus statt blockierendem read())
+- sounddevice: PortAudio über sounddevice (RawInputStream/RawOutputStream)
+- file:        Capture aus WAV/Raw-Datei (16-bit PCM, in Echtzeit oder so schnell
+               wie möglich), Wiedergabe in WAV/Raw-Datei
+- null:        Stille als Quelle, Wiedergabe wird verworfen (Benchmarks)
+
+Alle Backends liefern int16-PCM als bytes an callback(data, captured_at) -
+captured_at ist time.monotonic() am Ende des Blocks. Der Callback läuft im
+Audio-Thread des Backends und darf nicht blockieren. Pro Backend werden
+Block-Jitter, Callback-Dauer und Prozess-CPU pro Audio-Sekunde gemessen
+(stats.summary()), Vergleich der Backends: audio-io-bench.py
+
+Verwendung:
+    from audio_io import open_capture, open_playback, AudioBackendError
+
+    capture = open_capture('pyaudio')            # oder 'file' mit path=..., 'null'
+    rate, channels = capture.native_format()     # bei Dateien fest vorgegeben
+    capture.open(16000, 1, 8000, on_chunk, on_end=on_end)
+    capture.start()
+    ...
+    capture.stop()
+    capture.close()
+    print(capture.stats.summary())
+
+    playback = open_playback('sounddevice')
+    playback.open(16000, 1)
+    playback.start()
+    playback.play(pcm_bytes)                     # nicht blockierend (FIFO)
+
+Konfiguration über Umgebungsvariablen (Standardwerte der Skripte):
+    AUDIO_BACKEND      Capture-Backend (pyaudio | sounddevice | file | null)
+    AUDIO_OUTPUT       Wiedergabe-Backend (Skript-abhängig, z.B. ffplay im device-client.py)
+    AUDIO_FILE         Quelldatei für das file-Capture-Backend
+    AUDIO_OUTPUT_FILE  Zieldatei für das file-Wiedergabe-Backend
+"""
+
+import importlib
+import importlib.util
+import os
+import threading
+import time
+import wave
+from collections import deque
+
+from latency_stats import percentile
+
+BACKENDS = ('pyaudio', 'sounddevice', 'file', 'null')
+DEFAULT_BACKEND = os.getenv("AUDIO_BACKEND", "pyaudio")
+DEFAULT_FILE = os.getenv("AUDIO_FILE", "")
+DEFAULT_OUTPUT_FILE = os.getenv("AUDIO_OUTPUT_FILE", "")
+
+SAMPLE_WIDTH = 2  # int16
+
+# Installationshinweise für die optionalen Bibliotheken
+INSTALL_HINTS = {
+    'pyaudio': "pip install pyaudio (macOS: brew install portaudio && pip install pyaudio)",
+    'sounddevice': "pip install sounddevice",
+}
+
+class AudioBackendError(Exception):
+    """Backend nicht verfügbar oder falsch konfiguriert"""
+
+def add_audio_arguments(parser):
+    """Fügt --audio-backend und --audio-file zu einem ArgumentParser hinzu"""
+    parser.add_argument('--audio-backend', choices=BACKENDS, default=DEFAULT_BACKEND,
+                        help=f"Capture-Backend (Standard: $AUDIO_BACKEND oder pyaudio, aktuell {DEFAULT_BACKEND})")
+    parser.add_argument('--audio-file', default=DEFAULT_FILE,
+                        help="WAV/Raw-Datei für das file-Backend (Standard: $AUDIO_FILE)")
+
+def backend_problem(name):
+    """Fehlertext, falls ein Backend nicht nutzbar ist (ohne die Bibliothek zu importieren), sonst None"""
+    if name not in BACKENDS:
+        return f"Unbekanntes Audio-Backend '{name}' (erlaubt: {', '.join(BACKENDS)})"
+    if name in INSTALL_HINTS and importlib.util.find_spec(name) is None:
+        return f"{name} nicht installiert - Installiere mit: {INSTALL_HINTS[name]}"
+    return None
+
+def _import(name):
+    """Importiert die Bibliothek eines Backends erst bei Bedarf"""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        raise AudioBackendError(f"{name} nicht installiert - Installiere mit: {INSTALL_HINTS[name]}") from None
+    except OSError as e:
+        # z.B. sounddevice ohne PortAudio-Bibliothek
+        raise AudioBackendError(f"{name} nicht nutzbar: {e}") from None
+
+def read_audio_file(path, sample_rate=16000, channels=1):
+    """
+    Liest eine WAV- (16-bit PCM) oder Raw-Datei (s16le)
+
+    Returns:
+        (pcm_bytes, sample_rate, channels, is_wav) - bei Raw-Dateien gelten die übergebenen Werte
+    """
+    if path.lower().endswith('.wav'):
+        try:
+            with wave.open(path, 'rb') as wav:
+                if wav.getsampwidth() != SAMPLE_WIDTH:
+                    raise AudioBackendError(f"{path}: {wav.getsampwidth() * 8}-bit WAV, erwartet 16-bit PCM")
+                return wav.readframes(wav.getnframes()), wav.getframerate(), wav.getnchannels(), True
+        except (wave.Error, EOFError) as e:
+            raise AudioBackendError(f"{path}: keine gültige WAV-Datei ({e})") from None
+    with open(path, 'rb') as f:
+        data = f.read()
+    frame_bytes = SAMPLE_WIDTH * channels
+    return data[:len(data) - len(data) % frame_bytes], sample_rate, channels, False
+
+def split_blocks(pcm, block_bytes):
+    """Teilt PCM in gleich große Blöcke (letzter Block mit Stille aufgefüllt, wie bei einem Gerät)"""
+    view = memoryview(pcm)
+    blocks = []
+    for offset in range(0, len(view), block_bytes):
+        block = bytes(view[offset:offset + block_bytes])
+        if len(block) < block_bytes:
+            block += bytes(block_bytes - len(block))
+        blocks.append(block)
+    return blocks
+
+class IOStats:
+    """Laufzeit-Messung eines Backends: Block-Jitter, Callback-Dauer, Prozess-CPU"""
+
+    def __init__(self, backend, direction):
+        self.backend = backend
+        self.direction = direction      # 'capture' | 'playback'
+        self.block_seconds = 0.0        # Soll-Abstand der Blöcke
+        self.blocks = 0
+        self.audio_seconds = 0.0
+        self.xruns = 0                  # Über-/Unterläufe laut Backend (Status-Flags)
+        self.callback_errors = 0
+        self.reported_latency = None    # Vom Treiber gemeldete Latenz (Sekunden), falls bekannt
+        self.callback_seconds = 0.0     # Summe der Zeit im Client-Callback
+        self.jitter = deque(maxlen=4096)     # |Ist-Abstand - Soll-Abstand| pro Block (Sekunden)
+        self.latencies = deque(maxlen=4096)  # Wiedergabe: play() → Übergabe an das Gerät
+        self._last_block = None
+        self._cpu_start = None
+        self._cpu_end = None
+
+    def started(self):
+        self._cpu_start = time.process_time()
+        self._cpu_end = None
+        self._last_block = None
+
+    def stopped(self):
+        if self._cpu_start is not None and self._cpu_end is None:
+            self._cpu_end = time.process_time()
+
+    def block(self, frames, sample_rate, now, callback_seconds=0.0):
+        if self._last_block is not None and self.block_seconds:
+            self.jitter.append(abs(now - self._last_block - self.block_seconds))
+        self._last_block = now
+        self.blocks += 1
+        self.audio_seconds += frames / sample_rate
+        self.callback_seconds += callback_seconds
+
+    @property
+    def cpu_seconds(self):
+        """Prozess-CPU (alle Threads) seit start()"""
+        if self._cpu_start is None:
+            return 0.0
+        end = self._cpu_end if self._cpu_end is not None else time.process_time()
+        return end - self._cpu_start
+
+    @property
+    def cpu_ms_per_audio_second(self):
+        return self.cpu_seconds / self.audio_seconds * 1000 if self.audio_seconds else 0.0
+
+    def as_dict(self):
+        def ms(value):
+            return value * 1000 if value is not None else None
+        jitter = list(self.jitter)
+        return {
+            'backend': self.backend,
+            'direction': self.direction,
+            'blocks': self.blocks,
+            'audio_seconds': self.audio_seconds,
+            'xruns': self.xruns,
+            'callback_errors': self.callback_errors,
+            'reported_latency_ms': ms(self.reported_latency),
+            'jitter_p50_ms': ms(percentile(jitter, 50)),
+            'jitter_p99_ms': ms(percentile(jitter, 99)),
+            'latency_p50_ms': ms(percentile(list(self.latencies), 50)),
+            'latency_p99_ms': ms(percentile(list(self.latencies), 99)),
+            'callback_ms_per_audio_second': self.callback_seconds / self.audio_seconds * 1000 if self.audio_seconds else 0.0,
+            'cpu_ms_per_audio_second': self.cpu_ms_per_audio_second,
+        }
+
+    def summary(self):
+        """Kurzbericht für die Konsole"""
+        d = self.as_dict()
+        parts = [f"{self.backend}: {d['blocks']} Blöcke, {d['audio_seconds']:.1f}s Audio"]
+        if d['jitter_p50_ms'] is not None:
+            parts.append(f"Jitter p50 {d['jitter_p50_ms']:.2f} ms / p99 {d['jitter_p99_ms']:.2f} ms")
+        if d['latency_p50_ms'] is not None:
+            parts.append(f"Latenz p50 {d['latency_p50_ms']:.1f} ms / p99 {d['latency_p99_ms']:.1f} ms")
+        if d['reported_latency_ms'] is not None:
+            parts.append(f"Treiber-Latenz {d['reported_latency_ms']:.1f} ms")
+        if self.direction == 'capture':
+            parts.append(f"Callback {d['callback_ms_per_audio_second']:.2f} ms pro Sekunde Audio")
+        parts.append(f"Prozess-CPU {d['cpu_ms_per_audio_second']:.1f} ms pro Sekunde Audio")
+        if self.xruns:
+            parts.append(f"{self.xruns} Über-/Unterläufe")
+        if self.callback_errors:
+            parts.append(f"{self.callback_errors} Callback-Fehler")
+        return ', '.join(parts)
+
+# ======================================
+# Capture
+# ======================================
+
+class CaptureBackend:
+    """Basis: Backend ruft _deliver() pro Block aus seinem Audio-Thread auf"""
+
+    name = None
+    fixed_format = False  # True: Rate/Kanäle kommen aus der Quelle (Datei) und sind nicht wählbar
+
+    def __init__(self):
+        self.stats = IOStats(self.name, 'capture')
+        self.sample_rate = None
+        self.channels = None
+        self.frames = None
+        self.callback = None
+        self.on_end = None
+        self.last_error = None
+
+    def native_format(self):
+        """(rate, channels), mit denen die Quelle ohne Umrechnung läuft"""
+        return 16000, 1
+
+    def open(self, sample_rate, channels, frames, callback, on_end=None):
+        """
+        Args:
+            frames: Frames pro Block (= pro Callback)
+            callback: callback(data: bytes, captured_at: float), läuft im Audio-Thread
+            on_end: wird aufgerufen, wenn die Quelle von selbst endet (Dateiende, Dauer)
+        """
+        self.sample_rate, self.channels, self.frames = sample_rate, channels, frames
+        self.callback, self.on_end = callback, on_end
+        self.stats.block_seconds = frames / sample_rate
+        self._open()
+
+    def _open(self):
+        pass
+
+    def start(self):
+        self.stats.started()
+        self._start()
+
+    def _start(self):
+        pass
+
+    def stop(self):
+        self._stop()
+        self.stats.stopped()
+
+    def _stop(self):
+        pass
+
+    def close(self):
+        pass
+
+    def _deliver(self, data):
+        """Block an den Client übergeben (Audio-Thread), Fehler beenden den Stream nicht"""
+        captured_at = time.monotonic()
+        started = time.perf_counter()
+        try:
+            self.callback(data, captured_at)
+        except Exception as e:
+            if not self.stats.callback_errors:
+                print(f"⚠ Fehler im Audio-Callback ({self.name}): {e}")
+            self.stats.callback_errors += 1
+            self.last_error = e
+        frames = len(data) // (SAMPLE_WIDTH * self.channels)
+        self.stats.block(frames, self.sample_rate, captured_at, time.perf_counter() - started)
+
+class PyAudioCapture(CaptureBackend):
+    """PortAudio über PyAudio im Callback-Modus"""
+
+    name = 'pyaudio'
+
+    def __init__(self):
+        super().__init__()
+        self._pyaudio = _import('pyaudio')
+        self._audio = self._pyaudio.PyAudio()
+        self._stream = None
+
+    def native_format(self, max_channels=2):
+        info = self._audio.get_default_input_device_info()
+        rate = int(info.get('defaultSampleRate', 16000))
+        channels = max(1, min(int(info.get('maxInputChannels', 1)), max_channels))
+        return rate, channels
+
+    def _open(self):
+        self._stream = self._audio.open(
+            format=self._pyaudio.paInt16,
+            channels=self.channels,
+            rate=self.sample_rate,
+            input=True,
+            frames_per_buffer=self.frames,
+            stream_callback=self._on_audio,
+            start=False
+        )
+
+    def _on_audio(self, in_data, frame_count, time_info, status):
+        if status:
+            self.stats.xruns += 1
+        self._deliver(in_data)
+        return None, self._pyaudio.paContinue
+
+    def _start(self):
+        self._stream.start_stream()
+        self.stats.reported_latency = self._stream.get_input_latency()
+
+    def _stop(self):
+        if self._stream and self._stream.is_active():
+            self._stream.stop_stream()
+
+    def close(self):
+        if self._stream:
+            self._stream.close()
+            self._stream = None
+        if self._audio:
+            self._audio.terminate()
+            self._audio = None
+
+class SounddeviceCapture(CaptureBackend):
+    """PortAudio über sounddevice (RawInputStream, int16)"""
+
+    name = 'sounddevice'
+
+    def __init__(self):
+        super().__init__()
+        self._sd = _import('sounddevice')
+        self._stream = None
+
+    def native_format(self, max_channels=2):
+        info = self._sd.query_devices(kind='input')
+        rate = int(info.get('default_samplerate', 16000))
+        channels = max(1, min(int(info.get('max_input_channels', 1)), max_channels))
+        return rate, channels
+
+    def _open(self):
+        self._stream = self._sd.RawInputStream(
+            samplerate=self.sample_rate,
+            channels=self.channels,
+            dtype='int16',
+            blocksize=self.frames,
+            callback=self._on_audio
+        )
+
+    def _on_audio(self, indata, frames, time_info, status):
+        if status:
+            self.stats.xruns += 1
+        # indata ist nur während des Callbacks gültig
+        self._deliver(bytes(indata))
+
+    def _start(self):
+        self._stream.start()
+        self.stats.reported_latency = self._stream.latency
+
+    def _stop(self):
+        if self._stream and self._stream.active:
+            self._stream.stop()
+
+    def close(self):
+        if self._stream:
+            self._stream.close()
+            self._stream = None
+
+class _PacedCapture(CaptureBackend):
+    """Quelle ohne Hardware: eigener Thread liefert Blöcke im Echtzeit-Takt (oder ungebremst)"""
+
+    def __init__(self, realtime=True, duration=None):
+        super().__init__()
+        self.realtime = realtime
+        self.duration = duration  # Sekunden Audio, danach endet die Quelle (None = unbegrenzt)
+        self._running = False
+        self._thread = None
+
+    def _blocks(self):
+        raise NotImplementedError
+
+    def _start(self):
+        if not self.realtime:
+            # Ungebremst gibt es keinen Soll-Takt (kein Jitter)
+            self.stats.block_seconds = 0.0
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=f"audio-{self.name}", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        block_seconds = self.frames / self.sample_rate
+        limit = max(1, round(self.duration / block_seconds)) if self.duration is not None else None
+        next_at = time.monotonic()
+        delivered = 0
+        for block in self._blocks():
+            if self.realtime:
+                # Wie ein Gerät: der Block ist erst am Ende seiner Dauer vollständig
+                next_at += block_seconds
+                delay = next_at - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            if not self._running:
+                return
+            self._deliver(block)
+            delivered += 1
+            if limit is not None and delivered >= limit:
+                break
+        self._running = False
+        self.stats.stopped()
+        if self.on_end:
+            self.on_end()
+
+    def _stop(self):
+        self._running = False
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+
+class FileCapture(_PacedCapture):
+    """WAV/Raw-Datei als Mikrofon (16-bit PCM), optional in Schleife"""
+
+    name = 'file'
+
+    def __init__(self, path, realtime=True, duration=None, loop=False, raw_rate=16000, raw_channels=1):
+        super().__init__(realtime, duration)
+        if not path:
+            raise AudioBackendError("file-Backend benötigt eine Datei (AUDIO_FILE / --audio-file)")
+        try:
+            self.pcm, self.file_rate, self.file_channels, self.fixed_format = read_audio_file(path, raw_rate, raw_channels)
+        except OSError as e:
+            raise AudioBackendError(f"Audio-Datei nicht lesbar: {e}") from None
+        self.path = path
+        self.loop = loop
+        self._file_blocks = []
+
+    def native_format(self):
+        return self.file_rate, self.file_channels
+
+    def _open(self):
+        if self.fixed_format and (self.sample_rate, self.channels) != (self.file_rate, self.file_channels):
+            raise AudioBackendError(f"{self.path}: {self.file_rate} Hz / {self.file_channels} Kanal/Kanäle, "
+                                    f"angefordert {self.sample_rate} Hz / {self.channels}")
+        # Einmal vorab zerteilen - der Capture-Thread reicht nur noch fertige Blöcke weiter
+        self._file_blocks = split_blocks(self.pcm, self.frames * self.channels * SAMPLE_WIDTH)
+
+    def _blocks(self):
+        while True:
+            yield from self._file_blocks
+            if not self.loop or not self._file_blocks:
+                return
+
+class NullCapture(_PacedCapture):
+    """Stille als Quelle (Benchmarks, Pipeline ohne Audio-Hardware)"""
+
+    name = 'null'
+
+    def _blocks(self):
+        block = bytes(self.frames * self.channels * SAMPLE_WIDTH)
+        while True:
+            yield block
+
+def open_capture(name=DEFAULT_BACKEND, path=DEFAULT_FILE, realtime=True, duration=None, loop=False):
+    """
+    Legt ein Capture-Backend an (importiert die Bibliothek erst jetzt)
+
+    Raises:
+        AudioBackendError: Backend unbekannt, nicht installiert oder ohne Datei
+    """
+    if name == 'pyaudio':
+        return PyAudioCapture()
+    if name == 'sounddevice':
+        return SounddeviceCapture()
+    if name == 'file':
+        return FileCapture(path, realtime=realtime, duration=duration, loop=loop)
+    if name == 'null':
+        return NullCapture(realtime=realtime, duration=duration)
+    raise AudioBackendError(f"Unbekanntes Audio-Backend '{name}' (erlaubt: {', '.join(BACKENDS)})")
+
+# ======================================
+# Wiedergabe
+# ======================================
+
+class PlaybackBackend:
+    """Basis: play() ist nicht blockierend, busy() meldet laufende Wiedergabe"""
+
+    name = None
+    device_clock = False  # True: Geräte-Callback zieht Blöcke im festen Takt (Jitter messbar)
+
+    def __init__(self):
+        self.stats = IOStats(self.name, 'playback')
+        self.sample_rate = None
+        self.channels = None
+        self.frames = None
+        self._playing_until = 0.0  # Ende der Wiedergabe im Echtzeit-Takt (file/null)
+
+    def open(self, sample_rate, channels=1, frames=None):
+        """frames: Frames pro Geräte-Block (Standard 20 ms)"""
+        self.sample_rate, self.channels = sample_rate, channels
+        self.frames = frames or sample_rate // 50
+        if self.device_clock:
+            self.stats.block_seconds = self.frames / sample_rate
+        self._open()
+
+    def _open(self):
+        pass
+
+    def start(self):
+        self.stats.started()
+        self._start()
+
+    def _start(self):
+        pass
+
+    def play(self, data):
+        """
+        Reiht PCM-Daten zur Wiedergabe ein
+
+        Returns:
+            Voraussichtlicher Start der Wiedergabe (time.monotonic(), z.B. für die AEC-Referenz)
+        """
+        raise NotImplementedError
+
+    def busy(self):
+        """True, solange noch Audio abgespielt wird"""
+        return time.monotonic() < self._playing_until
+
+    def _advance(self, nbytes):
+        """Wiedergabe-Dauer ohne Gerät nachbilden (für busy() und Underrun-Erkennung)"""
+        now = time.monotonic()
+        frames = nbytes // (SAMPLE_WIDTH * self.channels)
+        start = max(self._playing_until, now)
+        self._playing_until = start + frames / self.sample_rate
+        self.stats.latencies.append(start - now)
+        self.stats.block(frames, self.sample_rate, now)
+        return start
+
+    def stop(self):
+        self._stop()
+        self.stats.stopped()
+
+    def _stop(self):
+        pass
+
+    def close(self):
+        pass
+
+class _FifoPlayback(PlaybackBackend):
+    """Gemeinsamer FIFO für Geräte-Backends: play() hängt an, der Geräte-Callback zieht Blöcke"""
+
+    device_clock = True
+
+    def __init__(self):
+        super().__init__()
+        self._fifo = bytearray()
+        self._lock = threading.Lock()
+        self._queued = 0        # Insgesamt angehängte Bytes
+        self._consumed = 0      # Insgesamt an das Gerät übergebene Bytes
+        self._pending = deque()  # (Byte-Offset, play()-Zeitpunkt) für die Latenz-Messung
+
+    def play(self, data):
+        now = time.monotonic()
+        with self._lock:
+            buffered = len(self._fifo)
+            self._pending.append((self._queued, now))
+            self._fifo += data
+            self._queued += len(data)
+        return now + buffered / (self.sample_rate * self.channels * SAMPLE_WIDTH)
+
+    def busy(self):
+        with self._lock:
+            return bool(self._fifo)
+
+    def _pull(self, nbytes):
+        """Geräte-Callback: nächster Block, fehlende Bytes als Stille"""
+        now = time.monotonic()
+        with self._lock:
+            block = bytes(self._fifo[:nbytes])
+            del self._fifo[:nbytes]
+            end = self._consumed + len(block)
+            while self._pending and self._pending[0][0] < end:
+                self.stats.latencies.append(now - self._pending.popleft()[1])
+            self._consumed = end
+        self.stats.block(nbytes // (SAMPLE_WIDTH * self.channels), self.sample_rate, now)
+        if len(block) < nbytes:
+            block += bytes(nbytes - len(block))
+        return block
+
+class PyAudioPlayback(_FifoPlayback):
+    """Lautsprecher über PyAudio im Callback-Modus"""
+
+    name = 'pyaudio'
+
+    def __init__(self):
+        super().__init__()
+        self._pyaudio = _import('pyaudio')
+        self._audio = self._pyaudio.PyAudio()
+        self._stream = None
+
+    def _open(self):
+        self._stream = self._audio.open(
+            format=self._pyaudio.paInt16,
+            channels=self.channels,
+            rate=self.sample_rate,
+            output=True,
+            frames_per_buffer=self.frames,
+            stream_callback=self._on_audio,
+            start=False
+        )
+
+    def _on_audio(self, in_data, frame_count, time_info, status):
+        if status:
+            self.stats.xruns += 1
+        return self._pull(frame_count * self.channels * SAMPLE_WIDTH), self._pyaudio.paContinue
+
+    def _start(self):
+        self._stream.start_stream()
+        self.stats.reported_latency = self._stream.get_output_latency()
+
+    def _stop(self):
+        if self._stream and self._stream.is_active():
+            self._stream.stop_stream()
+
+    def close(self):
+        if self._stream:
+            self._stream.close()
+            self._stream = None
+        if self._audio:
+            self._audio.terminate()
+            self._audio = None
+
+class SounddevicePlayback(_FifoPlayback):
+    """Lautsprecher über sounddevice (RawOutputStream, int16)"""
+
+    name = 'sounddevice'
+
+    def __init__(self):
+        super().__init__()
+        self._sd = _import('sounddevice')
+        self._stream = None
+
+    def _open(self):
+        self._stream = self._sd.RawOutputStream(
+            samplerate=self.sample_rate,
+            channels=self.channels,
+            dtype='int16',
+            blocksize=self.frames,
+            callback=self._on_audio
+        )
+
+    def _on_audio(self, outdata, frames, time_info, status):
+        if status:
+            self.stats.xruns += 1
+        outdata[:] = self._pull(len(outdata))
+
+    def _start(self):
+        self._stream.start()
+        self.stats.reported_latency = self._stream.latency
+
+    def _stop(self):
+        if self._stream and self._stream.active:
+            self._stream.stop()
+
+    def close(self):
+        if self._stream:
+            self._stream.close()
+            self._stream = None
+
+class FilePlayback(PlaybackBackend):
+    """Wiedergabe in eine WAV/Raw-Datei (CI: was der Lautsprecher gespielt hätte)"""
+
+    name = 'file'
+
+    def __init__(self, path):
+        super().__init__()
+        if not path:
+            raise AudioBackendError("file-Wiedergabe benötigt eine Zieldatei (AUDIO_OUTPUT_FILE)")
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _open(self):
+        if self.path.lower().endswith('.wav'):
+            self._file = wave.open(self.path, 'wb')
+            self._file.setnchannels(self.channels)
+            self._file.setsampwidth(SAMPLE_WIDTH)
+            self._file.setframerate(self.sample_rate)
+        else:
+            self._file = open(self.path, 'wb')
+
+    def play(self, data):
+        with self._lock:
+            if isinstance(self._file, wave.Wave_write):
+                self._file.writeframes(data)
+            else:
+                self._file.write(data)
+            return self._advance(len(data))
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+class NullPlayback(PlaybackBackend):
+    """Verwirft die Wiedergabe, bildet aber die Abspieldauer nach"""
+
+    name = 'null'
+
+    def play(self, data):
+        return self._advance(len(data))
+
+def open_playback(name, path=DEFAULT_OUTPUT_FILE):
+    """
+    Legt ein Wiedergabe-Backend an (importiert die Bibliothek erst jetzt)
+
+    Raises:
+        AudioBackendError: Backend unbekannt, nicht installiert oder ohne Datei
+    """
+    if name == 'pyaudio':
+        return PyAudioPlayback()
+    if name == 'sounddevice':
+        return SounddevicePlayback()
+    if name == 'file':
+        return FilePlayback(path)
+    if name == 'null':
+        return NullPlayback()
+    raise AudioBackendError(f"Unbekanntes Audio-Backend '{name}' (erlaubt: {', '.join(BACKENDS)})")
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Native-Rate-Capture: Downmix + Polyphasen-Resampling auf 16 kHz
+===============================================================
+Viele USB- und Onboard-Mikrofone laufen nativ mit 44.1/48 kHz und Stereo.
+Statt PortAudio zu 16 kHz Mono zu zwingen (langsames Treiber-Resampling oder
+Fehler beim Öffnen), wird das Gerät mit seiner nativen Rate geöffnet und
+im Capture-Thread vektorisiert (NumPy) heruntergerechnet.
+
+- Streaming-fähig: Filterzustand bleibt zwischen Chunks erhalten
+- Rationales Verhältnis L/M (z.B. 48000 → 16000 = 1/3, 44100 → 16000 = 160/441)
+- FIR-Tiefpass (Kaiser-gefensterter Sinc), als Polyphasen-Bank zerlegt
+- Misst die CPU-Zeit pro Sekunde Audio
+
+Verwendung:
+    from audio_resample import CaptureConverter
+
+    converter = CaptureConverter(in_rate=48000, in_channels=2, out_rate=16000)
+    pcm16k = converter.process(data)          # bytes (int16, interleaved) → bytes (int16, mono)
+    converter.process_into(data, buffer)      # oder direkt in einen PooledBuffer (audio_buffers.py)
+    print(converter.cpu_ms_per_audio_second)
+"""
+
+import time
+from math import gcd
+
+import numpy as np
+
+class PolyphaseResampler:
+    """Streaming-Resampler mit rationalem Faktor out_rate/in_rate"""
+
+    def __init__(self, in_rate, out_rate, taps_per_phase=24, beta=8.0):
+        divisor = gcd(int(in_rate), int(out_rate))
+        self.up = int(out_rate) // divisor      # L
+        self.down = int(in_rate) // divisor     # M
+        # Taps pro Phase mit dem Dezimationsfaktor skalieren (gleiche Flankensteilheit)
+        self.taps = taps_per_phase * max(1, -(-self.down // self.up))   # K
+
+        # Prototyp-Tiefpass auf der hochgetasteten Rate (L * in_rate)
+        length = self.up * self.taps
+        cutoff = 0.5 / max(self.up, self.down) * 0.9
+        t = np.arange(length) - (length - 1) / 2
+        prototype = 2 * cutoff * np.sinc(2 * cutoff * t) * np.kaiser(length, beta)
+        prototype *= self.up / prototype.sum()  # Verstärkung L kompensiert das Zero-Stuffing
+
+        # Polyphasen-Zerlegung: bank[p, k] = h[p + k*L]
+        self.bank = prototype.reshape(self.taps, self.up).T.astype(np.float32).copy()
+
+        # Zustand: letzte K-1 Eingangssamples und absolute Positionen
+        self._history = np.zeros(self.taps - 1, dtype=np.float32)
+        self._history_start = -(self.taps - 1)  # Absoluter Index des ersten History-Samples
+        self._next_out = 0                      # Absoluter Index des nächsten Ausgangssamples
+        self._total_in = 0                      # Bisher empfangene Eingangssamples
+
+    def process(self, samples):
+        """
+        Resampelt einen Block (float32, mono)
+
+        Returns:
+            np.ndarray (float32) mit allen Ausgangssamples, die mit den bisherigen
+            Eingangsdaten vollständig berechenbar sind
+        """
+        buffer = np.concatenate((self._history, samples))
+        self._total_in += len(samples)
+
+        # Alle Ausgangssamples n mit floor(n*M/L) < total_in
+        last_out = (self._total_in * self.up - 1) // self.down
+        count = last_out - self._next_out + 1
+        if count <= 0:
+            output = np.zeros(0, dtype=np.float32)
+        else:
+            n = np.arange(self._next_out, self._next_out + count, dtype=np.int64)
+            positions = n * self.down
+            base = positions // self.up - self._history_start     # Lokaler Index im Buffer
+            phases = positions % self.up
+            # Fenster x[base], x[base-1], ... x[base-K+1] für alle n auf einmal
+            window = buffer[base[:, None] - np.arange(self.taps)[None, :]]
+            output = np.einsum('nk,nk->n', window, self.bank[phases])
+            self._next_out += count
+
+        # History für den nächsten Block (K-1 letzte Samples)
+        self._history = buffer[-(self.taps - 1):].copy()
+        self._history_start = self._total_in - (self.taps - 1)
+        return output
+
+class CaptureConverter:
+    """Downmix (N Kanäle → Mono) + Resampling int16 → int16 inkl. CPU-Messung"""
+
+    def __init__(self, in_rate, in_channels, out_rate):
+        self.in_rate = int(in_rate)
+        self.in_channels = int(in_channels)
+        self.out_rate = int(out_rate)
+        self.passthrough = self.in_rate == self.out_rate
+        self.resampler = None if self.passthrough else PolyphaseResampler(self.in_rate, self.out_rate)
+        self.cpu_seconds = 0.0
+        self.audio_seconds = 0.0
+
+    def _convert(self, data):
+        """Downmix + Resampling, liefert float32-Samples (gerundet, auf int16-Bereich begrenzt)"""
+        frames = np.frombuffer(data, dtype=np.int16)
+        if self.in_channels > 1:
+            mono = frames.reshape(-1, self.in_channels).mean(axis=1, dtype=np.float32)
+        else:
+            mono = frames.astype(np.float32)
+
+        if self.passthrough:
+            output = mono
+        else:
+            output = self.resampler.process(mono)
+        np.rint(output, out=output)
+        np.clip(output, -32768, 32767, out=output)
+        self.audio_seconds += len(mono) / self.in_rate
+        return output
+
+    def process(self, data):
+        """Wandelt einen PortAudio-Block (bytes, int16 interleaved) in 16-bit Mono bei out_rate"""
+        start = time.thread_time()
+        result = self._convert(data).astype(np.int16).tobytes()
+        self.cpu_seconds += time.thread_time() - start
+        return result
+
+    def process_into(self, data, buffer):
+        """
+        Wie process(), schreibt das Ergebnis aber direkt in einen PooledBuffer
+        (audio_buffers.py) - keine Zwischen-Allokation für bytes
+        """
+        start = time.thread_time()
+        output = self._convert(data)
+        target = np.frombuffer(buffer.slab, dtype=np.int16, count=len(output))
+        target[:] = output
+        buffer.length = target.nbytes
+        self.cpu_seconds += time.thread_time() - start
+        return buffer
+
+    def max_output_bytes(self, in_frames):
+        """Obergrenze der Ausgabegröße für einen Block mit in_frames Frames (für Slab-Größe)"""
+        return (in_frames * self.out_rate // self.in_rate + 2) * 2
+
+    @property
+    def cpu_ms_per_audio_second(self):
+        """CPU-Kosten in Millisekunden pro Sekunde Audio"""
+        if self.audio_seconds <= 0:
+            return 0.0
+        return self.cpu_seconds * 1000 / self.audio_seconds
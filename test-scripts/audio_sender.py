@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Backpressure-bewusster Audio-Sender
+===================================
+Sendet die Audio-Chunks aus der Capture-Queue und beobachtet dabei den
+Schreibpuffer des Transports sowie das Alter der Chunks in der Queue.
+Bei Überlast greift eine konfigurierbare Policy, damit Live-Sprache live bleibt:
+
+- block:       alles senden, Sender wartet auf den Transport (bisheriges Verhalten)
+- drop_oldest: Chunks älter als max_queue_age bzw. bei vollem Schreibpuffer
+               verwerfen - der neueste Chunk wird immer gesendet
+- coalesce:    aufgestaute Chunks zu größeren Frames zusammenfassen
+               (weniger Frames/Overhead), nur zu alte Chunks verwerfen
+
+Queue-Einträge werden mit time.monotonic() beim Capture gestempelt.
+
+Verwendung:
+    from audio_sender import BackpressureSender
+
+    sender = BackpressureSender(policy="drop_oldest", max_queue_age=0.5, metrics=metrics)
+    await sender.send(websocket, [(payload, captured_at), ...])
+"""
+
+import time
+
+from audio_buffers import payload_view, release_payload
+
+SEND_POLICIES = ('block', 'drop_oldest', 'coalesce')
+
+def transport_write_buffer_size(websocket):
+    """Aktuelle Größe des Schreibpuffers (Bytes) oder 0 wenn nicht ermittelbar"""
+    transport = getattr(websocket, 'transport', None)
+    if transport is None:
+        return 0
+    try:
+        return transport.get_write_buffer_size()
+    except (AttributeError, NotImplementedError):
+        return 0
+
+class BackpressureSender:
+    """Sendet Audio-Chunks unter Berücksichtigung von Queue-Alter und Schreibpuffer"""
+
+    def __init__(self, policy='block', max_queue_age=1.0, write_buffer_limit=64 * 1024,
+                 max_coalesce_bytes=64 * 1024, metrics=None):
+        if policy not in SEND_POLICIES:
+            raise ValueError(f"Unbekannte Send-Policy '{policy}' (erlaubt: {', '.join(SEND_POLICIES)})")
+        self.policy = policy
+        self.max_queue_age = max_queue_age
+        self.write_buffer_limit = write_buffer_limit
+        self.max_coalesce_bytes = max_coalesce_bytes
+
+        # Statistik (auch ohne MetricsRegistry verfügbar)
+        self.chunks_sent = 0
+        self.frames_sent = 0
+        self.chunks_dropped = 0
+        self.chunks_coalesced = 0
+        self.max_age_seen = 0.0
+
+        self._age_histogram = None
+        self._dropped_counter = None
+        self._coalesced_counter = None
+        self._write_buffer_gauge = None
+        if metrics is not None:
+            self._age_histogram = metrics.histogram("send_queue_age_seconds", "Alter der Audio-Chunks beim Senden")
+            self._dropped_counter = metrics.counter("audio_chunks_dropped_total", "Wegen Überlast verworfene Audio-Chunks")
+            self._coalesced_counter = metrics.counter("audio_chunks_coalesced_total", "Zu größeren Frames zusammengefasste Audio-Chunks")
+            self._write_buffer_gauge = metrics.gauge("transport_write_buffer_bytes", "Schreibpuffer des WebSocket-Transports")
+
+    def _drop(self, chunk, reason):
+        release_payload(chunk[0])
+        self.chunks_dropped += 1
+        if self._dropped_counter:
+            self._dropped_counter.inc(reason=reason)
+
+    def _apply_drop_policy(self, websocket, chunks):
+        """Verwirft zu alte Chunks (drop_oldest: bei vollem Schreibpuffer alle bis auf den neuesten)"""
+        now = time.monotonic()
+        kept = []
+        for chunk in chunks[:-1]:
+            if now - chunk[1] > self.max_queue_age:
+                self._drop(chunk, 'age')
+            else:
+                kept.append(chunk)
+        kept.append(chunks[-1])
+
+        if (self.policy == 'drop_oldest' and len(kept) > 1
+                and transport_write_buffer_size(websocket) > self.write_buffer_limit):
+            for chunk in kept[:-1]:
+                self._drop(chunk, 'write_buffer')
+            kept = kept[-1:]
+        return kept
+
+    def _coalesce(self, chunks):
+        """Fasst Chunks zu Frames bis max_coalesce_bytes zusammen → [(payload, captured_at, count)]"""
+        frames = []
+        group = []
+        group_bytes = 0
+        for chunk in chunks:
+            size = len(chunk[0])
+            if group and group_bytes + size > self.max_coalesce_bytes:
+                frames.append(self._join(group))
+                group, group_bytes = [], 0
+            group.append(chunk)
+            group_bytes += size
+        if group:
+            frames.append(self._join(group))
+        return frames
+
+    def _join(self, group):
+        if len(group) == 1:
+            return group[0][0], group[0][1], 1
+        payload = b''.join(payload_view(chunk[0]) for chunk in group)
+        for chunk in group:
+            release_payload(chunk[0])
+        self.chunks_coalesced += len(group)
+        if self._coalesced_counter:
+            self._coalesced_counter.inc(len(group))
+        # Alter des Frames = Alter des ältesten enthaltenen Chunks
+        return payload, group[0][1], len(group)
+
+    async def send(self, websocket, chunks):
+        """
+        Sendet eine Liste von (payload, captured_at) gemäß Policy
+
+        Returns:
+            Anzahl der gesendeten Bytes
+        """
+        if not chunks:
+            return 0
+
+        if self._write_buffer_gauge:
+            self._write_buffer_gauge.set(transport_write_buffer_size(websocket))
+
+        if self.policy in ('drop_oldest', 'coalesce'):
+            chunks = self._apply_drop_policy(websocket, chunks)
+
+        if self.policy == 'coalesce' and len(chunks) > 1:
+            frames = self._coalesce(chunks)
+        else:
+            frames = [(payload, captured_at, 1) for payload, captured_at in chunks]
+
+        sent_bytes = 0
+        last_index = len(frames) - 1
+        for index, (payload, captured_at, count) in enumerate(frames):
+            age = time.monotonic() - captured_at
+            # Während vorheriger Sends gealtert? (der letzte Frame wird immer gesendet)
+            if self.policy != 'block' and index < last_index and age > self.max_queue_age:
+                release_payload(payload)
+                self.chunks_dropped += count
+                if self._dropped_counter:
+                    self._dropped_counter.inc(count, reason='age')
+                continue
+            self.max_age_seen = max(self.max_age_seen, age)
+            if self._age_histogram:
+                self._age_histogram.observe(age)
+            try:
+                await websocket.send(payload_view(payload))
+            except BaseException:
+                # Nicht gesendete Slabs trotzdem zurückgeben
+                for rest in frames[index:]:
+                    release_payload(rest[0])
+                raise
+            release_payload(payload)
+            sent_bytes += len(payload)
+            self.chunks_sent += count
+            self.frames_sent += 1
+        return sent_bytes
+
+    def summary(self):
+        """Kurzbericht für die Konsole"""
+        return (f"Policy {self.policy}: {self.chunks_sent} Chunks in {self.frames_sent} Frames gesendet, "
+                f"{self.chunks_dropped} verworfen, {self.chunks_coalesced} zusammengefasst, "
+                f"max. Queue-Alter {self.max_age_seen * 1000:.0f} ms")
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Client-Metriken im Prometheus-Textformat
+========================================
+Kleine, abhängigkeitsfreie Metrik-Sammlung für die Python-Test-Clients
+(device-client.py, device-signal.py, ...).
+
+- Counter, Gauge und Histogram (thread-safe, auch aus Audio-Threads nutzbar)
+- Optionaler eingebetteter HTTP-Endpoint (GET /metrics, text exposition format)
+- Messung der Event-Loop-Verzögerung (Lag)
+
+Verwendung:
+    from client_metrics import MetricsRegistry, serve_metrics, monitor_event_loop_lag
+
+    metrics = MetricsRegistry(prefix="device", labels={"device": DEVICE_NAME})
+    chunks_sent = metrics.counter("audio_chunks_sent_total", "Gesendete Audio-Chunks")
+    chunks_sent.inc()
+
+    await serve_metrics(metrics, port=9101)   # http://localhost:9101/metrics
+"""
+
+import asyncio
+import threading
+import time
+
+# Standard-Buckets für Latenzen in Sekunden (1ms bis 10s)
+DEFAULT_LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+def _format_labels(labels):
+    """Formatiert ein Label-Dict als {key="value",...}"""
+    if not labels:
+        return ''
+    parts = []
+    for key, value in labels.items():
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{key}="{escaped}"')
+    return '{' + ','.join(parts) + '}'
+
+def _format_value(value):
+    """Formatiert Zahlen wie Prometheus (Integer ohne Nachkommastellen)"""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+class _Metric:
+    """Basisklasse: Name, Hilfe-Text und Labels je Zeitreihe"""
+
+    metric_type = 'untyped'
+
+    def __init__(self, name, help_text, const_labels):
+        self.name = name
+        self.help_text = help_text
+        self.const_labels = const_labels
+        self._lock = threading.Lock()
+
+    def _labels(self, labels):
+        if not labels:
+            return self.const_labels
+        merged = dict(self.const_labels)
+        merged.update(labels)
+        return merged
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.metric_type}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self):
+        return []
+
+class Counter(_Metric):
+    """Monoton steigender Zähler (optional mit Labels)"""
+
+    metric_type = 'counter'
+
+    def __init__(self, name, help_text, const_labels):
+        super().__init__(name, help_text, const_labels)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(sorted(labels.items())), 0)
+
+    def _samples(self):
+        with self._lock:
+            items = list(self._values.items()) or [((), 0)]
+        return [f"{self.name}{_format_labels(self._labels(dict(key)))} {_format_value(value)}"
+                for key, value in items]
+
+class Gauge(_Metric):
+    """Momentanwert - gesetzt oder beim Abruf über eine Funktion ermittelt"""
+
+    metric_type = 'gauge'
+
+    def __init__(self, name, help_text, const_labels, func=None):
+        super().__init__(name, help_text, const_labels)
+        self._value = 0
+        self._func = func
+
+    def set(self, value):
+        with self._lock:
+            self._value = value
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount=1):
+        with self._lock:
+            self._value -= amount
+
+    def value(self):
+        if self._func:
+            try:
+                return self._func()
+            except Exception:
+                return float('nan')
+        return self._value
+
+    def _samples(self):
+        return [f"{self.name}{_format_labels(self.const_labels)} {_format_value(self.value())}"]
+
+class Histogram(_Metric):
+    """Histogramm mit festen Buckets (kumulativ, wie Prometheus)"""
+
+    metric_type = 'histogram'
+
+    def __init__(self, name, help_text, const_labels, buckets=DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, help_text, const_labels)
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * len(self.buckets)
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, value):
+        with self._lock:
+            self._sum += value
+            self._count += 1
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self._counts[index] += 1
+                    break
+
+    def time(self):
+        """Kontextmanager: misst die Dauer des Blocks"""
+        return _Timer(self)
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def sum(self):
+        return self._sum
+
+    def _samples(self):
+        with self._lock:
+            counts = list(self._counts)
+            total_sum, total_count = self._sum, self._count
+        samples = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            labels = self._labels({'le': _format_value(float(bound))})
+            samples.append(f"{self.name}_bucket{_format_labels(labels)} {cumulative}")
+        samples.append(f"{self.name}_bucket{_format_labels(self._labels({'le': '+Inf'}))} {total_count}")
+        samples.append(f"{self.name}_sum{_format_labels(self.const_labels)} {_format_value(total_sum)}")
+        samples.append(f"{self.name}_count{_format_labels(self.const_labels)} {total_count}")
+        return samples
+
+class _Timer:
+    """Hilfsklasse für Histogram.time()"""
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+class MetricsRegistry:
+    """Sammlung aller Metriken eines Clients"""
+
+    def __init__(self, prefix='', labels=None):
+        self.prefix = f"{prefix}_" if prefix else ''
+        self.labels = dict(labels or {})
+        self._metrics = {}
+
+    def _register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help_text):
+        return self._register(Counter(self.prefix + name, help_text, self.labels))
+
+    def gauge(self, name, help_text, func=None):
+        return self._register(Gauge(self.prefix + name, help_text, self.labels, func))
+
+    def histogram(self, name, help_text, buckets=DEFAULT_LATENCY_BUCKETS):
+        return self._register(Histogram(self.prefix + name, help_text, self.labels, buckets))
+
+    def get(self, name):
+        return self._metrics.get(self.prefix + name)
+
+    def render(self):
+        """Alle Metriken im Prometheus-Textformat"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+async def serve_metrics(registry, port, host='0.0.0.0'):
+    """
+    Startet den HTTP-Endpoint für /metrics im laufenden Event-Loop
+
+    Returns:
+        asyncio.Server (mit server.close() beenden)
+    """
+    async def handle(reader, writer):
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+            # Header überspringen
+            while True:
+                line = await asyncio.wait_for(reader.readline(), timeout=5)
+                if line in (b'\r\n', b'\n', b''):
+                    break
+
+            parts = request_line.decode('latin-1').split()
+            path = parts[1] if len(parts) > 1 else '/'
+            if path.split('?')[0] in ('/metrics', '/'):
+                body = registry.render().encode('utf-8')
+                status = '200 OK'
+                content_type = 'text/plain; version=0.0.4; charset=utf-8'
+            else:
+                body = b'Not Found\n'
+                status = '404 Not Found'
+                content_type = 'text/plain'
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode('latin-1') + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+async def monitor_event_loop_lag(registry, interval=0.5):
+    """
+    Misst periodisch, wie viel später der Event-Loop aufwacht als geplant
+    Registriert event_loop_lag_seconds (Gauge, letzter Wert) und
+    event_loop_lag_histogram_seconds (Histogramm).
+    """
+    lag_gauge = registry.gauge('event_loop_lag_seconds', 'Letzte gemessene Event-Loop-Verzögerung')
+    lag_histogram = registry.histogram('event_loop_lag_histogram_seconds', 'Verteilung der Event-Loop-Verzögerung')
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lag = max(0.0, time.perf_counter() - start - interval)
+        lag_gauge.set(lag)
+        lag_histogram.observe(lag)
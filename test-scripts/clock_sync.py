@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Uhren-Abgleich mit dem WebSocket-Gateway
+========================================
+Monotone, hochauflösende Zeitstempel für USO-Header plus NTP-artiger
+Offset-Abgleich mit dem Gateway, damit Latenzen über Host-Grenzen hinweg
+vergleichbar sind.
+
+- Lokale Zeit: einmalig an die Wall-Clock verankert, danach nur noch
+  time.perf_counter() (monoton, keine Sprünge durch NTP)
+- Abgleich: mehrere time_sync-Pings, Auswahl der Probe mit minimaler RTT
+- Header erhalten 'sentAt' (Epoch-MS mit Nachkommastellen, auf Gateway-Uhr korrigiert)
+- Andere Nachrichten, die während des Abgleichs eintreffen (z.B. ein USO-Header),
+  werden gepuffert und von receive() vor dem WebSocket geliefert
+
+Protokoll:
+    Client → Gateway: {"type": "time_sync", "t1": <Client-Sendezeit>}
+    Gateway → Client: {"type": "time_sync_reply", "t1": ..., "t2": <Empfang>, "t3": <Antwort>}
+
+    offset = ((t2 - t1) + (t3 - t4)) / 2
+    rtt    = (t4 - t1) - (t3 - t2)
+
+Verwendung:
+    from clock_sync import ClockSync
+
+    clock = ClockSync()
+    await clock.sync(websocket)        # nach der Willkommensnachricht
+    async for message in clock.receive(websocket):   # statt: async for message in websocket
+        ...
+    header = clock.stamp({...})        # setzt timestamp + sentAt
+    latency = clock.latency_ms(header['sentAt'])   # bei empfangenen Headern
+"""
+
+import asyncio
+import json
+import time
+
+class ClockSync:
+    """Monotone Uhr mit geschätztem Offset zur Gateway-Uhr"""
+
+    def __init__(self):
+        # Einmalige Verankerung: ab hier nur noch monotone Uhr
+        self._base_ms = time.time() * 1000 - time.perf_counter() * 1000
+        self.offset_ms = 0.0
+        self.rtt_ms = None
+        self.synced = False
+        self._pending = {}  # WebSocket -> während sync() empfangene andere Nachrichten
+
+    def local_ms(self):
+        """Lokale monotone Zeit in Epoch-MS (mit Nachkommastellen)"""
+        return self._base_ms + time.perf_counter() * 1000
+
+    def now_ms(self):
+        """Geschätzte Gateway-Zeit in Epoch-MS (mit Nachkommastellen)"""
+        return self.local_ms() + self.offset_ms
+
+    def stamp(self, header):
+        """Setzt timestamp (ganzzahlig, wie bisher) und sentAt (hochauflösend) im Header"""
+        now = self.now_ms()
+        header['timestamp'] = int(now)
+        header['sentAt'] = round(now, 3)
+        return header
+
+    def latency_ms(self, sent_at):
+        """One-Way-Latenz zu einem Zeitstempel der Gegenseite (Gateway-Uhr)"""
+        return self.now_ms() - sent_at
+
+    async def sync(self, websocket, samples=8, timeout=1.0):
+        """
+        Führt den Offset-Abgleich durch (vor dem Start der Empfangs-Tasks aufrufen)
+
+        Args:
+            websocket: Verbundener WebSocket zum Gateway
+            samples: Anzahl Ping-Proben
+            timeout: Max. Wartezeit pro Probe in Sekunden
+
+        Returns:
+            True wenn mindestens eine Probe beantwortet wurde
+        """
+        best = None
+        for _ in range(samples):
+            t1 = self.local_ms()
+            await websocket.send(json.dumps({"type": "time_sync", "t1": t1}))
+            reply = await self._wait_for_reply(websocket, t1, timeout, self._pending.setdefault(websocket, []))
+            t4 = self.local_ms()
+            if reply is None:
+                # Gateway unterstützt time_sync nicht (oder zu langsam) - abbrechen
+                break
+
+            t2, t3 = reply['t2'], reply['t3']
+            rtt = (t4 - t1) - (t3 - t2)
+            offset = ((t2 - t1) + (t3 - t4)) / 2
+            if best is None or rtt < best[0]:
+                best = (rtt, offset)
+
+        if not self._pending.get(websocket):
+            self._pending.pop(websocket, None)
+
+        if best is None:
+            return False
+
+        self.rtt_ms, self.offset_ms = best
+        self.synced = True
+        return True
+
+    async def receive(self, websocket):
+        """Nachrichten vom WebSocket, zuerst die während sync() gepufferten"""
+        for message in self._pending.pop(websocket, []):
+            yield message
+        async for message in websocket:
+            yield message
+
+    @staticmethod
+    async def _wait_for_reply(websocket, t1, timeout, pending):
+        """Wartet auf die passende time_sync_reply, andere Nachrichten landen in pending"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            try:
+                message = await asyncio.wait_for(websocket.recv(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return None
+            if isinstance(message, str):
+                try:
+                    data = json.loads(message)
+                except json.JSONDecodeError:
+                    data = None
+                if isinstance(data, dict) and data.get('type') == 'time_sync_reply':
+                    if data.get('t1') == t1:
+                        return data
+                    continue  # Verspätete Antwort auf eine frühere Probe
+            pending.append(message)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Event-getriebene Befehlseingabe für die Device-Clients
+======================================================
+Liefert Eingabezeilen (Tastatur oder Skript) über eine asyncio.Queue, statt
+sie in einer Schleife alle 100 ms abzufragen - ohne Eingabe keine Wake-ups.
+
+Quellen:
+- stdin über loop.add_reader() (POSIX, Terminal oder Pipe)
+- Fallback: Lese-Thread, der thread-safe in die Queue schreibt (z.B. Windows)
+- Befehls-Skript für Headless-Läufe (eine Eingabe pro Zeile)
+
+Skript-Format:
+    # Kommentar
+    sleep 2.5        → 2.5 Sekunden warten
+    t                → wie Eingabe 't' + Enter
+    Hallo Welt       → wie Eingabe 'Hallo Welt' + Enter
+                     → leere Zeile = nur Enter
+    q                → beenden
+
+Verwendung:
+    from command_input import CommandInput
+
+    commands = CommandInput(script_path=os.getenv("COMMAND_SCRIPT"))
+    commands.start()                    # innerhalb des laufenden Event-Loops
+    line = await commands.get()         # None = Eingabe beendet (EOF / Skript-Ende)
+"""
+
+import asyncio
+import os
+import sys
+import threading
+
+class CommandInput:
+    """Befehlsquelle (stdin oder Skript) mit asyncio.Queue"""
+
+    def __init__(self, script_path=None, stream=None):
+        self.script_path = script_path
+        self.stream = stream or sys.stdin
+        self.source = None              # 'reader', 'thread' oder 'script'
+        self.closed = False             # Keine weiteren Eingaben (EOF / Skript-Ende)
+        self.text_input_active = False  # Text-Eingabe-Modus (bleibt über Reconnects erhalten)
+        self._queue = None
+        self._loop = None
+        self._fd = None
+        self._buffer = b''
+        self._script_task = None
+
+    def start(self):
+        """Startet die Eingabequelle (muss im laufenden Event-Loop aufgerufen werden)"""
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+
+        if self.script_path:
+            self.source = 'script'
+            self._script_task = self._loop.create_task(self._run_script())
+            return
+
+        try:
+            fd = self.stream.fileno()
+            self._loop.add_reader(fd, self._on_readable)
+            self._fd = fd
+            self.source = 'reader'
+        except (AttributeError, ValueError, OSError, NotImplementedError):
+            # Kein add_reader möglich (Windows-Loop, reguläre Datei als stdin, ...)
+            self.source = 'thread'
+            threading.Thread(target=self._read_thread, daemon=True).start()
+
+    def stop(self):
+        """Beendet die Eingabequelle"""
+        if self._fd is not None:
+            self._loop.remove_reader(self._fd)
+            self._fd = None
+        if self._script_task:
+            self._script_task.cancel()
+
+    async def get(self):
+        """
+        Wartet auf die nächste Eingabezeile (ohne Polling)
+
+        Returns:
+            Zeile (ohne Zeilenumbruch, getrimmt) oder None wenn die Eingabe beendet ist
+        """
+        if self.closed and self._queue.empty():
+            return None
+        return await self._queue.get()
+
+    def _put(self, line):
+        self._queue.put_nowait(line.strip())
+
+    def _close(self):
+        if not self.closed:
+            self.closed = True
+            # Wartende get()-Aufrufe aufwecken
+            self._queue.put_nowait(None)
+
+    def _on_readable(self):
+        """Callback von add_reader: liest verfügbare Bytes und gibt vollständige Zeilen weiter"""
+        try:
+            data = os.read(self._fd, 4096)
+        except OSError:
+            data = b''
+        if not data:
+            self.stop()
+            if self._buffer:
+                self._put(self._buffer.decode(errors='replace'))
+                self._buffer = b''
+            self._close()
+            return
+
+        self._buffer += data
+        while b'\n' in self._buffer:
+            line, self._buffer = self._buffer.split(b'\n', 1)
+            self._put(line.decode(errors='replace'))
+
+    def _read_thread(self):
+        """Fallback: blockierendes Lesen in einem Thread, Übergabe thread-safe an den Loop"""
+        try:
+            for line in self.stream:
+                self._loop.call_soon_threadsafe(self._put, line)
+        except (OSError, ValueError):
+            pass
+        self._loop.call_soon_threadsafe(self._close)
+
+    async def _run_script(self):
+        """Spielt ein Befehls-Skript ab ('sleep <s>' pausiert, '#' = Kommentar)"""
+        try:
+            with open(self.script_path, encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        except OSError as e:
+            print(f"✗ Befehls-Skript konnte nicht gelesen werden: {e}")
+            self._close()
+            return
+
+        for line in lines:
+            command = line.strip()
+            if command.startswith('#'):
+                continue
+            parts = command.split()
+            if len(parts) == 2 and parts[0].lower() == 'sleep':
+                try:
+                    await asyncio.sleep(float(parts[1]))
+                    continue
+                except ValueError:
+                    pass
+            self._put(command)
+        self._close()
@@ -12,39 +12,48 @@ Dieses Script erstellt ein gerät, das:
 
 Verwendung:
     1. Passe Konfiguration an (DEVICE_NAME, WS_HOST, etc.)
-    2. Installiere Abhängigkeiten: pip install pyaudio websockets
+    2. Installiere Abhängigkeiten: pip install websockets (+ pyaudio oder sounddevice für 'mic', siehe AUDIO_BACKEND)
     3. Stelle sicher, dass client_secret_python-voice-device in der DB gespeichert ist
     4. Führe aus: python3 device-client.py
 """
 
+import math
+import time
+
+# Startup-Profiler so früh wie möglich (misst auch die folgenden Imports)
+from startup_profile import StartupProfiler, parse_budget
+startup = StartupProfiler()
+
 import asyncio
 import websockets
 import json
 import sys
 import threading
 import queue
-import time
-from datetime import datetime
+from collections import deque
 from typing import Optional
 
-# Audio-Bibliotheken
-try:
-    import pyaudio
-except ImportError:
-    print("❌ PyAudio nicht installiert!")
-    print("   Installiere mit: pip install pyaudio")
-    print("   Auf macOS: brew install portaudio && pip install pyaudio")
-    sys.exit(1)
-
 import subprocess
 import tempfile
 import os
 
+from client_metrics import MetricsRegistry, serve_metrics, monitor_event_loop_lag
+from clock_sync import ClockSync
+from device_registry import DeviceRegistry, RegistrationError, device_payload
+from audio_buffers import BufferPool, PooledBuffer, payload_view, release_payload
+from audio_sender import BackpressureSender
+from command_input import CommandInput
+from terminal_renderer import StreamRenderer
+from uso_delta import HeaderDeltaEncoder, HeaderDeltaDecoder
+from event_loop import run_loop, loop_from_argv, loop_name
+# Audio-Backends: PyAudio/sounddevice werden erst beim Öffnen des Mikrofons importiert
+from audio_io import open_capture, open_playback, backend_problem, AudioBackendError
+
 # ======================================
 # KONFIGURATION - HIER ANPASSEN
 # ======================================
-WS_HOST = "esp32.local.chase295.de"
-WS_PORT = 443  # WebSocket Gateway Port
+WS_HOST = os.getenv("WS_HOST", "esp32.local.chase295.de")
+WS_PORT = int(os.getenv("WS_PORT", "443"))  # WebSocket Gateway Port
 WS_PATH = "/ws/external"
 
 # Geräte-Informationen  
@@ -75,7 +84,89 @@ DEVICE_CAPABILITIES = [
 SAMPLE_RATE = 16000    # 16kHz für Vosk STT optimal
 CHANNELS = 1          # Mono
 CHUNK_SIZE = 8000     # Frames pro Buffer
-FORMAT = pyaudio.paInt16  # 16-bit PCM
+# Format: 16-bit PCM
+
+# Audio-Backend für das Mikrofon (siehe audio_io.py): pyaudio | sounddevice | file | null
+#   file = AUDIO_FILE (WAV/Raw, in Schleife) statt Mikrofon (CI, reproduzierbare Tests), null = Stille (Benchmarks)
+AUDIO_BACKEND = os.getenv("AUDIO_BACKEND", "pyaudio")
+AUDIO_FILE = os.getenv("AUDIO_FILE", "")
+# Wiedergabe (Speaker): ffplay = ein ffplay/afplay-Prozess pro Chunk (bisheriges Verhalten)
+#   pyaudio | sounddevice = ein durchgehender Stream, Chunks lückenlos aneinander
+#   file = in AUDIO_OUTPUT_FILE schreiben (WAV/Raw), null = verwerfen (Abspieldauer wird nachgebildet)
+AUDIO_OUTPUT = os.getenv("AUDIO_OUTPUT", "ffplay")
+AUDIO_OUTPUT_FILE = os.getenv("AUDIO_OUTPUT_FILE", "")
+
+# Native-Rate-Capture: Mikrofon mit nativer Rate/Kanalzahl öffnen (z.B. 48 kHz Stereo)
+# und im Capture-Thread auf SAMPLE_RATE Mono umrechnen (benötigt numpy)
+# 0 = PortAudio direkt mit SAMPLE_RATE/CHANNELS öffnen (bisheriges Verhalten)
+# WAV-Dateien (AUDIO_BACKEND=file) mit anderem Format werden immer umgerechnet
+NATIVE_CAPTURE = os.getenv("NATIVE_CAPTURE", "0") == "1"
+
+# Echo-Unterdrückung (Full-Duplex): TTS-Wiedergabe aus dem Mikrofon-Signal entfernen,
+# damit das Gerät während der Wiedergabe live bleibt (Barge-in, benötigt numpy)
+# AEC_DELAY_MS: Verzögerung Wiedergabe-Start → Mikrofon (lieber zu klein als zu groß)
+# AEC_FILTER_MS: Filterlänge (Echo-Ausklang + Unsicherheit der Verzögerung)
+AEC = os.getenv("AEC", "0") == "1"
+AEC_DELAY_MS = float(os.getenv("AEC_DELAY_MS", "100"))
+AEC_FILTER_MS = float(os.getenv("AEC_FILTER_MS", "256"))
+
+# Edge-Gating: Audio erst nach einem Trigger streamen statt per Enter (benötigt numpy)
+#   off     = Session per Enter (bisheriges Verhalten)
+#   energy  = Sprachbeginn öffnet die Session
+#   pattern = Energie-Muster aus 2 kurzen Bursts (z.B. zweisilbiges Wake-Word, Doppel-Klopfen)
+# Die Session schließt nach GATE_HANGOVER_MS Stille; der Pre-Roll (PRE_ROLL_MS) vor dem Trigger wird mitgesendet
+GATE = os.getenv("GATE", "off")
+GATE_HANGOVER_MS = float(os.getenv("GATE_HANGOVER_MS", "1200"))
+GATE_THRESHOLD_DB = float(os.getenv("GATE_THRESHOLD_DB", "12"))
+
+# Pre-Roll: der Capture-Thread hält immer die letzten PRE_ROLL_MS Audio vor (Ringpuffer);
+# beim Start einer Aufnahme gehen sie sofort raus (schneller als Echtzeit), danach live -
+# die ersten Silben vor/bei Enter gehen nicht verloren. 0 = Audio vor dem Start verwerfen
+PRE_ROLL_MS = float(os.getenv("PRE_ROLL_MS", "500"))
+
+# Verhalten bei Überlast (langsame Verbindung):
+#   block       = alles senden, Latenz wächst (bisheriges Verhalten)
+#   drop_oldest = Chunks älter als MAX_QUEUE_AGE verwerfen
+#   coalesce    = aufgestaute Chunks zu größeren Frames zusammenfassen (+ zu alte verwerfen)
+SEND_POLICY = os.getenv("SEND_POLICY", "block")
+MAX_QUEUE_AGE = float(os.getenv("MAX_QUEUE_AGE", "1.0"))            # Sekunden
+WRITE_BUFFER_LIMIT = int(os.getenv("WRITE_BUFFER_LIMIT", "65536"))  # Bytes im Transport-Schreibpuffer
+
+# Session-Steuerung: 'control'-USOs mit action start/stop um jede Aufnahme senden.
+# start lässt das Backend die Vosk-Verbindung vorab öffnen, stop finalisiert sofort
+# (statt über die Timeout-Fallbacks der STT-Node). 0 = nur RAW Audio (bisheriges Verhalten)
+SESSION_CONTROL = os.getenv("SESSION_CONTROL", "1") == "1"
+
+# Streaming-Text (TXT Output): auto = live mit TEXT_RENDER_FPS im Terminal, gesammelt bei Pipes/Logs
+#   live | final (Text erst am Ende) | token (print pro Token, bisheriges Verhalten)
+TEXT_RENDER = os.getenv("TEXT_RENDER", "auto")
+TEXT_RENDER_FPS = float(os.getenv("TEXT_RENDER_FPS", "30"))
+
+# Kompression: deflate = permessage-deflate anbieten (USO-Header schrumpfen um >90%, das Mikrofon-
+# Audio wird aber mitkomprimiert: ~9% kleiner für etwas CPU - auf schwachen Geräten 'none')
+WS_COMPRESSION = os.getenv("WS_COMPRESSION", "deflate")
+# Delta-Header: pro Session nur der erste Header vollständig, danach nur geänderte Felder (uso_delta.py)
+# Wird angefragt und erst genutzt, wenn die Willkommensnachricht des Gateways headerDelta bestätigt
+HEADER_DELTA = os.getenv("HEADER_DELTA", "1") == "1"
+
+# Headless-Betrieb: Befehle aus Datei statt Tastatur (eine Eingabe pro Zeile, 'sleep <s>' pausiert)
+COMMAND_SCRIPT = os.getenv("COMMAND_SCRIPT", "")
+
+# Verbindung
+RECONNECT_DELAY = float(os.getenv("RECONNECT_DELAY", "0"))  # Sekunden, 0 = kein automatischer Reconnect
+
+# Metriken (Prometheus-Textformat unter http://<host>:METRICS_PORT/metrics)
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))  # 0 = deaktiviert, z.B. 9101
+
+# Uhren-Abgleich mit dem Gateway (für One-Way-Latenzen), 0 = deaktiviert
+CLOCK_SYNC_SAMPLES = int(os.getenv("CLOCK_SYNC_SAMPLES", "8"))
+
+# Startup-Budget in ms je Phase (import, registration, connect, first_frame, total)
+# z.B. STARTUP_BUDGET="import=300,connect=800"; STARTUP_CHECK=1 beendet nach dem Start
+# mit Exit-Code 1 bei Budget-Überschreitung (Regressions-Check)
+STARTUP_BUDGET = os.getenv("STARTUP_BUDGET", "")
+STARTUP_CHECK = os.getenv("STARTUP_CHECK", "0") == "1"
+STARTUP_PROFILE_FILE = os.getenv("STARTUP_PROFILE_FILE", "")  # optional: Profil als JSON speichern
 
 # ======================================
 # ENDE KONFIGURATION
@@ -83,6 +174,52 @@ FORMAT = pyaudio.paInt16  # 16-bit PCM
 
 # Vollständige WebSocket-URL mit Authentifizierung
 WS_URL = f"ws://{WS_HOST}:{WS_PORT}{WS_PATH}?clientId={DEVICE_NAME}&secret={API_KEY}"
+if HEADER_DELTA:
+    WS_URL += "&headerDelta=1"
+
+# Client-Metriken (werden immer gezählt, der HTTP-Endpoint ist optional)
+metrics = MetricsRegistry(prefix="device", labels={"device": DEVICE_NAME})
+audio_chunks_sent = metrics.counter("audio_chunks_sent_total", "Gesendete Audio-Chunks")
+audio_bytes_sent = metrics.counter("audio_bytes_sent_total", "Gesendete Audio-Bytes")
+text_messages_sent = metrics.counter("text_messages_sent_total", "Gesendete Text-USOs")
+audio_send_latency = metrics.histogram("audio_send_latency_seconds", "Dauer eines Sendevorgangs (websocket.send)")
+messages_received = metrics.counter("messages_received_total", "Empfangene WebSocket-Frames")
+bytes_received = metrics.counter("bytes_received_total", "Empfangene Bytes")
+audio_chunks_received = metrics.counter("audio_chunks_received_total", "Empfangene Audio-Chunks (Speaker)")
+playback_underruns = metrics.counter("playback_underruns_total", "Audio-Chunks, die erst nach Ende der vorherigen Wiedergabe ankamen")
+playback_active = metrics.gauge("playback_active", "Laufende Wiedergabe-Threads")
+ws_connects = metrics.counter("ws_connects_total", "Aufgebaute Gateway-Verbindungen")
+ws_reconnects = metrics.counter("reconnects_total", "Reconnect-Versuche zum Gateway")
+downlink_latency = metrics.histogram("downlink_latency_seconds", "One-Way-Latenz Gateway → Device (nach Uhren-Abgleich)")
+time_to_final = metrics.histogram("time_to_final_seconds", "Ende der Aufnahme → erster finaler TXT Output")
+
+# Ende der letzten Aufnahme (time.monotonic()), bis der erste finale TXT Output eintrifft
+recording_stopped_at = None
+
+# Wiedergabe-Referenz für die Echo-Unterdrückung (wird mit dem Mikrofon angelegt, siehe AEC)
+playback_reference = None
+
+# Wiedergabe-Backend bei AUDIO_OUTPUT != ffplay (wird bei der ersten Wiedergabe geöffnet)
+playback_sink = None
+playback_sink_failed = False
+
+# Monotone Uhr mit Offset zur Gateway-Uhr (siehe clock_sync.py)
+clock = ClockSync()
+
+# Delta-Header für gesendete USOs (wird pro Verbindung neu angelegt)
+header_encoder = HeaderDeltaEncoder()
+header_delta_active = False  # Vom Gateway in der Willkommensnachricht bestätigt
+
+# Audio-Sender mit Backpressure-Policy (siehe audio_sender.py)
+audio_sender = BackpressureSender(
+    policy=SEND_POLICY,
+    max_queue_age=MAX_QUEUE_AGE,
+    write_buffer_limit=WRITE_BUFFER_LIMIT,
+    metrics=metrics
+)
+
+startup.budget = parse_budget(STARTUP_BUDGET)
+startup_check_failed = False  # Ergebnis des STARTUP_CHECK-Laufs
 
 # Farben für Terminal-Output
 class Colors:
@@ -124,16 +261,43 @@ def print_header():
     print(f"   {Colors.OKGREEN}• Lautsprecher:{Colors.ENDC} Empfängt automatisch Audio")
     print(f"   {Colors.OKGREEN}• TXT Output:{Colors.ENDC} Zeigt Text-Ausgaben in der Console\n")
 
+def create_uso_control_header(action: str, session_id: str) -> dict:
+    """
+    Erstellt einen Control-USO-Header (action 'start' / 'stop') für eine Audio-Session
+    Der Gateway übernimmt die id als Session-ID der folgenden RAW-Audio-Chunks
+    """
+    return clock.stamp({
+        "id": session_id,
+        "type": "control",
+        "sourceId": DEVICE_NAME,
+        "final": action == 'stop',
+        "control": {"action": action},
+    })
+
+def encode_header(header: dict) -> str:
+    """Header als JSON-Text - nach bestätigtem HEADER_DELTA als Delta zum letzten Header derselben Session"""
+    return json.dumps(header_encoder.encode(header) if header_delta_active else header)
+
+def observe_time_to_final():
+    """Misst die Zeit vom Ende der Aufnahme bis zum ersten finalen TXT Output"""
+    global recording_stopped_at
+    if recording_stopped_at is None:
+        return
+    elapsed = time.monotonic() - recording_stopped_at
+    recording_stopped_at = None
+    time_to_final.observe(elapsed)
+    print(f"{Colors.OKCYAN}⏱️  Zeit bis zum finalen Transkript: {elapsed * 1000:.0f} ms "
+          f"(Session-Steuerung {'an' if SESSION_CONTROL else 'aus'}){Colors.ENDC}")
+
 def create_uso_audio_header(final: bool = False) -> dict:
     """
     Erstellt einen USO-Header für Audio-Daten
     WICHTIG: sourceId muss mit der deviceId in der Mic-Node übereinstimmen!
     """
-    header = {
-        "id": f"audio_{DEVICE_NAME}_{int(datetime.now().timestamp() * 1000)}",
+    header = clock.stamp({
+        "id": f"audio_{DEVICE_NAME}_{int(clock.now_ms())}",
         "type": "audio",
         "sourceId": DEVICE_NAME,  # WICHTIG: Muss mit Mic-Node deviceId übereinstimmen!
-        "timestamp": int(datetime.now().timestamp() * 1000),
         "final": final,
         "audioMeta": {
             "sampleRate": SAMPLE_RATE,
@@ -143,7 +307,7 @@ def create_uso_audio_header(final: bool = False) -> dict:
             "format": "int16",
             "endianness": "little"
         }
-    }
+    })
     return header
 
 def play_audio(audio_data: bytes, sample_rate: int = 16000):
@@ -204,120 +368,292 @@ def play_audio(audio_data: bytes, sample_rate: int = 16000):
     except Exception as e:
         pass
 
+def get_playback_sink(sample_rate: int):
+    """
+    Öffnet das Wiedergabe-Backend (AUDIO_OUTPUT) bei der ersten Wiedergabe
+
+    Returns:
+        PlaybackBackend oder None (ffplay bzw. Fallback auf ffplay nach Fehler)
+    """
+    global playback_sink, playback_sink_failed
+    if playback_sink is None and not playback_sink_failed and AUDIO_OUTPUT != 'ffplay':
+        try:
+            sink = open_playback(AUDIO_OUTPUT, path=AUDIO_OUTPUT_FILE)
+            sink.open(sample_rate, 1)
+            sink.start()
+            playback_sink = sink
+        except Exception as e:
+            playback_sink_failed = True
+            print(f"{Colors.WARNING}⚠ Wiedergabe-Backend '{AUDIO_OUTPUT}' nicht nutzbar ({e}) - nutze ffplay{Colors.ENDC}")
+    return playback_sink
+
+def playback_busy() -> bool:
+    """Läuft noch eine Wiedergabe? (für die Underrun-Erkennung)"""
+    if playback_sink is not None:
+        return playback_sink.busy()
+    return playback_active.value() > 0
+
 def play_audio_data(audio_data: bytes, sample_rate: int = 16000):
     """
     Wrapper für play_audio - spielt Audio in Background-Thread
+    (bzw. reiht es beim Wiedergabe-Backend ein, siehe AUDIO_OUTPUT)
     """
     import threading
+
+    sink = get_playback_sink(sample_rate)
+    if sink is not None and sink.sample_rate == sample_rate:
+        # Nicht blockierend: der Stream spielt die Chunks lückenlos nacheinander ab
+        start_time = sink.play(audio_data)
+        if playback_reference is not None and sample_rate == playback_reference.sample_rate:
+            playback_reference.add(audio_data, start_time=start_time)
+        return
     
     def play_in_background():
-        play_audio(audio_data, sample_rate)
+        playback_active.inc()
+        # Referenz für die Echo-Unterdrückung (Wiedergabe beginnt jetzt)
+        if playback_reference is not None and sample_rate == playback_reference.sample_rate:
+            playback_reference.add(audio_data)
+        try:
+            play_audio(audio_data, sample_rate)
+        finally:
+            playback_active.dec()
     
     # Spielt in Background-Thread ab (nicht blockierend)
     thread = threading.Thread(target=play_in_background, daemon=True)
     thread.start()
 
 class AudioStreamer:
-    """Audio-Streaming Klasse mit PyAudio"""
+    """Audio-Streaming Klasse (Capture über audio_io, Backend per AUDIO_BACKEND)"""
 
     def __init__(self):
-        self.audio = None
-        self.stream = None
+        self.capture = None  # CaptureBackend (audio_io.py)
         self.audio_queue = queue.Queue()
         self.is_recording = False
+        self.converter = None  # CaptureConverter bei NATIVE_CAPTURE
+        self.buffer_pool = None  # BufferPool für konvertierte Chunks (NATIVE_CAPTURE)
+        self.echo_canceller = None  # EchoCanceller bei AEC
+        self.gate = None  # EdgeGate bei GATE (Session per Trigger statt Enter)
+        # Pre-Roll-Ringpuffer: letzte Chunks ohne laufende Session (payload, captured_at)
+        self.pre_roll = deque()
+        self.pre_roll_chunks = math.ceil(PRE_ROLL_MS * SAMPLE_RATE / 1000 / CHUNK_SIZE)
+        self.pre_roll_lock = threading.Lock()  # Capture-Thread ↔ Session-Start im Event-Loop
+        self.loop = None  # Event-Loop für thread-safe Session-Steuerung und Wake-ups aus dem Capture-Thread
+        self.capture_frames = CHUNK_SIZE  # Frames pro Capture-Callback (bei nativer Rate skaliert)
         self.recording_active = False  # Wird von Enter-Taste gesteuert
         self.header_sent = False  # Flag: Header wurde gesendet
+        self.send_wakeup = asyncio.Event()  # Weckt den Send-Task bei Start/Stopp einer Session und neuen Live-Chunks
         self.sample_silence_threshold = 100
 
     def initialize_audio(self):
-        """Initialisiert PyAudio und den Audio-Stream"""
+        """Initialisiert das Audio-Backend und den Capture-Stream"""
+        global playback_reference
         try:
-            self.audio = pyaudio.PyAudio()
-
-            # Audio-Stream öffnen
-            self.stream = self.audio.open(
-                format=FORMAT,
-                channels=CHANNELS,
-                rate=SAMPLE_RATE,
-                input=True,
-                frames_per_buffer=CHUNK_SIZE
-            )
+            capture = open_capture(AUDIO_BACKEND, path=AUDIO_FILE, loop=True)
+        except AudioBackendError as e:
+            print(f"{Colors.FAIL}❌ Audio-Backend '{AUDIO_BACKEND}': {e}{Colors.ENDC}")
+            return False
+
+        try:
+            capture_rate, capture_channels = SAMPLE_RATE, CHANNELS
+
+            # Native Rate des Geräts (NATIVE_CAPTURE) bzw. festes Format der Datei
+            if NATIVE_CAPTURE or capture.fixed_format:
+                native = capture.native_format()
+                if native != (SAMPLE_RATE, CHANNELS):
+                    try:
+                        from audio_resample import CaptureConverter
+                        capture_rate, capture_channels = native
+                        self.converter = CaptureConverter(capture_rate, capture_channels, SAMPLE_RATE)
+                        # Gleiche Chunk-Dauer wie bei SAMPLE_RATE
+                        self.capture_frames = int(CHUNK_SIZE * capture_rate / SAMPLE_RATE)
+                        # Konvertierte Chunks landen direkt in wiederverwendeten Slabs
+                        self.buffer_pool = BufferPool(self.converter.max_output_bytes(self.capture_frames))
+                    except ImportError:
+                        print(f"{Colors.WARNING}⚠ Resampling benötigt numpy (pip install numpy) - nutze {SAMPLE_RATE} Hz direkt{Colors.ENDC}")
+
+            if AEC:
+                try:
+                    from audio_aec import PlaybackReference, EchoCanceller
+                    # Ab jetzt wird jede Wiedergabe als Referenz mitgeschrieben (play_audio_data)
+                    playback_reference = PlaybackReference(SAMPLE_RATE)
+                    self.echo_canceller = EchoCanceller(playback_reference, delay_ms=AEC_DELAY_MS,
+                                                        filter_ms=AEC_FILTER_MS)
+                except ImportError:
+                    print(f"{Colors.WARNING}⚠ AEC benötigt numpy (pip install numpy) - ohne Echo-Unterdrückung{Colors.ENDC}")
+
+            if GATE != 'off':
+                try:
+                    from audio_gate import EdgeGate
+                    self.gate = EdgeGate(GATE, sample_rate=SAMPLE_RATE, threshold_db=GATE_THRESHOLD_DB,
+                                         hangover_ms=GATE_HANGOVER_MS)
+                except ImportError:
+                    print(f"{Colors.WARNING}⚠ GATE benötigt numpy (pip install numpy) - Session per Enter{Colors.ENDC}")
+
+            # Capture-Stream öffnen (Blöcke kommen per Callback aus dem Audio-Thread)
+            capture.open(capture_rate, capture_channels, self.capture_frames, self.on_capture)
+            self.capture = capture
 
             print(f"{Colors.OKGREEN}✓ Mikrofon initialisiert{Colors.ENDC}")
-            print(f"  {Colors.OKCYAN}→ Sample Rate:{Colors.ENDC} {SAMPLE_RATE} Hz")
-            print(f"  {Colors.OKCYAN}→ Channels:{Colors.ENDC} {CHANNELS}")
+            source = f" ({AUDIO_FILE})" if AUDIO_BACKEND == 'file' else ''
+            print(f"  {Colors.OKCYAN}→ Backend:{Colors.ENDC} {AUDIO_BACKEND}{source}")
+            if self.converter:
+                print(f"  {Colors.OKCYAN}→ Capture:{Colors.ENDC} {capture_rate} Hz, {capture_channels} Kanal/Kanäle (nativ)")
+                print(f"  {Colors.OKCYAN}→ Resampling:{Colors.ENDC} → {SAMPLE_RATE} Hz Mono (Polyphasen-Filter)")
+            else:
+                print(f"  {Colors.OKCYAN}→ Sample Rate:{Colors.ENDC} {SAMPLE_RATE} Hz")
+                print(f"  {Colors.OKCYAN}→ Channels:{Colors.ENDC} {CHANNELS}")
+            if self.echo_canceller:
+                print(f"  {Colors.OKCYAN}→ Echo-Unterdrückung:{Colors.ENDC} aktiv (Verzögerung {AEC_DELAY_MS:.0f} ms, "
+                      f"Filter {AEC_FILTER_MS:.0f} ms) - Full-Duplex während TTS")
+            if self.gate:
+                print(f"  {Colors.OKCYAN}→ Edge-Gating:{Colors.ENDC} {GATE} (Pre-Roll {PRE_ROLL_MS:.0f} ms, "
+                      f"Nachlauf {GATE_HANGOVER_MS:.0f} ms)")
             print(f"  {Colors.OKCYAN}→ Format:{Colors.ENDC} 16-bit PCM\n")
 
             return True
         except Exception as e:
             print(f"{Colors.FAIL}✗ Fehler bei Mikrofon-Initialisierung: {e}{Colors.ENDC}")
+            capture.close()
             return False
 
-    def start_recording_session(self):
-        """Startet eine Aufnahme-Session"""
+    def start_recording_session(self, reason='enter'):
+        """Startet eine Aufnahme-Session (Enter oder Trigger des Edge-Gates)"""
+        if self.recording_active:
+            return
         self.recording_active = True
-        print(f"\n{Colors.OKGREEN}🎤 Aufnahme gestartet...{Colors.ENDC}")
-        print(f"{Colors.WARNING}Drücke Enter erneut zum Stoppen der Aufnahme{Colors.ENDC}\n")
-
-    def stop_recording_session(self):
+        self.send_wakeup.set()
+        if reason == 'gate':
+            print(f"\n{Colors.OKGREEN}🎤 Trigger erkannt - Aufnahme gestartet (inkl. Pre-Roll)...{Colors.ENDC}\n")
+        else:
+            print(f"\n{Colors.OKGREEN}🎤 Aufnahme gestartet...{Colors.ENDC}")
+            print(f"{Colors.WARNING}Drücke Enter erneut zum Stoppen der Aufnahme{Colors.ENDC}\n")
+
+    def stop_recording_session(self, reason='enter'):
         """Stoppt die aktuelle Aufnahme-Session"""
+        if not self.recording_active:
+            return
         self.recording_active = False
-        print(f"\n{Colors.WARNING}⏹️  Aufnahme beendet{Colors.ENDC}\n")
+        self.send_wakeup.set()
+        if reason == 'gate':
+            print(f"\n{Colors.WARNING}⏹️  Sprechpause - Aufnahme beendet, warte auf Trigger{Colors.ENDC}\n")
+        else:
+            print(f"\n{Colors.WARNING}⏹️  Aufnahme beendet{Colors.ENDC}\n")
+
+    def prepare_chunk(self, data, read_at):
+        """Capture-Chunk aufbereiten: Resampling (NATIVE_CAPTURE) und Echo-Unterdrückung (AEC)"""
+        # Native Rate → SAMPLE_RATE Mono, direkt in einen Pool-Slab
+        if self.converter:
+            data = self.converter.process_into(data, self.buffer_pool.acquire())
+        # Lautsprecher-Echo entfernen (in-place im Slab bzw. neue bytes)
+        if self.echo_canceller:
+            if isinstance(data, PooledBuffer):
+                self.echo_canceller.process_into(data, end_time=read_at)
+            else:
+                data = self.echo_canceller.process(data, end_time=read_at)
+        return data
+
+    def gate_chunk(self, chunk):
+        """
+        Edge-Gating im Capture-Thread: Pre-Roll puffern, bei Trigger Session öffnen,
+        nach der Nachlaufzeit schließen (Session-Steuerung thread-safe im Event-Loop)
+        """
+        event = self.gate.update(payload_view(chunk))
+        if event == 'open':
+            self.loop.call_soon_threadsafe(self.start_recording_session, 'gate')
+        elif event == 'close':
+            self.loop.call_soon_threadsafe(self.stop_recording_session, 'gate')
+
+        # Bis die Session offen ist, bleiben Trigger- und Folge-Chunks im Pre-Roll
+        self.capture_chunk(chunk, trim=not self.gate.is_open)
+        if event == 'open':
+            # Pre-Roll-Chunks vor dem Trigger-Chunk werden zusätzlich gestreamt
+            with self.pre_roll_lock:
+                extra = list(self.pre_roll)[:-1]
+            self.gate.account_pre_roll(len(extra) * CHUNK_SIZE / SAMPLE_RATE,
+                                       sum(len(payload_view(item[0])) for item in extra))
+
+    def capture_chunk(self, chunk, trim=True):
+        """Capture-Thread: Chunk live in die Queue oder (ohne laufende Session) in den Pre-Roll"""
+        captured_at = time.monotonic()
+        with self.pre_roll_lock:
+            if self.recording_active and self.header_sent:
+                # Audio-Chunk in Queue speichern (bytes vom Backend oder PooledBuffer, ohne Kopie)
+                # Capture-Zeitpunkt für Queue-Alter/Backpressure
+                self.audio_queue.put(("audio", chunk, captured_at))
+                if self.loop:
+                    self.loop.call_soon_threadsafe(self.send_wakeup.set)
+                return
+            self.pre_roll.append((chunk, captured_at))
+            if trim:
+                while len(self.pre_roll) > self.pre_roll_chunks:
+                    release_payload(self.pre_roll.popleft()[0])
+
+    def begin_stream(self):
+        """
+        Session-Start (Event-Loop): ab jetzt gehen Chunks live in die Queue
+        Returns:
+            Pre-Roll als Liste von (payload, captured_at), älteste zuerst - ohne Lücke
+            oder Duplikat zum ersten Live-Chunk. captured_at = jetzt, damit die
+            Alters-Policies des Senders den Pre-Roll nicht als veraltet verwerfen
+        """
+        with self.pre_roll_lock:
+            self.header_sent = True
+            chunks = list(self.pre_roll)
+            self.pre_roll.clear()
+        now = time.monotonic()
+        return [(payload, now) for payload, _ in chunks]
+
+    def on_capture(self, data, read_at):
+        """
+        Capture-Callback (Audio-Thread des Backends), läuft immer, damit der Pre-Roll aktuell bleibt
+        read_at: Ende des Chunks (Zeitachse der AEC-Referenz)
+        """
+        if not self.is_recording:
+            return
+
+        # Edge-Gating: Trigger öffnet/schließt die Session selbst (kein Enter nötig)
+        if self.gate:
+            self.gate_chunk(self.prepare_chunk(data, read_at))
+            return
+
+        # Ohne Pre-Roll: Chunks nur bei aktiver Aufnahme UND gesendetem Start verwenden
+        if not self.pre_roll_chunks and not (self.recording_active and self.header_sent):
+            return
+
+        self.capture_chunk(self.prepare_chunk(data, read_at))
 
     def start_recording(self):
-        """Startet die Audio-Aufnahme in einem separaten Thread"""
-        if not self.stream:
+        """Startet die Audio-Aufnahme (Callbacks aus dem Audio-Thread des Backends)"""
+        if not self.capture:
             if not self.initialize_audio():
                 return False
 
         self.is_recording = True
-
-        def record_thread():
-            """Aufnahme-Thread"""
-            last_session_active = False
-
-            while self.is_recording:
-                try:
-                    # Audio-Daten lesen (immer, um Buffer nicht zu überlaufen)
-                    data = self.stream.read(CHUNK_SIZE, exception_on_overflow=False)
-
-                    # Prüfe ob Aufnahme aktiv ist
-                    if not self.recording_active:
-                        # Session beenden wenn aktiv
-                        if last_session_active:
-                            self.header_sent = False
-                        last_session_active = False
-                        time.sleep(0.1)
-                        continue
-                    
-                    # WICHTIG: Nur Chunks in Queue werfen, wenn:
-                    # 1. Aufnahme ist aktiv UND
-                    # 2. Header wurde bereits gesendet
-                    if self.header_sent:
-                        # Audio-Chunk in Queue speichern
-                        self.audio_queue.put(("audio", data))
-                    
-                    last_session_active = True
-
-                except Exception as e:
-                    print(f"{Colors.FAIL}✗ Fehler bei Audio-Aufnahme: {e}{Colors.ENDC}")
-                    break
-
-            print(f"\n{Colors.WARNING}⏹️  Audio-Aufnahme beendet{Colors.ENDC}")
-
-        # Thread starten
-        thread = threading.Thread(target=record_thread, daemon=True)
-        thread.start()
+        self.capture.start()
         return True
 
     def stop_recording(self):
         """Stoppt die Audio-Aufnahme"""
+        was_recording = self.is_recording
         self.is_recording = False
-        if self.stream:
-            self.stream.stop_stream()
-            self.stream.close()
-        if self.audio:
-            self.audio.terminate()
+        if self.capture:
+            self.capture.stop()
+            if was_recording:
+                print(f"\n{Colors.WARNING}⏹️  Audio-Aufnahme beendet{Colors.ENDC}")
+            if self.capture.stats.blocks:
+                print(f"{Colors.OKCYAN}📊 Audio-Capture: {self.capture.stats.summary()}{Colors.ENDC}")
+        if self.converter and self.converter.audio_seconds > 0:
+            print(f"{Colors.OKCYAN}📊 Resampling: {self.converter.cpu_ms_per_audio_second:.2f} ms CPU pro Sekunde Audio "
+                  f"({self.converter.audio_seconds:.1f}s Audio){Colors.ENDC}")
+        if self.echo_canceller and self.echo_canceller.audio_seconds > 0:
+            print(f"{Colors.OKCYAN}📊 Echo-Unterdrückung: {self.echo_canceller.summary()}{Colors.ENDC}")
+        if self.gate and self.gate.captured_seconds > 0:
+            print(f"{Colors.OKCYAN}📊 Edge-Gating: {self.gate.summary()}{Colors.ENDC}")
+        if self.buffer_pool and self.buffer_pool.acquires > 0:
+            print(f"{Colors.OKCYAN}📊 Buffer-Pool: {self.buffer_pool.summary()}{Colors.ENDC}")
+        if self.capture:
+            self.capture.close()
+            self.capture = None
 
     def get_audio_data(self):
         """Holt Audio-Daten aus der Queue"""
@@ -326,104 +662,60 @@ class AudioStreamer:
         except queue.Empty:
             return None
 
-class KeyboardInput:
-    """Keyboard-Input Handler"""
-
-    def __init__(self):
-        self.input_queue = queue.Queue()
-        self.text_input_active = False  # Flag für Text-Eingabe-Modus
-
-    def start(self):
-        """Startet Keyboard-Input in separatem Thread"""
-        def input_thread():
-            while True:
-                try:
-                    line = input().strip()
-                    self.input_queue.put(line)
-                except EOFError:
-                    break
-                except:
-                    break
-
-        thread = threading.Thread(target=input_thread, daemon=True)
-        thread.start()
-
-    def get_input(self):
-        """Holt Keyboard-Input aus der Queue"""
-        try:
-            return self.input_queue.get_nowait()
-        except queue.Empty:
-            return None
+    def get_pending_audio(self):
+        """Holt alle wartenden Audio-Chunks als Liste von (payload, captured_at)"""
+        chunks = []
+        while True:
+            data = self.get_audio_data()
+            if data is None:
+                return chunks
+            chunks.append((data[1], data[2]))
 
-async def send_text_data(websocket, keyboard_input: KeyboardInput):
+async def send_text(websocket, text: str):
     """
     Sendet Text als USO an WebSocket-Gateway
-    Wird aufgerufen wenn 't' eingegeben wird
+    Wird im Text-Modus ('t') für jede Eingabezeile aufgerufen
     """
-    try:
-        while True:
-            await asyncio.sleep(0.1)
-            
-            # Prüfe ob Text-Eingabe aktiv ist
-            if not keyboard_input.text_input_active:
-                continue
-            
-            # Hole Input aus der Queue
-            text = keyboard_input.get_input()
-            if text is None:
-                await asyncio.sleep(0.05)
-                continue
-            
-            print(f"{Colors.OKCYAN}→ Text-Modus: Input erhalten '{text}'{Colors.ENDC}")
-            
-            # Wechsel zu Audio-Modus wenn 'a'
-            if text.lower() == 'a':
-                keyboard_input.text_input_active = False
-                print(f"{Colors.OKCYAN}→ Wechsel zu Audio-Modus{Colors.ENDC}")
-                print(f"{Colors.OKCYAN}   (Drücke Enter zum Starten/Stoppen){Colors.ENDC}")
-                continue
-            
-            # Text senden als USO
-            if text:
-                session_id = f"txt_{DEVICE_NAME}_{int(datetime.now().timestamp() * 1000)}"
-                
-                # USO Header erstellen
-                header = {
-                    "id": session_id,
-                    "type": "text",
-                    "sourceId": DEVICE_NAME,
-                    "timestamp": int(datetime.now().timestamp() * 1000),
-                    "final": True
-                }
-                
-                # Header als JSON senden
-                header_json = json.dumps(header)
-                print(f"{Colors.OKCYAN}→ Sende Header: {header_json[:100]}{Colors.ENDC}")
-                await websocket.send(header_json)
-                
-                # Payload senden (als String!)
-                print(f"{Colors.OKCYAN}→ Sende Payload: {text[:100]}{Colors.ENDC}")
-                await websocket.send(text)
-                
-                print(f"{Colors.OKGREEN}✓ Text gesendet:{Colors.ENDC} {text[:100]}")
-    
-    except websockets.exceptions.ConnectionClosed:
-        print(f"{Colors.FAIL}✗ Verbindung geschlossen{Colors.ENDC}")
-    except Exception as e:
-        print(f"{Colors.FAIL}✗ Fehler beim Senden: {e}{Colors.ENDC}")
+    session_id = f"txt_{DEVICE_NAME}_{int(clock.now_ms())}"
+
+    # USO Header erstellen (timestamp + sentAt auf Gateway-Uhr korrigiert)
+    header = clock.stamp({
+        "id": session_id,
+        "type": "text",
+        "sourceId": DEVICE_NAME,
+        "final": True
+    })
+
+    # Header als JSON senden
+    header_json = encode_header(header)
+    print(f"{Colors.OKCYAN}→ Sende Header: {header_json[:100]}{Colors.ENDC}")
+    await websocket.send(header_json)
+
+    # Payload senden (als String!)
+    print(f"{Colors.OKCYAN}→ Sende Payload: {text[:100]}{Colors.ENDC}")
+    await websocket.send(text)
+    text_messages_sent.inc()
+
+    print(f"{Colors.OKGREEN}✓ Text gesendet:{Colors.ENDC} {text[:100]}")
 
 async def send_audio_data(websocket, audio_streamer: AudioStreamer):
     """
     Sendet RAW Audio-Daten an WebSocket-Gateway (ohne Header!)
     Der Gateway erstellt automatisch den USO-Header (wie WS In Node)
+    Mit SESSION_CONTROL wird jede Aufnahme von Control-USOs (start/stop) eingerahmt
     """
+    global recording_stopped_at
     chunk_count = 0
     last_recording_state = False
+    session_id = None
 
     try:
         while True:
-            await asyncio.sleep(0.05)
-            
+            # Schlafen bis Start/Stopp einer Session oder neue Live-Chunks (kein Polling,
+            # der Pre-Roll geht direkt nach dem Start raus)
+            await audio_streamer.send_wakeup.wait()
+            audio_streamer.send_wakeup.clear()
+
             # Prüfe ob recording_active sich geändert hat
             current_recording = audio_streamer.recording_active
             
@@ -437,43 +729,125 @@ async def send_audio_data(websocket, audio_streamer: AudioStreamer):
                     data = audio_streamer.get_audio_data()
                     if data is None:
                         break
+                    release_payload(data[1])
                 
-                # Erlaube Audio-Thread Chunks in die Queue zu werfen
-                audio_streamer.header_sent = True
-                
-                # Warte auf erste Chunks
-                await asyncio.sleep(0.05)
-                
+                # Session ankündigen: Backend öffnet die Vosk-Verbindung schon jetzt
+                if SESSION_CONTROL:
+                    session_id = f"audio_{DEVICE_NAME}_{int(clock.now_ms())}"
+                    await websocket.send(encode_header(create_uso_control_header('start', session_id)))
+
+                # Erlaube Audio-Thread Chunks in die Queue zu werfen, Pre-Roll sofort senden
                 chunk_count = 0
+                pre_roll = audio_streamer.begin_stream()
+                if pre_roll:
+                    flush_start = time.perf_counter()
+                    sent_before = audio_sender.chunks_sent
+                    audio_bytes_sent.inc(await audio_sender.send(websocket, pre_roll))
+                    chunk_count = audio_sender.chunks_sent - sent_before
+                    audio_chunks_sent.inc(chunk_count)
+                    flush_s = time.perf_counter() - flush_start
+                    audio_s = len(pre_roll) * CHUNK_SIZE / SAMPLE_RATE
+                    print(f"{Colors.OKCYAN}→ Pre-Roll: {audio_s * 1000:.0f} ms Audio in {flush_s * 1000:.1f} ms gesendet "
+                          f"({audio_s / max(flush_s, 1e-6):.0f}x Echtzeit){Colors.ENDC}")
+
                 last_recording_state = True
             
             elif not current_recording and last_recording_state:
                 # Aufnahme gestoppt
-                print(f"{Colors.OKCYAN}→ Audio-Stream beendet (insgesamt {chunk_count} RAW Chunks){Colors.ENDC}")
                 audio_streamer.header_sent = False
+                if SESSION_CONTROL:
+                    # Restliche Chunks vor dem stop senden (stop muss nach dem letzten Audio ankommen)
+                    chunks = audio_streamer.get_pending_audio()
+                    if chunks:
+                        sent_before = audio_sender.chunks_sent
+                        audio_bytes_sent.inc(await audio_sender.send(websocket, chunks))
+                        audio_chunks_sent.inc(audio_sender.chunks_sent - sent_before)
+                        chunk_count += audio_sender.chunks_sent - sent_before
+                    await websocket.send(encode_header(create_uso_control_header('stop', session_id)))
+                    session_id = None
+                recording_stopped_at = time.monotonic()
+                print(f"{Colors.OKCYAN}→ Audio-Stream beendet (insgesamt {chunk_count} RAW Chunks){Colors.ENDC}")
                 chunk_count = 0
                 last_recording_state = False
                 continue
             
             # Wenn Aufnahme aktiv, sende RAW Audio-Chunks
             if current_recording:
-                data = audio_streamer.get_audio_data()
-                if data:
-                    data_type, payload = data
+                chunks = audio_streamer.get_pending_audio()
+                if chunks:
+                    # Sende NUR RAW AUDIO (kein Header!) - Policy entscheidet bei Überlast
+                    # über Verwerfen/Zusammenfassen, Slabs werden nach dem Send freigegeben
+                    sent_before = audio_sender.chunks_sent
+                    send_start = time.perf_counter()
+                    sent_bytes = await audio_sender.send(websocket, chunks)
+                    audio_send_latency.observe(time.perf_counter() - send_start)
+                    sent_chunks = audio_sender.chunks_sent - sent_before
+                    audio_chunks_sent.inc(sent_chunks)
+                    audio_bytes_sent.inc(sent_bytes)
                     
-                    if data_type == "audio":
-                        # Sende NUR RAW AUDIO (kein Header!)
-                        await websocket.send(payload)
-                        chunk_count += 1
-                        
-                        if chunk_count % 100 == 0:
-                            print(f"{Colors.OKGREEN}✓ {chunk_count} RAW Audio-Chunks gesendet{Colors.ENDC}")
+                    if (chunk_count + sent_chunks) // 100 > chunk_count // 100:
+                        print(f"{Colors.OKGREEN}✓ {chunk_count + sent_chunks} RAW Audio-Chunks gesendet{Colors.ENDC}")
+                    chunk_count += sent_chunks
 
     except websockets.exceptions.ConnectionClosed:
         print(f"{Colors.FAIL}✗ Verbindung geschlossen{Colors.ENDC}")
     except Exception as e:
         print(f"{Colors.FAIL}✗ Fehler beim Senden: {e}{Colors.ENDC}")
 
+def handle_text_payload(payload: str, header: dict, session_buffer: dict) -> bool:
+    """
+    Zeigt einen Text-Payload für TXT Output an (Streaming-Chunk oder finales Paket)
+
+    Args:
+        payload: Text aus dem Frame nach dem Header (Binär- oder Text-Frame)
+        header: Zugehöriger USO-Header
+        session_buffer: Laufende Streaming-Sessions (sessionId -> Chunks + Renderer)
+
+    Returns:
+        True wenn das Paket final war (Header danach zurücksetzen)
+    """
+    is_final = header.get('final', True)
+    session_id = header.get('id', 'unknown')
+
+    # Streaming-Behandlung
+    if not is_final:
+        # Streaming-Chunk (Token-für-Token wie ChatGPT!)
+        if session_id not in session_buffer:
+            session_buffer[session_id] = {
+                'chunks': [], 'chunk_count': 0,
+                'renderer': StreamRenderer(fps=TEXT_RENDER_FPS, mode=TEXT_RENDER, color=Colors.OKGREEN),
+            }
+            print(f"\n{Colors.OKGREEN}📝 TXT Output gestartet{Colors.ENDC}")
+            print(f"{Colors.OKCYAN}→ Text:{Colors.ENDC} ", end='', flush=True)
+
+        session = session_buffer[session_id]
+        session['chunks'].append(payload)
+        session['chunk_count'] += 1
+
+        # Live-Anzeige: Nur der Text, kein JSON! Gesammelt mit begrenzter Bildrate statt print pro Token
+        session['renderer'].write(payload)
+        return False
+
+    # Finales Paket
+    if session_id in session_buffer:
+        # Streaming abgeschlossen
+        session = session_buffer[session_id]
+        session['renderer'].write(payload)
+        session['renderer'].finish()
+        full_text = ''.join(session['chunks']) + payload
+
+        print(f"\n\n{Colors.OKGREEN}✓ TXT Output abgeschlossen!{Colors.ENDC}")
+        print(f"  {Colors.OKCYAN}• Chunks:{Colors.ENDC} {session['chunk_count']}")
+        print(f"  {Colors.OKCYAN}• Gesamtlänge:{Colors.ENDC} {len(full_text)} Zeichen")
+
+        del session_buffer[session_id]
+    else:
+        # Normales finales Paket (nicht gestreamt)
+        print(f"\n{Colors.OKGREEN}📝 TXT Output:{Colors.ENDC} {payload}")
+
+    observe_time_to_final()
+    return True
+
 async def receive_messages(websocket, audio_streamer: AudioStreamer):
     """
     Empfängt Nachrichten vom WebSocket-Server (Speaker Audio & TXT Output)
@@ -481,54 +855,31 @@ async def receive_messages(websocket, audio_streamer: AudioStreamer):
     Ähnlich wie WebSocket Gateway in backend
     """
     last_uso_header = None  # Speichert letzten Header (für zwei-Phasen Protokoll)
+    header_decoder = HeaderDeltaDecoder()  # Löst Delta-Header auf (HEADER_DELTA)
     session_buffer = {}  # Session-Buffer für Streaming (sessionId -> text)
+    last_audio_session = None  # Für Underrun-Erkennung
     
     try:
-        async for message in websocket:
+        async for message in clock.receive(websocket):
+            messages_received.inc(kind='binary' if isinstance(message, (bytes, bytearray)) else 'text')
+            bytes_received.inc(len(message))
+            
             if isinstance(message, (bytes, bytearray)):
                 # Binary-Daten = Payload (Audio oder Binary-Daten)
                 if last_uso_header and last_uso_header.get('type') == 'audio':
+                    # Underrun: Folge-Chunk derselben Session, aber Wiedergabe schon beendet
+                    audio_session = last_uso_header.get('id')
+                    if audio_session == last_audio_session and not playback_busy():
+                        playback_underruns.inc()
+                    last_audio_session = audio_session
+                    audio_chunks_received.inc()
+                    
                     # Audio-Daten direkt abspielen
                     print(f"{Colors.OKGREEN}🔊 Spiele {len(message)} Bytes Audio ab...{Colors.ENDC}")
                     play_audio_data(message, sample_rate=16000)
                 elif last_uso_header and last_uso_header.get('type') == 'text':
                     # Text-Payload für TXT Output
-                    payload = message.decode('utf-8')
-                    is_final = last_uso_header.get('final', True)
-                    session_id = last_uso_header.get('id', 'unknown')
-                    
-                    # Streaming-Behandlung
-                    if not is_final:
-                        # Streaming-Chunk (Token-für-Token wie ChatGPT!)
-                        if session_id not in session_buffer:
-                            session_buffer[session_id] = {'chunks': [], 'chunk_count': 0}
-                            print(f"\n{Colors.OKGREEN}📝 TXT Output gestartet{Colors.ENDC}")
-                            print(f"{Colors.OKCYAN}→ Text:{Colors.ENDC} ", end='', flush=True)
-                        
-                        session = session_buffer[session_id]
-                        session['chunks'].append(payload)
-                        session['chunk_count'] += 1
-                        
-                        # Live-Anzeige: Nur der Text, kein JSON! (wie test-ws-out.py)
-                        print(f"{Colors.OKGREEN}{payload}{Colors.ENDC}", end='', flush=True)
-                    else:
-                        # Finales Paket
-                        if session_id in session_buffer:
-                            # Streaming abgeschlossen
-                            session = session_buffer[session_id]
-                            full_text = ''.join(session['chunks']) + payload
-                            
-                            print(f"\n\n{Colors.OKGREEN}✓ TXT Output abgeschlossen!{Colors.ENDC}")
-                            print(f"  {Colors.OKCYAN}• Chunks:{Colors.ENDC} {session['chunk_count']}")
-                            print(f"  {Colors.OKCYAN}• Gesamtlänge:{Colors.ENDC} {len(full_text)} Zeichen")
-                            
-                            del session_buffer[session_id]
-                        else:
-                            # Normales finales Paket (nicht gestreamt)
-                            print(f"\n{Colors.OKGREEN}📝 TXT Output:{Colors.ENDC} {payload}")
-                    
-                    # Header zurücksetzen nach final
-                    if is_final:
+                    if handle_text_payload(message.decode('utf-8'), last_uso_header, session_buffer):
                         last_uso_header = None
                 else:
                     # Unbekannte Binary-Daten
@@ -543,8 +894,15 @@ async def receive_messages(websocket, audio_streamer: AudioStreamer):
                     if data.get('type') == 'welcome' or 'connectionId' in data:
                         pass
                     # USO Header (wird im nächsten Frame gefolgt vom Payload)
-                    elif 'id' in data and 'type' in data:
-                        last_uso_header = data  # Speichere Header für nächste Payload
+                    elif data.get('delta') or ('id' in data and 'type' in data):
+                        # Speichere Header für nächste Payload (Delta-Header vorher vervollständigen)
+                        last_uso_header = header_decoder.decode(data)
+                        if last_uso_header is None:
+                            print(f"{Colors.WARNING}⚠ Delta-Header ohne bekannte Session: {data.get('id')}{Colors.ENDC}")
+                            continue
+                        data = last_uso_header
+                        if clock.synced and isinstance(data.get('sentAt'), (int, float)):
+                            downlink_latency.observe(max(0.0, clock.latency_ms(data['sentAt']) / 1000))
                         # Warte auf Payload (kommt im nächsten Frame)
                     else:
                         # Normale Text-Nachricht
@@ -553,42 +911,7 @@ async def receive_messages(websocket, audio_streamer: AudioStreamer):
                     # Kein JSON - könnte Text-Payload sein!
                     if last_uso_header and last_uso_header.get('type') == 'text':
                         # Text-Payload (als String!)
-                        payload = message
-                        is_final = last_uso_header.get('final', True)
-                        session_id = last_uso_header.get('id', 'unknown')
-                        
-                        # Streaming-Behandlung
-                        if not is_final:
-                            # Streaming-Chunk (Token-für-Token wie ChatGPT!)
-                            if session_id not in session_buffer:
-                                session_buffer[session_id] = {'chunks': [], 'chunk_count': 0}
-                                print(f"\n{Colors.OKGREEN}📝 TXT Output gestartet{Colors.ENDC}")
-                                print(f"{Colors.OKCYAN}→ Text:{Colors.ENDC} ", end='', flush=True)
-                            
-                            session = session_buffer[session_id]
-                            session['chunks'].append(payload)
-                            session['chunk_count'] += 1
-                            
-                            # Live-Anzeige: Nur der Text, kein JSON! (wie test-ws-out.py)
-                            print(f"{Colors.OKGREEN}{payload}{Colors.ENDC}", end='', flush=True)
-                        else:
-                            # Finales Paket
-                            if session_id in session_buffer:
-                                # Streaming abgeschlossen
-                                session = session_buffer[session_id]
-                                full_text = ''.join(session['chunks']) + payload
-                                
-                                print(f"\n\n{Colors.OKGREEN}✓ TXT Output abgeschlossen!{Colors.ENDC}")
-                                print(f"  {Colors.OKCYAN}• Chunks:{Colors.ENDC} {session['chunk_count']}")
-                                print(f"  {Colors.OKCYAN}• Gesamtlänge:{Colors.ENDC} {len(full_text)} Zeichen")
-                                
-                                del session_buffer[session_id]
-                            else:
-                                # Normales finales Paket (nicht gestreamt)
-                                print(f"\n{Colors.OKGREEN}📝 TXT Output:{Colors.ENDC} {payload}")
-                        
-                        # Header zurücksetzen nach final
-                        if is_final:
+                        if handle_text_payload(message, last_uso_header, session_buffer):
                             last_uso_header = None
                     else:
                         print(f"{Colors.WARNING}← Nachricht: {message[:100]}{Colors.ENDC}")
@@ -598,207 +921,302 @@ async def receive_messages(websocket, audio_streamer: AudioStreamer):
     except Exception as e:
         print(f"{Colors.FAIL}✗ Fehler beim Empfangen: {e}{Colors.ENDC}")
 
-def register_device_sync():
+async def register_device():
     """
-    Registriert das Device über die REST API (synchron)
+    Registriert das Device über die REST API (async, Keep-Alive-Client aus device_registry.py)
     """
-    import urllib.request
-    import urllib.error
-    
+    device = device_payload(DEVICE_NAME, DEVICE_CAPABILITIES, metadata={
+        'type': 'python-client',
+        'platform': sys.platform
+    })
+
     try:
-        url = f'http://{WS_HOST}:3000/api/devices'
-        data = json.dumps({
-            'clientId': DEVICE_NAME,
-            'name': DEVICE_NAME,
-            'capabilities': DEVICE_CAPABILITIES,
-            'metadata': {
-                'type': 'python-client',
-                'platform': sys.platform
-            }
-        }).encode('utf-8')
-        
-        req = urllib.request.Request(
-            url,
-            data=data,
-            headers={'Content-Type': 'application/json'}
-        )
-        
-        with urllib.request.urlopen(req, timeout=5) as response:
-            if response.status in (200, 201):
-                print(f"{Colors.OKGREEN}✓ Device registriert{Colors.ENDC}")
-            return True
-    except urllib.error.HTTPError as e:
-        print(f"{Colors.WARNING}⚠ Device-Registrierung: HTTP {e.code}{Colors.ENDC}")
-        return True
+        async with DeviceRegistry(f'http://{WS_HOST}:3000', timeout=5.0) as registry:
+            await registry.register(device)
+        print(f"{Colors.OKGREEN}✓ Device registriert{Colors.ENDC}")
+    except RegistrationError as e:
+        print(f"{Colors.WARNING}⚠ Device-Registrierung: HTTP {e.status_code}{Colors.ENDC}")
     except Exception as e:
         print(f"{Colors.WARNING}⚠ Device-Registrierung fehlgeschlagen: {e}{Colors.ENDC}")
         print(f"{Colors.WARNING}   Fortsetzen...{Colors.ENDC}")
-        return True
+    return True
 
-async def register_device():
+async def run_connection(audio_streamer: AudioStreamer, commands: CommandInput) -> bool:
     """
-    Wrapper für synchrone Registrierung
+    Eine Verbindung zum WebSocket-Gateway: verbinden, Tasks starten, Eingaben verarbeiten
+
+    Returns:
+        True wenn der Benutzer beendet hat ('q'), False bei Verbindungsverlust
     """
-    import concurrent.futures
-    loop = asyncio.get_event_loop()
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        await loop.run_in_executor(executor, register_device_sync)
+    print(f"{Colors.OKCYAN}⏳ Verbinde zu WebSocket-Gateway...{Colors.ENDC}")
+    print(f"{Colors.OKCYAN}   URL: {WS_URL}{Colors.ENDC}")
+
+    global header_encoder, header_delta_active
+    header_encoder = HeaderDeltaEncoder()
+    header_delta_active = False
+
+    connect_start = time.perf_counter()
+    async with websockets.connect(
+        WS_URL,
+        ping_interval=None,  # Heartbeat vom Server
+        close_timeout=10,
+        compression='deflate' if WS_COMPRESSION == 'deflate' else None
+    ) as websocket:
+        startup.record('connect', (time.perf_counter() - connect_start) * 1000)
+        ws_connects.inc()
+        print(f"{Colors.OKGREEN}✓ Verbindung hergestellt!{Colors.ENDC}\n")
+        extensions = [type(ext).__name__ for ext in getattr(websocket.protocol, 'extensions', [])]
+        deflate = any('Deflate' in name for name in extensions)
+        print(f"{Colors.OKCYAN}🗜️  permessage-deflate: {'aktiv' if deflate else 'aus'}, "
+              f"Delta-Header: {'angefragt' if HEADER_DELTA else 'aus'}{Colors.ENDC}")
+        
+        # Warte auf Willkommensnachricht
+        print(f"{Colors.OKCYAN}⏳ Warte auf Willkommensnachricht...{Colors.ENDC}")
+        try:
+            with startup.phase('first_frame'):
+                welcome_msg = await asyncio.wait_for(websocket.recv(), timeout=5)
+            if isinstance(welcome_msg, str):
+                welcome_data = json.loads(welcome_msg)
+                connection_id = welcome_data.get('connectionId', 'unknown')
+                # Ältere Gateways kennen headerDelta nicht und würden Delta-Header (ohne type) ablehnen
+                header_delta_active = HEADER_DELTA and welcome_data.get('headerDelta') is True
+                print(f"{Colors.OKGREEN}✓ Willkommensnachricht empfangen!{Colors.ENDC}")
+                print(f"{Colors.OKCYAN}   Connection ID: {connection_id}{Colors.ENDC}")
+                if HEADER_DELTA:
+                    print(f"{Colors.OKCYAN}   Delta-Header: {'bestätigt' if header_delta_active else 'vom Gateway nicht bestätigt - vollständige Header'}{Colors.ENDC}")
+                print()
+        except asyncio.TimeoutError:
+            print(f"{Colors.WARNING}⚠ Keine Willkommensnachricht erhalten, aber fortfahren...{Colors.ENDC}\n")
+
+        # Startup-Profil (nur bei der ersten Verbindung)
+        if not startup.finished:
+            violations = startup.report(printer=lambda line: print(f"{Colors.OKCYAN}{line}{Colors.ENDC}"))
+            if STARTUP_PROFILE_FILE:
+                startup.write_json(STARTUP_PROFILE_FILE)
+            if violations:
+                names = ', '.join(name for name, _, _ in violations)
+                print(f"{Colors.WARNING}⚠ Startup-Budget überschritten: {names}{Colors.ENDC}")
+            print()
+            if STARTUP_CHECK:
+                # Regressions-Check: nur Start messen, dann beenden
+                global startup_check_failed
+                startup_check_failed = bool(violations)
+                return True
+
+        # Uhren-Abgleich (vor dem Start der Empfangs-Tasks)
+        if CLOCK_SYNC_SAMPLES > 0:
+            if await clock.sync(websocket, samples=CLOCK_SYNC_SAMPLES):
+                print(f"{Colors.OKGREEN}✓ Uhren-Abgleich: Offset {clock.offset_ms:+.2f} ms, RTT {clock.rtt_ms:.2f} ms{Colors.ENDC}\n")
+            else:
+                print(f"{Colors.WARNING}⚠ Uhren-Abgleich nicht möglich (Gateway antwortet nicht auf time_sync){Colors.ENDC}\n")
+
+        # Mikrofon wird erst bei der ersten Aufnahme geöffnet (schneller Start, siehe AudioStreamer)
+        # Ausnahme Edge-Gating: Mikrofon sofort scharf schalten, Sessions startet der Trigger
+        gate_armed = False
+        audio_streamer.loop = asyncio.get_running_loop()
+        if GATE != 'off' and 'mic' in DEVICE_CAPABILITIES:
+            gate_armed = (audio_streamer.is_recording or audio_streamer.start_recording()) and audio_streamer.gate is not None
+
+        print(f"{Colors.BOLD}{'─'*70}{Colors.ENDC}")
+        print(f"{Colors.HEADER}✅ Device verbunden und bereit{Colors.ENDC}")
+        
+        # Zeige aktive Capabilities
+        cap_icons = {
+            'mic': 'Mic',
+            'speaker': 'Speaker',
+            'txt_input': 'Device TXT Input',
+            'txt_output': 'Device TXT Output'
+        }
+        active_caps = [cap_icons.get(cap, cap) for cap in DEVICE_CAPABILITIES]
+        print(f"{Colors.HEADER}💡 Device '{DEVICE_NAME}' verfügbar in: {', '.join(active_caps)} Nodes{Colors.ENDC}")
+        
+        # Zeige Bedienung basierend auf aktiven Capabilities
+        if gate_armed:
+            print(f"{Colors.HEADER}💡 Edge-Gating ({GATE}): warte auf Trigger - Aufnahme startet/stoppt automatisch{Colors.ENDC}")
+        elif 'mic' in DEVICE_CAPABILITIES:
+            print(f"{Colors.HEADER}💡 Drücke Enter zum Starten/Stoppen der Audio-Aufnahme{Colors.ENDC}")
+        if 'txt_input' in DEVICE_CAPABILITIES:
+            print(f"{Colors.HEADER}💡 Drücke 't' + Enter für Text-Eingabe{Colors.ENDC}")
+        print(f"{Colors.HEADER}💡 Drücke 'q' + Enter zum Beenden{Colors.ENDC}")
+        print(f"{Colors.BOLD}{'─'*70}{Colors.ENDC}\n")
+
+        # Starte Empfangs-Task im Hintergrund
+        receive_task = asyncio.create_task(receive_messages(websocket, audio_streamer))
+
+        # Starte Send-Task im Hintergrund (Audio, nur mit Mikrofon)
+        send_task = None
+        if 'mic' in DEVICE_CAPABILITIES:
+            send_task = asyncio.create_task(send_audio_data(websocket, audio_streamer))
+        
+        # Befehls-Dispatcher: wartet auf Eingaben oder Verbindungsende (kein Polling)
+        user_quit = False
+        while not user_quit:
+            command_task = asyncio.ensure_future(commands.get())
+            await asyncio.wait({receive_task, command_task}, return_when=asyncio.FIRST_COMPLETED)
+
+            # Verbindung verloren (Empfangs-Task beendet)
+            if receive_task.done():
+                command_task.cancel()
+                print(f"{Colors.FAIL}✗ Verbindung zum Gateway verloren{Colors.ENDC}")
+                break
+
+            user_input = command_task.result()
+            if user_input is None:
+                # Eingabe beendet (EOF / Skript-Ende) - Verbindung bleibt bis zum Ende offen
+                await asyncio.wait({receive_task})
+                continue
+
+            # 'q' beendet IMMER das Programm (egal in welchem Modus)
+            if user_input.lower() == 'q':
+                print(f"{Colors.WARNING}👋 Beende Verbindung...{Colors.ENDC}")
+                user_quit = True
+                continue
+
+            # Text-Modus: Eingaben als Text-USO senden, 'a' wechselt zurück
+            if commands.text_input_active:
+                print(f"{Colors.OKCYAN}→ Text-Modus: Input erhalten '{user_input}'{Colors.ENDC}")
+                if user_input.lower() == 'a':
+                    commands.text_input_active = False
+                    print(f"{Colors.OKCYAN}→ Wechsel zu Audio-Modus{Colors.ENDC}")
+                    print(f"{Colors.OKCYAN}   (Drücke Enter zum Starten/Stoppen){Colors.ENDC}")
+                elif user_input:
+                    try:
+                        await send_text(websocket, user_input)
+                    except websockets.exceptions.ConnectionClosed:
+                        print(f"{Colors.FAIL}✗ Verbindung geschlossen{Colors.ENDC}")
+                continue
+
+            # Audio-Modus: Verarbeite Inputs
+            if user_input.lower() == 't':
+                # Text-Modus aktivieren
+                commands.text_input_active = True
+                print(f"\n{Colors.OKCYAN}📝 Text-Modus aktiviert{Colors.ENDC}")
+                print(f"{Colors.OKCYAN}   Gib Text ein und drücke Enter zum Senden{Colors.ENDC}")
+                print(f"{Colors.OKCYAN}   'q' + Enter zum Beenden, 'a' + Enter für Audio-Modus{Colors.ENDC}\n")
+            else:
+                # Enter-Taste gedrückt - Toggle Audio-Aufnahme
+                if 'mic' not in DEVICE_CAPABILITIES:
+                    print(f"{Colors.WARNING}⚠ Capability 'mic' nicht aktiv - keine Audio-Aufnahme{Colors.ENDC}")
+                elif not audio_streamer.recording_active:
+                    # Mikrofon beim ersten Mal öffnen (läuft danach über Reconnects hinweg weiter)
+                    if not audio_streamer.is_recording and not audio_streamer.start_recording():
+                        print(f"{Colors.FAIL}✗ Audio-Aufnahme konnte nicht gestartet werden{Colors.ENDC}")
+                        continue
+                    audio_streamer.start_recording_session()
+                else:
+                    audio_streamer.stop_recording_session()
+
+        # Tasks beenden
+        if send_task:
+            send_task.cancel()
+        receive_task.cancel()
+        
+        try:
+            if send_task:
+                await send_task
+        except asyncio.CancelledError:
+            pass
+            
+        try:
+            await receive_task
+        except asyncio.CancelledError:
+            pass
+
+        return user_quit
 
 async def device_client():
     """
     Hauptfunktion: Verbindet zum WebSocket-Gateway als Device
+    Bei RECONNECT_DELAY > 0 wird nach Verbindungsverlust automatisch neu verbunden.
     """
     print_header()
+    print(f"{Colors.OKCYAN}🔁 Event-Loop:{Colors.ENDC} {loop_name()}\n")
+
+    # Metriken-Endpoint (optional) und Event-Loop-Lag-Messung - nur mit Endpoint,
+    # ohne METRICS_PORT bleibt die Loop im Leerlauf ohne periodische Wake-ups
+    metrics_server = None
+    lag_task = None
+    if METRICS_PORT:
+        try:
+            metrics_server = await serve_metrics(metrics, METRICS_PORT)
+            lag_task = asyncio.create_task(monitor_event_loop_lag(metrics))
+            print(f"{Colors.OKGREEN}✓ Metriken: http://0.0.0.0:{METRICS_PORT}/metrics{Colors.ENDC}\n")
+        except OSError as e:
+            print(f"{Colors.WARNING}⚠ Metriken-Endpoint konnte nicht starten: {e}{Colors.ENDC}\n")
 
     # Device registrieren
-    await register_device()
+    with startup.phase('registration'):
+        await register_device()
 
-    # Audio-Streamer initialisieren
+    # Audio-Streamer initialisieren (öffnet das Mikrofon noch nicht)
     audio_streamer = AudioStreamer()
+    metrics.gauge("capture_queue_depth", "Audio-Chunks in der Capture-Queue", func=audio_streamer.audio_queue.qsize)
+    metrics.gauge("resample_cpu_ms_per_audio_second", "CPU-Kosten des Resamplings (NATIVE_CAPTURE)",
+                  func=lambda: audio_streamer.converter.cpu_ms_per_audio_second if audio_streamer.converter else 0)
+    metrics.gauge("aec_erle_db", "Aktuelle Echo-Dämpfung der AEC (dB)",
+                  func=lambda: audio_streamer.echo_canceller.erle_db if audio_streamer.echo_canceller else 0)
+    metrics.gauge("aec_cpu_ms_per_audio_second", "CPU-Kosten der Echo-Unterdrückung (AEC)",
+                  func=lambda: audio_streamer.echo_canceller.cpu_ms_per_audio_second if audio_streamer.echo_canceller else 0)
+    metrics.gauge("gate_uplink_reduction_ratio", "Eingesparter Uplink-Anteil durch Edge-Gating (0-1)",
+                  func=lambda: audio_streamer.gate.reduction if audio_streamer.gate else 0)
+    metrics.gauge("gate_stt_session_seconds", "Gestreamte Audio-Sekunden (STT-Session-Zeit) mit Edge-Gating",
+                  func=lambda: audio_streamer.gate.streamed_seconds if audio_streamer.gate else 0)
+    metrics.gauge("audio_capture_cpu_ms_per_audio_second", "Prozess-CPU pro Sekunde Mikrofon-Audio (inkl. Capture-Backend)",
+                  func=lambda: audio_streamer.capture.stats.cpu_ms_per_audio_second if audio_streamer.capture else 0)
+    metrics.gauge("audio_capture_xruns", "Über-/Unterläufe laut Capture-Backend",
+                  func=lambda: audio_streamer.capture.stats.xruns if audio_streamer.capture else 0)
+    metrics.gauge("buffer_pool_allocations", "Angelegte Slabs im Audio-Buffer-Pool",
+                  func=lambda: audio_streamer.buffer_pool.allocations if audio_streamer.buffer_pool else 0)
+    metrics.gauge("buffer_pool_in_use", "Slabs zwischen Capture und Send",
+                  func=lambda: audio_streamer.buffer_pool.in_use if audio_streamer.buffer_pool else 0)
+    metrics.gauge("buffer_pool_bytes_copied", "Vom Client selbst kopierte Audio-Bytes",
+                  func=lambda: audio_streamer.buffer_pool.bytes_copied if audio_streamer.buffer_pool else 0)
+
+    # Befehlseingabe starten (Tastatur oder COMMAND_SCRIPT, bleibt über Reconnects hinweg aktiv)
+    commands = CommandInput(script_path=COMMAND_SCRIPT or None)
+    commands.start()
+    if commands.source == 'script':
+        print(f"{Colors.OKCYAN}📜 Befehle aus Skript: {COMMAND_SCRIPT}{Colors.ENDC}\n")
 
     try:
-        print(f"{Colors.OKCYAN}⏳ Verbinde zu WebSocket-Gateway...{Colors.ENDC}")
-        print(f"{Colors.OKCYAN}   URL: {WS_URL}{Colors.ENDC}")
-
-        async with websockets.connect(
-            WS_URL,
-            ping_interval=None,  # Heartbeat vom Server
-            close_timeout=10
-        ) as websocket:
-            print(f"{Colors.OKGREEN}✓ Verbindung hergestellt!{Colors.ENDC}\n")
-            
-            # Warte auf Willkommensnachricht
-            print(f"{Colors.OKCYAN}⏳ Warte auf Willkommensnachricht...{Colors.ENDC}")
-            try:
-                welcome_msg = await asyncio.wait_for(websocket.recv(), timeout=5)
-                if isinstance(welcome_msg, str):
-                    welcome_data = json.loads(welcome_msg)
-                    connection_id = welcome_data.get('connectionId', 'unknown')
-                    print(f"{Colors.OKGREEN}✓ Willkommensnachricht empfangen!{Colors.ENDC}")
-                    print(f"{Colors.OKCYAN}   Connection ID: {connection_id}{Colors.ENDC}\n")
-            except asyncio.TimeoutError:
-                print(f"{Colors.WARNING}⚠ Keine Willkommensnachricht erhalten, aber fortfahren...{Colors.ENDC}\n")
-
-            # Starte Audio-Aufnahme
-            if not audio_streamer.start_recording():
-                print(f"{Colors.FAIL}✗ Audio-Aufnahme konnte nicht gestartet werden{Colors.ENDC}")
-                return
-
-            print(f"{Colors.BOLD}{'─'*70}{Colors.ENDC}")
-            print(f"{Colors.HEADER}✅ Device verbunden und bereit{Colors.ENDC}")
-            
-            # Zeige aktive Capabilities
-            cap_icons = {
-                'mic': 'Mic',
-                'speaker': 'Speaker',
-                'txt_input': 'Device TXT Input',
-                'txt_output': 'Device TXT Output'
-            }
-            active_caps = [cap_icons.get(cap, cap) for cap in DEVICE_CAPABILITIES]
-            print(f"{Colors.HEADER}💡 Device '{DEVICE_NAME}' verfügbar in: {', '.join(active_caps)} Nodes{Colors.ENDC}")
-            
-            # Zeige Bedienung basierend auf aktiven Capabilities
-            if 'mic' in DEVICE_CAPABILITIES:
-                print(f"{Colors.HEADER}💡 Drücke Enter zum Starten/Stoppen der Audio-Aufnahme{Colors.ENDC}")
-            if 'txt_input' in DEVICE_CAPABILITIES:
-                print(f"{Colors.HEADER}💡 Drücke 't' + Enter für Text-Eingabe{Colors.ENDC}")
-            print(f"{Colors.HEADER}💡 Drücke 'q' + Enter zum Beenden{Colors.ENDC}")
-            print(f"{Colors.BOLD}{'─'*70}{Colors.ENDC}\n")
-
-            # Keyboard-Input starten
-            keyboard_input = KeyboardInput()
-            keyboard_input.start()
-
-            # Starte Empfangs-Task im Hintergrund
-            receive_task = asyncio.create_task(receive_messages(websocket, audio_streamer))
-
-            # Starte Send-Task im Hintergrund (Audio)
-            send_task = asyncio.create_task(send_audio_data(websocket, audio_streamer))
-            
-            # Starte Text-Send-Task im Hintergrund
-            send_text_task = asyncio.create_task(send_text_data(websocket, keyboard_input))
-
-            # Hauptschleife für Keyboard-Input
-            running = True
-            while running:
-                await asyncio.sleep(0.1)
-                
-                # Hole Input aus der Queue
-                user_input = keyboard_input.get_input()
-                if user_input is None:
-                    continue
-                
-                # 'q' beendet IMMER das Programm (egal in welchem Modus)
-                if user_input.lower() == 'q':
-                    print(f"{Colors.WARNING}👋 Beende Verbindung...{Colors.ENDC}")
-                    running = False
-                    continue
-                
-                # Text-Modus aktiv - Input zurück in Queue legen damit send_text_data ihn bekommt
-                if keyboard_input.text_input_active:
-                    print(f"{Colors.OKCYAN}→ Lege Input zurück in Queue für Text-Modus: '{user_input}'{Colors.ENDC}")
-                    keyboard_input.input_queue.put(user_input)
-                    continue
-                
-                # Audio-Modus: Verarbeite Inputs
-                if user_input.lower() == 't':
-                    # Text-Modus aktivieren
-                    keyboard_input.text_input_active = True
-                    print(f"\n{Colors.OKCYAN}📝 Text-Modus aktiviert{Colors.ENDC}")
-                    print(f"{Colors.OKCYAN}   Gib Text ein und drücke Enter zum Senden{Colors.ENDC}")
-                    print(f"{Colors.OKCYAN}   'q' + Enter zum Beenden, 'a' + Enter für Audio-Modus{Colors.ENDC}\n")
-                else:
-                    # Enter-Taste gedrückt - Toggle Audio-Aufnahme
-                    if not audio_streamer.recording_active:
-                        audio_streamer.start_recording_session()
-                    else:
-                        audio_streamer.stop_recording_session()
-
-            # Tasks beenden
-            send_task.cancel()
-            send_text_task.cancel()
-            receive_task.cancel()
-            
-            try:
-                await send_task
-            except asyncio.CancelledError:
-                pass
-                
-            try:
-                await send_text_task
-            except asyncio.CancelledError:
-                pass
-                
+        while True:
+            user_quit = False
             try:
-                await receive_task
-            except asyncio.CancelledError:
-                pass
-
-    except websockets.exceptions.InvalidURI:
-        print(f"{Colors.FAIL}✗ Ungültige WebSocket-URL: {WS_URL}{Colors.ENDC}")
-        print(f"{Colors.WARNING}💡 Überprüfe die Konfiguration (HOST, PORT, PATH){Colors.ENDC}\n")
-
-    except websockets.exceptions.InvalidStatusCode as e:
-        print(f"{Colors.FAIL}✗ WebSocket-Verbindung fehlgeschlagen!{Colors.ENDC}")
-        print(f"{Colors.FAIL}   Status Code: {e.status_code}{Colors.ENDC}")
-        print(f"{Colors.WARNING}💡 Mögliche Ursachen:{Colors.ENDC}")
-        print(f"   1. Secret nicht im Backend gespeichert")
-        print(f"   2. Falscher clientId oder secret")
-        print(f"   3. Backend läuft nicht")
-        print(f"")
-        print(f"{Colors.OKCYAN}💡 Lösung (EINFACH - nur EINEN API Key!):{Colors.ENDC}")
-        print(f"   Setze SIMPLE_API_KEY in docker-compose.yml:")
-        print(f"     SIMPLE_API_KEY={API_KEY}")
-        print(f"   Dann: docker-compose restart backend")
-        print(f"")
-        print(f"   ODER setze den Key hier in device-client.py direkt.")
-
-    except websockets.exceptions.WebSocketException as e:
-        print(f"{Colors.FAIL}✗ WebSocket-Fehler: {e}{Colors.ENDC}\n")
-
-    except ConnectionRefusedError:
-        print(f"{Colors.FAIL}✗ Verbindung abgelehnt!{Colors.ENDC}")
-        print(f"{Colors.WARNING}💡 Ist der Server gestartet? (docker-compose up){Colors.ENDC}\n")
+                user_quit = await run_connection(audio_streamer, commands)
+
+            except websockets.exceptions.InvalidURI:
+                print(f"{Colors.FAIL}✗ Ungültige WebSocket-URL: {WS_URL}{Colors.ENDC}")
+                print(f"{Colors.WARNING}💡 Überprüfe die Konfiguration (HOST, PORT, PATH){Colors.ENDC}\n")
+                break
+
+            except websockets.exceptions.InvalidStatusCode as e:
+                print(f"{Colors.FAIL}✗ WebSocket-Verbindung fehlgeschlagen!{Colors.ENDC}")
+                print(f"{Colors.FAIL}   Status Code: {e.status_code}{Colors.ENDC}")
+                print(f"{Colors.WARNING}💡 Mögliche Ursachen:{Colors.ENDC}")
+                print(f"   1. Secret nicht im Backend gespeichert")
+                print(f"   2. Falscher clientId oder secret")
+                print(f"   3. Backend läuft nicht")
+                print(f"")
+                print(f"{Colors.OKCYAN}💡 Lösung (EINFACH - nur EINEN API Key!):{Colors.ENDC}")
+                print(f"   Setze SIMPLE_API_KEY in docker-compose.yml:")
+                print(f"     SIMPLE_API_KEY={API_KEY}")
+                print(f"   Dann: docker-compose restart backend")
+                print(f"")
+                print(f"   ODER setze den Key hier in device-client.py direkt.")
+
+            except websockets.exceptions.WebSocketException as e:
+                print(f"{Colors.FAIL}✗ WebSocket-Fehler: {e}{Colors.ENDC}\n")
+
+            except ConnectionRefusedError:
+                print(f"{Colors.FAIL}✗ Verbindung abgelehnt!{Colors.ENDC}")
+                print(f"{Colors.WARNING}💡 Ist der Server gestartet? (docker-compose up){Colors.ENDC}\n")
+
+            if user_quit or RECONNECT_DELAY <= 0:
+                break
+
+            ws_reconnects.inc()
+            print(f"{Colors.WARNING}↻ Reconnect in {RECONNECT_DELAY:.0f}s...{Colors.ENDC}\n")
+            await asyncio.sleep(RECONNECT_DELAY)
 
     except KeyboardInterrupt:
         print(f"\n{Colors.WARNING}👋 Beende Device-Client...{Colors.ENDC}")
@@ -809,8 +1227,20 @@ async def device_client():
         traceback.print_exc()
 
     finally:
-        # Audio-Streaming stoppen
+        # Eingabe und Audio-Streaming stoppen
+        commands.stop()
         audio_streamer.stop_recording()
+        if playback_sink is not None:
+            playback_sink.stop()
+            if playback_sink.stats.blocks:
+                print(f"{Colors.OKCYAN}📊 Audio-Wiedergabe: {playback_sink.stats.summary()}{Colors.ENDC}")
+            playback_sink.close()
+        if audio_sender.frames_sent or audio_sender.chunks_dropped:
+            print(f"{Colors.OKCYAN}📊 Audio-Sender: {audio_sender.summary()}{Colors.ENDC}")
+        if lag_task:
+            lag_task.cancel()
+        if metrics_server:
+            metrics_server.close()
         print(f"\n{Colors.OKGREEN}✓ Device-Client beendet.{Colors.ENDC}\n")
 
 def main():
@@ -822,8 +1252,22 @@ def main():
             print(f"{Colors.WARNING}Aktuelle Version: {sys.version}{Colors.ENDC}\n")
             sys.exit(1)
 
+        # Alle Modul-Imports und -Initialisierungen sind abgeschlossen
+        startup.record_since_start('import')
+
+        # Audio-Backend nur für Geräte mit Mikrofon prüfen (ohne es schon zu importieren)
+        problem = backend_problem(AUDIO_BACKEND) if 'mic' in DEVICE_CAPABILITIES else None
+        if problem:
+            print(f"❌ {problem}")
+            print("   Oder AUDIO_BACKEND=file (AUDIO_FILE) bzw. null ohne Mikrofon-Hardware")
+            print("   Oder entferne 'mic' aus DEVICE_CAPABILITIES (Text-Gerät)")
+            sys.exit(1)
+
         # Starte Programm
-        asyncio.run(device_client())
+        run_loop(device_client(), loop_from_argv())
+
+        if STARTUP_CHECK and startup_check_failed:
+            sys.exit(1)
 
     except KeyboardInterrupt:
         print(f"\n{Colors.WARNING}Abgebrochen.{Colors.ENDC}\n")
@@ -23,7 +23,6 @@ import json
 import sys
 import os
 import ssl
-from datetime import datetime
 from typing import Optional
 
 # HTTP-Client für Signal REST API
@@ -34,13 +33,18 @@ except ImportError:
     print("   Installiere mit: pip install httpx")
     sys.exit(1)
 
+from client_metrics import MetricsRegistry, serve_metrics, monitor_event_loop_lag
+from clock_sync import ClockSync
+from device_registry import DeviceRegistry, RegistrationError, device_payload
+from event_loop import run_loop, loop_from_argv
+
 # ======================================
 # KONFIGURATION - HIER ANPASSEN
 # ======================================
 
 # IoT Orchestrator WebSocket-Gateway
-WS_HOST = "10.0.3.17"
-WS_PORT = 8080  # WebSocket Gateway Port
+WS_HOST = os.getenv("WS_HOST", "10.0.3.17")
+WS_PORT = int(os.getenv("WS_PORT", "8080"))  # WebSocket Gateway Port
 WS_PATH = "/ws/external"
 
 # Geräte-Informationen  
@@ -60,6 +64,13 @@ SIGNAL_RECIPIENT_NUMBER = "+4917681328005"  # Standard-Zielnummer (für Senden)
 # SSL-Konfiguration (für selbst-signierte Zertifikate)
 SIGNAL_VERIFY_SSL = False  # Setze auf True, wenn Zertifikat gültig ist
 
+# Metriken-Endpoint (Prometheus-Textformat), 0 = deaktiviert
+# z.B. METRICS_PORT=9102 → http://localhost:9102/metrics
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+
+# Uhren-Abgleich mit dem Gateway (für One-Way-Latenzen), 0 = deaktiviert
+CLOCK_SYNC_SAMPLES = int(os.getenv("CLOCK_SYNC_SAMPLES", "8"))
+
 # Signal-URLs
 SIGNAL_WS_URL = f"wss://{SIGNAL_SERVER_URL}/v1/receive/{SIGNAL_RECEIVE_NUMBER}"
 SIGNAL_API_URL = f"https://{SIGNAL_SERVER_URL}/v2/send"
@@ -79,6 +90,21 @@ DEVICE_CAPABILITIES = [
 # Vollständige IoT Orchestrator WebSocket-URL mit Authentifizierung
 IOT_WS_URL = f"ws://{WS_HOST}:{WS_PORT}{WS_PATH}?clientId={DEVICE_NAME}&secret={API_KEY}"
 
+# Client-Metriken (nur über HTTP sichtbar, wenn METRICS_PORT gesetzt ist)
+metrics = MetricsRegistry(prefix="device", labels={"device": DEVICE_NAME})
+signal_send_latency = metrics.histogram("signal_send_latency_seconds", "Dauer eines Signal-API-Sendeaufrufs")
+signal_send_failures = metrics.counter("signal_send_failures_total", "Fehlgeschlagene Signal-Sendeaufrufe")
+signal_messages_received = metrics.counter("signal_messages_received_total", "Empfangene Signal-Nachrichten")
+forward_latency = metrics.histogram("forward_latency_seconds", "Dauer der Weiterleitung an den IoT Orchestrator")
+messages_forwarded = metrics.counter("messages_forwarded_total", "An den IoT Orchestrator weitergeleitete Nachrichten")
+messages_received = metrics.counter("messages_received_total", "Vom IoT Orchestrator empfangene Nachrichten")
+bytes_received = metrics.counter("bytes_received_total", "Vom IoT Orchestrator empfangene Bytes")
+ws_connects = metrics.counter("ws_connects_total", "Aufgebaute Gateway-Verbindungen")
+downlink_latency = metrics.histogram("downlink_latency_seconds", "One-Way-Latenz Gateway → Device (nach Uhren-Abgleich)")
+
+# Monotone Uhr mit Offset zur Gateway-Uhr (siehe clock_sync.py)
+clock = ClockSync()
+
 # Farben für Terminal-Output
 class Colors:
     HEADER = '\033[95m'
@@ -128,19 +154,22 @@ async def send_signal_message(message: str, recipient: Optional[str] = None):
         # SSL-Verifizierung optional deaktivieren
         verify_ssl = SIGNAL_VERIFY_SSL if SIGNAL_VERIFY_SSL else False
         async with httpx.AsyncClient(timeout=10.0, verify=verify_ssl) as client:
-            response = await client.post(
-                SIGNAL_API_URL,
-                json=payload,
-                headers={"Content-Type": "application/json"}
-            )
+            with signal_send_latency.time():
+                response = await client.post(
+                    SIGNAL_API_URL,
+                    json=payload,
+                    headers={"Content-Type": "application/json"}
+                )
             response.raise_for_status()
             print(f"{Colors.OKGREEN}✓ Signal-Nachricht gesendet an {recipient_number}{Colors.ENDC}")
             print(f"  {Colors.OKCYAN}→ Nachricht: {message[:100]}{Colors.ENDC}")
             return True
     except httpx.HTTPError as e:
+        signal_send_failures.inc()
         print(f"{Colors.FAIL}✗ Fehler beim Senden über Signal API: {e}{Colors.ENDC}")
         return False
     except Exception as e:
+        signal_send_failures.inc()
         print(f"{Colors.FAIL}✗ Unerwarteter Fehler beim Signal-Senden: {e}{Colors.ENDC}")
         return False
 
@@ -187,17 +216,17 @@ async def receive_signal_messages(iot_websocket):
                         source_name = envelope.get('sourceName', 'unknown')
                         
                         if signal_message:
+                            signal_messages_received.inc()
                             print(f"{Colors.OKCYAN}📩 Signal-Nachricht empfangen{Colors.ENDC}")
                             print(f"  {Colors.OKCYAN}→ Von: {source_name} ({source_number}){Colors.ENDC}")
                             print(f"  {Colors.OKCYAN}→ Nachricht: {signal_message}{Colors.ENDC}")
                             
                             # Erstelle USO-Header für IoT Orchestrator
-                            session_id = f"signal_{DEVICE_NAME}_{int(datetime.now().timestamp() * 1000)}"
+                            session_id = f"signal_{DEVICE_NAME}_{int(clock.now_ms())}"
                             header = {
                                 "id": session_id,
                                 "type": "text",
                                 "sourceId": DEVICE_NAME,
-                                "timestamp": int(datetime.now().timestamp() * 1000),
                                 "final": True,
                                 "metadata": {
                                     "signalSource": source_number,
@@ -206,12 +235,14 @@ async def receive_signal_messages(iot_websocket):
                                 }
                             }
                             
-                            # Header als JSON senden
-                            header_json = json.dumps(header)
-                            await iot_websocket.send(header_json)
-                            
-                            # Payload senden (als String!)
-                            await iot_websocket.send(signal_message)
+                            # Header als JSON senden (timestamp + sentAt auf Gateway-Uhr korrigiert)
+                            header_json = json.dumps(clock.stamp(header))
+                            with forward_latency.time():
+                                await iot_websocket.send(header_json)
+                                
+                                # Payload senden (als String!)
+                                await iot_websocket.send(signal_message)
+                            messages_forwarded.inc()
                             
                             print(f"{Colors.OKGREEN}✓ Signal-Nachricht an IoT Orchestrator weitergeleitet{Colors.ENDC}\n")
                     
@@ -240,7 +271,9 @@ async def receive_iot_messages(iot_websocket):
     session_buffer = {}  # Session-Buffer für Streaming (sessionId -> text)
     
     try:
-        async for message in iot_websocket:
+        async for message in clock.receive(iot_websocket):
+            messages_received.inc(kind='binary' if isinstance(message, (bytes, bytearray)) else 'text')
+            bytes_received.inc(len(message))
             if isinstance(message, (bytes, bytearray)):
                 # Binary-Daten = Payload (Text-Payload)
                 if last_uso_header and last_uso_header.get('type') == 'text':
@@ -293,6 +326,8 @@ async def receive_iot_messages(iot_websocket):
                     # USO Header (wird im nächsten Frame gefolgt vom Payload)
                     elif 'id' in data and 'type' in data:
                         last_uso_header = data  # Speichere Header für nächste Payload
+                        if clock.synced and isinstance(data.get('sentAt'), (int, float)):
+                            downlink_latency.observe(max(0.0, clock.latency_ms(data['sentAt']) / 1000))
                     else:
                         # Normale Text-Nachricht
                         print(f"{Colors.OKCYAN}← Nachricht: {message[:100]}{Colors.ENDC}")
@@ -345,53 +380,27 @@ async def receive_iot_messages(iot_websocket):
     except Exception as e:
         print(f"{Colors.FAIL}✗ Fehler beim Empfangen vom IoT Orchestrator: {e}{Colors.ENDC}")
 
-def register_device_sync():
+async def register_device():
     """
-    Registriert das Device über die REST API (synchron)
+    Registriert das Device über die REST API (async, Keep-Alive-Client aus device_registry.py)
     """
-    import urllib.request
-    import urllib.error
-    
+    device = device_payload(DEVICE_NAME, DEVICE_CAPABILITIES, metadata={
+        'type': 'signal-client',
+        'platform': sys.platform,
+        'signalReceiveNumber': SIGNAL_RECEIVE_NUMBER,
+        'signalSendNumber': SIGNAL_SEND_NUMBER
+    })
+
     try:
-        url = f'http://{WS_HOST}:3000/api/devices'
-        data = json.dumps({
-            'clientId': DEVICE_NAME,
-            'name': DEVICE_NAME,
-            'capabilities': DEVICE_CAPABILITIES,
-            'metadata': {
-                'type': 'signal-client',
-                'platform': sys.platform,
-                'signalReceiveNumber': SIGNAL_RECEIVE_NUMBER,
-                'signalSendNumber': SIGNAL_SEND_NUMBER
-            }
-        }).encode('utf-8')
-        
-        req = urllib.request.Request(
-            url,
-            data=data,
-            headers={'Content-Type': 'application/json'}
-        )
-        
-        with urllib.request.urlopen(req, timeout=5) as response:
-            if response.status in (200, 201):
-                print(f"{Colors.OKGREEN}✓ Device registriert{Colors.ENDC}")
-            return True
-    except urllib.error.HTTPError as e:
-        print(f"{Colors.WARNING}⚠ Device-Registrierung: HTTP {e.code}{Colors.ENDC}")
-        return True
+        async with DeviceRegistry(f'http://{WS_HOST}:3000', timeout=5.0) as registry:
+            await registry.register(device)
+        print(f"{Colors.OKGREEN}✓ Device registriert{Colors.ENDC}")
+    except RegistrationError as e:
+        print(f"{Colors.WARNING}⚠ Device-Registrierung: HTTP {e.status_code}{Colors.ENDC}")
     except Exception as e:
         print(f"{Colors.WARNING}⚠ Device-Registrierung fehlgeschlagen: {e}{Colors.ENDC}")
         print(f"{Colors.WARNING}   Fortsetzen...{Colors.ENDC}")
-        return True
-
-async def register_device():
-    """
-    Wrapper für synchrone Registrierung
-    """
-    import concurrent.futures
-    loop = asyncio.get_event_loop()
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        await loop.run_in_executor(executor, register_device_sync)
+    return True
 
 async def signal_device_client():
     """
@@ -399,6 +408,18 @@ async def signal_device_client():
     """
     print_header()
 
+    # Metriken-Endpoint (optional) und Event-Loop-Lag-Messung - nur mit Endpoint,
+    # ohne METRICS_PORT bleibt die Loop im Leerlauf ohne periodische Wake-ups
+    metrics_server = None
+    lag_task = None
+    if METRICS_PORT:
+        try:
+            metrics_server = await serve_metrics(metrics, METRICS_PORT)
+            lag_task = asyncio.create_task(monitor_event_loop_lag(metrics))
+            print(f"{Colors.OKGREEN}✓ Metriken: http://0.0.0.0:{METRICS_PORT}/metrics{Colors.ENDC}\n")
+        except OSError as e:
+            print(f"{Colors.WARNING}⚠ Metriken-Endpoint konnte nicht starten: {e}{Colors.ENDC}\n")
+
     # Device registrieren
     await register_device()
 
@@ -411,6 +432,7 @@ async def signal_device_client():
             ping_interval=None,  # Heartbeat vom Server
             close_timeout=10
         ) as iot_websocket:
+            ws_connects.inc()
             print(f"{Colors.OKGREEN}✓ IoT Orchestrator Verbindung hergestellt!{Colors.ENDC}\n")
             
             # Warte auf Willkommensnachricht
@@ -425,6 +447,13 @@ async def signal_device_client():
             except asyncio.TimeoutError:
                 print(f"{Colors.WARNING}⚠ Keine Willkommensnachricht erhalten, aber fortfahren...{Colors.ENDC}\n")
 
+            # Uhren-Abgleich (vor dem Start der Empfangs-Tasks)
+            if CLOCK_SYNC_SAMPLES > 0:
+                if await clock.sync(iot_websocket, samples=CLOCK_SYNC_SAMPLES):
+                    print(f"{Colors.OKGREEN}✓ Uhren-Abgleich: Offset {clock.offset_ms:+.2f} ms, RTT {clock.rtt_ms:.2f} ms{Colors.ENDC}\n")
+                else:
+                    print(f"{Colors.WARNING}⚠ Uhren-Abgleich nicht möglich (Gateway antwortet nicht auf time_sync){Colors.ENDC}\n")
+
             print(f"{Colors.BOLD}{'─'*70}{Colors.ENDC}")
             print(f"{Colors.HEADER}✅ Device verbunden und bereit{Colors.ENDC}")
             print(f"{Colors.HEADER}💡 Device '{DEVICE_NAME}' verfügbar in TXT Input/Output Nodes{Colors.ENDC}")
@@ -475,6 +504,10 @@ async def signal_device_client():
         traceback.print_exc()
 
     finally:
+        if lag_task:
+            lag_task.cancel()
+        if metrics_server:
+            metrics_server.close()
         print(f"\n{Colors.OKGREEN}✓ Signal Device-Client beendet.{Colors.ENDC}\n")
 
 def main():
@@ -487,7 +520,7 @@ def main():
             sys.exit(1)
 
         # Starte Programm
-        asyncio.run(signal_device_client())
+        run_loop(signal_device_client(), loop_from_argv())
 
     except KeyboardInterrupt:
         print(f"\n{Colors.WARNING}Abgebrochen.{Colors.ENDC}\n")
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Device-Registrierung über die REST API (async)
+==============================================
+Registriert Devices über einen gepoolten Keep-Alive-HTTP-Client (httpx)
+statt pro Registrierung einen neuen ThreadPoolExecutor und eine neue
+TCP-Verbindung (urllib) zu erzeugen.
+
+- register():      ein Device (POST /api/devices)
+- register_many(): viele Devices in Batches (POST /api/devices/bulk),
+                   Fallback auf parallele Einzel-Registrierungen bei älteren Backends
+- Zeitmessung pro Batch (Round-Trip im Client + Dauer des bulkWrite im Backend)
+
+httpx wird erst beim ersten DeviceRegistry geladen (zählt nicht zum Import-Budget,
+siehe startup_profile.py). Ohne httpx wird auf urllib im Default-Executor des
+Event-Loops ausgewichen (der Device-Client bleibt ohne zusätzliche Abhängigkeit lauffähig).
+
+Verwendung:
+    from device_registry import DeviceRegistry, device_payload
+
+    async with DeviceRegistry("http://localhost:3000") as registry:
+        await registry.register(device_payload("python-voice-device", ["mic", "speaker"]))
+        batches = await registry.register_many([device_payload(f"sim-{i}", ["txt_input"]) for i in range(1000)])
+"""
+
+import asyncio
+import importlib
+import json
+import time
+
+DEFAULT_BATCH_SIZE = 250  # Backend-Limit: 500 Devices pro Bulk-Request
+
+def device_payload(client_id, capabilities, name=None, metadata=None):
+    """Body für POST /api/devices (bzw. ein Eintrag für /api/devices/bulk)"""
+    return {
+        'clientId': client_id,
+        'name': name or client_id,
+        'capabilities': list(capabilities),
+        'metadata': metadata or {},
+    }
+
+def _load_httpx():
+    """Importiert httpx bei Bedarf (None wenn nicht installiert)"""
+    try:
+        return importlib.import_module('httpx')
+    except ImportError:
+        return None
+
+class RegistrationError(Exception):
+    """Registrierung mit HTTP-Fehler beantwortet"""
+
+    def __init__(self, status_code, message=''):
+        super().__init__(f"HTTP {status_code} {message}".strip())
+        self.status_code = status_code
+
+class DeviceRegistry:
+    """Async-Client für die Device-Registrierung mit Verbindungs-Pool"""
+
+    def __init__(self, base_url, max_connections=20, timeout=10.0, batch_size=DEFAULT_BATCH_SIZE):
+        self.base_url = base_url.rstrip('/')
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self._client = None
+        httpx = _load_httpx()
+        if httpx is not None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=timeout,
+                limits=httpx.Limits(max_connections=max_connections,
+                                    max_keepalive_connections=max_connections),
+            )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+
+    async def _post(self, path, body):
+        """POST mit JSON-Body → (status_code, JSON-Antwort oder None)"""
+        if self._client is not None:
+            response = await self._client.post(path, json=body)
+            try:
+                data = response.json()
+            except ValueError:
+                data = None
+            return response.status_code, data
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._post_urllib, path, body)
+
+    def _post_urllib(self, path, body):
+        import urllib.request
+        import urllib.error
+
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=json.dumps(body).encode('utf-8'),
+            headers={'Content-Type': 'application/json'},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                raw = response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            return e.code, None
+        try:
+            return status, json.loads(raw)
+        except ValueError:
+            return status, None
+
+    async def register(self, device):
+        """
+        Registriert ein Device
+
+        Returns:
+            Antwort des Backends (registriertes Device)
+
+        Raises:
+            RegistrationError bei HTTP-Fehlern, httpx.HTTPError / OSError bei Verbindungsfehlern
+        """
+        status, data = await self._post('/api/devices', device)
+        if status not in (200, 201):
+            raise RegistrationError(status)
+        return data
+
+    async def register_many(self, devices, on_batch=None):
+        """
+        Registriert viele Devices in Batches (batch_size pro Request)
+
+        Args:
+            devices: Liste von device_payload()-Dicts
+            on_batch: Optionaler Callback(result) nach jedem Batch
+
+        Returns:
+            Liste der Batch-Ergebnisse: {'batch', 'count', 'upserted', 'modified',
+            'server_ms', 'round_trip_ms', 'mode'} ('bulk' oder 'single')
+        """
+        results = []
+        use_bulk = True
+        for index, start in enumerate(range(0, len(devices), self.batch_size)):
+            batch = devices[start:start + self.batch_size]
+            batch_start = time.perf_counter()
+
+            result = None
+            if use_bulk:
+                status, data = await self._post('/api/devices/bulk', {'devices': batch})
+                if status in (404, 405):
+                    # Älteres Backend ohne Bulk-Endpoint
+                    use_bulk = False
+                elif status not in (200, 201):
+                    raise RegistrationError(status, (data or {}).get('message', ''))
+                else:
+                    result = {
+                        'upserted': data.get('upserted', 0),
+                        'modified': data.get('modified', 0),
+                        'server_ms': data.get('durationMs'),
+                        'mode': 'bulk',
+                    }
+
+            if result is None:
+                await self.register_parallel(batch)
+                result = {'upserted': None, 'modified': None, 'server_ms': None, 'mode': 'single'}
+
+            result.update({
+                'batch': index,
+                'count': len(batch),
+                'round_trip_ms': (time.perf_counter() - batch_start) * 1000,
+            })
+            results.append(result)
+            if on_batch:
+                on_batch(result)
+        return results
+
+    async def register_parallel(self, batch):
+        """Registriert die Devices einzeln (POST /api/devices), parallel bis max_connections"""
+        semaphore = asyncio.Semaphore(self.max_connections)
+
+        async def register_one(device):
+            async with semaphore:
+                await self.register(device)
+
+        await asyncio.gather(*(register_one(device) for device in batch))
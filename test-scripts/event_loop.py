@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Auswahl der Event-Loop-Implementierung (asyncio / uvloop)
+=========================================================
+Einheitliche Option --loop asyncio|uvloop für alle Python-Clients, Test-Server
+und Simulatoren. Standard über EVENT_LOOP (Umgebungsvariable), sonst asyncio.
+Ist uvloop nicht installiert, wird mit Warnung auf asyncio zurückgefallen.
+
+Verwendung:
+    from event_loop import add_loop_argument, loop_from_argv, run_loop
+
+    # Skripte mit argparse
+    add_loop_argument(parser)
+    run_loop(main(args), args.loop)
+
+    # Skripte ohne argparse (nur --loop wird ausgewertet)
+    run_loop(main(), loop_from_argv())
+
+Vergleich der Implementierungen: loop-bench.py
+"""
+
+import argparse
+import asyncio
+import os
+
+LOOPS = ('asyncio', 'uvloop')
+DEFAULT_LOOP = os.getenv("EVENT_LOOP", "asyncio")
+
+def add_loop_argument(parser):
+    """Fügt --loop zu einem ArgumentParser hinzu"""
+    parser.add_argument('--loop', choices=LOOPS, default=DEFAULT_LOOP,
+                        help=f"Event-Loop-Implementierung (Standard: $EVENT_LOOP oder asyncio, aktuell {DEFAULT_LOOP})")
+
+def loop_from_argv(argv=None):
+    """--loop aus der Kommandozeile für Skripte ohne eigenes argparse (andere Argumente bleiben unberührt)"""
+    parser = argparse.ArgumentParser(add_help=False)
+    add_loop_argument(parser)
+    args, _ = parser.parse_known_args(argv)
+    return args.loop
+
+def uvloop_available():
+    try:
+        import uvloop  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def loop_factory(loop):
+    """Factory für neue Event-Loops (None = Standard-asyncio)"""
+    if loop not in LOOPS:
+        raise ValueError(f"Unbekannte Event-Loop '{loop}' (erlaubt: {', '.join(LOOPS)})")
+    if loop == 'uvloop':
+        try:
+            import uvloop
+        except ImportError:
+            print("⚠ uvloop nicht installiert - verwende asyncio")
+            print("  Installiere mit: pip install uvloop")
+            return None
+        return uvloop.new_event_loop
+    return None
+
+def run_loop(main, loop=DEFAULT_LOOP):
+    """Wie asyncio.run(main), aber auf der gewählten Event-Loop-Implementierung"""
+    factory = loop_factory(loop)
+    if factory is None:
+        return asyncio.run(main)
+    if hasattr(asyncio, 'Runner'):
+        with asyncio.Runner(loop_factory=factory) as runner:
+            return runner.run(main)
+    # Python < 3.11: über die Loop-Policy
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return asyncio.run(main)
+
+def loop_name():
+    """Name der laufenden Event-Loop-Implementierung (für Ausgaben)"""
+    loop = asyncio.get_running_loop()
+    return 'uvloop' if type(loop).__module__.startswith('uvloop') else 'asyncio'
@@ -0,0 +1,488 @@
+#!/usr/bin/env python3
+"""
+Flotten-Simulator: viele Audio-Devices über mehrere Prozesse
+============================================================
+Simuliert Mikrofon-Devices wie device-client.py (RAW Audio im Echtzeit-Takt,
+eingerahmt von start/stop Control-USOs, TXT Output wird empfangen) - verteilt
+auf mehrere Worker-Prozesse mit je eigenem Event-Loop. Ein einzelner
+asyncio-Prozess schafft wegen JSON und Sende-Overhead unter dem GIL nur einige
+hundert Devices; mit --workers skaliert der Simulator über alle CPU-Kerne.
+
+- Device i läuft im Worker i % workers (Sharding), Verbindungsaufbau über --ramp verteilt
+- Jeder Worker schreibt Zähler und Latenz-Histogramme in seine Zeile eines
+  Shared-Memory-Arrays (fleet_stats.py); der Koordinator summiert und zeigt live
+  Durchsatz und Perzentile an
+- Ein Uhren-Abgleich pro Worker (alle Devices eines Prozesses teilen die Uhr)
+
+Gemessen:
+- send_lag: wie spät ein Chunk gegenüber dem Echtzeit-Takt rausgeht (Sättigung des Simulators)
+- loop_lag: Event-Loop-Verzögerung je Worker
+- downlink / time_to_final: Latenz der Antworten (wenn ein Flow TXT Output an die Devices schickt)
+
+Verwendung:
+    python3 fleet-sim.py --devices 2000 --workers 8 --ramp 20 --duration 60
+    python3 fleet-sim.py --devices 300 --workers 1          # Vergleich: ein Prozess
+    python3 fleet-sim.py --devices 1000 --talk 4 --pause 6 --report fleet.json
+    python3 fleet-sim.py --devices 500 --audio-file sprache.wav   # echte Sprache statt Rauschen
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import signal
+import sys
+import time
+from array import array
+from datetime import datetime
+from urllib.parse import urlencode
+
+try:
+    import websockets
+except ImportError:
+    print("❌ websockets nicht installiert!")
+    print("   Installiere mit: pip install websockets")
+    sys.exit(1)
+
+from clock_sync import ClockSync
+from fleet_stats import FleetStats, HISTOGRAMS
+from event_loop import add_loop_argument, run_loop
+from audio_io import read_audio_file, split_blocks, AudioBackendError
+
+# ======================================
+# KONFIGURATION - HIER ANPASSEN
+# ======================================
+WS_HOST = os.getenv("WS_HOST", "localhost")
+WS_PORT = int(os.getenv("WS_PORT", "8080"))
+WS_PATH = "/ws/external"
+API_KEY = os.getenv("SIMPLE_API_KEY", "default-api-key-123")
+
+DEFAULT_DEVICES = 100
+DEFAULT_WORKERS = os.cpu_count() or 1
+DEVICE_PREFIX = "fleet-device"
+
+# Audio wie device-client.py: 16 kHz, 16-bit Mono, 8000 Samples (500 ms) pro Chunk
+SAMPLE_RATE = 16000
+CHUNK_SIZE = 8000
+
+# Audio-Quelle: WAV/Raw-Datei (wie AUDIO_BACKEND=file im device-client.py), leer = leises Rauschen
+AUDIO_FILE = os.getenv("AUDIO_FILE", "")
+
+# Sprechmuster pro Device (Sekunden, jeweils ±50% Zufall)
+TALK_SECONDS = 4.0
+PAUSE_SECONDS = 6.0
+
+WELCOME_TIMEOUT = 10.0
+RECONNECT_DELAY = 1.0
+LAG_PROBE_INTERVAL = 0.05
+REPORT_FILE = "fleet-sim-report.json"
+
+# ======================================
+# ENDE KONFIGURATION
+# ======================================
+
+# Farben für Terminal-Output
+class Colors:
+    HEADER = '\033[95m'
+    OKBLUE = '\033[94m'
+    OKCYAN = '\033[96m'
+    OKGREEN = '\033[92m'
+    WARNING = '\033[93m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+def print_header(args):
+    """Zeigt den Header mit Konfiguration an"""
+    print(f"\n{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}")
+    print(f"{Colors.HEADER}{Colors.BOLD}  Flotten-Simulator (Multi-Prozess){Colors.ENDC}")
+    print(f"{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}\n")
+    print(f"{Colors.OKCYAN}🔗 Gateway:{Colors.ENDC} {args.url}")
+    print(f"{Colors.OKCYAN}📱 Devices:{Colors.ENDC} {args.devices} auf {args.workers} Worker-Prozesse "
+          f"(~{args.devices / args.workers:.0f} pro Prozess)")
+    print(f"{Colors.OKCYAN}🔁 Event-Loop:{Colors.ENDC} {args.loop} (pro Worker)")
+    print(f"{Colors.OKCYAN}🎤 Audio:{Colors.ENDC} {args.chunk_ms:.0f} ms Chunks aus {args.audio_file or 'Rauschen'}, "
+          f"{args.talk}s sprechen / {args.pause}s Pause (±50%)")
+    print(f"{Colors.OKCYAN}⏱️  Ablauf:{Colors.ENDC} {args.ramp}s Ramp-up, {args.duration}s Laufzeit "
+          f"(Anzeige alle {args.interval}s)\n")
+
+# ======================================
+# Worker-Prozess
+# ======================================
+
+def make_chunk(samples, seed):
+    """Leises Rauschen als Audio-Chunk (Inhalt ist für den Gateway egal, Größe zählt)"""
+    rng = random.Random(seed)
+    return array('h', (int(rng.gauss(0, 500)) for _ in range(samples))).tobytes()
+
+def load_chunks(path, samples):
+    """
+    Audio-Datei als Chunks im Device-Format (16 kHz Mono), wie das file-Backend aus audio_io.py
+    Andere Formate werden umgerechnet (benötigt numpy)
+    """
+    pcm, rate, channels, _ = read_audio_file(path, SAMPLE_RATE, 1)
+    if (rate, channels) != (SAMPLE_RATE, 1):
+        try:
+            from audio_resample import CaptureConverter
+        except ImportError:
+            raise AudioBackendError(f"{path}: {rate} Hz / {channels} Kanal/Kanäle - Umrechnung benötigt numpy") from None
+        pcm = CaptureConverter(rate, channels, SAMPLE_RATE).process(pcm)
+    chunks = split_blocks(pcm, samples * 2)
+    if not chunks:
+        raise AudioBackendError(f"{path}: keine Audio-Daten")
+    return chunks
+
+class Worker:
+    """Ein Prozess mit eigenem Event-Loop und einem Teil der Devices"""
+
+    def __init__(self, index, device_ids, args, stats, stop_event, start_at):
+        self.index = index
+        self.device_ids = device_ids
+        self.args = args
+        self.stats = stats.writer(index)
+        self.stop_event = stop_event
+        self.start_at = start_at
+        self.stopping = None
+        self.clock = ClockSync()
+        self.clock_lock = None
+        samples = int(SAMPLE_RATE * args.chunk_ms / 1000)
+        self.chunks = load_chunks(args.audio_file, samples) if args.audio_file else [make_chunk(samples, seed=index)]
+        self.rng = random.Random((args.seed or 0) * 1000 + index)
+
+    async def run(self):
+        self.stopping = asyncio.Event()
+        self.clock_lock = asyncio.Lock()
+        tasks = [asyncio.create_task(self.run_device(device_id)) for device_id in self.device_ids]
+        probe = asyncio.create_task(self.lag_probe())
+        # Stop-Signal des Koordinators (multiprocessing.Event) in den Loop holen
+        while not self.stop_event.is_set():
+            await asyncio.sleep(0.2)
+        self.stopping.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        probe.cancel()
+
+    async def pause(self, seconds):
+        """Schläft, bricht beim Stoppen ab (Rückgabe True = stoppen)"""
+        if seconds > 0:
+            try:
+                await asyncio.wait_for(self.stopping.wait(), timeout=seconds)
+            except asyncio.TimeoutError:
+                pass
+        return self.stopping.is_set()
+
+    async def lag_probe(self):
+        """Misst, wie viel später der Loop aufwacht als geplant"""
+        loop = asyncio.get_running_loop()
+        while True:
+            planned = loop.time() + LAG_PROBE_INTERVAL
+            await asyncio.sleep(LAG_PROBE_INTERVAL)
+            self.stats.observe('loop_lag', max(0.0, loop.time() - planned))
+
+    async def run_device(self, device_id):
+        # Gestaffelter Start: Device i verbindet bei start_at + i * ramp / devices
+        offset = device_id * self.args.ramp / max(self.args.devices, 1)
+        if await self.pause(self.start_at + offset - time.time()):
+            return
+
+        url = f"{self.args.url}?{urlencode({'clientId': f'{self.args.prefix}-{device_id}', 'secret': self.args.secret})}"
+        while not self.stopping.is_set():
+            try:
+                await self.connect_and_stream(url)
+            except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException):
+                self.stats.inc('disconnects')
+            if await self.pause(RECONNECT_DELAY):
+                return
+
+    async def connect_and_stream(self, url):
+        start = time.perf_counter()
+        try:
+            websocket = await asyncio.wait_for(
+                websockets.connect(url, ping_interval=None, close_timeout=2,
+                                   compression='deflate' if self.args.deflate else None),
+                timeout=WELCOME_TIMEOUT
+            )
+        except Exception:
+            # Verbindung kam nicht zustande (zählt nicht als Abbruch)
+            self.stats.inc('devices_failed')
+            return
+        try:
+            await asyncio.wait_for(websocket.recv(), timeout=WELCOME_TIMEOUT)
+        except Exception:
+            # Handshake ok, aber keine Willkommensnachricht - Socket schließen, sonst bleibt
+            # bei jedem Reconnect eine offene Verbindung am Gateway zurück
+            self.stats.inc('devices_failed')
+            await websocket.close()
+            return
+        self.stats.observe('connect', time.perf_counter() - start)
+        self.stats.inc('devices_connected')
+
+        async with websocket:
+            # Ein Uhren-Abgleich pro Prozess reicht (gleiche Uhr für alle Devices)
+            if not self.clock.synced and not self.args.no_clock_sync:
+                async with self.clock_lock:
+                    if not self.clock.synced:
+                        await self.clock.sync(websocket, samples=4)
+
+            state = {'stopped_at': None}
+            receiver = asyncio.create_task(self.receive(websocket, state))
+            try:
+                await self.stream(websocket, state)
+            finally:
+                receiver.cancel()
+
+    async def stream(self, websocket, state):
+        """Sprechen/Pause im Wechsel: start → Chunks im Echtzeit-Takt → stop"""
+        chunk_s = self.args.chunk_ms / 1000
+        if await self.pause(self.rng.uniform(0, self.args.pause)):
+            return
+
+        while not self.stopping.is_set():
+            session_id = f"audio_{self.index}_{id(websocket)}_{int(self.clock.now_ms())}"
+            await websocket.send(json.dumps(self.control_header('start', session_id)))
+            self.stats.inc('sessions')
+
+            chunks = max(1, round(self.args.talk * self.rng.uniform(0.5, 1.5) / chunk_s))
+            position = self.rng.randrange(len(self.chunks))  # Jede Session an anderer Stelle der Datei
+            next_at = time.perf_counter()
+            for n in range(chunks):
+                chunk = self.chunks[(position + n) % len(self.chunks)]
+                next_at += chunk_s
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                try:
+                    await websocket.send(chunk)
+                except websockets.exceptions.ConnectionClosed:
+                    self.stats.inc('send_errors')
+                    raise
+                self.stats.observe('send_lag', max(0.0, time.perf_counter() - next_at))
+                self.stats.inc('chunks_sent')
+                self.stats.inc('bytes_sent', len(chunk))
+                if self.stopping.is_set():
+                    break
+
+            await websocket.send(json.dumps(self.control_header('stop', session_id)))
+            state['stopped_at'] = time.perf_counter()
+            if await self.pause(self.args.pause * self.rng.uniform(0.5, 1.5)):
+                return
+
+    def control_header(self, action, session_id):
+        return self.clock.stamp({
+            "id": session_id,
+            "type": "control",
+            "sourceId": self.args.prefix,
+            "final": action == 'stop',
+            "control": {"action": action},
+        })
+
+    async def receive(self, websocket, state):
+        """Zählt eingehende Frames, misst Latenz von Headern und Zeit bis zum finalen Text"""
+        async for message in self.clock.receive(websocket):
+            self.stats.inc('frames_received')
+            self.stats.inc('bytes_received', len(message))
+            if not isinstance(message, str) or not message.startswith('{'):
+                continue
+            try:
+                data = json.loads(message)
+            except json.JSONDecodeError:
+                continue
+            if 'id' not in data or 'type' not in data:
+                continue
+            if self.clock.synced and isinstance(data.get('sentAt'), (int, float)):
+                self.stats.observe('downlink', max(0.0, self.clock.latency_ms(data['sentAt']) / 1000))
+            if data.get('type') == 'text' and data.get('final') and state['stopped_at'] is not None:
+                self.stats.observe('time_to_final', time.perf_counter() - state['stopped_at'])
+                self.stats.inc('final_texts')
+                state['stopped_at'] = None
+
+def worker_main(index, device_ids, args, stats, stop_event, start_at):
+    """Einstiegspunkt des Worker-Prozesses (Ctrl+C behandelt der Koordinator)"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    worker = Worker(index, device_ids, args, stats, stop_event, start_at)
+    run_loop(worker.run(), args.loop)
+
+# ======================================
+# Koordinator
+# ======================================
+
+def fmt_ms(seconds):
+    return f"{seconds * 1000:.0f}ms" if seconds is not None else '-'
+
+def print_live(elapsed, total, window, interval):
+    active = total.counter('devices_connected') - total.counter('disconnects')
+    mbit = window.counter('bytes_sent') * 8 / interval / 1_000_000
+    print(f"{Colors.OKCYAN}[{elapsed:6.1f}s]{Colors.ENDC} "
+          f"Devices {active:>5} (Fehler {total.counter('devices_failed')}) | "
+          f"↑ {window.counter('chunks_sent') / interval:7.0f} Chunks/s {mbit:6.1f} Mbit/s | "
+          f"↓ {window.counter('frames_received') / interval:6.0f} Frames/s | "
+          f"Sende-Lag p50 {fmt_ms(window.percentile('send_lag', 50))} p99 {fmt_ms(window.percentile('send_lag', 99))} | "
+          f"Loop-Lag p99 {fmt_ms(window.percentile('loop_lag', 99))}")
+
+def build_report(args, stats, wall_s):
+    """Erstellt den JSON-Report (gesamt und pro Worker)"""
+    def histograms(snapshot):
+        return {
+            name: {
+                'count': snapshot.count(name),
+                'mean_ms': round(snapshot.mean(name) * 1000, 2) if snapshot.count(name) else None,
+                **{f'p{p}_ms': round(snapshot.percentile(name, p) * 1000, 2) if snapshot.count(name) else None
+                   for p in (50, 90, 99)},
+            }
+            for name in HISTOGRAMS
+        }
+
+    total = stats.snapshot()
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'config': {
+            'url': args.url,
+            'devices': args.devices,
+            'workers': args.workers,
+            'chunk_ms': args.chunk_ms,
+            'audio_file': args.audio_file or None,
+            'talk_s': args.talk,
+            'pause_s': args.pause,
+            'ramp_s': args.ramp,
+            'duration_s': args.duration,
+            'deflate': args.deflate,
+        },
+        'summary': {
+            'wall_s': round(wall_s, 1),
+            **{name: total.counter(name) for name in (
+                'devices_connected', 'devices_failed', 'disconnects', 'sessions', 'chunks_sent',
+                'bytes_sent', 'frames_received', 'bytes_received', 'final_texts', 'send_errors')},
+            'chunks_per_s': round(total.counter('chunks_sent') / wall_s, 1) if wall_s > 0 else None,
+        },
+        'latency': histograms(total),
+        'workers': [
+            {
+                'worker': row,
+                'devices': len(range(row, args.devices, args.workers)),
+                'chunks_sent': stats.row(row).counter('chunks_sent'),
+                'latency': histograms(stats.row(row)),
+            }
+            for row in range(args.workers)
+        ],
+    }
+
+def print_summary(report):
+    summary = report['summary']
+    print(f"\n{Colors.BOLD}{'─'*70}{Colors.ENDC}")
+    print(f"{Colors.HEADER}📊 Ergebnis{Colors.ENDC}")
+    print(f"  {Colors.OKCYAN}• Verbunden:{Colors.ENDC} {summary['devices_connected']}  "
+          f"{Colors.OKCYAN}• Fehlgeschlagen:{Colors.ENDC} {summary['devices_failed']}  "
+          f"{Colors.OKCYAN}• Abbrüche:{Colors.ENDC} {summary['disconnects']}")
+    print(f"  {Colors.OKCYAN}• Gesendet:{Colors.ENDC} {summary['sessions']} Sessions, {summary['chunks_sent']} Chunks "
+          f"({summary['bytes_sent'] / 1_000_000:.1f} MB, {summary['chunks_per_s']} Chunks/s)")
+    print(f"  {Colors.OKCYAN}• Empfangen:{Colors.ENDC} {summary['frames_received']} Frames, "
+          f"{summary['final_texts']} finale Texte")
+
+    print(f"\n  {'Messung':<16}{'Anzahl':>10}{'p50':>10}{'p90':>10}{'p99':>10}")
+    for name, stats in report['latency'].items():
+        if not stats['count']:
+            continue
+        print(f"  {name:<16}{stats['count']:>10}" + ''.join(
+            f"{stats[key]:>8.1f}ms" for key in ('p50_ms', 'p90_ms', 'p99_ms')))
+
+    print(f"\n  {'Worker':<8}{'Devices':>9}{'Chunks':>10}{'Sende-Lag p99':>15}{'Loop-Lag p99':>14}")
+    for worker in report['workers']:
+        send_lag = worker['latency']['send_lag']['p99_ms']
+        loop_lag = worker['latency']['loop_lag']['p99_ms']
+        print(f"  {worker['worker']:<8}{worker['devices']:>9}{worker['chunks_sent']:>10}"
+              f"{(f'{send_lag:.1f}ms' if send_lag is not None else '-'):>15}"
+              f"{(f'{loop_lag:.1f}ms' if loop_lag is not None else '-'):>14}")
+    print(f"{Colors.BOLD}{'─'*70}{Colors.ENDC}")
+
+def run_fleet(args):
+    """Startet die Worker-Prozesse und zeigt live die aggregierten Werte an"""
+    stats = FleetStats(args.workers)
+    stop_event = multiprocessing.Event()
+    start_at = time.time() + 1.0  # Zeit für den Prozessstart
+    processes = [
+        multiprocessing.Process(
+            target=worker_main,
+            args=(index, list(range(index, args.devices, args.workers)), args, stats, stop_event, start_at),
+            name=f"fleet-worker-{index}",
+            daemon=True,
+        )
+        for index in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+
+    end_at = start_at + args.ramp + args.duration
+    previous = stats.snapshot()
+    try:
+        while time.time() < end_at:
+            time.sleep(min(args.interval, max(0.0, end_at - time.time())))
+            current = stats.snapshot()
+            print_live(time.time() - start_at, current, current - previous, args.interval)
+            previous = current
+            if not any(process.is_alive() for process in processes):
+                print(f"{Colors.FAIL}✗ Alle Worker beendet{Colors.ENDC}")
+                break
+    except KeyboardInterrupt:
+        print(f"\n{Colors.WARNING}Abgebrochen - stoppe Worker...{Colors.ENDC}")
+
+    stop_event.set()
+    for process in processes:
+        process.join(timeout=10)
+        if process.is_alive():
+            process.terminate()
+    return stats, time.time() - start_at
+
+def parse_args():
+    """Kommandozeilen-Argumente"""
+    parser = argparse.ArgumentParser(description="Flotten-Simulator für Audio-Devices (mehrere Prozesse)")
+    parser.add_argument('--url', default=f"ws://{WS_HOST}:{WS_PORT}{WS_PATH}",
+                        help="Gateway-URL ohne Query (clientId/secret werden angehängt)")
+    parser.add_argument('--secret', default=API_KEY, help="Secret (Standard: $SIMPLE_API_KEY)")
+    parser.add_argument('--devices', '-n', type=int, default=DEFAULT_DEVICES, help="Anzahl Devices")
+    parser.add_argument('--workers', '-w', type=int, default=DEFAULT_WORKERS,
+                        help=f"Worker-Prozesse (Standard: CPU-Kerne = {DEFAULT_WORKERS})")
+    parser.add_argument('--ramp', type=float, default=10.0, help="Sekunden, über die sich die Verbindungen verteilen")
+    parser.add_argument('--duration', type=float, default=60.0, help="Laufzeit nach dem Ramp-up in Sekunden")
+    parser.add_argument('--chunk-ms', type=float, default=CHUNK_SIZE * 1000 / SAMPLE_RATE, help="Chunk-Dauer in ms")
+    parser.add_argument('--audio-file', default=AUDIO_FILE,
+                        help="WAV/Raw-Datei als Audio-Quelle (Standard: $AUDIO_FILE, sonst Rauschen)")
+    parser.add_argument('--talk', type=float, default=TALK_SECONDS, help="Sprechdauer pro Session in Sekunden")
+    parser.add_argument('--pause', type=float, default=PAUSE_SECONDS, help="Pause zwischen Sessions in Sekunden")
+    parser.add_argument('--deflate', action='store_true', help="permessage-deflate anbieten (mehr CPU)")
+    parser.add_argument('--no-clock-sync', action='store_true', help="Kein Uhren-Abgleich (keine Downlink-Latenz)")
+    parser.add_argument('--prefix', default=DEVICE_PREFIX, help="Präfix der clientIds")
+    parser.add_argument('--seed', type=int, default=None, help="Seed für Sprechmuster")
+    parser.add_argument('--interval', type=float, default=2.0, help="Anzeige-Intervall in Sekunden")
+    parser.add_argument('--report', default=REPORT_FILE, help=f"JSON-Report (Standard: {REPORT_FILE})")
+    add_loop_argument(parser)
+    args = parser.parse_args()
+
+    if args.workers < 1:
+        parser.error("--workers muss >= 1 sein")
+    args.workers = min(args.workers, max(args.devices, 1))
+    if args.audio_file:
+        # Früh prüfen statt in jedem Worker-Prozess zu scheitern
+        try:
+            load_chunks(args.audio_file, int(SAMPLE_RATE * args.chunk_ms / 1000))
+        except (AudioBackendError, OSError) as e:
+            parser.error(f"--audio-file: {e}")
+    return args
+
+def main():
+    """Entry Point"""
+    args = parse_args()
+    print_header(args)
+
+    stats, wall_s = run_fleet(args)
+    report = build_report(args, stats, wall_s)
+    print_summary(report)
+
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n{Colors.OKGREEN}✓ Report geschrieben:{Colors.ENDC} {args.report}\n")
+
+    sys.exit(1 if report['summary']['devices_failed'] else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Shared-Memory-Statistik für den Flotten-Simulator
+=================================================
+Jeder Worker-Prozess schreibt Zähler und Latenz-Histogramme in seine eigene
+Zeile eines gemeinsamen int64-Arrays (multiprocessing.RawArray, ohne Lock -
+pro Zeile gibt es genau einen Schreiber). Der Koordinator liest alle Zeilen,
+summiert sie und berechnet daraus Durchsatz und Perzentile; über die Differenz
+zweier Snapshots auch für das letzte Intervall.
+
+Histogramme haben feste, logarithmisch verteilte Buckets (0,1 ms bis ~100 s,
+Faktor 1,25) - so lassen sich Perzentile über Prozesse hinweg einfach
+aufsummieren, ohne Einzelwerte zu übertragen.
+
+Verwendung:
+    from fleet_stats import FleetStats
+
+    stats = FleetStats(workers=4)                 # im Koordinator, vor dem Start der Prozesse
+    writer = stats.writer(worker_index)           # im Worker (stats wird an den Prozess übergeben)
+    writer.inc('chunks_sent')
+    writer.observe('send_lag', 0.004)             # Sekunden
+
+    snapshot = stats.snapshot()                   # im Koordinator
+    snapshot.percentile('send_lag', 99)           # Sekunden
+"""
+
+import math
+import multiprocessing
+
+COUNTERS = (
+    'devices_connected',
+    'devices_failed',
+    'disconnects',
+    'sessions',
+    'chunks_sent',
+    'bytes_sent',
+    'frames_received',
+    'bytes_received',
+    'final_texts',
+    'send_errors',
+)
+
+HISTOGRAMS = (
+    'connect',          # Verbindungsaufbau bis Willkommensnachricht
+    'send_lag',         # Chunk gesendet - geplanter Zeitpunkt (Echtzeit-Takt)
+    'loop_lag',         # Event-Loop-Verzögerung im Worker (CPU/GIL-Sättigung)
+    'downlink',         # One-Way-Latenz Gateway → Device (nach Uhren-Abgleich)
+    'time_to_final',    # stop → erster finaler TXT Output
+)
+
+BUCKET_MIN = 0.0001     # Sekunden
+BUCKET_FACTOR = 1.25
+BUCKET_COUNT = 64       # bis ~0.0001 * 1.25^63 ≈ 127 s
+
+# Obergrenze jedes Buckets (der letzte nimmt alles darüber auf)
+BUCKET_BOUNDS = [BUCKET_MIN * BUCKET_FACTOR ** i for i in range(BUCKET_COUNT)]
+
+_COUNTER_INDEX = {name: i for i, name in enumerate(COUNTERS)}
+_HISTOGRAM_OFFSET = {name: len(COUNTERS) + i * (BUCKET_COUNT + 1) for i, name in enumerate(HISTOGRAMS)}
+# Pro Histogramm: BUCKET_COUNT Zähler + Summe in Mikrosekunden
+ROW_SIZE = len(COUNTERS) + len(HISTOGRAMS) * (BUCKET_COUNT + 1)
+
+def bucket_index(seconds):
+    """Bucket für einen Messwert in Sekunden"""
+    if seconds <= BUCKET_MIN:
+        return 0
+    index = math.ceil(math.log(seconds / BUCKET_MIN, BUCKET_FACTOR))
+    return min(index, BUCKET_COUNT - 1)
+
+class StatsWriter:
+    """Schreibzugriff eines Workers auf seine Zeile"""
+
+    def __init__(self, array, row):
+        self._array = array
+        self._base = row * ROW_SIZE
+
+    def inc(self, name, amount=1):
+        self._array[self._base + _COUNTER_INDEX[name]] += amount
+
+    def observe(self, name, seconds):
+        offset = self._base + _HISTOGRAM_OFFSET[name]
+        self._array[offset + bucket_index(seconds)] += 1
+        self._array[offset + BUCKET_COUNT] += int(seconds * 1_000_000)
+
+class StatsSnapshot:
+    """Summe aller Worker-Zeilen zu einem Zeitpunkt"""
+
+    def __init__(self, values):
+        self.values = values
+
+    def __sub__(self, other):
+        return StatsSnapshot([a - b for a, b in zip(self.values, other.values)])
+
+    def counter(self, name):
+        return self.values[_COUNTER_INDEX[name]]
+
+    def buckets(self, name):
+        offset = _HISTOGRAM_OFFSET[name]
+        return self.values[offset:offset + BUCKET_COUNT]
+
+    def count(self, name):
+        return sum(self.buckets(name))
+
+    def mean(self, name):
+        """Mittelwert in Sekunden (None ohne Messwerte)"""
+        count = self.count(name)
+        if not count:
+            return None
+        return self.values[_HISTOGRAM_OFFSET[name] + BUCKET_COUNT] / 1_000_000 / count
+
+    def percentile(self, name, pct):
+        """Perzentil in Sekunden (Obergrenze des Buckets, None ohne Messwerte)"""
+        buckets = self.buckets(name)
+        total = sum(buckets)
+        if not total:
+            return None
+        rank = max(1, math.ceil(pct / 100 * total))
+        seen = 0
+        for index, count in enumerate(buckets):
+            seen += count
+            if seen >= rank:
+                return BUCKET_BOUNDS[index]
+        return BUCKET_BOUNDS[-1]
+
+class FleetStats:
+    """Gemeinsames Statistik-Array für alle Worker (eine Zeile pro Worker)"""
+
+    def __init__(self, workers):
+        self.workers = workers
+        self.array = multiprocessing.RawArray('q', workers * ROW_SIZE)
+
+    def writer(self, row):
+        return StatsWriter(self.array, row)
+
+    def row(self, row):
+        """Snapshot einer einzelnen Worker-Zeile"""
+        return StatsSnapshot(self.array[row * ROW_SIZE:(row + 1) * ROW_SIZE])
+
+    def snapshot(self):
+        """Summe über alle Worker"""
+        values = [0] * ROW_SIZE
+        for row in range(self.workers):
+            for i, value in enumerate(self.array[row * ROW_SIZE:(row + 1) * ROW_SIZE]):
+                values[i] += value
+        return StatsSnapshot(values)
@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+Flowise Last- und Latenz-Test
+=============================
+Feuert Prediction-Requests mit fester Parallelität (closed loop) oder fester
+Ankunftsrate (open loop) gegen einen Flowise-Chatflow und misst:
+
+- Verbindungsaufbau (TCP + TLS, nur bei neuen Verbindungen)
+- Time-to-first-Token (Streaming: erstes "token"-Event, Blocking: Antwort)
+- Tokens/s (Streaming: Token-Events ab dem ersten Token)
+- Gesamt-Latenz mit Perzentilen (p50/p90/p95/p99)
+- Fehler nach Klasse (Timeouts, Verbindungsfehler, HTTP 4xx/5xx, Stream-Fehler)
+
+Das Ergebnis wird als JSON-Report geschrieben (Grundlage für das Sizing
+des Flowise-Deployments).
+
+Verwendung:
+    1. Passe FLOWISE_API_URL an oder übergib --url
+    2. Setze FLOWISE_API_KEY (Umgebungsvariable) oder übergib --token
+    3. Installiere Abhängigkeiten: pip install httpx
+    4. Führe aus:
+       python3 flowise-load-test.py --requests 50 --concurrency 5 --mode streaming
+       python3 flowise-load-test.py --requests 100 --rate 2 --mode blocking
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+
+# HTTP-Client (async, mit Streaming-Support)
+try:
+    import httpx
+except ImportError:
+    print("❌ httpx nicht installiert!")
+    print("   Installiere mit: pip install httpx")
+    sys.exit(1)
+
+from event_loop import add_loop_argument, run_loop
+from latency_stats import percentile, summarize
+
+# ======================================
+# KONFIGURATION - HIER ANPASSEN
+# ======================================
+FLOWISE_API_URL = os.getenv(
+    "FLOWISE_API_URL",
+    "https://flowise.local.chase295.de/api/v1/prediction/203c3495-cacc-408f-b9ea-8df04d44817c"
+)
+FLOWISE_API_KEY = os.getenv("FLOWISE_API_KEY", "")
+
+# SSL-Verifizierung (für selbst-signierte Zertifikate deaktivieren)
+VERIFY_SSL = False
+
+# Standard-Lastprofil
+DEFAULT_REQUESTS = 20
+DEFAULT_CONCURRENCY = 4
+DEFAULT_QUESTION = "Hey, how are you?"
+
+# Timeouts (Sekunden)
+CONNECT_TIMEOUT = 10.0
+READ_TIMEOUT = 60.0     # Maximale Pause zwischen zwei Bytes
+TOTAL_TIMEOUT = 120.0   # Maximale Gesamtdauer eines Requests
+
+REPORT_FILE = "flowise-load-report.json"
+
+# ======================================
+# ENDE KONFIGURATION
+# ======================================
+
+# Farben für Terminal-Output
+class Colors:
+    HEADER = '\033[95m'
+    OKBLUE = '\033[94m'
+    OKCYAN = '\033[96m'
+    OKGREEN = '\033[92m'
+    WARNING = '\033[93m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+def print_header(args):
+    """Zeigt den Header mit Konfiguration an"""
+    print(f"\n{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}")
+    print(f"{Colors.HEADER}{Colors.BOLD}  Flowise Last- und Latenz-Test{Colors.ENDC}")
+    print(f"{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}\n")
+    print(f"{Colors.OKCYAN}🔗 Endpoint:{Colors.ENDC} {args.url}")
+    print(f"{Colors.OKCYAN}📡 Modus:{Colors.ENDC} {args.mode}")
+    print(f"{Colors.OKCYAN}📦 Requests:{Colors.ENDC} {args.requests}")
+    if args.rate:
+        print(f"{Colors.OKCYAN}⏱️  Ankunftsrate:{Colors.ENDC} {args.rate}/s "
+              f"({'Poisson' if args.poisson else 'gleichmäßig'}, max. {args.concurrency} parallel)")
+    else:
+        print(f"{Colors.OKCYAN}🔀 Parallelität:{Colors.ENDC} {args.concurrency}")
+    print(f"{Colors.OKCYAN}⌛ Timeouts:{Colors.ENDC} connect {args.connect_timeout}s, "
+          f"read {args.read_timeout}s, gesamt {args.timeout}s\n")
+
+def classify_error(error: Exception) -> str:
+    """Ordnet eine Exception einer Fehlerklasse zu"""
+    if isinstance(error, httpx.ConnectTimeout):
+        return 'timeout_connect'
+    if isinstance(error, httpx.ReadTimeout):
+        return 'timeout_read'
+    if isinstance(error, httpx.PoolTimeout):
+        return 'timeout_pool'
+    if isinstance(error, asyncio.TimeoutError):
+        return 'timeout_total'
+    if isinstance(error, httpx.ConnectError):
+        return 'connect_error'
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return 'http_4xx' if status < 500 else 'http_5xx'
+    if isinstance(error, FlowiseStreamError):
+        return 'stream_error'
+    if isinstance(error, (httpx.RemoteProtocolError, httpx.ReadError)):
+        return 'protocol_error'
+    return 'other'
+
+class FlowiseStreamError(Exception):
+    """Flowise hat im SSE-Stream ein error-Event gesendet"""
+
+def parse_sse_event(raw_event: str):
+    """
+    Parst ein SSE-Event (wie FlowiseService im Backend)
+    Flowise verschachtelt: event "message" mit data {"event": "token", "data": "..."}
+
+    Returns:
+        tuple: (event, data)
+    """
+    event = 'message'
+    data = ''
+    for line in raw_event.split('\n'):
+        if line.startswith('event:'):
+            event = line[6:].strip()
+        elif line.startswith('data:'):
+            data = line[5:].strip()
+
+    if event == 'message' and data:
+        try:
+            nested = json.loads(data)
+            if isinstance(nested, dict) and 'event' in nested and 'data' in nested:
+                return nested['event'], nested['data']
+        except json.JSONDecodeError:
+            pass
+    return event, data
+
+async def run_request(client: httpx.AsyncClient, request_id: int, args, question: str) -> dict:
+    """
+    Führt einen Prediction-Request aus und misst alle Phasen
+
+    Returns:
+        dict mit Messwerten (Sekunden) oder Fehlerklasse
+    """
+    result = {
+        'id': request_id,
+        'ok': False,
+        'connect_s': None,
+        'ttfb_s': None,
+        'ttft_s': None,
+        'total_s': None,
+        'tokens': 0,
+        'tokens_per_s': None,
+        'status': None,
+        'error': None,
+        'error_class': None,
+    }
+    trace_times = {}
+
+    async def trace(event_name, info):
+        # httpcore Trace-Events: connection.connect_tcp.started / ...complete usw.
+        trace_times[event_name] = time.perf_counter()
+
+    payload = {'question': question}
+    headers = {'Content-Type': 'application/json'}
+    if args.token:
+        headers['Authorization'] = f"Bearer {args.token}"
+    if args.mode == 'streaming':
+        payload['streaming'] = True
+        headers['Accept'] = 'text/event-stream'
+
+    start = time.perf_counter()
+    try:
+        async def perform():
+            async with client.stream('POST', args.url, json=payload, headers=headers,
+                                     extensions={'trace': trace}) as response:
+                result['status'] = response.status_code
+                result['ttfb_s'] = time.perf_counter() - start
+                if response.status_code >= 400:
+                    await response.aread()
+                    response.raise_for_status()
+
+                if args.mode == 'blocking':
+                    body = await response.aread()
+                    result['ttft_s'] = time.perf_counter() - start
+                    try:
+                        data = json.loads(body)
+                        text = data.get('text', '') if isinstance(data, dict) else str(data)
+                    except json.JSONDecodeError:
+                        text = body.decode('utf-8', errors='replace')
+                    # Ohne Streaming keine Token-Events - Wörter als Näherung
+                    result['tokens'] = len(text.split())
+                    return
+
+                buffer = ''
+                async for chunk in response.aiter_text():
+                    buffer += chunk.replace('\r\n', '\n')
+                    events = buffer.split('\n\n')
+                    buffer = events.pop()
+                    for raw_event in events:
+                        if not raw_event.strip():
+                            continue
+                        event, data = parse_sse_event(raw_event)
+                        if event == 'token':
+                            if result['ttft_s'] is None:
+                                result['ttft_s'] = time.perf_counter() - start
+                            result['tokens'] += 1
+                        elif event == 'error':
+                            raise FlowiseStreamError(str(data)[:200])
+
+        await asyncio.wait_for(perform(), timeout=args.timeout)
+        result['total_s'] = time.perf_counter() - start
+        result['ok'] = True
+
+        # Tokens/s: Streaming ab erstem Token, Blocking über die Gesamtdauer
+        if args.mode == 'streaming' and result['ttft_s'] is not None and result['tokens'] > 1:
+            generation_s = result['total_s'] - result['ttft_s']
+            if generation_s > 0:
+                result['tokens_per_s'] = (result['tokens'] - 1) / generation_s
+        elif args.mode == 'blocking' and result['tokens']:
+            result['tokens_per_s'] = result['tokens'] / result['total_s']
+
+    except Exception as e:
+        result['total_s'] = time.perf_counter() - start
+        result['error_class'] = classify_error(e)
+        result['error'] = f"{type(e).__name__}: {e}"[:300]
+
+    # Verbindungsaufbau nur messbar, wenn keine Pool-Verbindung wiederverwendet wurde
+    connect_start = trace_times.get('connection.connect_tcp.started')
+    connect_end = trace_times.get('connection.start_tls.complete') or trace_times.get('connection.connect_tcp.complete')
+    if connect_start and connect_end:
+        result['connect_s'] = connect_end - connect_start
+
+    return result
+
+def print_result(result: dict, verbose: bool):
+    """Zeigt das Ergebnis eines Requests an"""
+    if result['ok']:
+        if not verbose:
+            return
+        ttft = f"{result['ttft_s'] * 1000:.0f}ms" if result['ttft_s'] is not None else '-'
+        print(f"{Colors.OKGREEN}✓ #{result['id']:04d}{Colors.ENDC} "
+              f"TTFT {ttft}, gesamt {result['total_s'] * 1000:.0f}ms, {result['tokens']} Tokens")
+    else:
+        print(f"{Colors.FAIL}✗ #{result['id']:04d} [{result['error_class']}]{Colors.ENDC} {result['error']}")
+
+async def run_closed_loop(client, args, questions, results):
+    """Feste Parallelität: N Worker senden jeweils den nächsten Request"""
+    counter = iter(range(args.requests))
+
+    async def worker():
+        for request_id in counter:
+            question = questions[request_id % len(questions)]
+            result = await run_request(client, request_id, args, question)
+            result['queue_delay_s'] = 0.0
+            results.append(result)
+            print_result(result, args.verbose)
+
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+
+async def run_open_loop(client, args, questions, results):
+    """
+    Feste Ankunftsrate: Requests starten nach Fahrplan, unabhängig von Antworten
+    Die Parallelität begrenzt die Requests in Flight; Wartezeit wird als
+    queue_delay_s erfasst (zeigt Überlast an).
+    """
+    rng = random.Random(args.seed)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    start = time.perf_counter()
+    tasks = []
+
+    async def launch(request_id, scheduled_at):
+        async with semaphore:
+            queue_delay = time.perf_counter() - scheduled_at
+            question = questions[request_id % len(questions)]
+            result = await run_request(client, request_id, args, question)
+            result['queue_delay_s'] = queue_delay
+            results.append(result)
+            print_result(result, args.verbose)
+
+    next_at = start
+    for request_id in range(args.requests):
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(launch(request_id, next_at)))
+        interval = rng.expovariate(args.rate) if args.poisson else 1.0 / args.rate
+        next_at += interval
+
+    await asyncio.gather(*tasks)
+
+def build_report(args, results, wall_s) -> dict:
+    """Erstellt den JSON-Report"""
+    ok = [r for r in results if r['ok']]
+    errors = {}
+    for r in results:
+        if not r['ok']:
+            errors[r['error_class']] = errors.get(r['error_class'], 0) + 1
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'config': {
+            'url': args.url,
+            'mode': args.mode,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'rate': args.rate,
+            'poisson': args.poisson,
+            'connect_timeout_s': args.connect_timeout,
+            'read_timeout_s': args.read_timeout,
+            'total_timeout_s': args.timeout,
+        },
+        'summary': {
+            'wall_s': round(wall_s, 3),
+            'succeeded': len(ok),
+            'failed': len(results) - len(ok),
+            'requests_per_s': round(len(ok) / wall_s, 3) if wall_s > 0 else None,
+            'tokens_total': sum(r['tokens'] for r in ok),
+            'errors': errors,
+        },
+        'latency_ms': {
+            'connect': summarize([r['connect_s'] for r in results]),
+            'ttfb': summarize([r['ttfb_s'] for r in ok]),
+            'ttft': summarize([r['ttft_s'] for r in ok]),
+            'total': summarize([r['total_s'] for r in ok]),
+            'queue_delay': summarize([r.get('queue_delay_s') for r in results]) if args.rate else None,
+        },
+        'tokens_per_s': (lambda v: {
+            'mean': round(statistics.mean(v), 1),
+            'p50': round(percentile(v, 50), 1),
+            'min': round(min(v), 1),
+        } if v else None)([r['tokens_per_s'] for r in ok if r['tokens_per_s']]),
+        'requests': sorted(results, key=lambda r: r['id']),
+    }
+
+def print_summary(report: dict):
+    """Zeigt die Zusammenfassung in der Konsole an"""
+    summary = report['summary']
+    print(f"\n{Colors.BOLD}{'─'*70}{Colors.ENDC}")
+    print(f"{Colors.HEADER}📊 Ergebnis{Colors.ENDC}")
+    print(f"  {Colors.OKCYAN}• Erfolgreich:{Colors.ENDC} {summary['succeeded']}  "
+          f"{Colors.OKCYAN}• Fehler:{Colors.ENDC} {summary['failed']}")
+    for error_class, count in sorted(summary['errors'].items()):
+        print(f"    {Colors.FAIL}- {error_class}: {count}{Colors.ENDC}")
+    print(f"  {Colors.OKCYAN}• Durchsatz:{Colors.ENDC} {summary['requests_per_s']} Requests/s "
+          f"({summary['wall_s']}s Wall-Time)")
+
+    print(f"\n  {'Phase':<14}{'p50':>10}{'p90':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for name, stats in report['latency_ms'].items():
+        if not stats:
+            continue
+        print(f"  {name:<14}" + ''.join(f"{stats[key]:>8.0f}ms" for key in ('p50', 'p90', 'p95', 'p99', 'max')))
+
+    if report['tokens_per_s']:
+        tps = report['tokens_per_s']
+        print(f"\n  {Colors.OKCYAN}• Tokens/s:{Colors.ENDC} mittel {tps['mean']}, p50 {tps['p50']}, min {tps['min']}")
+    print(f"{Colors.BOLD}{'─'*70}{Colors.ENDC}")
+
+def load_questions(args):
+    """Fragen aus Datei (eine pro Zeile) oder --question"""
+    if args.questions_file:
+        with open(args.questions_file, 'r', encoding='utf-8') as f:
+            questions = [line.strip() for line in f if line.strip()]
+        if questions:
+            return questions
+    return [args.question]
+
+def parse_args():
+    """Kommandozeilen-Argumente"""
+    parser = argparse.ArgumentParser(description="Flowise Last- und Latenz-Test")
+    parser.add_argument('--url', default=FLOWISE_API_URL, help="Flowise Prediction-URL")
+    parser.add_argument('--token', default=FLOWISE_API_KEY, help="Bearer-Token (Standard: $FLOWISE_API_KEY)")
+    parser.add_argument('--mode', choices=['blocking', 'streaming'], default='streaming',
+                        help="blocking = JSON-Antwort, streaming = SSE mit streaming: true")
+    parser.add_argument('--requests', '-n', type=int, default=DEFAULT_REQUESTS, help="Anzahl Requests")
+    parser.add_argument('--concurrency', '-c', type=int, default=DEFAULT_CONCURRENCY,
+                        help="Parallele Requests (bei --rate: Maximum in Flight)")
+    parser.add_argument('--rate', type=float, default=None,
+                        help="Ankunftsrate in Requests/s (open loop) statt fester Parallelität")
+    parser.add_argument('--poisson', action='store_true', help="Ankünfte exponentiell verteilt (mit --rate)")
+    parser.add_argument('--seed', type=int, default=None, help="Seed für reproduzierbare Ankunftszeiten")
+    parser.add_argument('--question', default=DEFAULT_QUESTION, help="Frage für alle Requests")
+    parser.add_argument('--questions-file', help="Datei mit Fragen (eine pro Zeile, rotierend)")
+    parser.add_argument('--connect-timeout', type=float, default=CONNECT_TIMEOUT)
+    parser.add_argument('--read-timeout', type=float, default=READ_TIMEOUT)
+    parser.add_argument('--timeout', type=float, default=TOTAL_TIMEOUT, help="Gesamt-Timeout pro Request")
+    parser.add_argument('--report', default=REPORT_FILE, help=f"JSON-Report (Standard: {REPORT_FILE})")
+    parser.add_argument('--verbose', '-v', action='store_true', help="Jeden erfolgreichen Request anzeigen")
+    add_loop_argument(parser)
+    args = parser.parse_args()
+    if args.concurrency < 1 or args.requests < 1:
+        parser.error("--requests und --concurrency müssen >= 1 sein")
+    if args.rate is not None and args.rate <= 0:
+        parser.error("--rate muss > 0 sein")
+    return args
+
+async def load_test(args) -> dict:
+    """Hauptfunktion: führt den Lasttest aus und gibt den Report zurück"""
+    print_header(args)
+    questions = load_questions(args)
+
+    timeout = httpx.Timeout(args.timeout, connect=args.connect_timeout, read=args.read_timeout)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    results = []
+
+    async with httpx.AsyncClient(timeout=timeout, limits=limits, verify=VERIFY_SSL) as client:
+        print(f"{Colors.OKCYAN}⏳ Starte Lasttest...{Colors.ENDC}\n")
+        start = time.perf_counter()
+        if args.rate:
+            await run_open_loop(client, args, questions, results)
+        else:
+            await run_closed_loop(client, args, questions, results)
+        wall_s = time.perf_counter() - start
+
+    report = build_report(args, results, wall_s)
+    print_summary(report)
+
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n{Colors.OKGREEN}✓ Report gespeichert:{Colors.ENDC} {args.report}\n")
+    return report
+
+def main():
+    """Entry Point"""
+    try:
+        if sys.version_info < (3, 7):
+            print(f"{Colors.FAIL}✗ Python 3.7 oder höher erforderlich!{Colors.ENDC}")
+            sys.exit(1)
+
+        args = parse_args()
+        report = run_loop(load_test(args), args.loop)
+        if report['summary']['succeeded'] == 0:
+            sys.exit(1)
+
+    except KeyboardInterrupt:
+        print(f"\n{Colors.WARNING}Abgebrochen.{Colors.ENDC}\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/bin/bash
+
+# Flowise Last- und Latenz-Test - Start Script
+# ============================================
+# Startet den Python-Lasttest gegen einen Flowise-Chatflow.
+# Alle Argumente werden an flowise-load-test.py weitergereicht.
+
+# Farben für Output
+RED='\033[0;31m'
+GREEN='\033[0;32m'
+YELLOW='\033[1;33m'
+BLUE='\033[0;34m'
+NC='\033[0m' # No Color
+
+echo -e "${BLUE}========================================${NC}"
+echo -e "${BLUE}  Flowise Last- und Latenz-Test${NC}"
+echo -e "${BLUE}========================================${NC}\n"
+
+# Prüfe ob Python 3 installiert ist
+if ! command -v python3 &> /dev/null; then
+    echo -e "${RED}✗ Python 3 ist nicht installiert!${NC}"
+    exit 1
+fi
+
+# Prüfe ob httpx-Modul installiert ist
+python3 -c "import httpx" 2>/dev/null
+
+if [ $? -ne 0 ]; then
+    echo -e "${YELLOW}⚠️  Python 'httpx' Modul nicht gefunden${NC}"
+    echo -e "${BLUE}📦 Installiere httpx...${NC}\n"
+    pip3 install httpx
+    echo ""
+fi
+
+if [ -z "$FLOWISE_API_KEY" ]; then
+    echo -e "${YELLOW}💡 FLOWISE_API_KEY ist nicht gesetzt - Requests ohne Bearer-Token (oder --token angeben)${NC}\n"
+fi
+
+# Starte Python-Script
+SCRIPT_PATH="$(dirname "$0")/flowise-load-test.py"
+echo -e "${GREEN}🚀 Starte Lasttest...${NC}\n"
+python3 "$SCRIPT_PATH" "$@"
+
+echo -e "\n${GREEN}✓ Fertig!${NC}\n"
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Connection-Storm-Test für das WebSocket-Gateway
+===============================================
+Simuliert viele Devices, die gleichzeitig (z.B. nach einem Stromausfall)
+oder mit fester Rate neu verbinden, und misst den Auth-Pfad des Gateways
+(validateClientSecret → ggf. getSecret mit MongoDB-Lookup + Entschlüsselung
+→ updateDeviceStatus → Willkommensnachricht):
+
+- Handshake (TCP + HTTP-Upgrade)
+- Accept-to-Welcome (Upgrade abgeschlossen → Willkommensnachricht bzw. Ablehnung)
+- Verbindungen/s (erfolgreiche Willkommensnachrichten pro Sekunde)
+- Fehlerbilder nach Klasse (Auth abgelehnt, Timeouts, HTTP-Status, abgelehnte Verbindungen)
+
+Gültige Secrets nutzen SIMPLE_API_KEY (kein DB-Lookup), ungültige Secrets laufen
+immer durch getSecret (MongoDB-Lookup) - mit --invalid-ratio lässt sich der
+teure Pfad gezielt belasten.
+
+Verwendung:
+    1. Passe WS_HOST/WS_PORT an oder übergib --url
+    2. Setze SIMPLE_API_KEY (Umgebungsvariable) oder übergib --secret
+    3. Installiere Abhängigkeiten: pip install websockets
+    4. Führe aus:
+       python3 gateway-storm-test.py --devices 500                       # alle auf einmal
+       python3 gateway-storm-test.py --devices 500 --rate 50 --hold 10   # 50 Connects/s, 10s halten
+       python3 gateway-storm-test.py --devices 200 --invalid-ratio 0.5   # halb ungültige Secrets
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+from urllib.parse import urlencode
+
+try:
+    import websockets
+except ImportError:
+    print("❌ websockets nicht installiert!")
+    print("   Installiere mit: pip install websockets")
+    sys.exit(1)
+
+from event_loop import add_loop_argument, run_loop
+from latency_stats import summarize
+
+# ======================================
+# KONFIGURATION - HIER ANPASSEN
+# ======================================
+WS_HOST = os.getenv("WS_HOST", "localhost")
+WS_PORT = int(os.getenv("WS_PORT", "8080"))
+WS_PATH = "/ws/external"
+API_KEY = os.getenv("SIMPLE_API_KEY", "default-api-key-123")
+
+# Standard-Lastprofil
+DEFAULT_DEVICES = 100
+DEFAULT_CONCURRENCY = 500   # Max. gleichzeitige Verbindungsaufbauten
+DEVICE_PREFIX = "storm-device"
+
+# Timeouts (Sekunden)
+HANDSHAKE_TIMEOUT = 10.0
+WELCOME_TIMEOUT = 10.0
+
+REPORT_FILE = "gateway-storm-report.json"
+
+# ======================================
+# ENDE KONFIGURATION
+# ======================================
+
+# Farben für Terminal-Output
+class Colors:
+    HEADER = '\033[95m'
+    OKBLUE = '\033[94m'
+    OKCYAN = '\033[96m'
+    OKGREEN = '\033[92m'
+    WARNING = '\033[93m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+def print_header(args):
+    """Zeigt den Header mit Konfiguration an"""
+    print(f"\n{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}")
+    print(f"{Colors.HEADER}{Colors.BOLD}  WebSocket-Gateway Connection-Storm-Test{Colors.ENDC}")
+    print(f"{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}\n")
+    print(f"{Colors.OKCYAN}🔗 Gateway:{Colors.ENDC} {args.url}")
+    print(f"{Colors.OKCYAN}📱 Devices:{Colors.ENDC} {args.devices} "
+          f"({args.invalid_ratio * 100:.0f}% mit ungültigem Secret)")
+    if args.rate:
+        print(f"{Colors.OKCYAN}⏱️  Ankunftsrate:{Colors.ENDC} {args.rate} Connects/s "
+              f"({'Poisson' if args.poisson else 'gleichmäßig'}, max. {args.concurrency} parallel)")
+    else:
+        print(f"{Colors.OKCYAN}⚡ Burst:{Colors.ENDC} alle auf einmal (max. {args.concurrency} parallel)")
+    print(f"{Colors.OKCYAN}⏳ Halten:{Colors.ENDC} {args.hold}s nach der Willkommensnachricht\n")
+
+def close_info(error):
+    """Close-Code und -Grund aus einer ConnectionClosed-Exception (alte und neue websockets-API)"""
+    received = getattr(error, 'rcvd', None)
+    if received is not None:
+        return received.code, received.reason
+    return getattr(error, 'code', None), getattr(error, 'reason', '')
+
+def classify_error(error: Exception) -> str:
+    """Ordnet eine Exception einer Fehlerklasse zu"""
+    if isinstance(error, websockets.exceptions.ConnectionClosed):
+        code, reason = close_info(error)
+        if code == 1008 and 'Authentication' in (reason or ''):
+            return 'auth_rejected'
+        if code == 1008:
+            return 'policy_violation'
+        return f'closed_{code}'
+    status = getattr(getattr(error, 'response', None), 'status_code', None) or getattr(error, 'status_code', None)
+    if status:
+        return f'http_{status}'
+    if isinstance(error, ConnectionRefusedError):
+        return 'refused'
+    if isinstance(error, OSError):
+        return 'os_error'
+    return 'other'
+
+async def run_device(index: int, args, valid: bool) -> dict:
+    """
+    Ein Device: verbinden, auf Willkommensnachricht (oder Ablehnung) warten, halten
+
+    Returns:
+        dict mit Messwerten (Sekunden) und Ergebnisklasse
+    """
+    result = {
+        'id': index,
+        'valid_secret': valid,
+        'outcome': None,
+        'expected': False,
+        'handshake_s': None,
+        'welcome_s': None,
+        'total_s': None,
+        'error': None,
+    }
+    client_id = f"{args.prefix}-{index}"
+    secret = args.secret if valid else f"invalid-{index}"
+    url = f"{args.url}?{urlencode({'clientId': client_id, 'secret': secret})}"
+
+    start = time.perf_counter()
+    websocket = None
+    phase = 'handshake'
+    try:
+        websocket = await asyncio.wait_for(
+            websockets.connect(url, ping_interval=None, close_timeout=2),
+            timeout=args.handshake_timeout
+        )
+        accepted_at = time.perf_counter()
+        result['handshake_s'] = accepted_at - start
+
+        phase = 'welcome'
+        message = await asyncio.wait_for(websocket.recv(), timeout=args.welcome_timeout)
+        result['welcome_s'] = time.perf_counter() - accepted_at
+        result['total_s'] = time.perf_counter() - start
+        data = json.loads(message) if isinstance(message, str) else {}
+        result['outcome'] = 'welcome' if data.get('type') == 'welcome' else 'unexpected_message'
+
+    except asyncio.TimeoutError:
+        result['outcome'] = f'timeout_{phase}'
+    except Exception as e:
+        result['outcome'] = classify_error(e)
+        result['error'] = f"{type(e).__name__}: {e}"[:200]
+        if result['handshake_s'] is not None:
+            # Ablehnung nach dem Upgrade (Auth im Gateway) - Zeit bis zur Ablehnung
+            result['welcome_s'] = time.perf_counter() - start - result['handshake_s']
+        result['total_s'] = time.perf_counter() - start
+
+    # Gültig → Willkommensnachricht, ungültig → Auth-Ablehnung
+    result['expected'] = result['outcome'] == ('welcome' if valid else 'auth_rejected')
+    result['websocket'] = websocket
+    return result
+
+async def hold_and_close(result, hold_s):
+    """Hält eine erfolgreiche Verbindung offen (Gateway trägt die volle Flotte) und schließt sie dann"""
+    websocket = result.pop('websocket', None)
+    if websocket is None:
+        return
+    try:
+        if hold_s > 0 and result['outcome'] == 'welcome':
+            try:
+                await asyncio.wait_for(websocket.wait_closed(), timeout=hold_s)
+                result['dropped_during_hold'] = True
+            except asyncio.TimeoutError:
+                pass
+        await websocket.close()
+    except Exception:
+        pass
+
+def print_result(result: dict, verbose: bool):
+    """Zeigt unerwartete Ergebnisse (und mit --verbose alle) an"""
+    if result['expected']:
+        if verbose:
+            welcome = f"{result['welcome_s'] * 1000:.0f}ms" if result['welcome_s'] is not None else '-'
+            print(f"{Colors.OKGREEN}✓ #{result['id']:04d} {result['outcome']}{Colors.ENDC} Accept→Antwort {welcome}")
+    else:
+        secret = 'gültig' if result['valid_secret'] else 'ungültig'
+        print(f"{Colors.FAIL}✗ #{result['id']:04d} [{result['outcome']}] ({secret}){Colors.ENDC} {result['error'] or ''}")
+
+async def run_storm(args) -> tuple:
+    """Startet alle Devices (Burst oder feste Rate) und sammelt die Ergebnisse"""
+    rng = random.Random(args.seed)
+    invalid = set(rng.sample(range(args.devices), int(round(args.devices * args.invalid_ratio))))
+    semaphore = asyncio.Semaphore(args.concurrency)
+    results = []
+    hold_tasks = []
+
+    async def launch(index, scheduled_at):
+        async with semaphore:
+            queue_delay = time.perf_counter() - scheduled_at
+            result = await run_device(index, args, index not in invalid)
+        result['queue_delay_s'] = queue_delay
+        results.append(result)
+        print_result(result, args.verbose)
+        hold_tasks.append(asyncio.create_task(hold_and_close(result, args.hold)))
+
+    start = time.perf_counter()
+    tasks = []
+    next_at = start
+    for index in range(args.devices):
+        scheduled_at = start
+        if args.rate:
+            scheduled_at = next_at
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            next_at += rng.expovariate(args.rate) if args.poisson else 1.0 / args.rate
+        tasks.append(asyncio.create_task(launch(index, scheduled_at)))
+
+    await asyncio.gather(*tasks)
+    connect_wall = time.perf_counter() - start
+    connected = sum(1 for r in results if r['outcome'] == 'welcome')
+    if args.hold > 0 and connected:
+        print(f"{Colors.OKCYAN}⏳ Halte {connected} Verbindungen für {args.hold}s...{Colors.ENDC}")
+    await asyncio.gather(*hold_tasks)
+    return results, connect_wall
+
+def build_report(args, results, wall_s) -> dict:
+    """Erstellt den JSON-Report"""
+    outcomes = {}
+    for r in results:
+        outcomes[r['outcome']] = outcomes.get(r['outcome'], 0) + 1
+    welcomed = [r for r in results if r['outcome'] == 'welcome']
+    rejected = [r for r in results if r['outcome'] == 'auth_rejected']
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'config': {
+            'url': args.url,
+            'devices': args.devices,
+            'invalid_ratio': args.invalid_ratio,
+            'concurrency': args.concurrency,
+            'rate': args.rate,
+            'poisson': args.poisson,
+            'hold_s': args.hold,
+            'handshake_timeout_s': args.handshake_timeout,
+            'welcome_timeout_s': args.welcome_timeout,
+        },
+        'summary': {
+            'wall_s': round(wall_s, 3),
+            'welcomed': len(welcomed),
+            'auth_rejected': len(rejected),
+            'unexpected': sum(1 for r in results if not r['expected']),
+            # Sicherheitsrelevant: ungültiges Secret wurde akzeptiert
+            'invalid_accepted': sum(1 for r in welcomed if not r['valid_secret']),
+            'dropped_during_hold': sum(1 for r in results if r.get('dropped_during_hold')),
+            'connects_per_s': round(len(welcomed) / wall_s, 2) if wall_s > 0 else None,
+            'outcomes': outcomes,
+        },
+        'latency_ms': {
+            'handshake': summarize([r['handshake_s'] for r in results]),
+            'accept_to_welcome': summarize([r['welcome_s'] for r in welcomed]),
+            'accept_to_reject': summarize([r['welcome_s'] for r in rejected]),
+            'total': summarize([r['total_s'] for r in welcomed]),
+            'queue_delay': summarize([r['queue_delay_s'] for r in results]),
+        },
+        'devices': sorted(results, key=lambda r: r['id']),
+    }
+
+def print_summary(report: dict):
+    """Zeigt die Zusammenfassung in der Konsole an"""
+    summary = report['summary']
+    print(f"\n{Colors.BOLD}{'─'*70}{Colors.ENDC}")
+    print(f"{Colors.HEADER}📊 Ergebnis{Colors.ENDC}")
+    print(f"  {Colors.OKCYAN}• Verbunden:{Colors.ENDC} {summary['welcomed']}  "
+          f"{Colors.OKCYAN}• Auth abgelehnt:{Colors.ENDC} {summary['auth_rejected']}  "
+          f"{Colors.OKCYAN}• Unerwartet:{Colors.ENDC} {summary['unexpected']}")
+    for outcome, count in sorted(summary['outcomes'].items()):
+        color = Colors.OKGREEN if outcome in ('welcome', 'auth_rejected') else Colors.FAIL
+        print(f"    {color}- {outcome}: {count}{Colors.ENDC}")
+    if summary['invalid_accepted']:
+        print(f"  {Colors.FAIL}⚠ {summary['invalid_accepted']} Verbindungen mit ungültigem Secret akzeptiert!{Colors.ENDC}")
+    if summary['dropped_during_hold']:
+        print(f"  {Colors.WARNING}⚠ {summary['dropped_during_hold']} Verbindungen während des Haltens getrennt{Colors.ENDC}")
+    print(f"  {Colors.OKCYAN}• Durchsatz:{Colors.ENDC} {summary['connects_per_s']} Connects/s "
+          f"({summary['wall_s']}s bis alle Verbindungsversuche abgeschlossen)")
+
+    print(f"\n  {'Phase':<18}{'p50':>10}{'p90':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for name, stats in report['latency_ms'].items():
+        if not stats:
+            continue
+        print(f"  {name:<18}" + ''.join(f"{stats[key]:>8.0f}ms" for key in ('p50', 'p90', 'p95', 'p99', 'max')))
+    print(f"{Colors.BOLD}{'─'*70}{Colors.ENDC}")
+
+def parse_args():
+    """Kommandozeilen-Argumente"""
+    parser = argparse.ArgumentParser(description="WebSocket-Gateway Connection-Storm-Test")
+    parser.add_argument('--url', default=f"ws://{WS_HOST}:{WS_PORT}{WS_PATH}",
+                        help="Gateway-URL ohne Query (clientId/secret werden angehängt)")
+    parser.add_argument('--secret', default=API_KEY, help="Gültiges Secret (Standard: $SIMPLE_API_KEY)")
+    parser.add_argument('--devices', '-n', type=int, default=DEFAULT_DEVICES, help="Anzahl Devices")
+    parser.add_argument('--concurrency', '-c', type=int, default=DEFAULT_CONCURRENCY,
+                        help="Max. gleichzeitige Verbindungsaufbauten")
+    parser.add_argument('--rate', type=float, default=None,
+                        help="Connects/s (open loop) statt Burst")
+    parser.add_argument('--poisson', action='store_true', help="Ankünfte exponentiell verteilt (mit --rate)")
+    parser.add_argument('--invalid-ratio', type=float, default=0.0,
+                        help="Anteil Devices mit ungültigem Secret (0.0 - 1.0)")
+    parser.add_argument('--hold', type=float, default=0.0,
+                        help="Sekunden, die erfolgreiche Verbindungen offen bleiben")
+    parser.add_argument('--prefix', default=DEVICE_PREFIX, help="Präfix der clientIds")
+    parser.add_argument('--seed', type=int, default=None, help="Seed für Ankunftszeiten / ungültige Devices")
+    parser.add_argument('--handshake-timeout', type=float, default=HANDSHAKE_TIMEOUT)
+    parser.add_argument('--welcome-timeout', type=float, default=WELCOME_TIMEOUT)
+    parser.add_argument('--report', default=REPORT_FILE, help=f"JSON-Report (Standard: {REPORT_FILE})")
+    parser.add_argument('--verbose', '-v', action='store_true', help="Jede Verbindung ausgeben")
+    add_loop_argument(parser)
+    args = parser.parse_args()
+
+    if not 0.0 <= args.invalid_ratio <= 1.0:
+        parser.error("--invalid-ratio muss zwischen 0.0 und 1.0 liegen")
+    if args.rate is not None and args.rate <= 0:
+        parser.error("--rate muss > 0 sein")
+    return args
+
+def main():
+    """Entry Point"""
+    args = parse_args()
+    print_header(args)
+
+    try:
+        start = time.perf_counter()
+        results, connect_wall = run_loop(run_storm(args), args.loop)
+    except KeyboardInterrupt:
+        print(f"\n{Colors.WARNING}Abgebrochen.{Colors.ENDC}\n")
+        sys.exit(1)
+
+    report = build_report(args, results, connect_wall)
+    print_summary(report)
+
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n{Colors.OKGREEN}✓ Report geschrieben:{Colors.ENDC} {args.report} "
+          f"(Gesamtdauer {time.perf_counter() - start:.1f}s)\n")
+
+    sys.exit(1 if report['summary']['unexpected'] else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Perzentile für Latenz-Messungen der Test-Skripte
+================================================
+Ein gemeinsames Perzentil (nearest rank: kleinster Wert, bis zu dem mindestens
+pct % der Messwerte reichen) - gleiche Regel wie StatsSnapshot.percentile in
+fleet_stats.py, damit alle Benchmarks vergleichbare Zahlen liefern.
+
+Verwendung:
+    from latency_stats import percentile, summarize
+
+    percentile([0.012, 0.015, 0.031], 50)      # 0.015
+    summarize([0.012, 0.015, None, 0.031])     # {'count': 3, 'mean': 19.3, 'p50': 15.0, ...} in ms
+"""
+
+import math
+import statistics
+
+def percentile(values, pct):
+    """Perzentil (nearest rank), None ohne Messwerte"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+def summarize(values):
+    """Statistik-Block (Millisekunden) für Reports aus Sekunden-Werten, None-Werte werden ignoriert"""
+    values = [v * 1000 for v in values if v is not None]
+    if not values:
+        return None
+    return {
+        'count': len(values),
+        'mean': round(statistics.mean(values), 1),
+        'p50': round(percentile(values, 50), 1),
+        'p90': round(percentile(values, 90), 1),
+        'p95': round(percentile(values, 95), 1),
+        'p99': round(percentile(values, 99), 1),
+        'max': round(max(values), 1),
+    }
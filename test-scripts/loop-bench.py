@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Event-Loop-Implementierungen (asyncio vs. uvloop) auf dem USO-Pfad
+=============================================================================
+Startet pro Loop-Implementierung einen frischen Prozess mit lokalem WebSocket-
+Server (wie Gateway: Header parsen, Payload zuordnen) und mehreren Clients
+(wie Devices: Header als JSON-Text-Frame, danach Payload) und misst:
+
+- Durchsatz: Frames/s ohne Pause (alle Clients senden so schnell wie möglich)
+- Latenz: Client-send() → Payload beim Server ausgewertet, bei fester Rate (p50/p99)
+
+Workloads:
+- tokens: Text-USOs (Header + kurzes Token, wie TXT Output)
+- audio:  Audio-USOs (Header + 500 ms PCM, 16000 Bytes)
+
+Verwendung:
+    python3 loop-bench.py                                 # asyncio und uvloop (falls installiert)
+    python3 loop-bench.py --connections 100 --usos 500
+    python3 loop-bench.py --workload audio --rate 400
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import multiprocessing
+import sys
+import time
+
+try:
+    import websockets
+except ImportError:
+    print("❌ websockets nicht installiert!")
+    print("   Installiere mit: pip install websockets")
+    sys.exit(1)
+
+from event_loop import LOOPS, run_loop, loop_name, uvloop_available
+from latency_stats import percentile
+
+# ======================================
+# KONFIGURATION - HIER ANPASSEN
+# ======================================
+DEFAULT_CONNECTIONS = 50
+DEFAULT_USOS = 200          # USOs pro Verbindung und Phase
+DEFAULT_RATE = 2000         # USOs/s gesamt in der Latenz-Phase
+AUDIO_PAYLOAD = bytes(16000)
+TOKEN_PAYLOAD = "Token "
+
+# ======================================
+# ENDE KONFIGURATION
+# ======================================
+
+# Farben für Terminal-Output
+class Colors:
+    HEADER = '\033[95m'
+    OKBLUE = '\033[94m'
+    OKCYAN = '\033[96m'
+    OKGREEN = '\033[92m'
+    WARNING = '\033[93m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+def print_header(args, loops):
+    """Zeigt den Header mit Konfiguration an"""
+    print(f"\n{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}")
+    print(f"{Colors.HEADER}{Colors.BOLD}  Benchmark: Event-Loop auf dem USO-Pfad{Colors.ENDC}")
+    print(f"{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}\n")
+    print(f"{Colors.OKCYAN}🔁 Loops:{Colors.ENDC} {', '.join(loops)}")
+    print(f"{Colors.OKCYAN}📦 Workloads:{Colors.ENDC} {', '.join(args.workload)}")
+    print(f"{Colors.OKCYAN}🔗 Verbindungen:{Colors.ENDC} {args.connections} x {args.usos} USOs pro Phase")
+    print(f"{Colors.OKCYAN}⏱️  Latenz-Phase:{Colors.ENDC} {args.rate} USOs/s gesamt\n")
+
+class Sink:
+    """Gateway-Seite: Header parsen, Payload zuordnen, Latenz messen"""
+
+    def __init__(self):
+        self.frames = 0
+        self.latencies = []
+        self.record = False
+
+    async def handle(self, websocket):
+        header = None
+        async for message in websocket:
+            self.frames += 1
+            if header is None:
+                header = json.loads(message)
+                continue
+            if self.record:
+                self.latencies.append(time.perf_counter() - header['sentAt'])
+            if header['final']:
+                await websocket.send(json.dumps({'type': 'ack', 'id': header['id']}))
+            header = None
+
+async def run_client(url, index, usos, payload, interval, start_at):
+    """Device-Seite: USOs senden (Header + Payload), am Ende auf Bestätigung warten"""
+    kind = 'audio' if isinstance(payload, bytes) else 'text'
+    async with websockets.connect(url, ping_interval=None, compression=None, max_size=None) as websocket:
+        next_at = start_at
+        for n in range(usos):
+            if interval:
+                next_at += interval
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            header = {'id': f'bench_{index}', 'type': kind, 'sourceId': f'device-{index}',
+                      'timestamp': int(time.time() * 1000), 'final': n == usos - 1,
+                      'sentAt': time.perf_counter()}
+            await websocket.send(json.dumps(header))
+            await websocket.send(payload)
+        await websocket.recv()
+
+async def run_phase(url, sink, args, payload, rate):
+    sink.frames = 0
+    sink.latencies = []
+    sink.record = rate > 0
+    # Gleichmäßig versetzte Clients, jeder mit rate / connections
+    interval = args.connections / rate if rate else 0.0
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        run_client(url, i, args.usos, payload, interval, start + (interval * i / args.connections))
+        for i in range(args.connections)
+    ))
+    return sink.frames, time.perf_counter() - start, sink.latencies
+
+async def bench(args, workload):
+    sink = Sink()
+    payload = AUDIO_PAYLOAD if workload == 'audio' else TOKEN_PAYLOAD
+    async with websockets.serve(sink.handle, '127.0.0.1', 0, compression=None, max_size=None) as server:
+        port = server.sockets[0].getsockname()[1]
+        url = f"ws://127.0.0.1:{port}"
+        frames, wall, _ = await run_phase(url, sink, args, payload, 0)
+        _, _, latencies = await run_phase(url, sink, args, payload, args.rate)
+    return {
+        'loop': loop_name(),
+        'workload': workload,
+        'frames_per_s': frames / wall,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+    }
+
+def bench_process(loop, args, workload):
+    """Läuft im eigenen Prozess (frischer Interpreter-Zustand pro Loop)"""
+    return run_loop(bench(args, workload), loop)
+
+def print_results(workload, results):
+    print(f"{Colors.BOLD}{workload}{Colors.ENDC}")
+    print(f"{Colors.BOLD}{'Loop':<10} {'Frames/s':>12} {'p50':>10} {'p99':>10}{Colors.ENDC}")
+    for r in results:
+        print(f"{r['loop']:<10} {r['frames_per_s']:>12,.0f} {r['p50_ms']:>8.2f}ms {r['p99_ms']:>8.2f}ms")
+    if len(results) > 1:
+        base, other = results
+        print(f"{Colors.OKGREEN}✓ {other['loop']}: {other['frames_per_s'] / base['frames_per_s']:.2f}x Durchsatz, "
+              f"p99 {other['p99_ms'] - base['p99_ms']:+.2f} ms gegenüber {base['loop']}{Colors.ENDC}")
+    print()
+
+def main():
+    parser = argparse.ArgumentParser(description="Vergleicht asyncio und uvloop auf dem USO-Sende-/Empfangspfad")
+    parser.add_argument('--loops', nargs='+', choices=LOOPS, default=list(LOOPS), help="Zu vergleichende Loops")
+    parser.add_argument('--workload', nargs='+', choices=('tokens', 'audio'), default=['tokens', 'audio'])
+    parser.add_argument('--connections', '-c', type=int, default=DEFAULT_CONNECTIONS, help="Gleichzeitige Clients")
+    parser.add_argument('--usos', type=int, default=DEFAULT_USOS, help="USOs pro Client und Phase")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help="USOs/s gesamt in der Latenz-Phase")
+    args = parser.parse_args()
+
+    loops = [loop for loop in args.loops if loop != 'uvloop' or uvloop_available()]
+    if len(loops) < len(args.loops):
+        print(f"{Colors.WARNING}⚠ uvloop nicht installiert - nur asyncio wird gemessen (pip install uvloop){Colors.ENDC}")
+    print_header(args, loops)
+
+    context = multiprocessing.get_context('spawn')
+    for workload in args.workload:
+        results = []
+        for loop in loops:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                results.append(pool.submit(bench_process, loop, args, workload).result())
+        print_results(workload, results)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print(f"\n{Colors.WARNING}Abgebrochen.{Colors.ENDC}\n")
+        sys.exit(1)
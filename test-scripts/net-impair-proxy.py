@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+Netzwerk-Impairment-Proxy für WebSocket-Verbindungen
+====================================================
+Lokaler TCP-Proxy zwischen einem Python-Client (device-client.py,
+test-ws-in-audio.py, ...) und dem WebSocket-Gateway bzw. einer WS-In-Node.
+Simuliert wackliges WLAN / LTE ohne die Maschine zu verlassen:
+
+- Latenz + Jitter (Reihenfolge bleibt erhalten wie bei TCP - Jitter zeigt sich als Bündelung)
+- Bandbreiten-Limit pro Richtung (Uplink / Downlink, kbit/s) mit begrenztem Puffer,
+  damit der Sender Backpressure sieht statt eines unendlichen Puffers
+- Burst-Stalls (Link hängt für stall_ms, Poisson-verteilt)
+- Verbindungsabbrüche (RST oder FIN nach exponentiell verteilter Dauer)
+- Reproduzierbar über --seed (eigener Zufallsstrom pro Verbindung und Richtung)
+
+WebSocket-aware: nach dem HTTP-Upgrade werden die Frames in beiden Richtungen
+mitgelesen (Text/Binary/Close/Ping/Pong, Größen) - die Daten selbst werden
+unverändert weitergeleitet. Bei TLS (wss://) wird nur auf Byte-Ebene gezählt.
+
+Verwendung:
+    1. Proxy starten (Ziel = Gateway):
+       python3 net-impair-proxy.py --target localhost:8080 --profile lte
+       python3 net-impair-proxy.py --target localhost:8080 --latency-ms 80 --jitter-ms 30 \\
+           --up-kbps 256 --stall-rate 0.1 --stall-ms 500 --reset-after 60 --seed 42
+    2. Client auf den Proxy zeigen lassen:
+       WS_HOST=127.0.0.1 WS_PORT=9080 python3 device-client.py
+    3. Ctrl+C → Zusammenfassung (optional JSON mit --report)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import struct
+import sys
+import time
+from datetime import datetime
+
+from event_loop import add_loop_argument, run_loop
+from latency_stats import percentile
+
+# ======================================
+# KONFIGURATION - HIER ANPASSEN
+# ======================================
+LISTEN_HOST = os.getenv("PROXY_HOST", "127.0.0.1")
+LISTEN_PORT = int(os.getenv("PROXY_PORT", "9080"))
+TARGET = os.getenv("PROXY_TARGET", "localhost:8080")   # Gateway (8080) oder WS-In-Node
+
+# Puffer pro Richtung im Proxy (wie Modem-/Funk-Puffer), darüber stockt das Lesen
+BUFFER_KB = 256
+READ_SIZE = 16384
+
+# Vordefinierte Link-Profile (einzelne Werte lassen sich per Argument überschreiben)
+#   latency/jitter in ms (pro Richtung), up/down in kbit/s (0 = unbegrenzt),
+#   stall_rate = Stalls pro Sekunde, reset_after = mittlere Sekunden bis Abbruch (0 = nie)
+PROFILES = {
+    'lan':        {'latency_ms': 1,   'jitter_ms': 0,  'up_kbps': 0,    'down_kbps': 0,     'stall_rate': 0.0,  'stall_ms': 0,   'reset_after': 0},
+    'wifi':       {'latency_ms': 10,  'jitter_ms': 8,  'up_kbps': 20000, 'down_kbps': 20000, 'stall_rate': 0.02, 'stall_ms': 150, 'reset_after': 0},
+    'wifi-flaky': {'latency_ms': 30,  'jitter_ms': 40, 'up_kbps': 2000, 'down_kbps': 2000,  'stall_rate': 0.2,  'stall_ms': 400, 'reset_after': 120},
+    'lte':        {'latency_ms': 45,  'jitter_ms': 20, 'up_kbps': 5000, 'down_kbps': 20000, 'stall_rate': 0.05, 'stall_ms': 250, 'reset_after': 0},
+    '3g':         {'latency_ms': 150, 'jitter_ms': 60, 'up_kbps': 384,  'down_kbps': 1500,  'stall_rate': 0.1,  'stall_ms': 800, 'reset_after': 300},
+}
+DEFAULT_PROFILE = 'lan'
+
+# ======================================
+# ENDE KONFIGURATION
+# ======================================
+
+# Farben für Terminal-Output
+class Colors:
+    HEADER = '\033[95m'
+    OKBLUE = '\033[94m'
+    OKCYAN = '\033[96m'
+    OKGREEN = '\033[92m'
+    WARNING = '\033[93m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+OPCODES = {0x0: 'continuation', 0x1: 'text', 0x2: 'binary', 0x8: 'close', 0x9: 'ping', 0xA: 'pong'}
+
+def print_header(args):
+    """Zeigt den Header mit Konfiguration an"""
+    print(f"\n{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}")
+    print(f"{Colors.HEADER}{Colors.BOLD}  Netzwerk-Impairment-Proxy{Colors.ENDC}")
+    print(f"{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}\n")
+    print(f"{Colors.OKCYAN}🔌 Lauscht auf:{Colors.ENDC} {args.listen_host}:{args.listen_port}")
+    print(f"{Colors.OKCYAN}🎯 Ziel:{Colors.ENDC} {args.target_host}:{args.target_port}")
+    print(f"{Colors.OKCYAN}📶 Profil:{Colors.ENDC} {args.profile} (Seed {args.seed})")
+    print(f"{Colors.OKCYAN}⏱️  Latenz:{Colors.ENDC} {args.latency_ms:g} ms ± {args.jitter_ms:g} ms pro Richtung")
+    print(f"{Colors.OKCYAN}📊 Bandbreite:{Colors.ENDC} Uplink {format_kbps(args.up_kbps)}, Downlink {format_kbps(args.down_kbps)}")
+    if args.stall_rate > 0:
+        print(f"{Colors.OKCYAN}🧊 Stalls:{Colors.ENDC} {args.stall_rate:g}/s à {args.stall_ms:g} ms")
+    if args.reset_after > 0:
+        print(f"{Colors.OKCYAN}💥 Abbrüche:{Colors.ENDC} im Mittel nach {args.reset_after:g}s ({args.reset_mode.upper()})")
+    print(f"\n{Colors.WARNING}Client verbinden mit: WS_HOST={args.listen_host} WS_PORT={args.listen_port}{Colors.ENDC}")
+    print(f"{Colors.WARNING}Drücke Ctrl+C zum Beenden{Colors.ENDC}\n")
+
+def format_kbps(kbps):
+    if not kbps:
+        return "unbegrenzt"
+    return f"{kbps / 1000:g} Mbit/s" if kbps >= 1000 else f"{kbps:g} kbit/s"
+
+class FrameCounter:
+    """
+    Liest WebSocket-Frames in einem Byte-Strom mit (ohne ihn zu verändern)
+
+    Der HTTP-Upgrade-Teil wird übersprungen; beginnt der Strom nicht mit HTTP
+    (z.B. TLS bei wss://), wird die Frame-Analyse deaktiviert.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self.handshake_done = False
+        self._buffer = b''
+        self._skip = 0          # Noch zu überspringende Payload-Bytes des aktuellen Frames
+        self.frames = {}        # Opcode-Name → Anzahl
+        self.frame_bytes = []   # Payload-Größen (Text/Binary)
+
+    def feed(self, data):
+        if not self.enabled:
+            return
+        if not self.handshake_done:
+            self._buffer += data
+            if len(self._buffer) >= 3 and not self._buffer[:3].isalpha():
+                self.enabled = False
+                self._buffer = b''
+                return
+            end = self._buffer.find(b'\r\n\r\n')
+            if end < 0:
+                return
+            data = self._buffer[end + 4:]
+            self._buffer = b''
+            self.handshake_done = True
+
+        view = memoryview(data)
+        if self._skip:
+            skipped = min(self._skip, len(view))
+            self._skip -= skipped
+            view = view[skipped:]
+        if not len(view):
+            return
+        self._buffer += bytes(view)
+        while True:
+            header = self._parse_header()
+            if header is None:
+                return
+            header_len, payload_len, opcode = header
+            name = OPCODES.get(opcode, f'0x{opcode:x}')
+            self.frames[name] = self.frames.get(name, 0) + 1
+            if opcode in (0x1, 0x2):
+                self.frame_bytes.append(payload_len)
+            available = len(self._buffer) - header_len
+            if available >= payload_len:
+                self._buffer = self._buffer[header_len + payload_len:]
+            else:
+                self._skip = payload_len - available
+                self._buffer = b''
+                return
+
+    def _parse_header(self):
+        """(Header-Länge, Payload-Länge, Opcode) oder None wenn der Header unvollständig ist"""
+        buffer = self._buffer
+        if len(buffer) < 2:
+            return None
+        opcode = buffer[0] & 0x0F
+        masked = buffer[1] & 0x80
+        length = buffer[1] & 0x7F
+        offset = 2
+        if length == 126:
+            if len(buffer) < 4:
+                return None
+            length = struct.unpack('>H', buffer[2:4])[0]
+            offset = 4
+        elif length == 127:
+            if len(buffer) < 10:
+                return None
+            length = struct.unpack('>Q', buffer[2:10])[0]
+            offset = 10
+        if masked:
+            offset += 4
+        if len(buffer) < offset:
+            return None
+        return offset, length, opcode
+
+class ImpairedLink:
+    """
+    Eine Richtung einer Verbindung: Serialisierung (Bandbreite) → Stalls → Latenz/Jitter
+
+    Jeder gelesene Block bekommt einen Auslieferungszeitpunkt; die Reihenfolge
+    bleibt erhalten (TCP), Jitter kann Blöcke also nur bündeln, nicht vertauschen.
+    """
+
+    def __init__(self, name, rng, latency_ms, jitter_ms, kbps, stall_rate, stall_ms, buffer_bytes):
+        self.name = name
+        self.rng = rng
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.bytes_per_s = kbps * 1000 / 8 if kbps else 0
+        self.stall_rate = stall_rate
+        self.stall_s = stall_ms / 1000
+        self.buffer_bytes = buffer_bytes
+
+        self._queue = asyncio.Queue()
+        self._queued = 0
+        self._drained = asyncio.Event()
+        self._link_free_at = 0.0      # Ende der Serialisierung des letzten Blocks
+        self._last_delivery = 0.0
+        self._next_stall = self._schedule_stall(time.monotonic())
+
+        self.frames = FrameCounter()
+        self.bytes = 0
+        self.stalls = 0
+        self.delays = []              # Zusätzliche Verzögerung pro Block (Sekunden)
+
+    def _schedule_stall(self, now):
+        if self.stall_rate <= 0:
+            return float('inf')
+        return now + self.rng.expovariate(self.stall_rate)
+
+    def _delivery_time(self, size, now):
+        start = max(now, self._link_free_at)
+        # Stall: Link hängt (Funkloch, Roaming) - alles danach wartet
+        while start >= self._next_stall:
+            self.stalls += 1
+            start = max(start, self._next_stall + self.stall_s)
+            self._next_stall = self._schedule_stall(self._next_stall + self.stall_s)
+        self._link_free_at = start + (size / self.bytes_per_s if self.bytes_per_s else 0.0)
+        delay = max(0.0, self.latency + (self.rng.gauss(0, self.jitter) if self.jitter else 0.0))
+        delivery = max(self._link_free_at + delay, self._last_delivery)
+        self._last_delivery = delivery
+        return delivery
+
+    async def pump_in(self, reader):
+        """Liest vom Sender und plant die Auslieferung (stockt bei vollem Puffer)"""
+        while True:
+            data = await reader.read(READ_SIZE)
+            if not data:
+                break
+            now = time.monotonic()
+            self.frames.feed(data)
+            delivery = self._delivery_time(len(data), now)
+            self.delays.append(delivery - now)
+            self._queued += len(data)
+            self._queue.put_nowait((delivery, data))
+            while self._queued > self.buffer_bytes:
+                self._drained.clear()
+                await self._drained.wait()
+        self._queue.put_nowait((None, None))
+
+    async def pump_out(self, writer):
+        """Liefert die Blöcke zum geplanten Zeitpunkt aus"""
+        while True:
+            delivery, data = await self._queue.get()
+            if data is None:
+                break
+            wait = delivery - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            writer.write(data)
+            await writer.drain()
+            self.bytes += len(data)
+            self._queued -= len(data)
+            self._drained.set()
+        if writer.can_write_eof():
+            writer.write_eof()
+
+    def stats(self):
+        delays_ms = [d * 1000 for d in self.delays]
+        return {
+            'bytes': self.bytes,
+            'chunks': len(self.delays),
+            'stalls': self.stalls,
+            'delay_ms_mean': round(statistics.mean(delays_ms), 1) if delays_ms else None,
+            'delay_ms_p95': round(percentile(delays_ms, 95), 1) if delays_ms else None,
+            'delay_ms_max': round(max(delays_ms), 1) if delays_ms else None,
+            'ws_frames': dict(self.frames.frames) if self.frames.handshake_done else None,
+            'ws_payload_bytes_mean': (round(statistics.mean(self.frames.frame_bytes))
+                                      if self.frames.frame_bytes else None),
+        }
+
+def abort_with_rst(writer):
+    """Verbindung hart abbrechen (TCP RST statt FIN, wie bei einem Funkabriss)"""
+    sock = writer.get_extra_info('socket')
+    if sock is not None:
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+        except OSError:
+            pass
+    writer.transport.abort()
+
+class ImpairmentProxy:
+    """TCP-Proxy: pro eingehender Verbindung eine Zielverbindung und zwei ImpairedLinks"""
+
+    def __init__(self, args):
+        self.args = args
+        self.connection_count = 0
+        self.active = 0
+        self.results = []
+
+    def _rng(self, index, direction):
+        # Eigener Strom pro Verbindung/Richtung: gleiche Seeds → gleiche Störungen,
+        # unabhängig davon, wie sich die Verbindungen zeitlich überlappen
+        return random.Random(f"{self.args.seed}:{index}:{direction}")
+
+    async def handle(self, client_reader, client_writer):
+        args = self.args
+        index = self.connection_count
+        self.connection_count += 1
+        peer = client_writer.get_extra_info('peername')
+        opened_at = time.monotonic()
+
+        try:
+            target_reader, target_writer = await asyncio.open_connection(args.target_host, args.target_port)
+        except OSError as e:
+            print(f"{Colors.FAIL}✗ #{index}: Ziel nicht erreichbar: {e}{Colors.ENDC}")
+            abort_with_rst(client_writer)
+            return
+
+        self.active += 1
+        print(f"{Colors.OKGREEN}✓ #{index}: {peer[0]}:{peer[1]} verbunden ({self.active} aktiv){Colors.ENDC}")
+
+        buffer_bytes = args.buffer_kb * 1024
+        uplink = ImpairedLink('uplink', self._rng(index, 'up'), args.latency_ms, args.jitter_ms,
+                              args.up_kbps, args.stall_rate, args.stall_ms, buffer_bytes)
+        downlink = ImpairedLink('downlink', self._rng(index, 'down'), args.latency_ms, args.jitter_ms,
+                                args.down_kbps, args.stall_rate, args.stall_ms, buffer_bytes)
+        tasks = [
+            asyncio.create_task(uplink.pump_in(client_reader)),
+            asyncio.create_task(uplink.pump_out(target_writer)),
+            asyncio.create_task(downlink.pump_in(target_reader)),
+            asyncio.create_task(downlink.pump_out(client_writer)),
+        ]
+
+        reset_after = (self._rng(index, 'reset').expovariate(1 / args.reset_after)
+                       if args.reset_after > 0 else None)
+        try:
+            # Ende: beide Richtungen fertig, Fehler auf einer Seite (ConnectionReset) oder geplanter Abbruch
+            done, pending = await asyncio.wait(tasks, timeout=reset_after, return_when=asyncio.FIRST_EXCEPTION)
+            reset = bool(pending) and not any(task.exception() for task in done)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if reset and args.reset_mode == 'rst':
+                abort_with_rst(client_writer)
+                abort_with_rst(target_writer)
+            else:
+                client_writer.close()
+                target_writer.close()
+            self.active -= 1
+
+        duration = time.monotonic() - opened_at
+        result = {
+            'connection': index,
+            'peer': f"{peer[0]}:{peer[1]}",
+            'duration_s': round(duration, 2),
+            'reset': reset,
+            'uplink': uplink.stats(),
+            'downlink': downlink.stats(),
+        }
+        self.results.append(result)
+
+        reason = f"{Colors.FAIL}Abbruch ({args.reset_mode.upper()}) nach {duration:.1f}s" if reset \
+            else f"{Colors.WARNING}geschlossen nach {duration:.1f}s"
+        print(f"{reason}{Colors.ENDC} - #{index}: ↑ {uplink.bytes / 1024:.0f} KB "
+              f"(+{result['uplink']['delay_ms_mean'] or 0:.0f} ms, {uplink.stalls} Stalls), "
+              f"↓ {downlink.bytes / 1024:.0f} KB (+{result['downlink']['delay_ms_mean'] or 0:.0f} ms, "
+              f"{downlink.stalls} Stalls)")
+
+def build_report(args, results):
+    """Report mit Konfiguration und Ergebnissen pro Verbindung"""
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'target': f"{args.target_host}:{args.target_port}",
+        'config': {
+            'profile': args.profile,
+            'seed': args.seed,
+            'latency_ms': args.latency_ms,
+            'jitter_ms': args.jitter_ms,
+            'up_kbps': args.up_kbps,
+            'down_kbps': args.down_kbps,
+            'stall_rate': args.stall_rate,
+            'stall_ms': args.stall_ms,
+            'reset_after': args.reset_after,
+            'reset_mode': args.reset_mode,
+            'buffer_kb': args.buffer_kb,
+        },
+        'connections': results,
+    }
+
+def print_summary(results):
+    print(f"\n{Colors.BOLD}{'─'*70}{Colors.ENDC}")
+    print(f"{Colors.HEADER}{Colors.BOLD}📊 Zusammenfassung{Colors.ENDC}")
+    if not results:
+        print(f"   Keine Verbindungen")
+        return
+    resets = sum(1 for result in results if result['reset'])
+    for direction, arrow in (('uplink', '↑'), ('downlink', '↓')):
+        total = sum(result[direction]['bytes'] for result in results)
+        stalls = sum(result[direction]['stalls'] for result in results)
+        frames = {}
+        for result in results:
+            for name, count in (result[direction]['ws_frames'] or {}).items():
+                frames[name] = frames.get(name, 0) + count
+        frame_info = ', '.join(f"{count} {name}" for name, count in sorted(frames.items())) or 'keine WS-Frames'
+        print(f"   {arrow} {direction}: {total / 1024:.0f} KB, {stalls} Stalls, {frame_info}")
+    print(f"   Verbindungen: {len(results)}, davon {resets} abgebrochen")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Lokaler Proxy mit Latenz, Jitter, Bandbreiten-Limit, Stalls und Abbrüchen")
+    parser.add_argument('--listen', default=f"{LISTEN_HOST}:{LISTEN_PORT}", help="host:port des Proxys")
+    parser.add_argument('--target', default=TARGET, help="host:port des Gateways bzw. der WS-In-Node")
+    parser.add_argument('--profile', choices=sorted(PROFILES), default=DEFAULT_PROFILE, help="Link-Profil")
+    parser.add_argument('--latency-ms', type=float, help="Einweg-Latenz pro Richtung")
+    parser.add_argument('--jitter-ms', type=float, help="Standardabweichung der Latenz")
+    parser.add_argument('--up-kbps', type=float, help="Uplink Client → Ziel (0 = unbegrenzt)")
+    parser.add_argument('--down-kbps', type=float, help="Downlink Ziel → Client (0 = unbegrenzt)")
+    parser.add_argument('--stall-rate', type=float, help="Stalls pro Sekunde (Poisson)")
+    parser.add_argument('--stall-ms', type=float, help="Dauer eines Stalls")
+    parser.add_argument('--reset-after', type=float, help="Mittlere Sekunden bis zum Verbindungsabbruch (0 = nie)")
+    parser.add_argument('--reset-mode', choices=('rst', 'fin'), default='rst',
+                        help="rst = harter Abbruch, fin = TCP-Close ohne WebSocket-Close-Frame")
+    parser.add_argument('--buffer-kb', type=int, default=BUFFER_KB, help="Puffer pro Richtung im Proxy")
+    parser.add_argument('--seed', type=int, default=1, help="Seed für reproduzierbare Störungen")
+    parser.add_argument('--report', help="JSON-Report beim Beenden schreiben")
+    add_loop_argument(parser)
+    args = parser.parse_args()
+
+    # Profilwerte, sofern nicht explizit überschrieben
+    for key, value in PROFILES[args.profile].items():
+        if getattr(args, key) is None:
+            setattr(args, key, value)
+
+    args.listen_host, _, listen_port = args.listen.rpartition(':')
+    args.target_host, _, target_port = args.target.rpartition(':')
+    try:
+        args.listen_port, args.target_port = int(listen_port), int(target_port)
+    except ValueError:
+        parser.error("--listen und --target erwarten host:port")
+    return args
+
+async def serve(args, proxy):
+    server = await asyncio.start_server(proxy.handle, args.listen_host, args.listen_port)
+    async with server:
+        await server.serve_forever()
+
+def main():
+    args = parse_args()
+    print_header(args)
+    proxy = ImpairmentProxy(args)
+    try:
+        run_loop(serve(args, proxy), args.loop)
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"{Colors.FAIL}✗ Proxy konnte nicht starten: {e}{Colors.ENDC}")
+        sys.exit(1)
+
+    print_summary(proxy.results)
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(build_report(args, proxy.results), f, indent=2)
+        print(f"\n{Colors.OKGREEN}✓ Report gespeichert: {args.report}{Colors.ENDC}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Anzeige und Stabilität von Vosk-Teilergebnissen (partial)
+=========================================================
+Vosk schickt bei kleinen Chunks sehr viele 'partial'-Nachrichten. Statt die
+ganze Zeile jedes Mal mit \\r und Leerzeichen neu zu zeichnen:
+
+- PartialLine: höchstens fps Aktualisierungen pro Sekunde, dazwischen gilt nur
+  das neueste Partial; geschrieben wird nur der geänderte Rest (Cursor um die
+  abweichenden Zeichen zurück, neuer Rest, Zeilenende löschen). Ein gedrosseltes
+  Partial wird nach Ablauf des Intervalls nachgezeichnet (loop.call_later wie
+  terminal_renderer.StreamRenderer, ohne Event-Loop per Timer-Thread). Breiter
+  als das Terminal wird es nie - sonst bricht die Zeile um und der Cursor kann
+  nicht mehr zurück; lange Partials zeigen "..." + das Ende
+- PartialStability: wie oft sich Wörter nach ihrem ersten Auftauchen noch
+  ändern, und wie lange es vom ersten Auftauchen bis zum finalen Ergebnis dauert
+  (Latenz-/Genauigkeits-Abwägung für verschiedene Chunk-Größen)
+
+Verwendung:
+    from partial_display import PartialLine, PartialStability
+
+    line = PartialLine(fps=10)
+    stability = PartialStability()
+
+    line.column = len(prefix)          # Partial steht hinter bereits ausgegebenem Text
+    line.update(partial_text)          # bei jedem partial
+    stability.partial(partial_text)
+    ...
+    line.clear()                       # bei final, danach den finalen Text ausgeben
+    stability.final(final_text)
+    print(stability.summary())
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import threading
+import time
+
+DIM = '\033[2m'
+ENDC = '\033[0m'
+CLEAR_TO_EOL = '\033[K'
+ELLIPSIS = '...'
+
+class PartialLine:
+    """Veränderliches Teilergebnis am Ende der aktuellen Terminal-Zeile"""
+
+    def __init__(self, fps=10, stream=None, style=DIM, width=None):
+        self.stream = stream or sys.stdout
+        self.interval = 1.0 / fps if fps > 0 else 0.0
+        self.style = style
+        self.width = width          # Terminal-Breite, None = beim Zeichnen abfragen
+        self.column = 0             # Spalte, ab der das Partial steht (Text davor gehört dem Aufrufer)
+        self.shown = ''             # Aktuell angezeigter Text (ohne Farbcodes)
+        self._pending = None
+        self._last_render = 0.0
+        self._handle = None         # Geplantes Nachzeichnen (asyncio.TimerHandle oder threading.Timer)
+        self._lock = threading.RLock()  # Timer-Thread ↔ Aufrufer
+
+        # Statistik
+        self.updates = 0
+        self.renders = 0
+        self.chars_written = 0
+
+    def update(self, text, now=None):
+        """Neues Partial - sofort gezeichnet oder nach Ablauf des Frame-Intervalls nachgezeichnet"""
+        with self._lock:
+            self.updates += 1
+            self._pending = text
+            now = time.monotonic() if now is None else now
+            due = self._last_render + self.interval - now
+            if due <= 0:
+                self.render(now)
+            else:
+                self._schedule(due)
+
+    def _schedule(self, due):
+        if self._handle is not None:
+            return
+        try:
+            self._handle = asyncio.get_running_loop().call_later(due, self.render)
+        except RuntimeError:
+            # Ohne Event-Loop (z.B. blockierendes recv im Haupt-Thread)
+            self._handle = threading.Timer(due, self.render)
+            self._handle.daemon = True
+            self._handle.start()
+
+    def _cancel(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def render(self, now=None):
+        """Zeichnet das neueste Partial (nur den geänderten Rest)"""
+        with self._lock:
+            self._cancel()
+            if self._pending is None:
+                return
+            new = self._fit(f"{self._pending}{ELLIPSIS}" if self._pending else '')
+            self._pending = None
+            self._write(new)
+            self._last_render = time.monotonic() if now is None else now
+
+    def clear(self):
+        """Entfernt das Partial (z.B. vor dem finalen Text), ungezeichnete Updates verfallen"""
+        with self._lock:
+            self._cancel()
+            self._pending = None
+            self._write('')
+
+    def _fit(self, text):
+        """Kürzt auf den Platz bis zum Zeilenende (vorne '...', das Ende des Partials bleibt sichtbar)"""
+        width = self.width or shutil.get_terminal_size((80, 24)).columns
+        available = width - self.column - 1
+        if len(text) <= available:
+            return text
+        if available <= len(ELLIPSIS):
+            return ''
+        return ELLIPSIS + text[len(text) - (available - len(ELLIPSIS)):]
+
+    def _write(self, new):
+        old = self.shown
+        if new == old:
+            return
+        common = len(os.path.commonprefix([old, new]))
+        back = len(old) - common
+        parts = []
+        if back:
+            parts.append(f"\033[{back}D")
+        if common < len(new):
+            parts.append(f"{self.style}{new[common:]}{ENDC}" if self.style else new[common:])
+        if len(new) < len(old):
+            parts.append(CLEAR_TO_EOL)
+        out = ''.join(parts)
+        self.stream.write(out)
+        self.stream.flush()
+        self.shown = new
+        self.renders += 1
+        self.chars_written += len(out)
+
+class PartialStability:
+    """Misst, wie stabil Wörter in Teilergebnissen sind"""
+
+    def __init__(self):
+        self._words = []            # Aktuelle Wörter des laufenden Satzes
+        self._first_seen = []       # Zeitpunkt des ersten Auftauchens pro Position
+        self._last_change = []      # Zeitpunkt der letzten Änderung pro Position
+        self._changed = set()       # Positionen, die sich nach dem ersten Auftauchen geändert haben
+
+        # Summen über alle Sätze
+        self.partials = 0
+        self.revisions = 0          # Änderungen an bereits gezeigten Wörtern (inkl. zurückgenommener)
+        self.final_words = 0
+        self.revised_words = 0      # Finale Wörter, die sich nach dem ersten Auftauchen geändert haben
+        self.utterances = 0
+        self._commit_latency = 0.0  # Summe: erstes Auftauchen → final
+        self._stable_after = 0.0    # Summe: erstes Auftauchen → letzte Änderung
+
+    def partial(self, text, now=None):
+        now = time.monotonic() if now is None else now
+        self.partials += 1
+        self._observe(text.split(), now)
+
+    def _observe(self, words, now):
+        for i, word in enumerate(words):
+            if i >= len(self._words):
+                self._words.append(word)
+                self._first_seen.append(now)
+                self._last_change.append(now)
+            elif self._words[i] != word:
+                self._words[i] = word
+                self._last_change[i] = now
+                self._changed.add(i)
+                self.revisions += 1
+        if len(words) < len(self._words):
+            # Wörter zurückgenommen
+            self.revisions += len(self._words) - len(words)
+            del self._words[len(words):], self._first_seen[len(words):], self._last_change[len(words):]
+            self._changed = {i for i in self._changed if i < len(words)}
+
+    def final(self, text, now=None):
+        """Satz abgeschlossen: finalen Text gegen die Teilergebnisse abgleichen"""
+        now = time.monotonic() if now is None else now
+        words = text.split()
+        self._observe(words, now)
+        self.utterances += 1
+        self.final_words += len(words)
+        self.revised_words += len(self._changed)
+        self._commit_latency += sum(now - seen for seen in self._first_seen)
+        self._stable_after += sum(last - seen for seen, last in zip(self._first_seen, self._last_change))
+        self._words, self._first_seen, self._last_change, self._changed = [], [], [], set()
+
+    def summary(self):
+        words = self.final_words or 1
+        return {
+            'utterances': self.utterances,
+            'partials': self.partials,
+            'final_words': self.final_words,
+            'revisions': self.revisions,
+            'revised_word_ratio': self.revised_words / words if self.final_words else None,
+            'commit_latency_ms': self._commit_latency / words * 1000 if self.final_words else None,
+            'stable_after_ms': self._stable_after / words * 1000 if self.final_words else None,
+        }
@@ -4,21 +4,124 @@ Piper TTS Client
 Verbindet sich mit externem Piper Server und spielt Audio ab
 """
 
+import argparse
 import asyncio
+import os
+import re
+import statistics
 import websockets
 import subprocess
 import sys
 import json
+import queue
+import threading
+import time
+
+from latency_stats import percentile
 
 # Konfiguration
 PIPER_WS_URL = "ws://100.64.0.103:5002"
 
-async def text_to_speech(text):
+# Audio-Format der Piper-Antwort (raw PCM)
+SAMPLE_RATE = 16000
+BYTES_PER_SAMPLE = 2  # 16-bit, mono
+
+# Antwort-Erkennung: Piper sendet kein Ende-Signal, eine Antwort kann aus
+# mehreren Binär-Frames bestehen. Sie gilt als vollständig, wenn nach dem
+# ersten Frame REPLY_IDLE_TIMEOUT Sekunden lang nichts mehr kommt.
+FIRST_BYTE_TIMEOUT = 30.0  # Sekunden bis zum ersten Audio-Frame
+REPLY_IDLE_TIMEOUT = 0.5   # Sekunden Stille nach dem letzten Frame
+
+# Batch-Modus
+BATCH_CONNECTIONS = 4            # Anzahl persistenter Verbindungen im Pool
+BATCH_OUTPUT_DIR = "piper_batch_output"
+
+# Satz-Modus
+SENTENCE_OUTPUT_FILE = "piper_sentences.raw"
+
+# Abkürzungen, nach denen ein Punkt KEIN Satzende ist (kleingeschrieben, ohne Punkt)
+SENTENCE_ABBREVIATIONS = {
+    'de': {
+        'z.b', 'd.h', 'u.a', 'bzw', 'ca', 'usw', 'etc', 'vgl', 'ggf', 'evtl',
+        'inkl', 'exkl', 'bspw', 'str', 'dr', 'prof', 'hr', 'fr', 'st',
+        'abs', 'abb', 'tel', 'mio', 'mrd', 'jh', 'z.t', 'u.u', 'o.ä', 's.o', 's.u',
+    },
+    'en': {
+        'e.g', 'i.e', 'etc', 'vs', 'mr', 'mrs', 'ms', 'dr', 'prof', 'sr', 'jr',
+        'st', 'approx', 'dept', 'inc', 'ltd', 'co', 'u.s', 'a.m', 'p.m',
+    },
+}
+
+# Abkürzungen, die nur vor einer Zahl keine Satzenden sind ("Nr. 5", "No. 7" - aber "He said no.")
+NUMBER_ABBREVIATIONS = {
+    'de': {'nr'},
+    'en': {'no'},
+}
+
+# Großgeschriebene Wörter nach einer deutschen Ordinalzahl, die kein Satzanfang sind ("am 3. Oktober")
+GERMAN_MONTHS = {
+    'januar', 'februar', 'märz', 'april', 'mai', 'juni', 'juli', 'august',
+    'september', 'oktober', 'november', 'dezember',
+}
+
+def audio_seconds(num_bytes):
+    """Rechnet PCM-Bytes in Sekunden Audio um"""
+    return num_bytes / (SAMPLE_RATE * BYTES_PER_SAMPLE)
+
+async def receive_audio_reply(websocket, on_chunk=None):
+    """
+    Empfängt eine (ggf. mehrteilige) Audio-Antwort von Piper
+    
+    Args:
+        websocket: Offene Piper-Verbindung, Text wurde bereits gesendet
+        on_chunk: Optionaler Callback, wird für jeden Audio-Frame aufgerufen
+    
+    Returns:
+        tuple: (audio_bytes, first_byte_s, last_byte_s) - Latenzen ab Aufruf,
+        ohne die abschließende Wartezeit REPLY_IDLE_TIMEOUT
+    """
+    start = time.perf_counter()
+    chunks = []
+    first_byte_latency = None
+    last_byte_latency = None
+    timeout = FIRST_BYTE_TIMEOUT
+    
+    while True:
+        try:
+            message = await asyncio.wait_for(websocket.recv(), timeout=timeout)
+        except asyncio.TimeoutError:
+            if not chunks:
+                raise TimeoutError(f"Kein Audio nach {FIRST_BYTE_TIMEOUT:.0f}s")
+            break
+        except websockets.exceptions.ConnectionClosedOK:
+            # Server schließt nach der Antwort - ist ok, wenn Audio da ist
+            if not chunks:
+                raise
+            break
+        
+        if not isinstance(message, (bytes, bytearray)):
+            # Text-Frame beendet die Antwort (Fehler oder Ende-Markierung)
+            if not chunks:
+                raise ValueError(f"Unerwartete Antwort: {message[:200]}")
+            break
+        
+        if first_byte_latency is None:
+            first_byte_latency = time.perf_counter() - start
+        last_byte_latency = time.perf_counter() - start
+        chunks.append(message)
+        if on_chunk:
+            on_chunk(message)
+        timeout = REPLY_IDLE_TIMEOUT
+    
+    return b''.join(chunks), first_byte_latency, last_byte_latency
+
+async def text_to_speech(text, on_chunk=None):
     """
     Sendet Text an Piper Server und empfängt Audio-Stream
     
     Args:
         text: Der zu sprechende Text
+        on_chunk: Optionaler Callback je empfangenem Audio-Frame (Streaming)
     
     Returns:
         Audio-Daten als bytes
@@ -33,17 +136,17 @@ async def text_to_speech(text):
             # Sende Text (Server akzeptiert Plain Text)
             await websocket.send(text)
             
-            # Empfange Audio-Daten
+            # Empfange Audio-Daten (alle Frames der Antwort)
             print("Warte auf Audio-Daten...")
-            audio_data = await websocket.recv()
+            audio_data, first_byte_latency, _ = await receive_audio_reply(websocket, on_chunk)
             
-            if isinstance(audio_data, bytes):
-                print(f"✓ Audio empfangen: {len(audio_data)} bytes")
-                return audio_data
-            else:
-                print(f"✗ Unerwartete Antwort: {audio_data}")
-                return None
+            print(f"✓ Audio empfangen: {len(audio_data)} bytes "
+                  f"(erstes Byte nach {first_byte_latency * 1000:.0f}ms)")
+            return audio_data
                 
+    except (TimeoutError, ValueError) as e:
+        print(f"✗ {e}")
+        return None
     except websockets.exceptions.WebSocketException as e:
         print(f"✗ WebSocket-Fehler: {e}")
         return None
@@ -51,6 +154,114 @@ async def text_to_speech(text):
         print(f"✗ Fehler: {e}")
         return None
 
+class StreamingPlayer:
+    """
+    Spielt PCM-Chunks ab, sobald sie ankommen
+    
+    Öffnet EINEN langlebigen Player (PyAudio-Stream oder ffplay/aplay/sox
+    über stdin) und schreibt jeden Chunk sofort hinein. Geschrieben wird in
+    einem eigenen Thread, damit ein voller Pipe-Buffer den Event-Loop
+    (und damit den WebSocket-Empfang) nicht blockiert.
+    """
+
+    # Player-Kandidaten (lesen raw PCM von stdin, möglichst ohne Puffer)
+    PLAYER_COMMANDS = [
+        ['ffplay', '-f', 's16le', '-ar', str(SAMPLE_RATE), '-ac', '1',
+         '-nodisp', '-autoexit', '-loglevel', 'quiet',
+         '-fflags', 'nobuffer', '-flags', 'low_delay',
+         '-probesize', '32', '-analyzeduration', '0', '-'],
+        ['aplay', '-q', '-f', 'S16_LE', '-r', str(SAMPLE_RATE), '-c', '1', '-'],
+        ['play', '-q', '-t', 'raw', '-e', 'signed', '-b', '16', '-r', str(SAMPLE_RATE), '-c', '1', '-'],
+    ]
+
+    def __init__(self):
+        self.process = None
+        self.pyaudio = None
+        self.stream = None
+        self.backend = None
+        self.chunk_queue = queue.Queue()
+        self.thread = None
+        self.start_time = None
+        self.first_chunk_latency = None
+        self.bytes_written = 0
+
+    def start(self):
+        """Öffnet den Player, gibt False zurück wenn keiner verfügbar ist"""
+        self.start_time = time.perf_counter()
+        
+        # PyAudio-Stream (kein Subprozess, geringste Latenz)
+        try:
+            import pyaudio
+            self.pyaudio = pyaudio.PyAudio()
+            self.stream = self.pyaudio.open(
+                format=pyaudio.paInt16, channels=1, rate=SAMPLE_RATE, output=True
+            )
+            self.backend = 'pyaudio'
+        except Exception:
+            if self.pyaudio:
+                self.pyaudio.terminate()
+                self.pyaudio = None
+            
+            for command in self.PLAYER_COMMANDS:
+                try:
+                    self.process = subprocess.Popen(
+                        command,
+                        stdin=subprocess.PIPE,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL
+                    )
+                    self.backend = command[0]
+                    break
+                except FileNotFoundError:
+                    continue
+        
+        if not self.backend:
+            return False
+        
+        self.thread = threading.Thread(target=self._writer, daemon=True)
+        self.thread.start()
+        return True
+
+    def feed(self, chunk):
+        """Übergibt einen PCM-Chunk an den Player (nicht blockierend)"""
+        if self.first_chunk_latency is None:
+            self.first_chunk_latency = time.perf_counter() - self.start_time
+        self.chunk_queue.put(chunk)
+
+    def _writer(self):
+        """Writer-Thread: schreibt Chunks in Stream bzw. stdin des Players"""
+        while True:
+            chunk = self.chunk_queue.get()
+            if chunk is None:
+                break
+            try:
+                if self.stream:
+                    self.stream.write(bytes(chunk))
+                else:
+                    self.process.stdin.write(chunk)
+                    self.process.stdin.flush()
+                self.bytes_written += len(chunk)
+            except (BrokenPipeError, OSError) as e:
+                print(f"⚠ Player ({self.backend}) beendet: {e}")
+                break
+
+    def close(self):
+        """Beendet die Eingabe und wartet, bis alles abgespielt ist"""
+        if not self.backend:
+            return
+        self.chunk_queue.put(None)
+        self.thread.join()
+        if self.stream:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.pyaudio.terminate()
+        else:
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+            self.process.wait()
+
 def play_audio(audio_data):
     """
     Spielt rohe PCM Audio-Daten über die Lautsprecher ab
@@ -199,11 +410,448 @@ def play_audio(audio_data):
     print("  - macOS: brew install ffmpeg")
     print("  - Windows: winget install ffmpeg")
 
+def read_batch_texts(source):
+    """
+    Liest Texte für den Batch-Modus (ein Text pro Zeile)
+    
+    Args:
+        source: Dateipfad oder '-' für stdin
+    
+    Returns:
+        Liste der nicht-leeren Zeilen
+    """
+    if source == '-':
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    return [line.strip() for line in lines if line.strip()]
+
+async def batch_worker(worker_id, jobs, results, output_dir):
+    """
+    Verarbeitet Jobs über eine persistente Piper-Verbindung
+    Bei Verbindungsfehlern wird für den nächsten Job neu verbunden.
+    """
+    websocket = None
+    try:
+        while True:
+            try:
+                index, text = jobs.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            
+            result = {'index': index, 'chars': len(text), 'worker': worker_id}
+            start = time.perf_counter()
+            try:
+                if websocket is None:
+                    websocket = await websockets.connect(PIPER_WS_URL)
+                
+                await websocket.send(text)
+                audio_data, first_byte_latency, last_byte_latency = await receive_audio_reply(websocket)
+                
+                output_path = os.path.join(output_dir, f"{index:04d}.raw")
+                with open(output_path, 'wb') as f:
+                    f.write(audio_data)
+                
+                result.update({
+                    'ok': True,
+                    'bytes': len(audio_data),
+                    'audio_s': audio_seconds(len(audio_data)),
+                    'first_byte_s': first_byte_latency,
+                    'total_s': last_byte_latency,
+                    'file': output_path,
+                })
+                print(f"✓ [{index:04d}] Verbindung {worker_id}: {len(text)} Zeichen → "
+                      f"{result['audio_s']:.2f}s Audio, erstes Byte {first_byte_latency * 1000:.0f}ms, "
+                      f"gesamt {result['total_s'] * 1000:.0f}ms")
+            except Exception as e:
+                result.update({'ok': False, 'error': str(e), 'total_s': time.perf_counter() - start})
+                print(f"✗ [{index:04d}] Verbindung {worker_id}: {e}")
+                # Verbindung verwerfen, nächster Job verbindet neu
+                if websocket is not None:
+                    await websocket.close()
+                    websocket = None
+            
+            results.append(result)
+    finally:
+        if websocket is not None:
+            await websocket.close()
+
+async def batch_synthesis(texts, connections=BATCH_CONNECTIONS, output_dir=BATCH_OUTPUT_DIR):
+    """
+    Synthetisiert viele Texte parallel über einen Pool persistenter Verbindungen
+    
+    Args:
+        texts: Liste der Texte
+        connections: Anzahl paralleler Piper-Verbindungen
+        output_dir: Zielverzeichnis für die raw PCM Dateien
+    
+    Returns:
+        Liste der Ergebnis-Dicts (eins pro Text, nach Index sortiert)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    
+    jobs = asyncio.Queue()
+    for index, text in enumerate(texts):
+        jobs.put_nowait((index, text))
+    
+    results = []
+    connections = max(1, min(connections, len(texts)))
+    print(f"Starte Batch: {len(texts)} Texte über {connections} Verbindungen → {output_dir}/\n")
+    
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(
+        batch_worker(worker_id, jobs, results, output_dir)
+        for worker_id in range(connections)
+    ))
+    wall_time = time.perf_counter() - wall_start
+    
+    print_batch_summary(results, wall_time)
+    return sorted(results, key=lambda r: r['index'])
+
+def print_batch_summary(results, wall_time):
+    """Gibt Durchsatz und Latenz-Statistiken des Batch-Laufs aus"""
+    ok = [r for r in results if r['ok']]
+    failed = len(results) - len(ok)
+    total_chars = sum(r['chars'] for r in ok)
+    total_audio = sum(r['audio_s'] for r in ok)
+    first_bytes = [r['first_byte_s'] * 1000 for r in ok]
+    
+    print("\n" + "=" * 60)
+    print("Batch-Ergebnis")
+    print("=" * 60)
+    print(f"  Texte:            {len(results)} ({len(ok)} ok, {failed} Fehler)")
+    print(f"  Wall-Time:        {wall_time:.2f}s")
+    if wall_time > 0:
+        print(f"  Zeichen/s:        {total_chars / wall_time:.1f}")
+        print(f"  Audio-Sekunden/s: {total_audio / wall_time:.2f} "
+              f"({total_audio:.1f}s Audio gesamt)")
+    if first_bytes:
+        print(f"  Erstes Byte:      p50 {percentile(first_bytes, 50):.0f}ms, "
+              f"p95 {percentile(first_bytes, 95):.0f}ms, "
+              f"max {max(first_bytes):.0f}ms, "
+              f"mittel {statistics.mean(first_bytes):.0f}ms")
+    print("=" * 60)
+
+def split_sentences(text, lang='de'):
+    """
+    Zerlegt Text in Sätze (regelbasiert, sprachabhängige Abkürzungen)
+    
+    Kein Satzende bei bekannten Abkürzungen ("z.B.", "Dr."), "Nr."/"No." vor
+    einer Zahl, Initialen ("A. Müller"), Datumsangaben ("am 3. Oktober") und
+    wenn der nächste Teil klein beginnt. Zeilenumbrüche trennen immer.
+    
+    Args:
+        text: Eingabetext
+        lang: Sprachcode ('de' oder 'en')
+    
+    Returns:
+        Liste der Sätze (ohne Leerzeichen am Rand)
+    """
+    abbreviations = SENTENCE_ABBREVIATIONS.get(lang, set())
+    sentences = []
+    
+    for paragraph in re.split(r'\n\s*\n|\n', text):
+        # Kandidaten: Satzzeichen (ggf. mit Anführungszeichen/Klammer) + Leerraum
+        parts = re.split(r'(?<=[.!?…])(["»«\')\]]?)\s+', paragraph)
+        # re.split mit Gruppe liefert [teil, gruppe, teil, gruppe, ...]
+        pieces = [parts[k] + (parts[k + 1] if k + 1 < len(parts) else '')
+                  for k in range(0, len(parts), 2)]
+        
+        current = ''
+        for index, piece in enumerate(pieces):
+            current = f"{current} {piece}" if current else piece
+            following = pieces[index + 1] if index + 1 < len(pieces) else ''
+            if following and not _is_sentence_end(current, following, lang, abbreviations):
+                continue
+            if current.strip():
+                sentences.append(current.strip())
+            current = ''
+    
+    return sentences
+
+def _is_sentence_end(current, following, lang, abbreviations):
+    """Prüft ob zwischen current und following ein echtes Satzende liegt"""
+    stripped = current.rstrip('"»«\')]')
+    if not stripped.endswith('.'):
+        return True  # ! ? … beenden immer
+    
+    words = stripped.split()
+    last_word = words[-1][:-1].lower()
+    if last_word in abbreviations:
+        return False
+    # "Nr. 5" / "No. 7" - ohne folgende Zahl normales Wort ("He said no.")
+    if last_word in NUMBER_ABBREVIATIONS.get(lang, ()) and following[:1].isdigit():
+        return False
+    # Initialen ("A. Müller")
+    if len(last_word) == 1 and last_word.isalpha():
+        return False
+    # Datum im Deutschen ("am 3. Oktober") - sonst gilt eine Zahl nur als Ordinalzahl, wenn
+    # klein weitergeht (Regel unten); nie nach "Nr." ("Das ist Nr. 5. Fertig?" = zwei Sätze)
+    if lang == 'de' and last_word.isdigit():
+        previous = words[-2].rstrip('.').lower() if len(words) > 1 else ''
+        next_word = re.sub(r'\W+$', '', following.split(None, 1)[0]).lower() if following.split() else ''
+        if previous not in NUMBER_ABBREVIATIONS['de'] and next_word in GERMAN_MONTHS:
+            return False
+    # Nächster Teil beginnt klein → kein Satzanfang
+    if following[:1].islower():
+        return False
+    return True
+
+async def sentence_worker(worker_id, jobs, chunk_queues, timings):
+    """
+    Synthetisiert Sätze über eine persistente Verbindung
+    Audio-Frames landen sofort in der Queue des jeweiligen Satzes,
+    None markiert das Ende eines Satzes.
+    """
+    websocket = None
+    try:
+        while True:
+            try:
+                index, sentence = jobs.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            
+            chunk_queue = chunk_queues[index]
+            try:
+                if websocket is None:
+                    websocket = await websockets.connect(PIPER_WS_URL)
+                await websocket.send(sentence)
+                audio_data, first_byte, last_byte = await receive_audio_reply(
+                    websocket, on_chunk=chunk_queue.put_nowait
+                )
+                timings[index] = {
+                    'worker': worker_id,
+                    'first_byte_s': first_byte,
+                    'last_byte_s': last_byte,
+                    'bytes': len(audio_data),
+                }
+            except Exception as e:
+                print(f"✗ Satz {index + 1} (Verbindung {worker_id}): {e}")
+                timings[index] = {'worker': worker_id, 'error': str(e)}
+                if websocket is not None:
+                    await websocket.close()
+                    websocket = None
+            finally:
+                chunk_queue.put_nowait(None)
+    finally:
+        if websocket is not None:
+            await websocket.close()
+
+async def stream_sentences(sentences, connections=BATCH_CONNECTIONS, timings=None):
+    """
+    Synthetisiert Sätze parallel und liefert das Audio in Satz-Reihenfolge
+    
+    Audio von Satz 1 wird geliefert, sobald die ersten Frames da sind -
+    spätere Sätze werden parallel vorab synthetisiert und gepuffert.
+    
+    Args:
+        sentences: Liste der Sätze
+        connections: Anzahl paralleler Piper-Verbindungen
+        timings: Optionales Dict, wird mit Latenzen je Satz-Index gefüllt
+    
+    Yields:
+        tuple: (satz_index, pcm_chunk)
+    """
+    if timings is None:
+        timings = {}
+    jobs = asyncio.Queue()
+    chunk_queues = []
+    for index, sentence in enumerate(sentences):
+        jobs.put_nowait((index, sentence))
+        chunk_queues.append(asyncio.Queue())
+    
+    connections = max(1, min(connections, len(sentences)))
+    workers = [
+        asyncio.create_task(sentence_worker(worker_id, jobs, chunk_queues, timings))
+        for worker_id in range(connections)
+    ]
+    
+    try:
+        for index, chunk_queue in enumerate(chunk_queues):
+            while True:
+                chunk = await chunk_queue.get()
+                if chunk is None:
+                    break
+                yield index, chunk
+        await asyncio.gather(*workers)
+    finally:
+        for worker in workers:
+            worker.cancel()
+
+async def sentence_synthesis(text, lang='de', connections=BATCH_CONNECTIONS,
+                             output_file=SENTENCE_OUTPUT_FILE, player=None):
+    """
+    Satz-parallele Synthese eines langen Textes mit Zusammenfügen in Reihenfolge
+    
+    Das Audio wird fortlaufend (satzweise in Reihenfolge) in output_file
+    geschrieben und - falls angegeben - sofort an den StreamingPlayer gegeben.
+    
+    Returns:
+        dict mit audio (bytes), time_to_first_audio_s, wall_s, sentences
+    """
+    sentences = split_sentences(text, lang)
+    print(f"Text in {len(sentences)} Sätze zerlegt ({lang}):")
+    for index, sentence in enumerate(sentences):
+        print(f"  {index + 1:2d}. {sentence[:70]}{'...' if len(sentence) > 70 else ''}")
+    print()
+    
+    timings = {}
+    audio = bytearray()
+    time_to_first_audio = None
+    last_audio = 0.0
+    current_sentence = -1
+    start = time.perf_counter()
+    
+    with open(output_file, 'wb') as f:
+        async for index, chunk in stream_sentences(sentences, connections, timings):
+            if time_to_first_audio is None:
+                time_to_first_audio = time.perf_counter() - start
+            if index != current_sentence:
+                current_sentence = index
+                print(f"▶ Satz {index + 1} abspielbereit nach {(time.perf_counter() - start) * 1000:.0f}ms")
+            last_audio = time.perf_counter() - start
+            audio.extend(chunk)
+            f.write(chunk)
+            f.flush()
+            if player:
+                player.feed(chunk)
+    
+    failed = sum(1 for t in timings.values() if 'error' in t)
+    
+    return {
+        'audio': bytes(audio),
+        'time_to_first_audio_s': time_to_first_audio,
+        'wall_s': last_audio,
+        'sentences': len(sentences),
+        'failed': failed,
+    }
+
+async def single_request_baseline(text):
+    """Misst den Ein-Request-Pfad (ganzer Text in einem Request) als Referenz"""
+    start = time.perf_counter()
+    async with websockets.connect(PIPER_WS_URL) as websocket:
+        connect_s = time.perf_counter() - start
+        await websocket.send(text)
+        audio_data, first_byte, last_byte = await receive_audio_reply(websocket)
+    # Latenzen inkl. Verbindungsaufbau, damit sie mit dem Satz-Modus vergleichbar sind
+    return {
+        'audio': audio_data,
+        'time_to_first_audio_s': connect_s + first_byte,
+        'wall_s': connect_s + last_byte,
+    }
+
+def print_sentence_comparison(sentence_result, baseline=None):
+    """Vergleicht Satz-Modus mit dem Ein-Request-Pfad"""
+    print("\n" + "=" * 60)
+    print("Satz-parallele Synthese")
+    print("=" * 60)
+    print(f"  Sätze:              {sentence_result['sentences']} ({sentence_result['failed']} Fehler)")
+    print(f"  Audio:              {audio_seconds(len(sentence_result['audio'])):.2f}s")
+    rows = [('Satz-parallel', sentence_result)]
+    if baseline:
+        rows.insert(0, ('Ein Request', baseline))
+    print(f"\n  {'Modus':<16}{'Time-to-first-audio':>22}{'Wall-Time':>14}")
+    for name, result in rows:
+        ttfa = result['time_to_first_audio_s']
+        ttfa_text = f"{ttfa * 1000:.0f}ms" if ttfa is not None else "-"
+        print(f"  {name:<16}{ttfa_text:>22}{result['wall_s'] * 1000:>12.0f}ms")
+    if baseline and sentence_result['time_to_first_audio_s']:
+        speedup = baseline['time_to_first_audio_s'] / sentence_result['time_to_first_audio_s']
+        print(f"\n  → Time-to-first-audio {speedup:.1f}x schneller")
+    print("=" * 60)
+
+def start_streaming_player():
+    """Startet einen StreamingPlayer, fällt bei Fehlschlag auf play_audio zurück (None)"""
+    player = StreamingPlayer()
+    if player.start():
+        print(f"✓ Streaming-Player: {player.backend}")
+        return player
+    print("⚠ Kein Streaming-Player gefunden (pyaudio/ffplay/aplay/sox) - spiele nach Empfang ab")
+    return None
+
+def parse_args():
+    """Kommandozeilen-Argumente"""
+    parser = argparse.ArgumentParser(
+        description="Piper TTS Client",
+        epilog="Beispiele:\n"
+               "  python piper_test.py 'Hallo Welt'\n"
+               "  python piper_test.py --batch texte.txt --connections 8\n"
+               "  cat texte.txt | python piper_test.py --batch -\n"
+               "  python piper_test.py --sentences --compare 'Erster Satz. Zweiter Satz.'\n"
+               "  python piper_test.py --stream --sentences 'Erster Satz. Zweiter Satz.'",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('text', nargs='?', help="Zu sprechender Text")
+    parser.add_argument('--url', default=PIPER_WS_URL, help=f"Piper WebSocket-URL (Standard: {PIPER_WS_URL})")
+    parser.add_argument('--batch', metavar='DATEI',
+                        help="Batch-Modus: Texte zeilenweise aus Datei lesen ('-' = stdin)")
+    parser.add_argument('--connections', type=int, default=BATCH_CONNECTIONS,
+                        help=f"Batch: Anzahl persistenter Verbindungen (Standard: {BATCH_CONNECTIONS})")
+    parser.add_argument('--output-dir', default=BATCH_OUTPUT_DIR,
+                        help=f"Batch: Ausgabeverzeichnis für .raw Dateien (Standard: {BATCH_OUTPUT_DIR})")
+    parser.add_argument('--sentences', action='store_true',
+                        help="Satz-Modus: Text in Sätze zerlegen und parallel synthetisieren")
+    parser.add_argument('--lang', default='de', choices=sorted(SENTENCE_ABBREVIATIONS),
+                        help="Satz-Modus: Sprache für die Satzzerlegung (Standard: de)")
+    parser.add_argument('--output', default=SENTENCE_OUTPUT_FILE,
+                        help=f"Satz-Modus: Ausgabedatei für das zusammengefügte PCM (Standard: {SENTENCE_OUTPUT_FILE})")
+    parser.add_argument('--compare', action='store_true',
+                        help="Satz-Modus: zusätzlich den Ein-Request-Pfad messen und vergleichen")
+    parser.add_argument('--idle-timeout', type=float, default=REPLY_IDLE_TIMEOUT,
+                        help=f"Sekunden Stille, nach denen eine Antwort als vollständig gilt (Standard: {REPLY_IDLE_TIMEOUT})")
+    parser.add_argument('--stream', action='store_true',
+                        help="Audio-Chunks sofort beim Empfang abspielen (ein langlebiger Player)")
+    parser.add_argument('--no-play', action='store_true', help="Audio nicht abspielen")
+    return parser.parse_args()
+
 async def main_async():
     """Hauptfunktion (async)"""
+    global PIPER_WS_URL, REPLY_IDLE_TIMEOUT
+    args = parse_args()
+    PIPER_WS_URL = args.url
+    REPLY_IDLE_TIMEOUT = args.idle_timeout
+    
+    # Batch-Modus
+    if args.batch:
+        print("=" * 60)
+        print("Piper TTS Client - Batch-Modus")
+        print("=" * 60)
+        print()
+        texts = read_batch_texts(args.batch)
+        if not texts:
+            print("✗ Keine Texte gefunden")
+            sys.exit(1)
+        results = await batch_synthesis(texts, args.connections, args.output_dir)
+        if not any(r['ok'] for r in results):
+            sys.exit(1)
+        return
+    
+    # Satz-Modus
+    if args.sentences and args.text:
+        print("=" * 60)
+        print("Piper TTS Client - Satz-Modus")
+        print("=" * 60)
+        print()
+        baseline = None
+        if args.compare:
+            print("Messe Ein-Request-Pfad (Referenz)...")
+            baseline = await single_request_baseline(args.text)
+            print(f"✓ Referenz: {audio_seconds(len(baseline['audio'])):.2f}s Audio\n")
+        player = start_streaming_player() if args.stream and not args.no_play else None
+        result = await sentence_synthesis(args.text, args.lang, args.connections, args.output, player)
+        print(f"\n✓ Zusammengefügtes Audio: {args.output}")
+        print_sentence_comparison(result, baseline)
+        if player:
+            player.close()
+        if not result['audio']:
+            sys.exit(1)
+        if not args.no_play and not player:
+            play_audio(result['audio'])
+        return
     
     # Prüfe Argumente
-    if len(sys.argv) < 2:
+    if not args.text:
         print("=" * 60)
         print("Piper TTS Client")
         print("=" * 60)
@@ -212,23 +860,37 @@ async def main_async():
         print("\nBeispiele:")
         print("  python piper_test.py 'Hallo Welt'")
         print("  python piper_test.py 'Guten Tag, wie geht es dir?'")
+        print("  python piper_test.py --batch texte.txt --connections 8")
+        print("  python piper_test.py --sentences --compare 'Langer Text. Mit mehreren Sätzen.'")
         print(f"\nServer: {PIPER_WS_URL}")
         print("=" * 60)
         sys.exit(1)
     
     # Text aus Argumenten
-    text = sys.argv[1]
+    text = args.text
     
     print("=" * 60)
     print("Piper TTS Client")
     print("=" * 60)
     print()
     
+    # Streaming: Player vorab öffnen, Chunks werden direkt beim Empfang abgespielt
+    player = start_streaming_player() if args.stream and not args.no_play else None
+    
     # Text zu Audio konvertieren
-    audio_data = await text_to_speech(text)
+    request_start = time.perf_counter()
+    audio_data = await text_to_speech(text, on_chunk=player.feed if player else None)
+    synthesis_time = time.perf_counter() - request_start
+    
+    if player:
+        if player.first_chunk_latency is not None:
+            print(f"\n▶ Wiedergabe gestartet nach {player.first_chunk_latency * 1000:.0f}ms "
+                  f"(vollständige Synthese: {synthesis_time * 1000:.0f}ms)")
+        player.close()
     
     if audio_data and len(audio_data) > 0:
-        play_audio(audio_data)
+        if not args.no_play and not player:
+            play_audio(audio_data)
         print("\n" + "=" * 60)
         print("✓ Fertig!")
         print("=" * 60)
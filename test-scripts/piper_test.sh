@@ -58,6 +58,10 @@ if [ $# -eq 0 ]; then
     echo -e "${BLUE}Beispiel:${NC}"
     echo "  ./piper_test.sh \"Hallo, das ist ein Test\""
     echo ""
+    echo -e "${BLUE}Batch-Modus (Texte zeilenweise, Pool persistenter Verbindungen):${NC}"
+    echo "  ./piper_test.sh --batch texte.txt --connections 8 --output-dir piper_batch_output"
+    echo "  cat texte.txt | ./piper_test.sh --batch -"
+    echo ""
     echo -e "${BLUE}Mit eigener Stimme:${NC}"
     echo "  ./piper_test.sh \"Hallo Welt\" de_DE-thorsten-medium"
     echo ""
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Flotten-Registrierung (Bulk)
+============================
+Registriert eine simulierte Device-Flotte (z.B. 1000 Devices) über den
+Bulk-Endpoint POST /api/devices/bulk und misst die Dauer pro Batch
+(Round-Trip im Client und bulkWrite im Backend).
+
+Mit --single wird zum Vergleich jedes Device einzeln über POST /api/devices
+registriert (parallel über einen Keep-Alive-Pool).
+
+Verwendung:
+    1. Passe BACKEND_URL an oder übergib --url
+    2. Installiere Abhängigkeiten: pip install httpx
+    3. Führe aus:
+       python3 register-fleet.py --count 1000
+       python3 register-fleet.py --count 1000 --single --connections 50
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+try:
+    import httpx  # noqa: F401 - Keep-Alive-Pool in device_registry.py
+except ImportError:
+    print("❌ httpx nicht installiert!")
+    print("   Installiere mit: pip install httpx")
+    sys.exit(1)
+
+from device_registry import DEFAULT_BATCH_SIZE, DeviceRegistry, device_payload
+from event_loop import add_loop_argument, run_loop
+
+# ======================================
+# KONFIGURATION - HIER ANPASSEN
+# ======================================
+BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:3000")
+
+# Simulierte Flotte
+DEFAULT_COUNT = 1000
+DEVICE_PREFIX = "sim-device"
+DEVICE_CAPABILITIES = ['mic', 'speaker', 'txt_input', 'txt_output']
+
+# Parallele Verbindungen (nur für --single)
+DEFAULT_CONNECTIONS = 20
+
+# ======================================
+# ENDE KONFIGURATION
+# ======================================
+
+# Farben für Terminal-Output
+class Colors:
+    HEADER = '\033[95m'
+    OKBLUE = '\033[94m'
+    OKCYAN = '\033[96m'
+    OKGREEN = '\033[92m'
+    WARNING = '\033[93m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+def print_header(args):
+    """Zeigt den Header mit Konfiguration an"""
+    print(f"\n{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}")
+    print(f"{Colors.HEADER}{Colors.BOLD}  Flotten-Registrierung{Colors.ENDC}")
+    print(f"{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}\n")
+    print(f"{Colors.OKCYAN}🔗 Backend:{Colors.ENDC} {args.url}")
+    print(f"{Colors.OKCYAN}📱 Devices:{Colors.ENDC} {args.count} ({args.prefix}-0 … {args.prefix}-{args.count - 1})")
+    if args.single:
+        print(f"{Colors.OKCYAN}📡 Modus:{Colors.ENDC} einzeln (POST /api/devices), {args.connections} parallel")
+    else:
+        print(f"{Colors.OKCYAN}📡 Modus:{Colors.ENDC} bulk (POST /api/devices/bulk), {args.batch_size} pro Batch")
+    print()
+
+def print_batch(result):
+    """Ausgabe pro Batch"""
+    server = f", Backend {result['server_ms']} ms" if result['server_ms'] is not None else ""
+    upserted = f", {result['upserted']} neu" if result['upserted'] is not None else ""
+    print(f"  {Colors.OKGREEN}✓ Batch {result['batch'] + 1}:{Colors.ENDC} {result['count']} Devices "
+          f"({result['mode']}) in {result['round_trip_ms']:.0f} ms{server}{upserted}")
+
+async def register_fleet(args):
+    devices = [
+        device_payload(f"{args.prefix}-{i}", DEVICE_CAPABILITIES, metadata={'type': 'simulated-fleet'})
+        for i in range(args.count)
+    ]
+
+    start = time.perf_counter()
+    async with DeviceRegistry(args.url, max_connections=args.connections, batch_size=args.batch_size) as registry:
+        if args.single:
+            await registry.register_parallel(devices)
+            results = [{'batch': 0, 'count': len(devices), 'mode': 'single', 'upserted': None,
+                        'server_ms': None, 'round_trip_ms': (time.perf_counter() - start) * 1000}]
+            print_batch(results[0])
+        else:
+            results = await registry.register_many(devices, on_batch=print_batch)
+    total = time.perf_counter() - start
+
+    print(f"\n{Colors.BOLD}{'─'*70}{Colors.ENDC}")
+    print(f"{Colors.OKGREEN}✓ {args.count} Devices in {total:.2f}s registriert "
+          f"({args.count / max(total, 1e-9):.0f} Devices/s, {len(results)} Requests/Batches){Colors.ENDC}")
+    if any(result['mode'] == 'single' for result in results) and not args.single:
+        print(f"{Colors.WARNING}⚠ Backend ohne Bulk-Endpoint - Einzel-Registrierung verwendet{Colors.ENDC}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Registriert eine simulierte Device-Flotte")
+    parser.add_argument('--url', default=BACKEND_URL, help="Backend-URL (ohne /api)")
+    parser.add_argument('--count', type=int, default=DEFAULT_COUNT, help="Anzahl Devices")
+    parser.add_argument('--prefix', default=DEVICE_PREFIX, help="Präfix der clientIds")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Devices pro Bulk-Request (max. 500)")
+    parser.add_argument('--single', action='store_true', help="Einzeln registrieren (Vergleich)")
+    parser.add_argument('--connections', type=int, default=DEFAULT_CONNECTIONS, help="Parallele Verbindungen")
+    add_loop_argument(parser)
+    args = parser.parse_args()
+
+    print_header(args)
+    try:
+        run_loop(register_fleet(args), args.loop)
+    except KeyboardInterrupt:
+        print(f"\n{Colors.WARNING}Abgebrochen.{Colors.ENDC}\n")
+    except Exception as e:
+        print(f"{Colors.FAIL}✗ Registrierung fehlgeschlagen: {e}{Colors.ENDC}\n")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
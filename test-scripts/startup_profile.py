@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Startup-Profiler für die Device-Clients
+=======================================
+Misst die Dauer der Startphasen eines Clients und vergleicht sie mit einem
+Budget (Regressions-Check, z.B. für die Raspberry-Pi-Flotte):
+
+- import:       Modul-Imports (ab Erzeugung des Profilers)
+- registration: Device-Registrierung über die REST API
+- connect:      WebSocket-Handshake mit dem Gateway
+- first_frame:  Erster Frame vom Gateway (Willkommensnachricht)
+
+Budget-Format (ms): "import=300,registration=1000,connect=1000,first_frame=1000,total=3000"
+
+Verwendung:
+    import time
+    from startup_profile import StartupProfiler
+    startup = StartupProfiler()          # so früh wie möglich, vor den schweren Imports
+    ...
+    startup.record_since_start('import')
+    with startup.phase('registration'):
+        await register_device()
+    violations = startup.report()
+"""
+
+import json
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUDGET_MS = {
+    'import': 300,
+    'registration': 1000,
+    'connect': 1000,
+    'first_frame': 1000,
+    'total': 3000,
+}
+
+def parse_budget(spec):
+    """Parst "phase=ms,phase=ms" und ergänzt die Standardwerte"""
+    budget = dict(DEFAULT_BUDGET_MS)
+    if not spec:
+        return budget
+    for part in spec.split(','):
+        if '=' not in part:
+            continue
+        name, value = part.split('=', 1)
+        budget[name.strip()] = float(value)
+    return budget
+
+class StartupProfiler:
+    """Sammelt Phasendauern (ms) seit Prozess-/Skriptstart"""
+
+    def __init__(self, budget=None):
+        self._start = time.perf_counter()
+        self.budget = dict(budget or DEFAULT_BUDGET_MS)
+        self.phases = {}
+        self.finished = False
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self._start) * 1000
+
+    def record(self, name, duration_ms):
+        """Speichert eine Phasendauer (nur die erste Messung zählt, z.B. bei Reconnects)"""
+        if not self.finished and name not in self.phases:
+            self.phases[name] = duration_ms
+
+    def record_since_start(self, name):
+        self.record(name, self.elapsed_ms())
+
+    @contextmanager
+    def phase(self, name):
+        """Kontextmanager: misst die Dauer des Blocks als Phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def finish(self):
+        """Schließt die Messung ab (total = Zeit bis jetzt)"""
+        if not self.finished:
+            self.phases['total'] = self.elapsed_ms()
+            self.finished = True
+
+    def violations(self):
+        """Phasen über Budget → [(name, dauer_ms, budget_ms)]"""
+        return [(name, duration, self.budget[name])
+                for name, duration in self.phases.items()
+                if name in self.budget and duration > self.budget[name]]
+
+    def report(self, printer=print):
+        """Gibt die Phasen als Tabelle aus und liefert die Budget-Überschreitungen"""
+        self.finish()
+        over = {name for name, _, _ in self.violations()}
+        printer("⏱️  Startup-Profil:")
+        for name, duration in self.phases.items():
+            budget = self.budget.get(name)
+            budget_text = f"/ {budget:.0f} ms" if budget is not None else ""
+            status = "✗ über Budget" if name in over else "✓"
+            printer(f"   {name:<13} {duration:8.1f} ms {budget_text:<12} {status}")
+        return self.violations()
+
+    def write_json(self, path):
+        """Schreibt das Profil als JSON (für Regressions-Vergleiche)"""
+        self.finish()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'timestamp': time.time(),
+                'phases_ms': {name: round(value, 3) for name, value in self.phases.items()},
+                'budget_ms': self.budget,
+                'violations': [name for name, _, _ in self.violations()],
+            }, f, indent=2)
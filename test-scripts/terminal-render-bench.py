@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Streaming-Text-Ausgabe pro Token vs. StreamRenderer
+==============================================================
+Simuliert einen Token-Stream (wie TXT Output von der AI-Node) im Event-Loop
+und vergleicht:
+
+- print:  print(f"{Colors.OKGREEN}{token}{Colors.ENDC}", end='', flush=True) pro Token
+          (bisheriges Verhalten in device-client.py / test-ws-out.py)
+- live:   StreamRenderer mit begrenzter Bildrate (--fps)
+- final:  StreamRenderer ohne Live-Ausgabe (Text erst am Ende, z.B. bei Pipes)
+
+Gemessen werden write-Syscalls, CPU-Zeit und die Event-Loop-Verzögerung
+(Lag-Probe alle 1 ms) während des Streams.
+
+Verwendung:
+    python3 terminal-render-bench.py                          # Ausgabe nach /dev/null
+    python3 terminal-render-bench.py --output /dev/tty        # echtes Terminal (Text läuft durch)
+    python3 terminal-render-bench.py --tokens 20000 --rate 0  # so schnell wie möglich
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import sys
+import time
+
+from terminal_renderer import StreamRenderer
+
+# ======================================
+# KONFIGURATION - HIER ANPASSEN
+# ======================================
+DEFAULT_TOKENS = 5000
+DEFAULT_RATE = 2000      # Tokens pro Sekunde (0 = ohne Pause)
+DEFAULT_FPS = 30
+LAG_PROBE_INTERVAL = 0.001
+
+# ======================================
+# ENDE KONFIGURATION
+# ======================================
+
+# Farben für Terminal-Output
+class Colors:
+    HEADER = '\033[95m'
+    OKBLUE = '\033[94m'
+    OKCYAN = '\033[96m'
+    OKGREEN = '\033[92m'
+    WARNING = '\033[93m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+TOKENS = ["Das ", "ist ", "eine ", "gestreamte ", "Antwort ", "der ", "KI", ", ", "Token ", "für ", "Token", ". "]
+
+class CountingFile(io.FileIO):
+    """FileIO, das die write-Syscalls zählt"""
+
+    def __init__(self, path):
+        super().__init__(path, 'w')
+        self.syscalls = 0
+
+    def write(self, data):
+        self.syscalls += 1
+        return super().write(data)
+
+def print_header(args):
+    """Zeigt den Header mit Konfiguration an"""
+    print(f"\n{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}")
+    print(f"{Colors.HEADER}{Colors.BOLD}  Benchmark: Streaming-Text-Ausgabe{Colors.ENDC}")
+    print(f"{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}\n")
+    rate = f"{args.rate} Tokens/s" if args.rate else "ohne Pause"
+    print(f"{Colors.OKCYAN}📝 Tokens:{Colors.ENDC} {args.tokens} ({rate})")
+    print(f"{Colors.OKCYAN}🖥️  Ausgabe:{Colors.ENDC} {args.output}")
+    print(f"{Colors.OKCYAN}🎞️  Renderer:{Colors.ENDC} {args.fps} fps\n")
+
+async def lag_probe(samples, stop):
+    """Misst, wie viel später der Loop aufwacht als geplant"""
+    while not stop.is_set():
+        planned = time.perf_counter() + LAG_PROBE_INTERVAL
+        await asyncio.sleep(LAG_PROBE_INTERVAL)
+        samples.append(max(0.0, time.perf_counter() - planned))
+
+async def run_variant(variant, args):
+    raw = CountingFile(args.output)
+    out = io.TextIOWrapper(io.BufferedWriter(raw), encoding='utf-8', write_through=False)
+    renderer = None
+    if variant != 'print':
+        renderer = StreamRenderer(fps=args.fps, stream=out, mode=variant, color=Colors.OKGREEN)
+
+    lag = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(lag_probe(lag, stop))
+    await asyncio.sleep(0.01)
+
+    interval = 1.0 / args.rate if args.rate else 0.0
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    next_token = wall_start
+    for index in range(args.tokens):
+        token = TOKENS[index % len(TOKENS)]
+        if renderer:
+            renderer.write(token)
+        else:
+            print(f"{Colors.OKGREEN}{token}{Colors.ENDC}", end='', flush=True, file=out)
+        # Tokens kommen wie vom WebSocket: jeweils ein Loop-Durchlauf dazwischen
+        next_token += interval
+        await asyncio.sleep(max(0.0, next_token - time.perf_counter()))
+    if renderer:
+        renderer.finish()
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    stop.set()
+    await probe
+    out.close()
+
+    lag.sort()
+    return {
+        'variant': variant,
+        'syscalls': raw.syscalls,
+        'cpu_ms': cpu * 1000,
+        'wall_s': wall,
+        'lag_p99_ms': lag[int(len(lag) * 0.99)] * 1000 if lag else 0.0,
+        'lag_max_ms': lag[-1] * 1000 if lag else 0.0,
+    }
+
+def print_results(results, tokens):
+    print(f"{Colors.BOLD}{'Variante':<8} {'Syscalls':>9} {'CPU ms':>9} {'µs/Token':>9} {'Lag p99':>9} {'Lag max':>9}{Colors.ENDC}")
+    for r in results:
+        print(f"{r['variant']:<8} {r['syscalls']:>9} {r['cpu_ms']:>9.1f} {r['cpu_ms'] * 1000 / tokens:>9.1f} "
+              f"{r['lag_p99_ms']:>7.2f}ms {r['lag_max_ms']:>7.2f}ms")
+
+    baseline = results[0]
+    for r in results[1:]:
+        factor = baseline['syscalls'] / max(r['syscalls'], 1)
+        print(f"\n{Colors.OKGREEN}✓ {r['variant']}: {factor:.0f}x weniger Syscalls, "
+              f"CPU {r['cpu_ms'] - baseline['cpu_ms']:+.1f} ms gegenüber print pro Token{Colors.ENDC}", end='')
+    print("\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="Vergleicht print pro Token mit dem StreamRenderer")
+    parser.add_argument('--tokens', type=int, default=DEFAULT_TOKENS, help="Anzahl Tokens")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help="Tokens pro Sekunde (0 = ohne Pause)")
+    parser.add_argument('--fps', type=float, default=DEFAULT_FPS, help="Bildrate des Renderers")
+    parser.add_argument('--output', default=os.devnull, help="Ziel der Ausgabe (z.B. /dev/tty)")
+    args = parser.parse_args()
+
+    print_header(args)
+    results = []
+    for variant in ('print', 'live', 'final'):
+        results.append(asyncio.run(run_variant(variant, args)))
+    print_results(results, args.tokens)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print(f"\n{Colors.WARNING}Abgebrochen.{Colors.ENDC}\n")
+        sys.exit(1)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Gepufferte Terminal-Ausgabe für Streaming-Text
+==============================================
+Statt jedes Token einzeln mit print(..., flush=True) auszugeben (ein write-Syscall
+plus ANSI-Farbcodes pro Token), sammelt StreamRenderer die Tokens und schreibt sie
+mit begrenzter Bildrate (Standard 30 fps) in einem Rutsch.
+
+Modi:
+- live:  Tokens erscheinen fortlaufend, höchstens fps Schreibvorgänge pro Sekunde
+- final: nichts während des Streams, der komplette Text beim Abschluss (Logs, Pipes)
+- token: ein Schreibvorgang pro Token (bisheriges Verhalten, Vergleich im Benchmark)
+- auto:  live wenn der Stream ein Terminal ist, sonst final
+
+Im Event-Loop wird der nächste Schreibvorgang per loop.call_later geplant, ohne
+laufenden Loop wird beim Schreiben geprüft, ob das Frame-Intervall abgelaufen ist.
+
+Verwendung:
+    from terminal_renderer import StreamRenderer
+
+    renderer = StreamRenderer(fps=30, color='\\033[92m')
+    renderer.write(token)      # pro Streaming-Token
+    renderer.finish()          # bei final: Rest ausgeben
+
+Benchmark gegen print pro Token: terminal-render-bench.py
+"""
+
+import asyncio
+import sys
+import time
+
+RENDER_MODES = ('auto', 'live', 'final', 'token')
+ENDC = '\033[0m'
+
+class StreamRenderer:
+    """Sammelt Streaming-Tokens und schreibt sie mit begrenzter Bildrate"""
+
+    def __init__(self, fps=30, stream=None, mode='auto', color=''):
+        if mode not in RENDER_MODES:
+            raise ValueError(f"Unbekannter Render-Modus '{mode}' (erlaubt: {', '.join(RENDER_MODES)})")
+        self.stream = stream or sys.stdout
+        if mode == 'auto':
+            isatty = getattr(self.stream, 'isatty', None)
+            mode = 'live' if isatty and isatty() else 'final'
+        self.mode = mode
+        self.interval = 1.0 / fps if fps > 0 else 0.0
+        self.color = color
+
+        self._pending = []
+        self._handle = None          # Geplanter Schreibvorgang (asyncio.TimerHandle)
+        self._last_write = 0.0
+
+        # Statistik
+        self.tokens = 0
+        self.writes = 0
+        self.chars = 0
+
+    def write(self, text):
+        """Nimmt ein Token entgegen (schreibt sofort, später oder erst bei finish())"""
+        if not text:
+            return
+        self.tokens += 1
+        self._pending.append(text)
+        if self.mode == 'token':
+            self.flush()
+        elif self.mode == 'live':
+            self._schedule()
+
+    def _schedule(self):
+        if self._handle is not None:
+            return
+        due = self._last_write + self.interval - time.monotonic()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Ohne Event-Loop: schreiben, sobald das Frame-Intervall abgelaufen ist
+            if due <= 0:
+                self.flush()
+            return
+        if due <= 0:
+            # Erstes Token nach einer Pause: im nächsten Loop-Durchlauf (sammelt gleichzeitig eintreffende)
+            self._handle = loop.call_soon(self.flush)
+        else:
+            self._handle = loop.call_later(due, self.flush)
+
+    def flush(self):
+        """Schreibt alle gesammelten Tokens in einem Schreibvorgang"""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if not self._pending:
+            return
+        text = ''.join(self._pending)
+        self._pending.clear()
+        if self.color:
+            text = f"{self.color}{text}{ENDC}"
+        self.stream.write(text)
+        self.stream.flush()
+        self._last_write = time.monotonic()
+        self.writes += 1
+        self.chars += len(text)
+
+    def finish(self):
+        """Stream beendet: Rest ausgeben (im Modus final der komplette Text)"""
+        self.flush()
+
+    def text_pending(self):
+        """Noch nicht geschriebener Text (z.B. für eine Zusammenfassung)"""
+        return ''.join(self._pending)
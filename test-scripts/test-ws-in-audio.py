@@ -21,8 +21,11 @@ Verwendung:
 
     4. Sprich ins Mikrofon - Audio wird an WS-In-Node gestreamt
 
+    Ohne Mikrofon (CI): AUDIO_BACKEND=file AUDIO_FILE=aufnahme.wav python3 test-ws-in-audio.py
+    (die Datei wird einmal in Echtzeit gestreamt, danach endet der Test)
+
 Voraussetzungen:
-    - PyAudio: pip install pyaudio
+    - PyAudio: pip install pyaudio (oder sounddevice, siehe AUDIO_BACKEND)
     - WebSocket-Client: pip install websockets
     - Aktive WS-In-Node auf Port 8081 mit Audio-Modus
 """
@@ -32,25 +35,24 @@ import websockets
 import json
 import uuid
 import sys
-import threading
 import queue
-import time
+import os
 from datetime import datetime
 
-# Audio-Bibliotheken
-try:
-    import pyaudio
-except ImportError:
-    print("❌ PyAudio nicht installiert!")
-    print("   Installiere mit: pip install pyaudio")
-    print("   Auf macOS: brew install portaudio && pip install pyaudio")
-    sys.exit(1)
+from clock_sync import ClockSync
+from audio_buffers import BufferPool, payload_view, release_payload
+from audio_sender import BackpressureSender
+from event_loop import run_loop, loop_from_argv
+from audio_io import open_capture, backend_problem, AudioBackendError
+
+# Monotone, hochauflösende Zeitstempel (kein Uhren-Abgleich: WS In Node unterstützt kein time_sync)
+clock = ClockSync()
 
 # ======================================
 # KONFIGURATION - HIER ANPASSEN
 # ======================================
-WS_HOST = "localhost"
-WS_PORT = 8081  # WebSocket Gateway Port (nicht WS-In-Node Port)
+WS_HOST = os.getenv("WS_HOST", "localhost")
+WS_PORT = int(os.getenv("WS_PORT", "8081"))  # WebSocket Gateway Port (nicht WS-In-Node Port)
 WS_PATH = "/ws/external"     # Leerer Path für Gateway
 
 # Authentifizierung - HIER DEINE WERTE EINTRAGEN!
@@ -66,7 +68,21 @@ CONTEXT_CLIENT = "Laptop xyz"           # Geräte-Name
 SAMPLE_RATE = 16000    # 16kHz für Vosk STT optimal
 CHANNELS = 1          # Mono
 CHUNK_SIZE = 8000     # Frames pro Buffer (wie vosk-mic-test.py)
-FORMAT = pyaudio.paInt16  # 16-bit PCM
+# Format: 16-bit PCM
+
+# Audio-Backend (siehe audio_io.py): pyaudio | sounddevice | file (AUDIO_FILE, WAV/Raw) | null (Stille)
+AUDIO_BACKEND = os.getenv("AUDIO_BACKEND", "pyaudio")
+AUDIO_FILE = os.getenv("AUDIO_FILE", "")
+
+# Native-Rate-Capture: Mikrofon mit nativer Rate/Kanalzahl öffnen (z.B. 48 kHz Stereo)
+# und im Capture-Thread auf SAMPLE_RATE Mono umrechnen (benötigt numpy)
+# 0 = PortAudio direkt mit SAMPLE_RATE/CHANNELS öffnen (bisheriges Verhalten)
+NATIVE_CAPTURE = os.getenv("NATIVE_CAPTURE", "0") == "1"
+
+# Verhalten bei Überlast: block (alles senden) | drop_oldest | coalesce (siehe audio_sender.py)
+SEND_POLICY = os.getenv("SEND_POLICY", "block")
+MAX_QUEUE_AGE = float(os.getenv("MAX_QUEUE_AGE", "1.0"))            # Sekunden
+WRITE_BUFFER_LIMIT = int(os.getenv("WRITE_BUFFER_LIMIT", "65536"))  # Bytes im Transport-Schreibpuffer
 
 # ======================================
 # ENDE KONFIGURATION
@@ -114,7 +130,6 @@ def create_uso_audio_header(context_person: str = "", context_location: str = ""
         "id": str(uuid.uuid4()),
         "type": "audio",
         "sourceId": CLIENT_ID,
-        "timestamp": int(datetime.now().timestamp() * 1000),
         "final": False,  # Wird nur beim Beenden auf True gesetzt
         "audioMeta": {
             "sampleRate": SAMPLE_RATE,
@@ -126,6 +141,9 @@ def create_uso_audio_header(context_person: str = "", context_location: str = ""
         }
     }
 
+    # timestamp + sentAt (monotone Uhr)
+    clock.stamp(header)
+
     # Context-Informationen hinzufügen
     context = {}
 
@@ -147,111 +165,141 @@ def create_uso_audio_header(context_person: str = "", context_location: str = ""
     return json.dumps(header)
 
 class AudioStreamer:
-    """Audio-Streaming Klasse mit PyAudio"""
+    """Audio-Streaming Klasse (Capture über audio_io, Backend per AUDIO_BACKEND)"""
 
     def __init__(self):
-        self.audio = None
-        self.stream = None
+        self.capture = None  # CaptureBackend (audio_io.py)
         self.audio_queue = queue.Queue()
         self.is_recording = False
+        self.converter = None  # CaptureConverter bei NATIVE_CAPTURE
+        self.buffer_pool = None  # BufferPool für konvertierte Chunks (NATIVE_CAPTURE)
+        self.capture_frames = CHUNK_SIZE  # Frames pro Capture-Callback (bei nativer Rate skaliert)
         self.sample_silence_threshold = 100  # Schwellwert für Stille
+        self.session_id = None
+        self.chunk_count = 0
 
     def initialize_audio(self):
-        """Initialisiert PyAudio und den Audio-Stream"""
+        """Initialisiert das Audio-Backend und den Capture-Stream"""
         try:
-            self.audio = pyaudio.PyAudio()
-
-            # Audio-Stream öffnen
-            self.stream = self.audio.open(
-                format=FORMAT,
-                channels=CHANNELS,
-                rate=SAMPLE_RATE,
-                input=True,
-                frames_per_buffer=CHUNK_SIZE
-            )
+            # Datei einmal abspielen, danach endet der Stream (on_end)
+            capture = open_capture(AUDIO_BACKEND, path=AUDIO_FILE)
+        except AudioBackendError as e:
+            print(f"{Colors.FAIL}❌ Audio-Backend '{AUDIO_BACKEND}': {e}{Colors.ENDC}")
+            return False
+
+        try:
+            capture_rate, capture_channels = SAMPLE_RATE, CHANNELS
+
+            # Native Rate des Geräts (NATIVE_CAPTURE) bzw. festes Format der Datei
+            if NATIVE_CAPTURE or capture.fixed_format:
+                native = capture.native_format()
+                if native != (SAMPLE_RATE, CHANNELS):
+                    try:
+                        from audio_resample import CaptureConverter
+                        capture_rate, capture_channels = native
+                        self.converter = CaptureConverter(capture_rate, capture_channels, SAMPLE_RATE)
+                        # Gleiche Chunk-Dauer wie bei SAMPLE_RATE
+                        self.capture_frames = int(CHUNK_SIZE * capture_rate / SAMPLE_RATE)
+                        # Konvertierte Chunks landen direkt in wiederverwendeten Slabs
+                        self.buffer_pool = BufferPool(self.converter.max_output_bytes(self.capture_frames))
+                    except ImportError:
+                        print(f"{Colors.WARNING}⚠ Resampling benötigt numpy (pip install numpy) - nutze {SAMPLE_RATE} Hz direkt{Colors.ENDC}")
+
+            # Capture-Stream öffnen (Blöcke kommen per Callback aus dem Audio-Thread)
+            capture.open(capture_rate, capture_channels, self.capture_frames, self.on_capture, on_end=self.on_end)
+            self.capture = capture
 
             print(f"{Colors.OKGREEN}✓ Mikrofon initialisiert{Colors.ENDC}")
-            print(f"  {Colors.OKCYAN}→ Sample Rate:{Colors.ENDC} {SAMPLE_RATE} Hz")
-            print(f"  {Colors.OKCYAN}→ Channels:{Colors.ENDC} {CHANNELS}")
+            source = f" ({AUDIO_FILE})" if AUDIO_BACKEND == 'file' else ''
+            print(f"  {Colors.OKCYAN}→ Backend:{Colors.ENDC} {AUDIO_BACKEND}{source}")
+            if self.converter:
+                print(f"  {Colors.OKCYAN}→ Capture:{Colors.ENDC} {capture_rate} Hz, {capture_channels} Kanal/Kanäle (nativ)")
+                print(f"  {Colors.OKCYAN}→ Resampling:{Colors.ENDC} → {SAMPLE_RATE} Hz Mono (Polyphasen-Filter)")
+            else:
+                print(f"  {Colors.OKCYAN}→ Sample Rate:{Colors.ENDC} {SAMPLE_RATE} Hz")
+                print(f"  {Colors.OKCYAN}→ Channels:{Colors.ENDC} {CHANNELS}")
             print(f"  {Colors.OKCYAN}→ Chunk Size:{Colors.ENDC} {CHUNK_SIZE} samples (8KB chunks like vosk-mic-test.py)")
             print(f"  {Colors.OKCYAN}→ Format:{Colors.ENDC} 16-bit PCM\n")
 
             return True
         except Exception as e:
             print(f"{Colors.FAIL}✗ Fehler bei Mikrofon-Initialisierung: {e}{Colors.ENDC}")
+            capture.close()
             return False
 
+    def on_capture(self, data, read_at):
+        """Capture-Callback (Audio-Thread des Backends)"""
+        if not self.is_recording:
+            return
+        if self.converter:
+            # Native Rate → SAMPLE_RATE Mono, direkt in einen Pool-Slab
+            data = self.converter.process_into(data, self.buffer_pool.acquire())
+        self.chunk_count += 1
+
+        # Prüfe auf Stille (optional - kann auskommentiert werden)
+        if self._is_silent(payload_view(data)):
+            release_payload(data)
+            return
+
+        # Erster Chunk mit Audio: Header erstellen
+        if self.session_id is None:
+            header_json = create_uso_audio_header(
+                CONTEXT_PERSON,
+                CONTEXT_LOCATION,
+                CONTEXT_CLIENT
+            )
+            self.session_id = json.loads(header_json)["id"]
+            self.audio_queue.put(("header", header_json))
+
+        # Audio-Chunk senden (Capture-Zeitpunkt für Queue-Alter/Backpressure)
+        self.audio_queue.put(("audio", data, read_at))
+
+    def on_end(self):
+        """Quelle zu Ende (z.B. Dateiende bei AUDIO_BACKEND=file): Stream beenden"""
+        self.is_recording = False
+        self.audio_queue.put(("stop", None))
+        print(f"\n{Colors.WARNING}⏹️  Audio-Aufnahme beendet (Ende der Quelle){Colors.ENDC}")
+
     def start_recording(self):
-        """Startet die Audio-Aufnahme in einem separaten Thread"""
-        if not self.stream:
+        """Startet die Audio-Aufnahme (Callbacks aus dem Audio-Thread des Backends)"""
+        if not self.capture:
             if not self.initialize_audio():
                 return False
 
+        print(f"{Colors.OKGREEN}🎤 Starte Audio-Aufnahme...{Colors.ENDC}")
+        print(f"{Colors.WARNING}💡 Sprich ins Mikrofon (STRG+C zum Beenden){Colors.ENDC}\n")
         self.is_recording = True
-
-        def record_thread():
-            """Aufnahme-Thread"""
-            print(f"{Colors.OKGREEN}🎤 Starte Audio-Aufnahme...{Colors.ENDC}")
-            print(f"{Colors.WARNING}💡 Sprich ins Mikrofon (STRG+C zum Beenden){Colors.ENDC}\n")
-
-            session_id = None
-            chunk_count = 0
-
-            while self.is_recording:
-                try:
-                    # Audio-Daten lesen
-                    data = self.stream.read(CHUNK_SIZE, exception_on_overflow=False)
-                    chunk_count += 1
-
-                    # Prüfe auf Stille (optional - kann auskommentiert werden)
-                    if self._is_silent(data):
-                        continue
-
-                    # Ersten Chunk senden (Header + Audio)
-                    if chunk_count == 1:
-                        # Header erstellen
-                        header_json = create_uso_audio_header(
-                            CONTEXT_PERSON,
-                            CONTEXT_LOCATION,
-                            CONTEXT_CLIENT
-                        )
-                        session_id = json.loads(header_json)["id"]
-                        self.audio_queue.put(("header", header_json))
-
-                    # Audio-Chunk senden
-                    self.audio_queue.put(("audio", data))
-
-                except Exception as e:
-                    print(f"{Colors.FAIL}✗ Fehler bei Audio-Aufnahme: {e}{Colors.ENDC}")
-                    break
-
-            # Signal zum Beenden senden
-            if session_id:
-                self.audio_queue.put(("stop", None))
-
-            print(f"\n{Colors.WARNING}⏹️  Audio-Aufnahme beendet{Colors.ENDC}")
-
-        # Thread starten
-        thread = threading.Thread(target=record_thread, daemon=True)
-        thread.start()
+        self.capture.start()
         return True
 
     def _is_silent(self, data):
         """Prüft ob Audio-Daten Stille enthalten"""
-        # Konvertiere zu Int16 und prüfe Amplitude
-        import array
-        samples = array.array('h', data)
-        amplitude = max(abs(sample) for sample in samples)
+        # Int16-Sicht auf die Daten (ohne Kopie) und Amplitude prüfen
+        samples = memoryview(data).cast('h')
+        amplitude = max(max(samples, default=0), -min(samples, default=0))
         return amplitude < self.sample_silence_threshold
 
     def stop_recording(self):
         """Stoppt die Audio-Aufnahme"""
+        was_recording = self.is_recording
         self.is_recording = False
-        if self.stream:
-            self.stream.stop_stream()
-            self.stream.close()
-        if self.audio:
-            self.audio.terminate()
+        if self.capture:
+            self.capture.stop()
+            if was_recording:
+                # Signal zum Beenden senden
+                if self.session_id:
+                    self.audio_queue.put(("stop", None))
+                print(f"\n{Colors.WARNING}⏹️  Audio-Aufnahme beendet{Colors.ENDC}")
+            if self.capture.stats.blocks:
+                print(f"{Colors.OKCYAN}📊 Audio-Capture: {self.capture.stats.summary()}{Colors.ENDC}")
+        if self.converter and self.converter.audio_seconds > 0:
+            print(f"{Colors.OKCYAN}📊 Resampling: {self.converter.cpu_ms_per_audio_second:.2f} ms CPU pro Sekunde Audio "
+                  f"({self.converter.audio_seconds:.1f}s Audio){Colors.ENDC}")
+        if self.buffer_pool and self.buffer_pool.acquires > 0:
+            print(f"{Colors.OKCYAN}📊 Buffer-Pool: {self.buffer_pool.summary()}{Colors.ENDC}")
+        if self.capture:
+            self.capture.close()
+            self.capture = None
 
     def get_audio_data(self):
         """Holt Audio-Daten aus der Queue"""
@@ -272,16 +320,23 @@ async def send_audio_data(websocket, audio_streamer: AudioStreamer):
     """
     session_id = None
     chunk_count = 0
+    pending = None  # Nicht-Audio-Eintrag, der beim Sammeln der Audio-Chunks gelesen wurde
+    sender = BackpressureSender(
+        policy=SEND_POLICY,
+        max_queue_age=MAX_QUEUE_AGE,
+        write_buffer_limit=WRITE_BUFFER_LIMIT
+    )
 
     try:
         while True:
             # Hole Daten aus der Queue
-            data = audio_streamer.get_audio_data()
+            data = pending or audio_streamer.get_audio_data()
+            pending = None
             if data is None:
                 await asyncio.sleep(0.01)  # Kurze Pause
                 continue
 
-            data_type, payload = data
+            data_type, payload = data[0], data[1]
 
             if data_type == "header":
                 # IGNORIERE Header - senden nur Audio-Daten!
@@ -290,14 +345,27 @@ async def send_audio_data(websocket, audio_streamer: AudioStreamer):
                 print(f"{Colors.WARNING}⚠️  Header wird NICHT gesendet - nur Audio-Daten!{Colors.ENDC}")
 
             elif data_type == "audio":
-                # Audio-Chunk direkt senden (rohe Binärdaten)
-                await websocket.send(payload)
-                chunk_count += 1
-                print(f"{Colors.OKGREEN}✓ Audio-Chunk #{chunk_count} gesendet ({len(payload)} bytes){Colors.ENDC}")
+                # Alle bereits wartenden Audio-Chunks mitnehmen (Backlog für die Send-Policy)
+                chunks = [(payload, data[2])]
+                while True:
+                    following = audio_streamer.get_audio_data()
+                    if following is None:
+                        break
+                    if following[0] != "audio":
+                        pending = following
+                        break
+                    chunks.append((following[1], following[2]))
+
+                # Audio-Chunks direkt senden (rohe Binärdaten, ohne Kopie)
+                sent_before = sender.chunks_sent
+                sent_bytes = await sender.send(websocket, chunks)
+                chunk_count += sender.chunks_sent - sent_before
+                print(f"{Colors.OKGREEN}✓ Audio-Chunk #{chunk_count} gesendet ({sent_bytes} bytes){Colors.ENDC}")
 
             elif data_type == "stop":
                 # Beenden-Signal empfangen - keine weiteren Daten senden
                 print(f"{Colors.OKCYAN}→ Audio-Stream beendet (insgesamt {chunk_count} Chunks){Colors.ENDC}")
+                print(f"{Colors.OKCYAN}📊 Audio-Sender: {sender.summary()}{Colors.ENDC}")
                 break
 
     except websockets.exceptions.ConnectionClosed:
@@ -410,8 +478,15 @@ def main():
             print(f"{Colors.WARNING}Aktuelle Version: {sys.version}{Colors.ENDC}\n")
             sys.exit(1)
 
+        # Audio-Backend prüfen (ohne die Bibliothek schon zu importieren)
+        problem = backend_problem(AUDIO_BACKEND)
+        if problem:
+            print(f"❌ {problem}")
+            print("   Ohne Mikrofon: AUDIO_BACKEND=file AUDIO_FILE=aufnahme.wav")
+            sys.exit(1)
+
         # Starte Programm
-        asyncio.run(interactive_audio_client())
+        run_loop(interactive_audio_client(), loop_from_argv())
 
     except KeyboardInterrupt:
         print(f"\n{Colors.WARNING}Abgebrochen.{Colors.ENDC}\n")
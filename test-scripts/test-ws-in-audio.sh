@@ -34,8 +34,8 @@ echo ""
 
 # Prüfe ob erforderliche Pakete installiert sind
 echo "🔍 Prüfe Abhängigkeiten..."
-python3 -c "import pyaudio" 2>/dev/null
-if [ $? -ne 0 ]; then
+# PyAudio nur für das Standard-Backend prüfen (AUDIO_BACKEND=sounddevice|file|null braucht es nicht)
+if [ "${AUDIO_BACKEND:-pyaudio}" = "pyaudio" ] && ! python3 -c "import pyaudio" 2>/dev/null; then
     echo "⚠️  PyAudio ist nicht installiert!"
     echo "   Installiere mit einem der folgenden Befehle:"
     echo "   • pip install pyaudio"
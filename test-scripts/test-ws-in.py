@@ -21,14 +21,21 @@ import asyncio
 import websockets
 import json
 import uuid
+import os
 import sys
 from datetime import datetime
 
+from clock_sync import ClockSync
+from event_loop import run_loop, loop_from_argv
+
+# Monotone, hochauflösende Zeitstempel (kein Uhren-Abgleich: WS In Node unterstützt kein time_sync)
+clock = ClockSync()
+
 # ======================================
 # KONFIGURATION - HIER ANPASSEN
 # ======================================
-WS_HOST = "localhost"
-WS_PORT = 8081
+WS_HOST = os.getenv("WS_HOST", "localhost")
+WS_PORT = int(os.getenv("WS_PORT", "8081"))
 WS_PATH = "/ws/external"
 
 # Context-Informationen - HIER DEINE WERTE EINTRAGEN!
@@ -81,7 +88,6 @@ def create_uso_text_message(text: str, context_person: str = "", context_locatio
         "id": str(uuid.uuid4()),
         "type": "text",
         "sourceId": "python_test_client",
-        "timestamp": int(datetime.now().timestamp() * 1000),
         "final": True,
         "textMeta": {
             "encoding": "utf-8",
@@ -89,6 +95,9 @@ def create_uso_text_message(text: str, context_person: str = "", context_locatio
         }
     }
     
+    # timestamp + sentAt (monotone Uhr)
+    clock.stamp(header)
+
     # Context-Informationen hinzufügen
     context = {}
     
@@ -238,7 +247,7 @@ async def interactive_client():
 def main():
     """Entry Point"""
     try:
-        asyncio.run(interactive_client())
+        run_loop(interactive_client(), loop_from_argv())
     except KeyboardInterrupt:
         print(f"\n{Colors.WARNING}Abgebrochen.{Colors.ENDC}\n")
     finally:
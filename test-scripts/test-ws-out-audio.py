@@ -24,6 +24,8 @@ import subprocess
 import tempfile
 import os
 
+from event_loop import run_loop, loop_from_argv
+
 # ======================================
 # KONFIGURATION - HIER ANPASSEN
 # ======================================
@@ -303,7 +305,7 @@ if __name__ == "__main__":
     
     try:
         print(f"\n{Colors.OKGREEN}🚀 Starte WebSocket-Out Audio Tester...{Colors.ENDC}")
-        asyncio.run(main())
+        run_loop(main(), loop_from_argv())
     except KeyboardInterrupt:
         print(f"\n\n{Colors.WARNING}👋 Server gestoppt.{Colors.ENDC}")
     finally:
@@ -20,9 +20,13 @@ Verwendung:
 import asyncio
 import websockets
 import json
+import os
 import sys
 from datetime import datetime
 
+from terminal_renderer import StreamRenderer
+from event_loop import run_loop, loop_from_argv
+
 # ======================================
 # KONFIGURATION - HIER ANPASSEN
 # ======================================
@@ -30,6 +34,11 @@ WS_HOST = "0.0.0.0"  # 0.0.0.0 = lauscht auf allen Interfaces
 WS_PORT = 8091
 WS_PATH = "/endpoint"
 
+# Streaming-Text: auto = live mit TEXT_RENDER_FPS im Terminal, gesammelt bei Pipes/Logs
+#   live | final (Text erst am Ende) | token (print pro Token, bisheriges Verhalten)
+TEXT_RENDER = os.getenv("TEXT_RENDER", "auto")
+TEXT_RENDER_FPS = float(os.getenv("TEXT_RENDER_FPS", "30"))
+
 # ======================================
 # ENDE KONFIGURATION
 # ======================================
@@ -155,7 +164,9 @@ async def handle_client(websocket):
                                         'chunks': [],
                                         'start_time': timestamp,
                                         'chunk_count': 0,
-                                        'header_shown': False
+                                        'header_shown': False,
+                                        'renderer': StreamRenderer(fps=TEXT_RENDER_FPS, mode=TEXT_RENDER,
+                                                                   color=Colors.OKGREEN),
                                     }
                                     
                                     print(f"\n  {Colors.HEADER}→ USO-Format erkannt!{Colors.ENDC}")
@@ -176,14 +187,16 @@ async def handle_client(websocket):
                                 session['chunks'].append(payload)
                                 session['chunk_count'] += 1
                                 
-                                # Live-Anzeige: Nur der Text, kein JSON!
-                                print(f"{Colors.OKGREEN}{payload}{Colors.ENDC}", end='', flush=True)
+                                # Live-Anzeige: Nur der Text, kein JSON! Gesammelt mit begrenzter Bildrate
+                                session['renderer'].write(payload)
                                 
                             else:
                                 # Finales Paket
                                 if session_id in streaming_sessions:
                                     # Streaming abgeschlossen - zeige Zusammenfassung
                                     session = streaming_sessions[session_id]
+                                    session['renderer'].write(payload)
+                                    session['renderer'].finish()
                                     full_text = ''.join(session['chunks']) + payload
                                     
                                     print(f"\n\n{Colors.OKBLUE}[{timestamp}] 📩 Final-Nachricht #{message_count} empfangen{Colors.ENDC}")
@@ -314,7 +327,7 @@ if __name__ == "__main__":
     
     try:
         print(f"\n{Colors.OKGREEN}🚀 Starte WebSocket-Out Tester...{Colors.ENDC}")
-        asyncio.run(main())
+        run_loop(main(), loop_from_argv())
     except KeyboardInterrupt:
         print(f"\n\n{Colors.WARNING}👋 Server gestoppt.{Colors.ENDC}")
     finally:
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Benchmark: USO-Header-Kompression (permessage-deflate / Delta-Header)
+=====================================================================
+Misst Bytes auf der Leitung und CPU-Zeit für typische USO-Ströme:
+
+- tokens:      AI-Streaming zum Device (Header + Token pro Frame-Paar, wie ai.node.ts)
+- tts:         Speaker-Audio zum Device (Header mit audioMeta + 500 ms PCM pro Chunk)
+- mic:         RAW Audio vom Device (PCM-Chunks + start/stop Control-USOs)
+
+Varianten:
+- raw:            JSON-Header wie bisher, keine Kompression
+- deflate:        permessage-deflate (RFC 7692, Kontext über Nachrichten hinweg)
+- delta:          Delta-Header (uso_delta.py), keine Kompression
+- delta+deflate:  beides
+
+permessage-deflate wird mit zlib nachgebildet (raw deflate, Z_SYNC_FLUSH, ohne die
+abschließenden 00 00 ff ff) - so wie ws (Gateway) und websockets (Client) komprimieren.
+Gezählt werden WebSocket-Frame-Header (+ Maske bei Client → Server) mit.
+CPU = JSON + Delta + Kompression auf Sender- und Empfängerseite.
+Die PCM-Chunks stammen aus dem Audio-Korpus (audio_corpus.py, gleicher --seed = gleiche Eingaben).
+
+Verwendung:
+    python3 uso-compression-bench.py
+    python3 uso-compression-bench.py --sessions 50 --tokens 200 --level 1
+    python3 uso-compression-bench.py --threshold 1024       # Standard-Schwelle von ws
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+import zlib
+from array import array
+
+from uso_delta import HeaderDeltaEncoder, HeaderDeltaDecoder
+
+# ======================================
+# KONFIGURATION - HIER ANPASSEN
+# ======================================
+DEFAULT_SESSIONS = 20
+DEFAULT_TOKENS = 150        # Tokens pro AI-Antwort
+DEFAULT_AUDIO_SECONDS = 5   # Audio pro TTS-/Mikrofon-Session
+DEFAULT_LEVEL = 1           # zlib-Level (1 = schnell, 9 = klein)
+DEFAULT_THRESHOLD = 0       # Nachrichten kleiner als das bleiben unkomprimiert
+SAMPLE_RATE = 16000
+CHUNK_SIZE = 8000           # Samples pro Chunk (wie device-client.py)
+
+# ======================================
+# ENDE KONFIGURATION
+# ======================================
+
+# Farben für Terminal-Output
+class Colors:
+    HEADER = '\033[95m'
+    OKBLUE = '\033[94m'
+    OKCYAN = '\033[96m'
+    OKGREEN = '\033[92m'
+    WARNING = '\033[93m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+VARIANTS = ('raw', 'deflate', 'delta', 'delta+deflate')
+WORDS = ["Das ", "ist ", "eine ", "gestreamte ", "Antwort ", "der ", "KI", ", ", "mit ", "Wörtern ",
+         "unterschiedlicher ", "Länge", ". ", "Heute ", "sind ", "es ", "21 ", "Grad", "."]
+
+def print_header(args):
+    """Zeigt den Header mit Konfiguration an"""
+    print(f"\n{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}")
+    print(f"{Colors.HEADER}{Colors.BOLD}  Benchmark: USO-Header-Kompression{Colors.ENDC}")
+    print(f"{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}\n")
+    print(f"{Colors.OKCYAN}💬 Tokens:{Colors.ENDC} {args.sessions} Sessions x {args.tokens} Tokens")
+    print(f"{Colors.OKCYAN}🎵 Audio:{Colors.ENDC} {args.sessions} Sessions x {args.audio_seconds} s "
+          f"({CHUNK_SIZE} Samples pro Chunk)")
+    print(f"{Colors.OKCYAN}🗜️  Deflate:{Colors.ENDC} Level {args.level}, Schwelle {args.threshold} Bytes\n")
+
+# ======================================
+# Workloads: Liste von (Richtung, Frame) mit Frame = dict (Header) | str | bytes
+# ======================================
+
+def token_workload(sessions, tokens):
+    frames = []
+    for s in range(sessions):
+        session_id = f"txt_python-voice-device_{1760000000000 + s * 7919}"
+        base = {
+            'id': session_id, 'type': 'text', 'sourceId': 'ai_node_1',
+            'speakerInfo': {'speakerId': 'moritz', 'confidence': 0.93, 'language': 'de'},
+            'websocketInfo': {'connectionId': f'conn_1760000000000_{s:09d}', 'clientIp': '192.168.1.42',
+                              'connectedAt': 1760000000000},
+        }
+        timestamp = 1760000000000.0 + s * 10000
+        for t in range(tokens):
+            timestamp += random.uniform(10, 40)
+            frames.append(('down', {**base, 'timestamp': int(timestamp), 'final': False,
+                                    'control': {'action': 'ai_response',
+                                                'data': {'model': 'flowise', 'event': 'token', 'chunkNumber': t + 1}},
+                                    'sentAt': round(timestamp + random.random(), 3)}))
+            frames.append(('down', WORDS[(s + t) % len(WORDS)]))
+        text = ''.join(WORDS[(s + t) % len(WORDS)] for t in range(tokens))
+        frames.append(('down', {**base, 'timestamp': int(timestamp) + 5, 'final': True,
+                                'control': {'action': 'ai_response',
+                                            'data': {'model': 'flowise', 'streamingComplete': True}},
+                                'sentAt': round(timestamp + 5.2, 3)}))
+        frames.append(('down', text))
+    return frames
+
+def speech_chunk(index):
+    """Sprachähnliches Signal: Grundton mit Obertönen, wechselnder Tonhöhe und Rauschen"""
+    samples = array('h')
+    pitch = 110 + 40 * math.sin(index * 0.7)
+    for n in range(CHUNK_SIZE):
+        t = (index * CHUNK_SIZE + n) / SAMPLE_RATE
+        envelope = 0.5 + 0.5 * math.sin(2 * math.pi * 3 * t)
+        value = sum(math.sin(2 * math.pi * pitch * k * t) / k for k in range(1, 6))
+        samples.append(int(max(-32767, min(32767, 6000 * envelope * value + random.gauss(0, 300)))))
+    return samples.tobytes()
+
+def corpus_chunks(seed, count):
+    """Chunks aus dem Audio-Korpus (audio_corpus.py) - gleiche Eingaben wie die übrigen Audio-Benchmarks"""
+    try:
+        from audio_corpus import generate_corpus, Corpus
+    except ImportError:
+        print(f"{Colors.WARNING}⚠ numpy nicht installiert - synthetisches Signal statt Audio-Korpus{Colors.ENDC}")
+        return [speech_chunk(i) for i in range(count)]
+    corpus = Corpus(*generate_corpus(seed, count * CHUNK_SIZE / SAMPLE_RATE))
+    return corpus.chunks(CHUNK_SIZE)
+
+def tts_workload(sessions, seconds, chunks_cache):
+    frames = []
+    chunks = int(seconds * SAMPLE_RATE / CHUNK_SIZE)
+    audio_meta = {'sampleRate': SAMPLE_RATE, 'channels': 1, 'encoding': 'pcm_s16le',
+                  'bitDepth': 16, 'format': 'raw', 'endianness': 'little'}
+    for s in range(sessions):
+        session_id = f"tts_{1760000000000 + s * 7919}"
+        timestamp = 1760000000000 + s * 10000
+        for c in range(chunks):
+            timestamp += 500
+            frames.append(('down', {'id': session_id, 'type': 'audio', 'sourceId': 'tts_node_1',
+                                    'timestamp': timestamp, 'final': False, 'audioMeta': audio_meta,
+                                    'sentAt': timestamp + 0.417}))
+            frames.append(('down', chunks_cache[(s + c) % len(chunks_cache)]))
+        frames.append(('down', {'id': session_id, 'type': 'audio', 'sourceId': 'tts_node_1',
+                                'timestamp': timestamp + 1, 'final': True, 'audioMeta': audio_meta,
+                                'sentAt': timestamp + 1.5}))
+    return frames
+
+def mic_workload(sessions, seconds, chunks_cache):
+    frames = []
+    chunks = int(seconds * SAMPLE_RATE / CHUNK_SIZE)
+    for s in range(sessions):
+        session_id = f"audio_python-voice-device_{1760000000000 + s * 7919}"
+        timestamp = 1760000000000 + s * 10000
+        frames.append(('up', {'id': session_id, 'type': 'control', 'sourceId': 'python-voice-device',
+                              'final': False, 'control': {'action': 'start'},
+                              'timestamp': timestamp, 'sentAt': timestamp + 0.25}))
+        for c in range(chunks):
+            frames.append(('up', chunks_cache[(s * 3 + c) % len(chunks_cache)]))
+        timestamp += chunks * 500
+        frames.append(('up', {'id': session_id, 'type': 'control', 'sourceId': 'python-voice-device',
+                              'final': True, 'control': {'action': 'stop'},
+                              'timestamp': timestamp, 'sentAt': timestamp + 0.31}))
+    return frames
+
+# ======================================
+# Übertragung
+# ======================================
+
+def frame_overhead(length, masked):
+    """WebSocket-Frame-Header (RFC 6455) plus Maskierungsschlüssel bei Client → Server"""
+    size = 2 if length < 126 else 4 if length < 65536 else 10
+    return size + (4 if masked else 0)
+
+class DeflateChannel:
+    """permessage-deflate einer Richtung (mit Context Takeover)"""
+
+    def __init__(self, level, threshold):
+        self.threshold = threshold
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        self.decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+
+    def transfer(self, data):
+        if len(data) < self.threshold:
+            return data
+        wire = self.compressor.compress(data) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+        wire = wire[:-4]
+        # Empfängerseite: Endmarke wieder anhängen und entpacken
+        restored = self.decompressor.decompress(wire + b'\x00\x00\xff\xff')
+        assert restored == data
+        return wire
+
+def run_variant(variant, frames, args):
+    delta = variant.startswith('delta')
+    deflate = variant.endswith('deflate')
+    encoders = {'up': HeaderDeltaEncoder(), 'down': HeaderDeltaEncoder()}
+    decoders = {'up': HeaderDeltaDecoder(), 'down': HeaderDeltaDecoder()}
+    channels = {'up': DeflateChannel(args.level, args.threshold), 'down': DeflateChannel(args.level, args.threshold)}
+    totals = {'header': 0, 'payload': 0}
+    wire_bytes = 0
+
+    cpu_start = time.process_time()
+    for direction, frame in frames:
+        if isinstance(frame, dict):
+            kind = 'header'
+            header = encoders[direction].encode(frame) if delta else frame
+            data = json.dumps(header).encode('utf-8')
+        else:
+            kind = 'payload'
+            data = frame.encode('utf-8') if isinstance(frame, str) else frame
+        wire = channels[direction].transfer(data) if deflate else data
+        size = len(wire) + frame_overhead(len(wire), direction == 'up')
+        totals[kind] += size
+        wire_bytes += size
+        if kind == 'header':
+            # Empfängerseite: JSON parsen und Delta auflösen
+            received = json.loads(data)
+            if delta:
+                received = decoders[direction].decode(received)
+            assert received == frame
+    cpu = time.process_time() - cpu_start
+
+    return {'variant': variant, 'bytes': wire_bytes, 'header_bytes': totals['header'],
+            'payload_bytes': totals['payload'], 'cpu_ms': cpu * 1000}
+
+def print_results(name, results, frame_count):
+    print(f"{Colors.BOLD}{name} ({frame_count} Frames){Colors.ENDC}")
+    print(f"{Colors.BOLD}{'Variante':<14} {'Gesamt':>11} {'Header':>11} {'Payload':>11} {'Ersparnis':>10} {'CPU ms':>9}{Colors.ENDC}")
+    baseline = results[0]
+    for r in results:
+        saving = 1 - r['bytes'] / baseline['bytes']
+        print(f"{r['variant']:<14} {r['bytes']:>11,} {r['header_bytes']:>11,} {r['payload_bytes']:>11,} "
+              f"{saving:>9.1%} {r['cpu_ms']:>9.1f}")
+    print()
+
+def main():
+    parser = argparse.ArgumentParser(description="Misst Bytes und CPU für permessage-deflate und Delta-Header")
+    parser.add_argument('--sessions', type=int, default=DEFAULT_SESSIONS, help="Sessions pro Workload")
+    parser.add_argument('--tokens', type=int, default=DEFAULT_TOKENS, help="Tokens pro AI-Antwort")
+    parser.add_argument('--audio-seconds', type=float, default=DEFAULT_AUDIO_SECONDS, help="Audio pro Session")
+    parser.add_argument('--level', type=int, default=DEFAULT_LEVEL, help="zlib-Kompressionslevel (1-9)")
+    parser.add_argument('--threshold', type=int, default=DEFAULT_THRESHOLD,
+                        help="Mindestgröße für Kompression in Bytes (ws-Standard: 1024)")
+    parser.add_argument('--seed', type=int, default=42, help="Zufalls-Seed (reproduzierbar)")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    print_header(args)
+
+    print(f"{Colors.OKCYAN}⏳ Erzeuge Audio...{Colors.ENDC}\n")
+    chunks_cache = corpus_chunks(args.seed, 8)
+    workloads = [
+        ('Token-Streaming (Gateway → Device)', token_workload(args.sessions, args.tokens)),
+        ('TTS-Audio (Gateway → Device)', tts_workload(args.sessions, args.audio_seconds, chunks_cache)),
+        ('Mikrofon RAW Audio (Device → Gateway)', mic_workload(args.sessions, args.audio_seconds, chunks_cache)),
+    ]
+    for name, frames in workloads:
+        results = [run_variant(variant, frames, args) for variant in VARIANTS]
+        print_results(name, results, len(frames))
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print(f"\n{Colors.WARNING}Abgebrochen.{Colors.ENDC}\n")
+        sys.exit(1)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Delta-Header für USOs
+=====================
+Der erste Header einer Session wird vollständig gesendet, alle weiteren Header
+derselben Session (gleiche id) nur mit den geänderten Feldern:
+
+    {"id": "...", "delta": true, "timestamp": ..., "final": true}
+
+Entfernte Felder stehen in "unset". Nach einem finalen Header wird die Session
+vergessen (der nächste Header mit dieser id ist wieder vollständig).
+
+Gleiches Schema wie USOUtils.createHeaderDelta / applyHeaderDelta im Backend.
+Aktiviert wird es pro Verbindung über den Query-Parameter headerDelta=1.
+
+Verwendung:
+    from uso_delta import HeaderDeltaEncoder, HeaderDeltaDecoder
+
+    encoder = HeaderDeltaEncoder()
+    wire = encoder.encode(header)          # vollständig oder Delta
+    decoder = HeaderDeltaDecoder()
+    header = decoder.decode(json.loads(text))   # None bei Delta ohne bekannte Session
+"""
+
+from collections import OrderedDict
+
+MAX_SESSIONS = 32  # Gemerkte Sessions pro Richtung (älteste fliegt raus)
+
+def create_header_delta(previous, header):
+    """Delta von previous zu header (gleiche Session-id)"""
+    delta = {'id': header['id'], 'delta': True}
+    for key, value in header.items():
+        if key != 'id' and previous.get(key, delta) != value:
+            delta[key] = value
+    unset = [key for key in previous if key not in header]
+    if unset:
+        delta['unset'] = unset
+    return delta
+
+def apply_header_delta(previous, delta):
+    """Setzt einen Header aus dem vorherigen Header und einem Delta zusammen"""
+    header = dict(previous)
+    for key, value in delta.items():
+        if key not in ('delta', 'unset'):
+            header[key] = value
+    for key in delta.get('unset', ()):
+        header.pop(key, None)
+    return header
+
+class _SessionCache:
+    def __init__(self, max_sessions):
+        self.max_sessions = max_sessions
+        self._headers = OrderedDict()
+
+    def get(self, session_id):
+        return self._headers.get(session_id)
+
+    def remember(self, header):
+        session_id = header.get('id')
+        if header.get('final'):
+            self._headers.pop(session_id, None)
+            return
+        self._headers[session_id] = header
+        self._headers.move_to_end(session_id)
+        while len(self._headers) > self.max_sessions:
+            self._headers.popitem(last=False)
+
+class HeaderDeltaEncoder:
+    """Sendeseite: erster Header pro Session vollständig, danach nur Änderungen"""
+
+    def __init__(self, max_sessions=MAX_SESSIONS):
+        self._cache = _SessionCache(max_sessions)
+
+    def encode(self, header):
+        previous = self._cache.get(header.get('id'))
+        self._cache.remember(header)
+        if previous is None:
+            return header
+        return create_header_delta(previous, header)
+
+class HeaderDeltaDecoder:
+    """Empfangsseite: setzt Delta-Header wieder zu vollständigen Headern zusammen"""
+
+    def __init__(self, max_sessions=MAX_SESSIONS):
+        self._cache = _SessionCache(max_sessions)
+        self.unknown_deltas = 0
+
+    def decode(self, data):
+        """Vollständiger Header, oder None bei einem Delta ohne bekannte Session"""
+        if data.get('delta'):
+            previous = self._cache.get(data.get('id'))
+            if previous is None:
+                self.unknown_deltas += 1
+                return None
+            data = apply_header_delta(previous, data)
+        self._cache.remember(data)
+        return data
@@ -7,6 +7,7 @@ Zeigt Sprache als kontinuierlichen Fließtext an.
 
 import websocket
 import json
+import os
 import sys
 import time
 from datetime import datetime
@@ -14,6 +15,8 @@ import sounddevice as sd
 import numpy as np
 import threading
 import queue
+from audio_buffers import BufferPool
+from partial_display import PartialLine, PartialStability
 
 # ======================================
 # KONFIGURATION
@@ -25,11 +28,12 @@ VOSK_URI = f"ws://{VOSK_HOST}:{VOSK_PORT}"
 SAMPLE_RATE = 16000
 CHANNELS = 1
 DTYPE = 'int16'
-CHUNK_SIZE = 8000
+CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "8000"))  # Bytes pro Block (kleiner = mehr Partials)
 
 DEVICE = None  # None = default, oder z.B. 0 für iPhone-Mikrofon
 SHOW_PARTIAL = True  # Zeige auch Teil-Ergebnisse (während du sprichst)
 SHOW_CONFIDENCE = False  # Zeige Konfidenz-Scores
+PARTIAL_FPS = float(os.getenv("PARTIAL_FPS", "10"))  # Max. Partial-Aktualisierungen pro Sekunde (0 = jedes)
 # ======================================
 
 class Colors:
@@ -44,39 +48,55 @@ class Colors:
     DIM = '\033[2m'
 
 audio_queue = queue.Queue()
+audio_pool = BufferPool(slab_size=(CHUNK_SIZE // 2) * 2)  # frames_per_buffer * 2 Bytes (int16)
 ws = None
 transcript_buffer = []  # Puffer für den Fließtext
+partial_line = PartialLine(fps=PARTIAL_FPS, style=Colors.DIM)  # Nur geänderter Rest, begrenzte Bildrate
+stability = PartialStability()  # Wie oft ändern sich Wörter nach dem ersten Auftauchen?
 
 def print_header():
     print(f"\n{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}")
     print(f"{Colors.HEADER}{Colors.BOLD}  Vosk Live-Transkription (Fließtext-Modus){Colors.ENDC}")
     print(f"{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}\n")
     print(f"{Colors.OKCYAN}📡 Server:{Colors.ENDC} {VOSK_URI}")
-    print(f"{Colors.OKCYAN}🎵 Format:{Colors.ENDC} {SAMPLE_RATE}Hz, 16-bit PCM LE, Mono\n")
+    print(f"{Colors.OKCYAN}🎵 Format:{Colors.ENDC} {SAMPLE_RATE}Hz, 16-bit PCM LE, Mono")
+    print(f"{Colors.OKCYAN}📦 Chunk:{Colors.ENDC} {CHUNK_SIZE} Bytes ({CHUNK_SIZE / 2 / SAMPLE_RATE * 1000:.0f} ms), "
+          f"Partials max. {PARTIAL_FPS:g}/s\n")
+
+def print_partial_stats():
+    """Partial-Statistik: Zeichenaufwand und Stabilität (Latenz/Genauigkeit je Chunk-Größe)"""
+    summary = stability.summary()
+    shown = partial_line.renders / partial_line.updates if partial_line.updates else 0
+    print(f"\n{Colors.DIM}📊 Partials: {partial_line.updates} empfangen, {partial_line.renders} gezeichnet "
+          f"({shown:.0%}), {partial_line.chars_written} Zeichen geschrieben{Colors.ENDC}")
+    if summary['final_words']:
+        print(f"{Colors.DIM}📊 Stabilität (Chunk {CHUNK_SIZE} Bytes): {summary['final_words']} Wörter in "
+              f"{summary['utterances']} Sätzen, {summary['revised_word_ratio']:.1%} nach dem ersten Auftauchen geändert "
+              f"({summary['revisions']} Änderungen), Ø erstes Auftauchen → final {summary['commit_latency_ms']:.0f} ms, "
+              f"Ø stabil nach {summary['stable_after_ms']:.0f} ms{Colors.ENDC}")
 
 def audio_callback(indata, frames, time, status):
     """Audio-Callback - NON-BLOCKING"""
     if status:
         print(f"{Colors.WARNING}⚠️  {status}{Colors.ENDC}", file=sys.stderr)
     
-    audio_data = np.frombuffer(indata, dtype=np.int16)
-    
-    if len(audio_data.shape) > 1 and audio_data.shape[1] > 1:
-        audio_data = audio_data[:, 0]
+    # indata ist nur während des Callbacks gültig → genau eine Kopie in einen Pool-Slab
+    if indata.ndim > 1 and indata.shape[1] > 1:
+        indata = np.ascontiguousarray(indata[:, 0])
     
-    if audio_data.dtype.byteorder == '>':
-        audio_data = audio_data.byteswap().newbyteorder('<')
-    
-    audio_queue.put(audio_data.tobytes())
+    audio_queue.put(audio_pool.acquire().write(indata))
 
 def send_thread_func(ws_app):
     """Sender-Thread"""
     while True:
         try:
-            data = audio_queue.get()
-            if data is None:
+            buffer = audio_queue.get()
+            if buffer is None:
                 break
-            ws_app.send(data, opcode=websocket.ABNF.OPCODE_BINARY)
+            try:
+                ws_app.send(buffer.payload, opcode=websocket.ABNF.OPCODE_BINARY)
+            finally:
+                buffer.release()
         except Exception:
             break
 
@@ -137,6 +157,7 @@ def stream_microphone():
                            callback=audio_callback):
 
             current_line = ""
+            current_plain = ""  # Sichtbarer Text von current_line (ohne Farbcodes aus SHOW_CONFIDENCE)
             line_length = 0
             MAX_LINE_LENGTH = 80  # Zeichen pro Zeile
 
@@ -148,17 +169,20 @@ def stream_microphone():
                 if SHOW_PARTIAL and "partial" in result:
                     partial_text = result["partial"].strip()
                     if partial_text:
-                        # Zeige Partial in hellerer Farbe, ohne neue Zeile
-                        preview = f"{Colors.DIM}{partial_text}...{Colors.ENDC}"
-                        print(f"\r{current_line}{preview}", end="", flush=True)
+                        stability.partial(partial_text)
+                        # Partial in hellerer Farbe hinter dem Satz, gebündelt und nur der geänderte Rest
+                        partial_line.column = len(current_plain)
+                        partial_line.update(partial_text if not current_line else f" {partial_text}")
 
                 # Finales Ergebnis (Satz abgeschlossen)
                 elif "text" in result and result["text"]:
                     final_text = result["text"].strip()
                     
                     if final_text:
+                        stability.final(final_text)
                         # Lösche Partial-Preview
-                        print(f"\r{' ' * (line_length + 50)}\r", end="")
+                        partial_line.clear()
+                        print("\r", end="")
                         
                         # Formatiere Text (mit oder ohne Konfidenz)
                         if SHOW_CONFIDENCE:
@@ -169,15 +193,18 @@ def stream_microphone():
                         # Füge zum aktuellen Satz hinzu
                         if current_line:
                             current_line += " " + formatted_text
+                            current_plain += " " + final_text
                         else:
                             current_line = formatted_text
+                            current_plain = final_text
                         
-                        line_length = len(current_line)
+                        line_length = len(current_plain)
                         
                         # Automatischer Zeilenumbruch bei langen Sätzen
                         if line_length > MAX_LINE_LENGTH:
                             print(current_line)
                             current_line = ""
+                            current_plain = ""
                             line_length = 0
                         else:
                             # Zeige aktuellen Satz
@@ -196,6 +223,8 @@ def stream_microphone():
 
     finally:
         audio_queue.put(None)
+        print_partial_stats()
+        print(f"{Colors.DIM}📊 Buffer-Pool: {audio_pool.summary()}{Colors.ENDC}")
         
         if ws and ws.connected:
             try: